@@ -1,6 +1,13 @@
+import os
+import sys
 import ply.lex as lex
 from typing import List
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from comun.diagnosticos import ListaDiagnosticos, columna_de
+from comun.lexico import CADENA, CADENA_SIN_CERRAR, saltar_comentario
+from comun.lexico_unificado import Gramatica, SALTAR
+
 # =========================================================================
 # 1. ANALIZADOR LÉXICO (PLY Lex) - Definición de Tokens
 # =========================================================================
@@ -54,7 +61,12 @@ t_PUNTO = r'\.'
 t_ignore = ' \t'
 
 # Listas para almacenar resultados globales
-errores_lexicos: List[str] = []
+MENSAJES_LEXICOS = {
+    'LEX001': "❌ Error léxico: carácter no reconocido '{caracter}' en la línea {linea}",
+    'LEX002': "❌ Error léxico: cadena sin cerrar en la línea {linea}",
+    'LEX003': "❌ Error léxico: comentario '/*' sin cerrar desde la línea {linea}",
+}
+errores_lexicos: List[str] = ListaDiagnosticos('lexico', MENSAJES_LEXICOS)
 tokens_reconocidos: List[lex.LexToken] = [] 
 
 # Definiciones de tokens complejos
@@ -70,12 +82,22 @@ def t_ENTERO(t):
     tokens_reconocidos.append(t)
     return t
 
+# Patrones sin retroceso y comentarios con str.find: costo lineal (ver comun/lexico.py)
+@lex.TOKEN(CADENA)
 def t_CADENA(t):
-    r'\"([^\\\n]|(\\.))*?\"'
     t.value = bytes(t.value[1:-1], "utf-8").decode("unicode_escape")
     tokens_reconocidos.append(t)
     return t
 
+@lex.TOKEN(CADENA_SIN_CERRAR)
+def t_cadena_sin_cerrar(t):
+    # se reporta una vez y se toma como cadena hasta el fin de la línea
+    errores_lexicos.reportar('LEX002', t.lineno, columna_de(t.lexer.lexdata, t.lexpos))
+    t.type = 'CADENA'
+    t.value = bytes(t.value[1:], "utf-8").decode("unicode_escape")
+    tokens_reconocidos.append(t)
+    return t
+
 def t_IDENTIFICADOR(t):
     r'[A-Za-z_][A-Za-z0-9_]*'
     t.type = reservadas.get(t.value, 'IDENTIFICADOR')
@@ -83,9 +105,9 @@ def t_IDENTIFICADOR(t):
     return t
 
 def t_comentario_multilinea(t):
-    r'/\*([^*]|\*+[^*/])*\*+/'
-    t.lexer.lineno += t.value.count('\n') 
-    pass
+    r'/\*'
+    if not saltar_comentario(t):
+        errores_lexicos.reportar('LEX003', t.lineno, columna_de(t.lexer.lexdata, t.lexpos))
 
 def t_comentario_linea(t):
     r'//.*'
@@ -95,12 +117,33 @@ def t_nueva_linea(t):
     r'\n+'
     t.lexer.lineno += len(t.value)
 
+# Resguardo (ver comun/lexico.py): última regla de función; un carácter con el que
+# no empieza ningún token se reporta aquí, sin pasar por t_error.
+def t_caracter_ilegal(t):
+    r'[^+\-*/%&|!=<>(){}\[\],:;.]|&(?!&)|\|(?!\|)'
+    errores_lexicos.reportar('LEX001', t.lineno, columna_de(t.lexer.lexdata, t.lexpos), caracter=t.value)
+
 def t_error(t):
-    errores_lexicos.append(f"❌ Error léxico: carácter no reconocido '{t.value[0]}' en la línea {t.lineno}")
+    errores_lexicos.reportar('LEX001', t.lineno, columna_de(t.lexer.lexdata, t.lexpos), caracter=t.value[0])
     t.lexer.skip(1)
 
 # Inicialización del analizador léxico
 analizador_lexico = lex.lex()
 
+# Tokens del léxico unificado (comun/lexico_unificado.py) -> tokens de esta gramática.
+# Lo que falta ('...', '+=', '?', caracteres, ...) lo lexea analizador_lexico.
+TABLA_UNIFICADA = {
+    'ENTERO': 'ENTERO', 'DECIMAL': 'DECIMAL', 'CADENA': 'CADENA', 'COMENTARIO': SALTAR,
+    '(': 'LPAREN', ')': 'RPAREN', '{': 'LBRACE', '}': 'RBRACE', '[': 'LBRACKET', ']': 'RBRACKET',
+    ',': 'COMA', ':': 'DOSPTOS', ';': 'PUNTOYCOMA', '=': 'ASIGNAR', '.': 'PUNTO',
+    '+': 'SUMA', '-': 'RESTA', '*': 'MULT', '/': 'DIV', '%': 'MOD',
+    '&&': 'AND', '||': 'OR', '!': 'NOT',
+    '==': 'IGUAL', '!=': 'DIFERENTE', '<': 'MENOR', '>': 'MAYOR', '<=': 'MENORIGUAL', '>=': 'MAYORIGUAL',
+    '->': 'FLECHA',
+}
+# Los tokens traducidos no pasan por tokens_reconocidos (solo lo usa el log de analizar_archivo)
+gramatica_unificada = Gramatica(analizador_lexico, 'IDENTIFICADOR', reservadas, TABLA_UNIFICADA,
+                                valores={'CADENA': lambda v: bytes(v[1:-1], "utf-8").decode("unicode_escape")})
+
 # Exportamos los tokens para ser usados por PLY Yacc en el otro archivo
 # Usamos 'tokens' (la lista de nombres de tokens) directamente.
\ No newline at end of file
@@ -1,9 +1,20 @@
 from __future__ import annotations
+import os
+import sys
 import ply.yacc as yacc
-from typing import Dict, List, Optional
+from typing import List, Optional
 # Importamos la lista de tokens del lexer
 from analizadorLexicoArielAAT123 import tokens, errores_lexicos, tokens_reconocidos
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from comun.simbolos import Ambito, Simbolo
+from comun.colecciones import ColeccionLiteral, agregar_elemento
+from comun.plazo import Plazo
+from comun.diagnosticos import ListaDiagnosticos, columna_de
+from comun.recuperacion import Recuperacion
+from comun.flujo import SalidaSentencias
+from comun.incremental import anclar_como
+
 # =========================================================================
 # 2. NODOS DEL ÁRBOL (AST) - Clases mínimas requeridas
 # =========================================================================
@@ -13,6 +24,20 @@ class Nodo:
         self.linea = linea
     def get_linea(self): return self.linea
 
+    # Los nodos de un trozo del reparseo incremental no guardan `linea`: guardan
+    # 'ancla' (el Trozo) y 'desde_ancla', y su línea se calcula al leerla, así
+    # mover el trozo no recorre sus nodos (ver comun/incremental.py).
+    def __getattr__(self, nombre):
+        campos = self.__dict__
+        if nombre == 'linea' and 'ancla' in campos:
+            return campos['ancla'].linea + campos['desde_ancla']
+        raise AttributeError(nombre)
+
+    def en_linea_de(self, otro: 'Nodo', linea: Optional[int] = None) -> 'Nodo':
+        """Le da la línea de `otro` (o `linea`), anclada al mismo trozo que `otro` si lo está."""
+        anclar_como(self.__dict__, otro.__dict__, otro.linea if linea is None else linea)
+        return self
+
 class Programa(Nodo):
     def __init__(self, sentencias):
         super().__init__(1)
@@ -78,6 +103,23 @@ class OperacionBinaria(Nodo):
         super().__init__(linea)
         self.operador, self.izquierda, self.derecha = op, izq, der
 
+class OperacionNaria(Nodo):
+    """Cadena a op b op c ... de un operador asociativo (lineas: línea de cada operador)."""
+    def __init__(self, op, operandos, lineas):
+        super().__init__(lineas[0])
+        self.operador, self.operandos = op, operandos
+        self.saltos = [linea - lineas[0] for linea in lineas]    # relativas a la del nodo: se mueven con ella
+
+    @property
+    def lineas(self) -> List[int]:
+        linea = self.linea
+        return [linea + salto for salto in self.saltos]
+
+    @lineas.setter
+    def lineas(self, lineas: List[int]):
+        linea = self.linea
+        self.saltos = [l - linea for l in lineas]
+
 class OperacionUnaria(Nodo): 
     def __init__(self, op, opnd, linea):
         super().__init__(linea)
@@ -96,7 +138,42 @@ class Identificador(Nodo):
 # =========================================================================
 # 3. ANALIZADOR SINTÁCTICO (PLY Yacc) - Reglas Ariel + Mínimas
 # =========================================================================
-errores_sintacticos: List[str] = []
+# Catálogo de mensajes: los errores se guardan como (código, línea, argumentos)
+# y el texto se arma recién al leer la lista (ver comun/diagnosticos.py)
+MENSAJES = {
+    'SIN001': "❌ Error de sintaxis en línea {linea}: token inesperado '{valor}' (tipo: {tipo})",
+    'SIN002': "❌ Error de sintaxis: fin de archivo inesperado",
+    'SIN003': "❌ Demasiados errores de sintaxis ({maximo}); se omite el resto del archivo.",
+    'SEM001': "❌ Línea {linea}: variable '{nombre}' ya fue declarada en este ámbito.",
+    'SEM002': "❌ Línea {linea}: Tipo de inicialización incompatible para '{nombre}'. Esperado {esperado}, recibido {recibido}.",
+    'SEM003': "❌ Línea {linea}: variable '{nombre}' no declarada.",
+    'SEM004': "❌ Línea {linea}: variable '{nombre}' es inmutable (let) y no puede ser reasignada.",
+    'SEM005': "❌ Línea {linea}: Tipo incompatible al reasignar a '{nombre}'. Esperado {esperado}, recibido {recibido}.",
+    'SEM006': "❌ Línea {linea}: '{operador}' requiere operandos compatibles ({numericos} o String + String), recibido {izquierdo} y {derecho}.",
+    'SEM007': "❌ Línea {linea}: '{operador}' requiere tipos Bool, recibido {izquierdo} y {derecho}.",
+    'SEM008': "❌ Línea {linea}: La condición de WHILE debe ser de tipo Bool, recibido {recibido}.",
+    'SEM009': "❌ Línea {linea}: La condición de IF debe ser de tipo Bool, recibido {recibido}.",
+    'SEM010': "❌ Línea {linea}: identificador '{nombre}' no declarado.",
+    'SEM011': "❌ Línea {linea}: operador '!' requiere tipo Bool.",
+    'SEM012': "❌ Línea {linea}: operador '-' requiere tipo numérico.",
+}
+
+errores_sintacticos: List[str] = ListaDiagnosticos('sintactico', MENSAJES)
+
+def _olvidar_token(t):
+    # el lexer registra cada identificador/palabra clave; al releerlo no se duplica
+    if tokens_reconocidos and tokens_reconocidos[-1] is t:
+        tokens_reconocidos.pop()
+
+# Modo pánico: tras un error se sincroniza en ';', '{', '}' o en una palabra
+# clave al comienzo de una línea (ver comun/recuperacion.py)
+recuperacion = Recuperacion('PUNTOYCOMA', 'LBRACE', 'RBRACE',
+                            ('VAR', 'LET', 'FUNC', 'WHILE', 'IF', 'RETURN', 'CLASS'),
+                            al_rebobinar=_olvidar_token)
+
+# Sentencias de nivel superior: al programa o, en flujo, a un consumidor
+# apenas se reducen (ver comun/flujo.py)
+salida = SalidaSentencias()
 
 # La variable tokens ya está importada del archivo lexer
 # tokens = tokens # no es necesario, pero aquí se usaría si no se importara directamente.
@@ -113,16 +190,29 @@ precedence = (
 )
 
 def p_programa(p):
-    'programa : lista_sentencias'
+    'programa : sentencias_programa'
     p[0] = Programa(p[1])
 
+# Misma forma que lista_sentencias, pero solo para el nivel superior
+def p_sentencias_programa(p):
+    '''
+    sentencias_programa : sentencias_programa sentencia
+                        |
+    '''
+    if len(p) == 3:
+        p[0] = salida.entregar(p[1], p[2]) if p[2] is not None else p[1]
+    else:
+        p[0] = []
+
+# Las listas se extienden en el lugar (p[1] + [...] copiaba la lista en cada sentencia)
 def p_lista_sentencias(p):
     '''
     lista_sentencias : lista_sentencias sentencia
                      |
     '''
     if len(p) == 3:
-        p[0] = p[1] + ([p[2]] if p[2] is not None else []) 
+        if p[2] is not None: p[1].append(p[2])
+        p[0] = p[1]
     else:
         p[0] = []
 
@@ -139,6 +229,15 @@ def p_sentencia(p):
     '''
     p[0] = p[1]
 
+# --- Recuperación de errores: la sentencia con error se descarta (None) ---
+def p_sentencia_error(p):
+    '''
+    sentencia : error PUNTOYCOMA
+              | error LBRACE lista_sentencias RBRACE
+    '''
+    p.parser.errok()
+    p[0] = None
+
 # --- REGLAS SINTÁCTICAS DE ARIEL: Declaración VAR (Incluye LET para Semántico) ---
 def p_declaracion_variable_ariel(p):
     '''
@@ -192,7 +291,9 @@ def p_lista_miembros_clase(p):
     lista_miembros_clase : lista_miembros_clase miembro_clase
                          |
     '''
-    if len(p) == 3: p[0] = p[1] + [p[2]]
+    if len(p) == 3:
+        p[1].append(p[2])
+        p[0] = p[1]
     else: p[0] = []
 
 def p_miembro_clase(p):
@@ -202,6 +303,11 @@ def p_miembro_clase(p):
     '''
     p[0] = p[1]
 
+def p_miembro_clase_error(p):
+    'miembro_clase : error PUNTOYCOMA'
+    p.parser.errok()
+    p[0] = None
+
 # --- REGLAS SINTÁCTICAS DE ARIEL: Funciones con Default ---
 def p_definicion_funcion_ariel(p):
     'definicion_funcion_ariel : FUNC IDENTIFICADOR LPAREN lista_parametros_ariel RPAREN tipo_retorno LBRACE lista_sentencias RBRACE'
@@ -213,7 +319,9 @@ def p_lista_parametros_ariel(p):
                            | parametro_ariel
                            |
     '''
-    if len(p) == 4: p[0] = p[1] + [p[3]]
+    if len(p) == 4:
+        p[1].append(p[3])
+        p[0] = p[1]
     elif len(p) == 2: p[0] = [p[1]]
     else: p[0] = []
 
@@ -241,32 +349,46 @@ def p_retorno_completo(p):
 # --- REGLAS SINTÁCTICAS DE ARIEL: Tuples ---
 def p_expresion_tupla_ariel(p):
     'expresion : LPAREN lista_expresiones_ariel RPAREN'
+    linea = p.lineno(1)
     if len(p[2]) >= 2:
-        p[0] = Tupla(p[2], p.lineno(1))
+        p[0] = Tupla(p[2], linea)
     elif len(p[2]) == 1:
-        p[0] = p[2][0]
+        p[0] = p[2].primero(lambda tipo, valor: Literal(valor, tipo, linea))
     else:
-        p[0] = Tupla([], p.lineno(1))
+        p[0] = Tupla(p[2], linea)
 
 def p_expresion_llamada(p):
     'expresion : IDENTIFICADOR LPAREN lista_expresiones_ariel RPAREN'
-    p[0] = LlamadaFuncion(p[1], p[3], p.lineno(1))
+    linea = p.lineno(1)
+    argumentos = list(p[3].elementos(lambda tipo, valor: Literal(valor, tipo, linea)))
+    p[0] = LlamadaFuncion(p[1], argumentos, linea)
 
+# Los elementos se juntan en una ColeccionLiteral: los literales seguidos del mismo
+# tipo quedan en un buffer tipado (sin un nodo Literal por elemento) y agregar uno
+# no copia la lista.
 def p_lista_expresiones_ariel(p):
     '''
     lista_expresiones_ariel : lista_expresiones_ariel COMA expresion
                             | expresion
                             |
     '''
-    if len(p) == 4: p[0] = p[1] + [p[3]]
-    elif len(p) == 2: p[0] = [p[1]]
-    else: p[0] = []
+    if len(p) == 4:
+        p[0] = p[1]
+        expr = p[3]
+    else:
+        p[0] = ColeccionLiteral()
+        expr = p[1] if len(p) == 2 else None
+    if expr is not None:
+        literal = (expr.tipo, expr.valor) if type(expr) is Literal else None
+        agregar_elemento(p[0], expr, literal)
 
 # --- REGLAS SINTÁCTICAS: Expresiones (Mínimo Requerido) ---
 def p_expresion_acceso_miembro(p):
     'expresion : expresion PUNTO IDENTIFICADOR'
     p[0] = AccesoMiembro(p[1], p[3], p.lineno(2))
 
+OPERADORES_ASOCIATIVOS = ('+', '*', '&&', '||')
+
 def p_expresion_binaria(p):
     '''
     expresion : expresion SUMA expresion
@@ -283,7 +405,18 @@ def p_expresion_binaria(p):
               | expresion AND expresion
               | expresion OR expresion
     '''
-    p[0] = OperacionBinaria(p[2], p[1], p[3], p.lineno(2))
+    op, izq = p[2], p[1]
+    # las cadenas de un mismo operador asociativo se juntan en un solo nodo
+    if op in OPERADORES_ASOCIATIVOS:
+        if isinstance(izq, OperacionNaria) and izq.operador == op:
+            izq.operandos.append(p[3])
+            izq.saltos.append(p.lineno(2) - izq.linea)
+            p[0] = izq
+            return
+        if isinstance(izq, OperacionBinaria) and izq.operador == op:
+            p[0] = OperacionNaria(op, [izq.izquierda, izq.derecha, p[3]], [izq.linea, p.lineno(2)])
+            return
+    p[0] = OperacionBinaria(op, izq, p[3], p.lineno(2))
 
 def p_expresion_unaria(p):
     '''
@@ -312,28 +445,26 @@ def p_expresion_identificador(p):
     p[0] = Identificador(p[1], p.lineno(1))
 
 def p_error(p):
+    if not recuperacion.contar(analizador_sintactico, p):
+        if recuperacion.recien_cortado:
+            errores_sintacticos.reportar('SIN003', maximo=recuperacion.max_errores)
+        return
     if p:
-        errores_sintacticos.append(
-            f"❌ Error de sintaxis en línea {p.lineno}: token inesperado '{p.value}' (tipo: {p.type})"
-        )
-        analizador_sintactico.errok()
+        errores_sintacticos.reportar('SIN001', p.lineno, columna_de(p.lexer.lexdata, p.lexpos), valor=p.value, tipo=p.type)
+        recuperacion.sincronizar(analizador_sintactico, p)
     else:
-        errores_sintacticos.append("❌ Error de sintaxis: fin de archivo inesperado")
+        errores_sintacticos.reportar('SIN002')
 
-analizador_sintactico = yacc.yacc()
+analizador_sintactico = yacc.yacc(debug=False, write_tables=False)
 
 
 # =========================================================================
 # 4. ANALIZADOR SEMÁNTICO (Reglas Ariel)
 # =========================================================================
-class Simbolo:
-    def __init__(self, nombre, tipo, mutable, linea):
-        self.nombre, self.tipo, self.mutable, self.linea = nombre, tipo, mutable, linea
-
 class AnalizadorSemantico:
     def __init__(self):
-        self.ambitos: List[Dict[str, Simbolo]] = [{}]
-        self.errores: List[str] = []
+        self.ambitos: List[Ambito] = [Ambito()]
+        self.errores: List[str] = ListaDiagnosticos('semantico', MENSAJES)
         self.tipos_numericos = ['Int', 'Double']
         self.tipos_compatibles = {
             'Int': ['Int', 'Double'],
@@ -341,19 +472,19 @@ class AnalizadorSemantico:
             'String': ['String'],
             'Bool': ['Bool']
         }
+        self.plazo: Optional[Plazo] = None   # si se fija, se revisa en cada sentencia de nivel superior
 
-    def nuevo_ambito(self): self.ambitos.append({})
+    def nuevo_ambito(self): self.ambitos.append(Ambito())
     def cerrar_ambito(self): self.ambitos.pop()
 
     def declarar(self, nombre, tipo, mutable, linea):
-        if nombre in self.ambitos[-1]:
-            self.errores.append(f"❌ Línea {linea}: variable '{nombre}' ya fue declarada en este ámbito.")
-        else:
-            self.ambitos[-1][nombre] = Simbolo(nombre, tipo, mutable, linea)
+        if not self.ambitos[-1].declarar(nombre, tipo, mutable, linea):
+            self.errores.reportar('SEM001', linea, nombre=nombre)
 
     def buscar(self, nombre) -> Optional[Simbolo]:
         for a in reversed(self.ambitos):
-            if nombre in a: return a[nombre]
+            simb = a.get(nombre)
+            if simb is not None: return simb
         return None
 
     def verificar(self, nodo) -> Optional[str]:
@@ -364,57 +495,72 @@ class AnalizadorSemantico:
              [self.verificar(s) for s in nodo.sentencias]
         return None
 
+    def verificar_Programa(self, n: Programa):
+        for s in n.sentencias:
+            if self.plazo is not None: self.plazo.revisar()
+            self.verificar(s)
+
     def verificar_DeclaracionVariable(self, n: DeclaracionVariable):
         tipo_inf = self.verificar(n.valor)
         tipo_final = n.tipo or tipo_inf or 'Desconocido'
         
         if n.valor and n.tipo and tipo_inf and tipo_inf not in self.tipos_compatibles.get(n.tipo, []):
-            self.errores.append(f"❌ Línea {n.linea}: Tipo de inicialización incompatible para '{n.nombre}'. Esperado {n.tipo}, recibido {tipo_inf}.")
+            self.errores.reportar('SEM002', n.linea, nombre=n.nombre, esperado=n.tipo, recibido=tipo_inf)
             
         self.declarar(n.nombre, tipo_final, n.mutable, n.linea)
 
     def verificar_Asignacion(self, n: Asignacion):
         simb = self.buscar(n.nombre)
         if not simb:
-            self.errores.append(f"❌ Línea {n.linea}: variable '{n.nombre}' no declarada.")
+            self.errores.reportar('SEM003', n.linea, nombre=n.nombre)
             return
             
         if not simb.mutable:
-            self.errores.append(f"❌ Línea {n.linea}: variable '{n.nombre}' es inmutable (let) y no puede ser reasignada.")
+            self.errores.reportar('SEM004', n.linea, nombre=n.nombre)
             return
             
         tipo_valor = self.verificar(n.expresion)
         if tipo_valor and tipo_valor not in self.tipos_compatibles.get(simb.tipo, []):
-             self.errores.append(f"❌ Línea {n.linea}: Tipo incompatible al reasignar a '{n.nombre}'. Esperado {simb.tipo}, recibido {tipo_valor}.")
+             self.errores.reportar('SEM005', n.linea, nombre=n.nombre, esperado=simb.tipo, recibido=tipo_valor)
 
     def verificar_OperacionBinaria(self, n: OperacionBinaria):
         tipo_izq, tipo_der = self.verificar(n.izquierda), self.verificar(n.derecha)
-        
-        if n.operador in ['+', '-', '*', '/', '%']:
+        return self.tipo_binario(n.operador, tipo_izq, tipo_der, n.get_linea())
+
+    def verificar_OperacionNaria(self, n: OperacionNaria):
+        # mismo resultado que la cadena binaria ((a op b) op c) ..., sin recursión
+        tipo = self.verificar(n.operandos[0])
+        for operando, linea in zip(n.operandos[1:], n.lineas):
+            tipo = self.tipo_binario(n.operador, tipo, self.verificar(operando), linea)
+        return tipo
+
+    def tipo_binario(self, operador, tipo_izq, tipo_der, linea):
+        if operador in ['+', '-', '*', '/', '%']:
             if tipo_izq in self.tipos_numericos and tipo_der in self.tipos_numericos:
                 return 'Double' if 'Double' in [tipo_izq, tipo_der] else 'Int'
             
-            if tipo_izq == 'String' and n.operador == '+' and tipo_der == 'String': return 'String'
+            if tipo_izq == 'String' and operador == '+' and tipo_der == 'String': return 'String'
             
             if 'Desconocido' in [tipo_izq, tipo_der]: return 'Desconocido'
             
-            self.errores.append(f"❌ Línea {n.get_linea()}: '{n.operador}' requiere operandos compatibles ({self.tipos_numericos} o String + String), recibido {tipo_izq} y {tipo_der}.")
+            self.errores.reportar('SEM006', linea, operador=operador, numericos=str(self.tipos_numericos),
+                                  izquierdo=tipo_izq, derecho=tipo_der)
             return 'Desconocido'
 
-        elif n.operador in ['&&', '||']:
+        elif operador in ['&&', '||']:
             if tipo_izq == 'Bool' and tipo_der == 'Bool': return 'Bool'
             if 'Desconocido' in [tipo_izq, tipo_der]: return 'Desconocido'
-            self.errores.append(f"❌ Línea {n.get_linea()}: '{n.operador}' requiere tipos Bool, recibido {tipo_izq} y {tipo_der}.")
+            self.errores.reportar('SEM007', linea, operador=operador, izquierdo=tipo_izq, derecho=tipo_der)
             return 'Bool'
             
-        elif n.operador in ['==', '!=', '<', '>', '<=', '>=']: return 'Bool'
+        elif operador in ['==', '!=', '<', '>', '<=', '>=']: return 'Bool'
         
         return 'Desconocido'
         
     def verificar_Mientras(self, n: Mientras):
         tipo_cond = self.verificar(n.condicion)
         if tipo_cond not in ['Bool', 'Desconocido']:
-            self.errores.append(f"❌ Línea {n.get_linea()}: La condición de WHILE debe ser de tipo Bool, recibido {tipo_cond}.")
+            self.errores.reportar('SEM008', n.get_linea(), recibido=tipo_cond)
         self.nuevo_ambito()
         [self.verificar(s) for s in n.cuerpo]
         self.cerrar_ambito()
@@ -422,7 +568,7 @@ class AnalizadorSemantico:
     def verificar_Si(self, n: Si):
         tipo_cond = self.verificar(n.condicion)
         if tipo_cond not in ['Bool', 'Desconocido']:
-            self.errores.append(f"❌ Línea {n.get_linea()}: La condición de IF debe ser de tipo Bool, recibido {tipo_cond}.")
+            self.errores.reportar('SEM009', n.get_linea(), recibido=tipo_cond)
             
         self.nuevo_ambito()
         [self.verificar(s) for s in n.cuerpo_if]
@@ -449,25 +595,27 @@ class AnalizadorSemantico:
         self.cerrar_ambito()
         
     def verificar_Tupla(self, n: Tupla):
-        tipos = [self.verificar(elem) or 'Desconocido' for elem in n.elementos]
+        # por tramos: un buffer de literales aporta su tipo repetido sin crear nodos
+        tramos = n.elementos.tramos_por_tipo(lambda elem: self.verificar(elem) or 'Desconocido')
+        tipos = [', '.join([tipo] * cantidad) for tipo, _, cantidad in tramos]
         return f"Tuple<{', '.join(tipos)}>"
 
     def verificar_Literal(self, n: Literal): return n.tipo
     def verificar_Identificador(self, n: Identificador):
         simb = self.buscar(n.nombre)
         if not simb:
-            self.errores.append(f"❌ Línea {n.get_linea()}: identificador '{n.nombre}' no declarado.")
+            self.errores.reportar('SEM010', n.get_linea(), nombre=n.nombre)
             return 'Desconocido'
         return simb.tipo
     def verificar_OperacionUnaria(self, n: OperacionUnaria):
         tipo = self.verificar(n.operando)
         if n.operador == '!':
             if tipo not in ['Bool', 'Desconocido']:
-                self.errores.append(f"❌ Línea {n.get_linea()}: operador '!' requiere tipo Bool.")
+                self.errores.reportar('SEM011', n.get_linea())
             return 'Bool'
         elif n.operador == '-':
             if tipo not in self.tipos_numericos and tipo != 'Desconocido':
-                self.errores.append(f"❌ Línea {n.get_linea()}: operador '-' requiere tipo numérico.")
+                self.errores.reportar('SEM012', n.get_linea())
             return tipo
         return 'Desconocido'
     def verificar_LlamadaFuncion(self, n: LlamadaFuncion):
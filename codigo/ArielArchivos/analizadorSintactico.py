@@ -1,22 +1,411 @@
 from __future__ import annotations
 import os
 import sys
+import time
 from datetime import datetime
+from functools import partial
+from typing import Dict, Optional
 
 # Importamos las herramientas de las otras capas
-from analizadorLexicoArielAAT123 import analizador_lexico, errores_lexicos, tokens_reconocidos
-from analizadorSemantico import analizador_sintactico, errores_sintacticos, AnalizadorSemantico
+import analizadorLexicoArielAAT123 as lexico
+from analizadorLexicoArielAAT123 import analizador_lexico, errores_lexicos, tokens_reconocidos, gramatica_unificada
+from analizadorSemantico import (analizador_sintactico, errores_sintacticos, recuperacion, salida, AnalizadorSemantico,
+                                 Nodo, Programa, ColeccionLiteral)
+from verificacionParalela import verificar_paralelo
+from plegadoConstantes import PlegadorConstantes
+from motorEjecucion import compilar, ErrorEjecucion
+from proyecto import Proyecto
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from comun.plazo import Plazo, PlazoAgotado, LexerConPlazo, ResultadoAnalisis
+from comun.flujo import en_flujo
+from comun.diagnosticos import por_linea, apariciones
+from comun import tuberia
+from comun.tokens_compartidos import BufferTokens, LexerCompartido
+from comun.lexico_unificado import LexerUnificado
+from comun.cache_resultados import CacheResultados, firma_de, CARPETA as CARPETA_CACHE
+from comun.incremental import ParseIncremental, anclar_campos
+from comun.vigilancia import Vigilante, INTERVALO
+from comun.servidor_lsp import ServidorLSP
 
 # Forzar UTF-8 para manejo de logs en la terminal
 sys.stdout.reconfigure(encoding='utf-8')
 
+# =========================================================================
+# ANÁLISIS CON HORA LÍMITE (sin logs)
+# =========================================================================
+
+@salida.exclusivo
+def analyze(codigo: str, deadline=None, max_errors: Optional[int] = None, pasada=None) -> ResultadoAnalisis:
+    """
+    Léxico + sintáctico + plegado + semántico sobre `codigo`.
+    `deadline` es un Plazo o un instante de time.monotonic(); si se agota, el
+    resultado trae los errores encontrados hasta ese punto y parcial=True.
+    `max_errors` limita los errores sintácticos (por omisión MAX_ERRORES).
+    `pasada` es el resultado de comun.lexico_unificado.lexear(codigo): los
+    tokens salen de ahí (compartida con las otras gramáticas) en vez de lexear.
+    """
+    plazo = Plazo.desde(deadline)
+    inicio = time.perf_counter()
+    errores_lexicos.clear()
+    tokens_reconocidos.clear()
+    errores_sintacticos.clear()
+    analizador_lexico.lineno = 1
+    lexer = LexerUnificado(pasada, gramatica_unificada) if pasada is not None else analizador_lexico
+    if plazo: lexer = LexerConPlazo(lexer, plazo)
+    plegador = PlegadorConstantes()
+    plegador.plazo = plazo
+    sem = AnalizadorSemantico()
+    sem.plazo = plazo
+
+    ast, fase = None, 'sintactico'
+    try:
+        with recuperacion.con_maximo(max_errors):
+            ast = analizador_sintactico.parse(codigo, lexer=lexer)
+        fase = 'semantico'
+        if ast:
+            ast = plegador.plegar_programa(ast)
+            sem.verificar(ast)
+        fase = None
+    except PlazoAgotado:
+        pass
+    errores = errores_lexicos + errores_sintacticos + por_linea(plegador.errores, sem.errores)
+    return ResultadoAnalisis(errores, fase, ast, (time.perf_counter() - inicio) * 1000)
+
+# =========================================================================
+# ANÁLISIS EN FLUJO (sentencia por sentencia)
+# =========================================================================
+
+@salida.exclusivo
+def analizar_en_flujo(codigo: str, consumidor=None, max_errors: Optional[int] = None):
+    """
+    Como analyze, pero cada sentencia de nivel superior se pliega, se verifica
+    y se entrega a `consumidor` apenas el parser la reduce: el Programa
+    completo no se arma (ast=None en el resultado) y tokens_reconocidos no
+    guarda los tokens de las sentencias ya entregadas. Sin consumidor devuelve un
+    generador de las sentencias; el ResultadoAnalisis queda en StopIteration.value.
+    """
+    if consumidor is None:
+        return en_flujo(lambda entregar: analizar_en_flujo(codigo, entregar, max_errors), salida)
+    inicio = time.perf_counter()
+    errores_lexicos.clear()
+    tokens_reconocidos.clear()
+    errores_sintacticos.clear()
+    analizador_lexico.lineno = 1
+    plegador = PlegadorConstantes()
+    sem = AnalizadorSemantico()
+
+    def procesar(sentencia):
+        # el lexer registra cada token; en flujo solo se conserva el lookahead
+        del tokens_reconocidos[:-1]
+        sentencia = plegador.plegar_sentencia(sentencia)
+        sem.verificar(sentencia)
+        consumidor(sentencia)
+
+    with recuperacion.con_maximo(max_errors), salida.hacia(procesar):
+        analizador_sintactico.parse(codigo, lexer=analizador_lexico)
+    errores = errores_lexicos + errores_sintacticos + por_linea(plegador.errores, sem.errores)
+    return ResultadoAnalisis(errores, None, None, (time.perf_counter() - inicio) * 1000)
+
+# =========================================================================
+# ANÁLISIS EN TUBERÍA (léxico, sintáctico y semántico en procesos separados)
+# =========================================================================
+# Cada etapa corre en su proceso con su copia de los globales (ver comun/tuberia.py)
+
+@salida.exclusivo
+def _etapa_lexica(codigo: str, salida_tokens):
+    # los errores léxicos viajan con los tokens hacia el parser
+    lexico.errores_lexicos = salida_tokens
+    try:
+        analizador_lexico.lineno = 1
+        analizador_lexico.input(codigo)
+        for token in iter(analizador_lexico.token, None):
+            salida_tokens(token)
+            if len(tokens_reconocidos) >= tuberia.TAM_LOTE: tokens_reconocidos.clear()
+    finally:
+        lexico.errores_lexicos = errores_lexicos
+        tokens_reconocidos.clear()
+
+@salida.exclusivo
+def _etapa_sintactica(lexer, entregar, max_errors: Optional[int] = None):
+    errores_lexicos.clear()
+    errores_sintacticos.clear()
+    lexer.errores_lexicos = errores_lexicos
+    with recuperacion.con_maximo(max_errors), salida.hacia(entregar):
+        programa = analizador_sintactico.parse(lexer=lexer)
+    return errores_lexicos, errores_sintacticos, programa is not None
+
+def _etapa_semantica(sentencias):
+    plegador = PlegadorConstantes()
+    sem = AnalizadorSemantico()
+    for sentencia in sentencias:
+        sem.verificar(plegador.plegar_sentencia(sentencia))
+    return plegador.errores, sem.errores
+
+def analizar_en_tuberia(codigo: str, max_errors: Optional[int] = None) -> ResultadoAnalisis:
+    """
+    Mismos errores que analyze, con léxico, sintáctico y semántico en tres
+    procesos que se pasan tokens y sentencias por colas acotadas. Conviene
+    con archivos grandes y al menos tres núcleos; el AST no vuelve (ast=None).
+    """
+    inicio = time.perf_counter()
+    _, (lexicos, sintacticos, completo), (plegado, semanticos) = tuberia.ejecutar(
+        codigo, _etapa_lexica, partial(_etapa_sintactica, max_errors=max_errors), _etapa_semantica)
+    errores = lexicos + sintacticos
+    if completo: errores += por_linea(plegado, semanticos)   # como en analyze: sin programa no hay semántico
+    return ResultadoAnalisis(errores, None, None, (time.perf_counter() - inicio) * 1000)
+
+# =========================================================================
+# TOKENS EN MEMORIA COMPARTIDA (un lexeo, varios procesos que parsean)
+# =========================================================================
+
+def lexear_compartido(codigo: str) -> BufferTokens:
+    """Lexea `codigo` una vez y deja los tokens en memoria compartida (ver comun/tokens_compartidos.py)."""
+    return BufferTokens.crear(codigo, _etapa_lexica)
+
+@salida.exclusivo
+def analizar_tokens(buffer: BufferTokens, max_errors: Optional[int] = None) -> ResultadoAnalisis:
+    """
+    Como analyze, pero toma los tokens de un BufferTokens en vez de lexear:
+    se puede llamar desde cualquier proceso que haya abierto el buffer (p. ej.
+    con tokens_compartidos.repartir).
+    """
+    inicio = time.perf_counter()
+    errores_lexicos.clear()
+    errores_sintacticos.clear()
+    lexer = LexerCompartido(buffer)
+    lexer.errores_lexicos = errores_lexicos
+    plegador = PlegadorConstantes()
+    sem = AnalizadorSemantico()
+    with recuperacion.con_maximo(max_errors):
+        ast = analizador_sintactico.parse(lexer=lexer)
+    if ast:
+        ast = plegador.plegar_programa(ast)
+        sem.verificar(ast)
+    errores = errores_lexicos + errores_sintacticos + por_linea(plegador.errores, sem.errores)
+    return ResultadoAnalisis(errores, None, ast, (time.perf_counter() - inicio) * 1000)
+
+# =========================================================================
+# CACHÉ DE RESULTADOS (un archivo sin cambios no se vuelve a analizar)
+# =========================================================================
+
+# Clases de nodo por nombre, para cargar instantáneas del AST (comun/instantanea_ast.py)
+CLASES_AST = {clase.__name__: clase for clase in Nodo.__subclasses__()}
+
+def cache_resultados(carpeta: str = CARPETA_CACHE, **opciones) -> CacheResultados:
+    """CacheResultados de este analizador; cualquier cambio en ArielArchivos o comun cambia la firma."""
+    opciones.setdefault('clases_ast', CLASES_AST)
+    return CacheResultados(carpeta, 'ariel', firma_de(os.path.dirname(os.path.abspath(__file__))), **opciones)
+
+def analizar_ruta(ruta: str, cache: Optional[CacheResultados] = None,
+                  max_errors: Optional[int] = None) -> ResultadoAnalisis:
+    """analyze sobre el contenido de `ruta`; con un CacheResultados, un archivo ya analizado cuesta un stat."""
+    if cache is None:
+        with open(ruta, "r", encoding="utf-8") as f:
+            return analyze(f.read(), max_errors=max_errors)
+    return cache.analizar(ruta, partial(analyze, max_errors=max_errors), variante=max_errors)
+
+# =========================================================================
+# REPARSEO INCREMENTAL (solo las sentencias que cambiaron, ver comun/incremental.py)
+# =========================================================================
+
+@salida.exclusivo
+def _parsear_trozo(texto: str, linea: int):
+    errores_lexicos.clear()
+    errores_sintacticos.clear()
+    analizador_lexico.lineno = linea
+    programa = analizador_sintactico.parse(texto, lexer=analizador_lexico)
+    tokens_reconocidos.clear()
+    if programa is None or errores_lexicos or errores_sintacticos:
+        return None
+    return programa.sentencias, None
+
+def _anclar_lineas(sentencias: list, trozo):
+    # mismo recorrido que motorConsultas.hijos, sin un generador por nodo; solo al parsear
+    # el trozo: después, moverlo no recorre sus nodos (Nodo.__getattr__)
+    pendientes = list(sentencias)
+    sacar, agregar, extender = pendientes.pop, pendientes.append, pendientes.extend
+    while pendientes:
+        campos = vars(sacar())
+        anclar_campos(campos, trozo)
+        for valor in campos.values():
+            if isinstance(valor, Nodo):
+                agregar(valor)
+            elif isinstance(valor, list):
+                extender(v for v in valor if isinstance(v, Nodo))
+            elif isinstance(valor, ColeccionLiteral):
+                extender(valor.nodos())
+
+def parser_incremental() -> ParseIncremental:
+    """Estado del reparseo incremental de un archivo (uno por archivo abierto)."""
+    return ParseIncremental(_parsear_trozo, _anclar_lineas)
+
+@salida.exclusivo
+def reparsear(incremental: ParseIncremental, codigo: str, max_errors: Optional[int] = None) -> Programa:
+    """
+    El Programa de `codigo` sin plegar, igual al de analizador_sintactico.parse,
+    parseando solo las sentencias de nivel superior que cambiaron desde la
+    última llamada con `incremental`. Si alguna tiene errores se parsea el
+    archivo completo y los errores quedan en errores_lexicos y
+    errores_sintacticos como siempre.
+    """
+    sentencias = incremental.actualizar(codigo)
+    if sentencias is not None:
+        errores_lexicos.clear()
+        errores_sintacticos.clear()
+        return Programa(list(sentencias))     # copia: el plegado reemplaza elementos de la lista
+    errores_lexicos.clear()
+    errores_sintacticos.clear()
+    analizador_lexico.lineno = 1
+    with recuperacion.con_maximo(max_errors):
+        programa = analizador_sintactico.parse(codigo, lexer=analizador_lexico)
+    tokens_reconocidos.clear()
+    return programa
+
+@salida.exclusivo
+def analizar_incremental(incremental: ParseIncremental, codigo: str, max_errors: Optional[int] = None,
+                         deadline=None) -> ResultadoAnalisis:
+    """
+    Como analyze, pero el parseo es reparsear: solo se parsean las sentencias
+    que cambiaron. El plazo se revisa en el semántico (el parseo de lo que
+    cambió no se corta).
+    """
+    plazo = Plazo.desde(deadline)
+    inicio = time.perf_counter()
+    plegador = PlegadorConstantes()
+    plegador.plazo = plazo
+    sem = AnalizadorSemantico()
+    sem.plazo = plazo
+    ast, fase = None, 'sintactico'
+    try:
+        ast = reparsear(incremental, codigo, max_errors)
+        fase = 'semantico'
+        if ast:
+            ast = plegador.plegar_programa(ast)
+            sem.verificar(ast)
+        fase = None
+    except PlazoAgotado:
+        pass
+    errores = errores_lexicos + errores_sintacticos + por_linea(plegador.errores, sem.errores)
+    return ResultadoAnalisis(errores, fase, ast, (time.perf_counter() - inicio) * 1000)
+
+# =========================================================================
+# MODO VIGILANCIA (--watch: se vuelve a analizar lo que se guarda)
+# =========================================================================
+
+def _informar(ruta: str, resultado: ResultadoAnalisis, ms: float, guardado_ns: Optional[int] = None):
+    hora = datetime.now().strftime('%H:%M:%S')
+    estado = f"❌ {len(resultado.errores)} error(es)" if resultado.errores else "✅ sin errores"
+    latencia = f", {(time.time_ns() - guardado_ns) / 1e6:.0f} ms desde que se guardó" if guardado_ns else ""
+    print(f"[{hora}] {ruta}: {estado} ({ms:.1f} ms{latencia})")
+    for error in resultado.errores:
+        print(f"    {error}")
+
+def vigilar(carpeta: str = "algoritmos", cache: Optional[CacheResultados] = None,
+            max_errors: Optional[int] = None, detener=None, intervalo: float = INTERVALO):
+    """
+    Analiza los .swift de `carpeta` y después, en cada ráfaga de cambios,
+    solo los archivos que cambiaron. Cada archivo guarda su parser
+    incremental entre análisis; con un CacheResultados los archivos sin
+    cambios (o que vuelven a un contenido ya visto) no se analizan.
+    Imprime los errores y cuánto tardó cada análisis. Termina con Ctrl+C o
+    cuando detener() devuelve True. `intervalo`: segundos entre revisiones
+    de la carpeta (comun/vigilancia.py).
+    """
+    parsers: Dict[str, ParseIncremental] = {}
+    vigilante = Vigilante(carpeta, intervalo=intervalo, espera=intervalo / 2)
+
+    def analizar(ruta: str, guardado_ns: Optional[int] = None):
+        inicio = time.perf_counter()
+        incremental = parsers.setdefault(ruta, parser_incremental())
+        analizar_texto = partial(analizar_incremental, incremental, max_errors=max_errors)
+        try:
+            if cache is not None:
+                resultado = cache.analizar(ruta, analizar_texto, variante=max_errors)
+            else:
+                with open(ruta, "r", encoding="utf-8") as f:
+                    resultado = analizar_texto(f.read())
+        except (OSError, UnicodeDecodeError) as e:     # borrado a medio guardar, codificación inválida
+            print(f"⚠️ {ruta}: no se pudo leer ({e})")
+            return
+        _informar(ruta, resultado, (time.perf_counter() - inicio) * 1000, guardado_ns)
+
+    for ruta in sorted(vigilante.estados):
+        analizar(ruta)
+    print(f"👀 Vigilando '{carpeta}' ({len(vigilante.estados)} archivo(s)). Ctrl+C para salir.")
+    for cambiados, borrados in vigilante.rafagas(detener):
+        for ruta in borrados:
+            parsers.pop(ruta, None)
+            print(f"🗑️ {ruta}: eliminado")
+        inicio = time.perf_counter()
+        for ruta in cambiados:
+            estado = vigilante.estados.get(ruta)
+            analizar(ruta, estado[0] if estado else None)
+        if len(cambiados) > 1:
+            print(f"   {len(cambiados)} archivo(s) en {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+# =========================================================================
+# SERVIDOR DE DIAGNÓSTICOS (--lsp: subconjunto de LSP por stdio)
+# =========================================================================
+
+def servidor_lsp(**opciones) -> ServidorLSP:
+    """ServidorLSP con este analizador; cada documento abierto guarda su parser incremental."""
+    return ServidorLSP(lambda incremental, texto, plazo: analizar_incremental(incremental, texto, deadline=plazo),
+                       parser_incremental, fuente='ariel', **opciones)
+
+# =========================================================================
+# EJECUCIÓN (--ejecutar: el programa compilado a clausuras)
+# =========================================================================
+
+def ejecutar_archivo(ruta: str) -> int:
+    """Analiza `ruta` y, si no tiene errores, lo ejecuta (motorEjecucion). Devuelve el código de salida."""
+    with open(ruta, "r", encoding="utf-8") as f:
+        resultado = analyze(f.read())
+    if resultado.errores or resultado.ast is None:
+        for err in resultado.errores: print(err)
+        print(f"❌ {ruta}: no se ejecuta, tiene {len(resultado.errores)} error(es).")
+        return 1
+    try:
+        compilar(resultado.ast).ejecutar()
+    except ErrorEjecucion as error:
+        print(error)
+        return 1
+    return 0
+
+# =========================================================================
+# PROYECTO (--proyecto: todos los .swift de una carpeta, ver proyecto.py)
+# =========================================================================
+
+def analizar_proyecto(carpeta: str, trabajadores: Optional[int] = None) -> int:
+    """Analiza los .swift de `carpeta` como un módulo e imprime los errores de cada archivo.
+    Devuelve el código de salida (1 si algún archivo tiene errores)."""
+    resultado = Proyecto(carpeta, trabajadores=trabajadores).analizar()
+    for componente in resultado.componentes:
+        ciclo = " (ciclo)" if len(componente) > 1 else ""
+        for ruta in componente:
+            errores = resultado.errores[ruta]
+            estado = f"❌ {len(errores)} error(es)" if errores else "✅ sin errores"
+            print(f"{os.path.relpath(ruta, carpeta)}{ciclo}: {estado}")
+            for error in errores:
+                print(f"    {error}")
+    print(f"📦 {len(resultado.errores)} archivo(s) en {len(resultado.componentes)} componente(s): "
+          f"{len(resultado.parseados)} parseado(s), {len(resultado.verificados)} verificado(s) "
+          f"en {resultado.duracion_ms:.1f} ms")
+    return 1 if any(resultado.errores.values()) else 0
+
 # =========================================================================
 # FUNCIÓN PRINCIPAL Y LOGGING
 # =========================================================================
 
-def analizar_archivo(ruta: str, usuario_git: str):
+# Los errores repetidos van en una sola entrada; los totales cuentan cada uno.
+NOTA_TOTALES = ("Nota: un error que se repite (mismo código y datos) se muestra una vez con "
+                "'(se repite N veces; líneas ... y M más)'; los totales cuentan cada aparición.\n\n")
+
+@salida.exclusivo
+def analizar_archivo(ruta: str, usuario_git: str, paralelo: bool = False):
     """
     Ejecuta el análisis completo (Lex, Yacc, Semántico) y genera los logs.
+    Con paralelo=True los cuerpos de funciones y clases se verifican en varios procesos.
     """
     
     # --- Cargar Código Fuente ---
@@ -61,8 +450,18 @@ def analizar_archivo(ruta: str, usuario_git: str):
     lexer.lineno = 1
     ast = parser.parse(codigo, lexer=lexer)
 
+    # --- Plegado de constantes (antes del semántico) ---
+    plegador = PlegadorConstantes()
+    if ast: ast = plegador.plegar_programa(ast)
+
     sem = AnalizadorSemantico()
-    if ast: sem.verificar(ast)
+    inicio_sem = time.perf_counter()
+    if ast:
+        if paralelo: sem.errores = verificar_paralelo(ast)
+        else: sem.verificar(ast)
+    duracion_sem = time.perf_counter() - inicio_sem
+    total_semanticos = apariciones(plegador.errores, sem.errores)
+    sem.errores = por_linea(plegador.errores, sem.errores)
 
     # --- 2. Generar Logs ---
     os.makedirs("logs", exist_ok=True)
@@ -85,6 +484,7 @@ def analizar_archivo(ruta: str, usuario_git: str):
         log.write("- Bucles WHILE, Condicionales IF/ELSE, Tuplas, Clases.\n")
         log.write("- Funciones con parámetros por defecto.\n")
         log.write("- SEMÁNTICO: Asignación de tipos y Operaciones permitidas.\n\n")
+        log.write(NOTA_TOTALES)
 
         log.write("✅ RESUMEN DE TOKENS RECONOCIDOS:\n")
         log.write("-" * 60 + f"\nTotal: {len(tokens_reconocidos)} tokens\n\n")
@@ -93,21 +493,26 @@ def analizar_archivo(ruta: str, usuario_git: str):
         log.write("-" * 60 + "\n")
         if errores_lexicos: log.write('\n'.join(errores_lexicos) + '\n')
         else: log.write("No se encontraron errores léxicos.\n")
-        log.write(f"\nTotal: {len(errores_lexicos)} error(es) léxico(s)\n\n")
+        log.write(f"\nTotal: {apariciones(errores_lexicos)} error(es) léxico(s)\n\n")
 
         log.write("❌ ERRORES SINTÁCTICOS:\n")
         log.write("-" * 60 + "\n")
         if errores_sintacticos: log.write('\n'.join(errores_sintacticos) + '\n')
         else: log.write("No se encontraron errores sintácticos.\n")
-        log.write(f"\nTotal: {len(errores_sintacticos)} error(es) sintáctico(s)\n\n")
+        log.write(f"\nTotal: {apariciones(errores_sintacticos)} error(es) sintáctico(s)\n\n")
+
+        log.write("⚙️ PLEGADO DE CONSTANTES:\n")
+        log.write("-" * 60 + "\n")
+        log.write(f"{plegador.resumen()}\n")
+        log.write(f"Semántico sobre el árbol plegado: {duracion_sem * 1000:.1f} ms\n\n")
 
         log.write("❌ ERRORES SEMÁNTICOS:\n")
         log.write("-" * 60 + "\n")
         if sem.errores: log.write('\n'.join(sem.errores) + '\n')
         else: log.write("No se encontraron errores semánticos.\n")
-        log.write(f"\nTotal: {len(sem.errores)} error(es) semántico(s)\n\n")
+        log.write(f"\nTotal: {total_semanticos} error(es) semántico(s)\n\n")
 
-        total_errores = len(errores_lexicos) + len(errores_sintacticos) + len(sem.errores)
+        total_errores = apariciones(errores_lexicos, errores_sintacticos) + total_semanticos
         log.write("=" * 60 + "\n")
         log.write(f"RESUMEN FINAL: {total_errores} error(es) total(es).\n")
         log.write("=" * 60 + "\n")
@@ -125,8 +530,9 @@ def analizar_archivo(ruta: str, usuario_git: str):
             log_sint.write(f"LOG DE ERRORES SINTÁCTICOS - {usuario_git}\n")
             log_sint.write(f"Fecha: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n")
             log_sint.write("=" * 60 + "\n\n")
+            log_sint.write(NOTA_TOTALES)
             log_sint.write('\n'.join(errores_sintacticos) + '\n')
-            log_sint.write(f"\nTotal de errores sintácticos: {len(errores_sintacticos)}.\n")
+            log_sint.write(f"\nTotal de errores sintácticos: {apariciones(errores_sintacticos)}.\n")
         
         print(f"✅ Log Sintáctico generado en: {archivo_log_sintactico}")
     
@@ -137,4 +543,26 @@ if __name__ == "__main__":
     ruta_archivo = "algoritmos/algoritmo_identificadores_y_operadores.swift"
     usuario_git_ariel = "ArielAT123" 
     
-    analizar_archivo(ruta_archivo, usuario_git_ariel)
\ No newline at end of file
+    if '--lsp' in sys.argv:
+        sys.exit(servidor_lsp().atender())
+    elif '--ejecutar' in sys.argv:
+        # --ejecutar archivo.swift
+        siguiente = sys.argv[sys.argv.index('--ejecutar') + 1:]
+        sys.exit(ejecutar_archivo(siguiente[0] if siguiente else ruta_archivo))
+    elif '--proyecto' in sys.argv:
+        # --proyecto [carpeta]: por omisión algoritmos/
+        siguiente = sys.argv[sys.argv.index('--proyecto') + 1:]
+        sys.exit(analizar_proyecto(siguiente[0] if siguiente and not siguiente[0].startswith('--') else "algoritmos"))
+    elif '--watch' in sys.argv:
+        # --watch [carpeta] [--intervalo ms]: por omisión algoritmos/, revisada cada INTERVALO
+        siguiente = sys.argv[sys.argv.index('--watch') + 1:]
+        carpeta = siguiente[0] if siguiente and not siguiente[0].startswith('--') else "algoritmos"
+        intervalo = INTERVALO
+        if '--intervalo' in sys.argv:
+            intervalo = float(sys.argv[sys.argv.index('--intervalo') + 1]) / 1000
+        try:
+            vigilar(carpeta, cache_resultados(), intervalo=intervalo)
+        except KeyboardInterrupt:
+            print("\nVigilancia terminada.")
+    else:
+        analizar_archivo(ruta_archivo, usuario_git_ariel, paralelo='--paralelo' in sys.argv)
\ No newline at end of file
@@ -0,0 +1,286 @@
+from __future__ import annotations
+from typing import Dict, List, Optional, Set, Tuple
+
+from analizadorSemantico import (
+    AnalizadorSemantico, Programa, Nodo, DeclaracionVariable, DefinicionFuncion, DefinicionClase, Simbolo,
+    ColeccionLiteral, ListaDiagnosticos, MENSAJES,
+)
+
+# =========================================================================
+# 5. MOTOR DE CONSULTAS SEMÁNTICAS (memoizado, con invalidación)
+# =========================================================================
+# Cada sentencia de nivel superior se verifica una sola vez y su resultado
+# (errores, tipo de cada nodo, nombres globales que consultó) queda en caché.
+# Al reemplazar una sentencia solo se vuelve a verificar esa sentencia y,
+# si cambió la firma de lo que declara, las sentencias que dependen de ese
+# nombre. Los mensajes son los mismos que produce AnalizadorSemantico.
+
+
+def hijos(nodo):
+    """Nodos hijos directos de un nodo del AST (en orden de aparición)."""
+    for valor in vars(nodo).values():
+        if isinstance(valor, Nodo):
+            yield valor
+        elif isinstance(valor, ColeccionLiteral):
+            yield from valor.nodos()
+        elif isinstance(valor, list):
+            for v in valor:
+                if isinstance(v, Nodo):
+                    yield v
+
+
+def declara(sentencia) -> Optional[str]:
+    """Nombre global que introduce una sentencia de nivel superior (o None)."""
+    if isinstance(sentencia, (DeclaracionVariable, DefinicionFuncion, DefinicionClase)):
+        return sentencia.nombre
+    return None
+
+
+class _Resultado:
+    __slots__ = ('errores', 'tipos', 'dependencias')
+
+    def __init__(self, errores, tipos, dependencias):
+        self.errores, self.tipos, self.dependencias = errores, tipos, dependencias
+
+
+class VerificadorConGlobales(AnalizadorSemantico):
+    """AnalizadorSemantico cuyo ámbito global lo resuelve otro objeto.
+
+    Los ámbitos locales funcionan igual que en AnalizadorSemantico; cuando un
+    nombre no aparece en ellos se consulta `resolver_global(nombre)` y el nombre
+    queda anotado en `dependencias`. Las declaraciones globales las lleva quien
+    resuelve, así que aquí no se registran.
+    """
+
+    def __init__(self, resolver_global):
+        super().__init__()
+        self.resolver_global = resolver_global
+        self.dependencias: Set[str] = set()
+
+    def declarar(self, nombre, tipo, mutable, linea):
+        if len(self.ambitos) > 1:
+            super().declarar(nombre, tipo, mutable, linea)
+
+    def buscar(self, nombre) -> Optional[Simbolo]:
+        # ambitos[0] queda siempre vacío: lo global lo responde resolver_global
+        for a in reversed(self.ambitos):
+            simb = a.get(nombre)
+            if simb is not None: return simb
+        self.dependencias.add(nombre)
+        return self.resolver_global(nombre)
+
+
+class _VerificadorAnotado(VerificadorConGlobales):
+    """Además guarda el tipo inferido de cada nodo visitado."""
+
+    def __init__(self, resolver_global):
+        super().__init__(resolver_global)
+        self.tipos: Dict[Nodo, Optional[str]] = {}
+
+    def verificar(self, nodo) -> Optional[str]:
+        tipo = super().verificar(nodo)
+        if nodo is not None: self.tipos[nodo] = tipo
+        return tipo
+
+
+class MotorConsultas:
+    def __init__(self, programa: Programa):
+        self.sentencias: List[Nodo] = []
+        self._posicion: Dict[Nodo, int] = {}
+        self._declaraciones: Dict[str, List[Nodo]] = {}
+        self._memo: Dict[Nodo, _Resultado] = {}
+        self._dependientes: Dict[str, Set[Nodo]] = {}
+        self._simbolos: Dict[Nodo, Simbolo] = {}
+        self._firmas: Dict[Nodo, Tuple] = {}
+        self._duenio: Dict[Nodo, Nodo] = {}
+        self.verificaciones = 0
+        self._cargar(programa.sentencias)
+
+    # ---------------------------------------------------------------
+    # Índice global
+    # ---------------------------------------------------------------
+    def _cargar(self, sentencias):
+        self.sentencias = list(sentencias)
+        self._posicion = {s: i for i, s in enumerate(self.sentencias)}
+        self._declaraciones = {}
+        for s in self.sentencias:
+            nombre = declara(s)
+            if nombre is not None:
+                self._declaraciones.setdefault(nombre, []).append(s)
+
+    def _visible(self, nombre, desde: int) -> Optional[Nodo]:
+        """Primera declaración global de `nombre` visible desde la sentencia `desde`."""
+        for decl in self._declaraciones.get(nombre, ()):
+            pos = self._posicion[decl]
+            # funciones y clases se declaran antes de verificar su cuerpo (recursión)
+            if pos < desde or (pos == desde and not isinstance(decl, DeclaracionVariable)):
+                return decl
+            break
+        return None
+
+    def _es_duplicada(self, sentencia) -> bool:
+        nombre = declara(sentencia)
+        return nombre is not None and self._declaraciones[nombre][0] is not sentencia
+
+    # ---------------------------------------------------------------
+    # Consultas
+    # ---------------------------------------------------------------
+    def resolve(self, nombre: str, ambito=None) -> Optional[Simbolo]:
+        """Símbolo visible con ese nombre.
+
+        `ambito` puede ser None (todo el programa), una sentencia de nivel
+        superior (lo visible desde ella) o una DefinicionFuncion (sus parámetros
+        y declaraciones directas, y luego lo global visible desde su sentencia).
+        """
+        if isinstance(ambito, DefinicionFuncion) and ambito not in self._posicion:
+            for p in ambito.parametros:
+                if p.nombre == nombre: return Simbolo(p.nombre, p.tipo, False, p.linea)
+            for s in ambito.cuerpo:
+                if declara(s) == nombre: return self._simbolo_de(s)
+            ambito = self._sentencia_de(ambito)
+        if ambito is None:
+            desde = len(self.sentencias)
+        else:
+            desde = self._posicion[self._sentencia_de(ambito)]
+        decl = self._visible(nombre, desde)
+        return None if decl is None else self._simbolo_de(decl)
+
+    def signature_of(self, funcion) -> Optional[Tuple[Tuple[str, ...], str]]:
+        """(tipos de parámetros, tipo de retorno) de una función, por nodo o por nombre."""
+        if isinstance(funcion, str):
+            decls = [d for d in self._declaraciones.get(funcion, ()) if isinstance(d, DefinicionFuncion)]
+            if not decls: return None
+            funcion = decls[0]
+        firma = self._firmas.get(funcion)
+        if firma is None:
+            firma = (tuple(p.tipo for p in funcion.parametros), funcion.tipo_retorno or 'Void')
+            self._firmas[funcion] = firma
+        return firma
+
+    def type_of(self, nodo) -> Optional[str]:
+        """Tipo inferido de cualquier nodo (verifica su sentencia si hace falta)."""
+        return self._resultado(self._sentencia_de(nodo)).tipos.get(nodo)
+
+    def diagnosticos(self) -> ListaDiagnosticos:
+        """Errores de todo el programa, en el mismo orden (y con las mismas repeticiones) que AnalizadorSemantico."""
+        errores = ListaDiagnosticos('semantico', MENSAJES)
+        for s in self.sentencias:
+            duplicada = self._es_duplicada(s)
+            if duplicada and not isinstance(s, DeclaracionVariable):
+                errores.reportar('SEM001', s.linea, nombre=s.nombre)
+            errores.extend(self._resultado(s).errores)
+            if duplicada and isinstance(s, DeclaracionVariable):
+                errores.reportar('SEM001', s.linea, nombre=s.nombre)
+        return errores
+
+    # ---------------------------------------------------------------
+    # Memoización
+    # ---------------------------------------------------------------
+    def _sentencia_de(self, nodo):
+        if nodo in self._posicion: return nodo
+        duenio = self._duenio.get(nodo)
+        if duenio is None:
+            for s in self.sentencias:
+                if s not in self._memo and s not in self._duenio: self._indexar_duenio(s)
+                if nodo in self._duenio: break
+            duenio = self._duenio.get(nodo)
+            if duenio is None: raise KeyError(f"el nodo {nodo!r} no pertenece al programa")
+        return duenio
+
+    def _indexar_duenio(self, sentencia):
+        pendientes = [sentencia]
+        while pendientes:
+            n = pendientes.pop()
+            self._duenio[n] = sentencia
+            pendientes.extend(hijos(n))
+
+    def _resultado(self, sentencia) -> _Resultado:
+        res = self._memo.get(sentencia)
+        if res is None:
+            desde = self._posicion[sentencia]
+            v = _VerificadorAnotado(lambda nombre: self._resolver_desde(nombre, desde))
+            v.verificar(sentencia)
+            self.verificaciones += 1
+            res = _Resultado(v.errores, v.tipos, v.dependencias)
+            self._memo[sentencia] = res
+            for nodo in v.tipos: self._duenio[nodo] = sentencia
+            for nombre in v.dependencias:
+                self._dependientes.setdefault(nombre, set()).add(sentencia)
+        return res
+
+    def _resolver_desde(self, nombre, desde):
+        decl = self._visible(nombre, desde)
+        return None if decl is None else self._simbolo_de(decl)
+
+    def _simbolo_de(self, decl) -> Simbolo:
+        simb = self._simbolos.get(decl)
+        if simb is None:
+            if isinstance(decl, DefinicionFuncion):
+                simb = Simbolo(decl.nombre, f"Function->{decl.tipo_retorno or 'Void'}", False, decl.linea)
+            elif isinstance(decl, DefinicionClase):
+                simb = Simbolo(decl.nombre, 'Class', False, decl.linea)
+            else:
+                tipo_inf = self.type_of(decl.valor) if decl.valor is not None else None
+                simb = Simbolo(decl.nombre, decl.tipo or tipo_inf or 'Desconocido', decl.mutable, decl.linea)
+            self._simbolos[decl] = simb
+        return simb
+
+    def _firma_nombre(self, nombre):
+        decls = self._declaraciones.get(nombre, ())
+        return tuple((self._posicion[d], self._simbolo_de(d).tipo, self._simbolo_de(d).mutable) for d in decls[:1])
+
+    def _olvidar(self, sentencia):
+        res = self._memo.pop(sentencia, None)
+        if res is not None:
+            for nombre in res.dependencias:
+                deps = self._dependientes.get(nombre)
+                if deps: deps.discard(sentencia)
+            for nodo in res.tipos: self._duenio.pop(nodo, None)
+        self._simbolos.pop(sentencia, None)
+        self._firmas.pop(sentencia, None)
+
+    # ---------------------------------------------------------------
+    # Ediciones
+    # ---------------------------------------------------------------
+    def reemplazar_sentencia(self, vieja, nueva):
+        """Cambia una sentencia de nivel superior por otra en la misma posición."""
+        nombres = {n for n in (declara(vieja), declara(nueva)) if n is not None}
+        antes = {n: self._firma_nombre(n) for n in nombres}
+        pos = self._posicion.pop(vieja)
+        self._olvidar(vieja)
+        self.sentencias[pos] = nueva
+        self._posicion[nueva] = pos
+        nombre_viejo = declara(vieja)
+        if nombre_viejo is not None:
+            self._declaraciones[nombre_viejo].remove(vieja)
+            if not self._declaraciones[nombre_viejo]: del self._declaraciones[nombre_viejo]
+        nombre_nuevo = declara(nueva)
+        if nombre_nuevo is not None:
+            decls = self._declaraciones.setdefault(nombre_nuevo, [])
+            decls.append(nueva)
+            decls.sort(key=self._posicion.__getitem__)
+        self._propagar(antes)
+
+    def actualizar(self, programa: Programa):
+        """Carga una nueva versión del programa reutilizando lo verificado de las
+        sentencias que siguen siendo el mismo objeto (p. ej. tras un reparseo incremental)."""
+        nuevas = set(programa.sentencias)
+        quitadas = [s for s in self.sentencias if s not in nuevas]
+        agregadas = [s for s in programa.sentencias if s not in self._posicion]
+        nombres = {n for n in map(declara, quitadas + agregadas) if n is not None}
+        antes = {n: self._firma_nombre(n) for n in nombres}
+        for s in quitadas: self._olvidar(s)
+        self._cargar(programa.sentencias)
+        self._propagar(antes)
+
+    def _propagar(self, antes: Dict[str, Tuple]):
+        """Invalida a los dependientes de cada nombre cuya firma cambió (y así sucesivamente)."""
+        pendientes = list(antes.items())
+        while pendientes:
+            nombre, firma_anterior = pendientes.pop()
+            if self._firma_nombre(nombre) == firma_anterior: continue
+            for dependiente in list(self._dependientes.get(nombre, ())):
+                declarado = declara(dependiente)
+                previa = self._firma_nombre(declarado) if declarado is not None else None
+                self._olvidar(dependiente)
+                if declarado is not None: pendientes.append((declarado, previa))
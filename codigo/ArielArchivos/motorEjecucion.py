@@ -0,0 +1,915 @@
+from __future__ import annotations
+import math
+import operator
+import os
+import sys
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from analizadorSemantico import (
+    AnalizadorSemantico, Nodo, Programa, DeclaracionVariable, Asignacion, Si, Mientras, DefinicionClase,
+    DefinicionFuncion, Retorno, LlamadaFuncion, AccesoMiembro, Tupla, OperacionBinaria, OperacionNaria,
+    OperacionUnaria, Literal, Identificador,
+)
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from comun.plazo import Plazo
+
+# =========================================================================
+# 7. MOTOR DE EJECUCIÓN (el AST compilado a clausuras)
+# =========================================================================
+# Cada nodo se compila una sola vez a una función de Python que recibe el
+# marco de la llamada en curso (una lista). Las variables se resuelven al
+# compilar a una posición del marco, y las globales a una posición de la
+# lista de globales, que es a la vez el marco del nivel superior: al
+# ejecutar no se busca ningún nombre en un dict. Con los tipos que deja el
+# AnalizadorSemantico se elige la operación ya especializada (Int + Int es
+# un '+' de Python, Int / Int la división que trunca, ...) y con las formas
+# más comunes de operandos (variable local, constante) se evita una llamada
+# por operando. Lo que no tiene tipo conocido va por `operar`, que decide
+# según los valores. Una sentencia devuelve None para seguir, o el valor
+# del 'return' que la cortó (no hay excepciones para volver).
+#
+# Semántica: una variable, parámetro o retorno con tipo Int o Double
+# convierte lo que se le guarda (el semántico acepta Int <-> Double), una
+# variable sin valor empieza en el valor nulo de su tipo y las funciones y
+# clases de nivel superior se pueden usar antes de su definición. Los Int
+# no se desbordan (son enteros de Python). Los métodos no se compilan: la
+# gramática no tiene forma de llamarlos (no hay `objeto.metodo(...)`), y
+# una función anidada no ve las variables de la función que la contiene
+# (sin capturas, cada marco es una lista plana). `InterpreteArbol` es la versión que recorre el árbol en cada
+# ejecución, con la misma semántica: es la referencia para comparar.
+
+VACIO = ()      # el valor de Void (en Swift, la tupla vacía)
+
+VALORES_INICIALES = {'Int': 0, 'Double': 0.0, 'String': '', 'Bool': False}
+
+
+class ErrorEjecucion(Exception):
+    """Error en tiempo de ejecución (división entera entre cero, llamada inválida, ...)."""
+
+    def __init__(self, mensaje: str, linea: Optional[int] = None):
+        super().__init__(f"❌ Línea {linea}: {mensaje}" if linea else f"❌ {mensaje}")
+        self.linea = linea
+
+
+# ---------------------------------------------------------------
+# Valores y operaciones (compartidos por los dos motores)
+# ---------------------------------------------------------------
+def texto_swift(valor, anidado: bool = False) -> str:
+    """Como lo imprime print() de Swift."""
+    if valor is True: return 'true'
+    if valor is False: return 'false'
+    if type(valor) is str: return f'"{valor}"' if anidado else valor
+    if type(valor) is tuple: return '(' + ', '.join(texto_swift(v, True) for v in valor) + ')'
+    return str(valor)
+
+
+def convertir(valor, tipo: Optional[str]):
+    """Lo que queda guardado en algo declarado `tipo`."""
+    if tipo == 'Int' and type(valor) is float: return int(valor)
+    if tipo == 'Double' and type(valor) is int: return float(valor)
+    return valor
+
+
+def division_entera(a, b, linea=None):
+    # como en Swift: trunca hacia cero y dividir entre 0 detiene el programa
+    if b == 0: raise ErrorEjecucion("división entera entre cero", linea)
+    q = a // b
+    return q + 1 if q < 0 and q * b != a else q
+
+
+def resto_entero(a, b, linea=None):
+    if b == 0: raise ErrorEjecucion("resto de una división entera entre cero", linea)
+    r = abs(a) % abs(b)
+    return -r if a < 0 else r
+
+
+def division_real(a, b):
+    if b == 0:
+        if a == 0 or a != a: return math.nan
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+
+def resto_real(a, b):
+    return math.fmod(a, b) if b != 0 else math.nan
+
+
+COMPARACIONES = {
+    '==': operator.eq, '!=': operator.ne,
+    '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+}
+ARITMETICAS = {'+': operator.add, '-': operator.sub, '*': operator.mul}
+
+
+def operar(op: str, a, b, linea=None):
+    """`a op b` según el tipo de los valores (&& y || se resuelven antes, sin evaluar de más)."""
+    comparar = COMPARACIONES.get(op)
+    if comparar is not None: return comparar(a, b)
+    if type(a) is int and type(b) is int:
+        if op == '/': return division_entera(a, b, linea)
+        if op == '%': return resto_entero(a, b, linea)
+    elif op == '/': return division_real(a, b)
+    elif op == '%': return resto_real(a, b)
+    return ARITMETICAS[op](a, b)
+
+
+NATIVAS: Dict[str, Callable] = {'Int': int, 'Double': float, 'String': texto_swift}
+RETORNOS_NATIVOS = {'Int': 'Int', 'Double': 'Double', 'String': 'String', 'print': 'Void'}
+
+
+class Funcion:
+    """Función compilada: `cuerpo(marco)` con los parámetros al comienzo del marco."""
+    __slots__ = ('nombre', 'parametros', 'tipos', 'opcionales', 'defaults', 'tipo_retorno', 'cuerpo', 'locales')
+
+    def __init__(self, n: DefinicionFuncion):
+        self.nombre = n.nombre
+        self.parametros = [p.nombre for p in n.parametros]
+        self.tipos = [p.tipo for p in n.parametros]
+        self.opcionales = [p.valor_default is not None for p in n.parametros]
+        self.defaults: List[Optional[Callable]] = [None] * len(n.parametros)     # se llenan al compilar el cuerpo
+        self.tipo_retorno = n.tipo_retorno
+        self.cuerpo: Optional[Callable] = None
+        self.locales = ()           # un None por cada posición del marco que no es un parámetro
+
+    def invocar(self, valores: list, linea=None):
+        """Llamada que no se resolvió al compilar (p. ej. una función guardada en una variable)."""
+        if len(valores) > len(self.parametros):
+            raise ErrorEjecucion(f"'{self.nombre}' recibe {len(self.parametros)} argumento(s), no {len(valores)}", linea)
+        marco = [convertir(v, t) for v, t in zip(valores, self.tipos)]
+        for k in range(len(valores), len(self.parametros)):
+            if not self.opcionales[k]:
+                raise ErrorEjecucion(f"falta el argumento '{self.parametros[k]}' de '{self.nombre}'", linea)
+            marco.append(self.defaults[k](marco))
+        marco += self.locales
+        r = self.cuerpo(marco)
+        return VACIO if r is None else r
+
+    def __str__(self): return "(Function)"
+
+
+class ClaseAriel:
+    """Clase compilada: los argumentos de `Clase(...)` van a las propiedades en orden, el resto a su valor inicial."""
+    __slots__ = ('nombre', 'propiedades', 'tipos', 'iniciales', 'indices')
+
+    def __init__(self, n: DefinicionClase):
+        self.nombre = n.nombre
+        self.propiedades = [p.nombre for p in n.propiedades]
+        self.tipos: List[Optional[str]] = [p.tipo for p in n.propiedades]
+        self.iniciales: List[Callable] = []
+        self.indices = {nombre: i for i, nombre in enumerate(self.propiedades)}
+
+    def invocar(self, valores: list, linea=None):
+        if len(valores) > len(self.propiedades):
+            raise ErrorEjecucion(f"'{self.nombre}' tiene {len(self.propiedades)} propiedad(es), no {len(valores)}", linea)
+        marco = [convertir(v, t) for v, t in zip(valores, self.tipos)]
+        for k in range(len(valores), len(self.propiedades)):
+            marco.append(self.iniciales[k](marco))
+        return Instancia(self, marco)
+
+    def __str__(self): return self.nombre
+
+
+class Instancia:
+    __slots__ = ('clase', 'valores')
+
+    def __init__(self, clase: ClaseAriel, valores: list):
+        self.clase, self.valores = clase, valores
+
+    def __str__(self):
+        campos = ', '.join(f"{p}: {texto_swift(v, True)}" for p, v in zip(self.clase.propiedades, self.valores))
+        return f"{self.clase.nombre}({campos})"
+
+
+def invocar(llamado, valores: list, linea=None):
+    if isinstance(llamado, (Funcion, ClaseAriel)): return llamado.invocar(valores, linea)
+    raise ErrorEjecucion(f"'{texto_swift(llamado)}' no se puede llamar", linea)
+
+
+# ---------------------------------------------------------------
+# Tipos de cada nodo
+# ---------------------------------------------------------------
+class _AnalizadorTipado(AnalizadorSemantico):
+    """Guarda el tipo de cada nodo; una llamada a una función ya declarada (o a Int, Double,
+    String) toma su tipo de retorno en vez de 'Desconocido'. Sus errores no se usan."""
+
+    def __init__(self):
+        super().__init__()
+        self.tipos: Dict[Nodo, Optional[str]] = {}
+
+    def verificar(self, nodo) -> Optional[str]:
+        tipo = super().verificar(nodo)
+        if nodo is not None: self.tipos[nodo] = tipo
+        return tipo
+
+    def verificar_LlamadaFuncion(self, n: LlamadaFuncion):
+        super().verificar_LlamadaFuncion(n)
+        simb = self.buscar(n.nombre)
+        if simb is None: return RETORNOS_NATIVOS.get(n.nombre, 'Desconocido')
+        if simb.tipo.startswith('Function->'): return simb.tipo[len('Function->'):]
+        return 'Desconocido'
+
+
+def tipos_de(programa: Programa) -> Dict[Nodo, Optional[str]]:
+    analizador = _AnalizadorTipado()
+    analizador.verificar(programa)
+    return analizador.tipos
+
+
+def tipo_declarado(n: DeclaracionVariable, tipos: Dict[Nodo, Optional[str]]) -> Optional[str]:
+    """El tipo de una variable: el anotado, o el que el semántico infirió de su valor."""
+    return n.tipo or (tipos.get(n.valor) if n.valor is not None else None)
+
+
+def vuelve(sentencias) -> bool:
+    """Si alguna de las sentencias puede ejecutar un 'return' (sin contar funciones anidadas)."""
+    for s in sentencias:
+        tipo = type(s)
+        if tipo is Retorno: return True
+        if tipo is Si and (vuelve(s.cuerpo_if) or vuelve(s.cuerpo_else)): return True
+        if tipo is Mientras and vuelve(s.cuerpo): return True
+    return False
+
+
+# ---------------------------------------------------------------
+# Clausuras especializadas
+# ---------------------------------------------------------------
+# Por operador, una fábrica por forma de operandos: e = expresión (una
+# clausura), c = constante, l = variable del marco actual.
+_FORMAS = {
+    'ee': "lambda a, b: lambda m: a(m) {op} b(m)",
+    'ec': "lambda a, b: lambda m: a(m) {op} b",
+    'ce': "lambda a, b: lambda m: a {op} b(m)",
+    'lc': "lambda a, b: lambda m: m[a] {op} b",
+    'cl': "lambda a, b: lambda m: a {op} m[b]",
+    'll': "lambda a, b: lambda m: m[a] {op} m[b]",
+    'le': "lambda a, b: lambda m: m[a] {op} b(m)",
+    'el': "lambda a, b: lambda m: a(m) {op} m[b]",
+}
+DIRECTAS = {op: {forma: eval(plantilla.format(op=op)) for forma, plantilla in _FORMAS.items()}
+            for op in ('+', '-', '*', '<', '<=', '>', '>=', '==', '!=')}
+
+TIPOS_NUMERICOS = ('Int', 'Double')
+
+
+def _familia(tipo_izq, tipo_der) -> Optional[str]:
+    """Tipo con el que se puede especializar una operación binaria (None: se decide al ejecutar)."""
+    if tipo_izq in TIPOS_NUMERICOS and tipo_der in TIPOS_NUMERICOS:
+        return 'Int' if tipo_izq == tipo_der == 'Int' else 'Double'
+    if tipo_izq == tipo_der and tipo_izq in ('String', 'Bool'): return tipo_izq
+    return None
+
+
+def _como_expresion(forma, valor):
+    if forma == 'e': return valor
+    if forma == 'c': return lambda m: valor
+    return lambda m: m[valor]
+
+
+def _fallar(mensaje, linea):
+    def fallar(m):
+        raise ErrorEjecucion(mensaje, linea)
+    return fallar
+
+
+def _conversion(valor: Callable, tipo_valor, tipo) -> Callable:
+    """`valor` convertido a `tipo` si hace falta; con tipos conocidos la decisión se toma aquí."""
+    if tipo not in TIPOS_NUMERICOS or tipo_valor == tipo or tipo_valor in ('String', 'Bool'): return valor
+    if tipo_valor in TIPOS_NUMERICOS:
+        a_tipo = int if tipo == 'Int' else float
+        return lambda m: a_tipo(valor(m))
+    return lambda m: convertir(valor(m), tipo)
+
+
+def _nada(m):
+    return None
+
+
+def _secuencia(pasos: List[Callable], puede_volver: bool) -> Callable:
+    if not pasos: return _nada
+    if len(pasos) == 1: return pasos[0]
+    if not puede_volver:
+        if len(pasos) == 2:
+            a, b = pasos
+            def secuencia(m):
+                a(m); b(m)
+            return secuencia
+        if len(pasos) == 3:
+            a, b, c = pasos
+            def secuencia(m):
+                a(m); b(m); c(m)
+            return secuencia
+        def secuencia(m):
+            for paso in pasos: paso(m)
+        return secuencia
+    def secuencia(m):
+        for paso in pasos:
+            r = paso(m)
+            if r is not None: return r
+    return secuencia
+
+
+class _Enlace:
+    """A qué se refiere un nombre al compilar: una posición de un marco, una función o una clase."""
+    __slots__ = ('posicion', 'tipo', 'objeto', 'contexto')
+
+    def __init__(self, posicion=None, tipo=None, objeto=None, contexto=None):
+        self.posicion, self.tipo, self.objeto, self.contexto = posicion, tipo, objeto, contexto
+
+
+class _Contexto:
+    """El programa o una función que se está compilando: sus ámbitos y el tamaño de su marco."""
+    __slots__ = ('ambitos', 'tamano', 'funcion')
+
+    def __init__(self, funcion: Optional[Funcion] = None):
+        self.ambitos: List[Dict[str, _Enlace]] = [{}]
+        self.tamano = 0
+        self.funcion = funcion
+
+    def nueva_posicion(self) -> int:
+        self.tamano += 1
+        return self.tamano - 1
+
+
+class ProgramaCompilado:
+    def __init__(self, principal: Callable, globales: list, tamano: int):
+        self.principal, self.globales, self.tamano = principal, globales, tamano
+
+    def ejecutar(self):
+        """Ejecuta el programa desde cero (las globales se reinician)."""
+        self.globales[:] = [None] * self.tamano
+        with _errores_de_ejecucion():
+            self.principal(self.globales)
+
+
+@contextmanager
+def _errores_de_ejecucion():
+    """Los errores de Python que puede dar un programa válido pasan a ser ErrorEjecucion."""
+    try:
+        yield
+    except RecursionError as error:
+        raise ErrorEjecucion("demasiadas llamadas anidadas") from error
+    except (TypeError, ValueError, OverflowError) as error:
+        raise ErrorEjecucion(str(error)) from error
+
+
+# ---------------------------------------------------------------
+# Compilador
+# ---------------------------------------------------------------
+class CompiladorClausuras:
+    def __init__(self, tipos: Dict[Nodo, Optional[str]], salida: Optional[Callable[[str], None]] = None,
+                 plazo: Optional[Plazo] = None):
+        self.tipos = tipos
+        self.salida = salida or print
+        self.plazo = plazo              # si se da, los while lo revisan cada 1024 vueltas
+        self.globales: list = []
+        self.global_ = _Contexto()
+        self.ctx = self.global_
+
+    def compilar_programa(self, programa: Programa) -> ProgramaCompilado:
+        # funciones y clases de nivel superior: se pueden llamar desde antes de su definición
+        for s in programa.sentencias:
+            if type(s) is DefinicionFuncion and s.nombre not in self.global_.ambitos[0]:
+                self.global_.ambitos[0][s.nombre] = _Enlace(objeto=Funcion(s))
+            elif type(s) is DefinicionClase and s.nombre not in self.global_.ambitos[0]:
+                self.global_.ambitos[0][s.nombre] = _Enlace(objeto=ClaseAriel(s))
+        principal = self.bloque(programa.sentencias, nuevo_ambito=False)
+        return ProgramaCompilado(principal, self.globales, self.global_.tamano)
+
+    def tipo(self, nodo) -> Optional[str]:
+        return self.tipos.get(nodo)
+
+    # --- nombres ---
+    def buscar(self, nombre) -> Optional[_Enlace]:
+        """En la función actual y luego en lo global (no en las funciones que la contienen)."""
+        for ambito in reversed(self.ctx.ambitos):
+            enlace = ambito.get(nombre)
+            if enlace is not None: return enlace
+        if self.ctx is not self.global_:
+            for ambito in reversed(self.global_.ambitos):
+                enlace = ambito.get(nombre)
+                if enlace is not None: return enlace
+        return None
+
+    def declarar(self, nombre, tipo) -> int:
+        posicion = self.ctx.nueva_posicion()
+        self.ctx.ambitos[-1][nombre] = _Enlace(posicion, tipo, contexto=self.ctx)
+        return posicion
+
+    def operando(self, nodo):
+        """(forma, valor): ('c', constante), ('l', posición en el marco actual) o ('e', clausura)."""
+        if type(nodo) is Literal: return 'c', nodo.valor
+        if type(nodo) is Identificador:
+            enlace = self.buscar(nodo.nombre)
+            if enlace is not None and enlace.contexto is self.ctx: return 'l', enlace.posicion
+        return 'e', self.expresion(nodo)
+
+    # --- sentencias ---
+    def bloque(self, sentencias, nuevo_ambito=True) -> Callable:
+        if nuevo_ambito: self.ctx.ambitos.append({})
+        pasos = [self.sentencia(s) for s in sentencias]
+        if nuevo_ambito: self.ctx.ambitos.pop()
+        return _secuencia([p for p in pasos if p is not _nada], vuelve(sentencias))
+
+    def sentencia(self, s) -> Callable:
+        metodo = getattr(self, f"compilar_{type(s).__name__}", None)
+        if metodo is not None: return metodo(s)
+        expresion = self.expresion(s)
+        def sentencia(m):
+            expresion(m)
+        return sentencia
+
+    def compilar_DeclaracionVariable(self, n: DeclaracionVariable):
+        tipo = tipo_declarado(n, self.tipos)
+        if n.valor is None:
+            inicial = VALORES_INICIALES.get(tipo, VACIO)
+            posicion = self.declarar(n.nombre, tipo)
+            def declarar(m):
+                m[posicion] = inicial
+            return declarar
+        # el valor se compila antes de declarar: `var x = x + 1;` usa la x de afuera
+        valor = _conversion(self.expresion(n.valor), self.tipo(n.valor), tipo)
+        posicion = self.declarar(n.nombre, tipo)
+        def declarar(m):
+            m[posicion] = valor(m)
+        return declarar
+
+    def compilar_Asignacion(self, n: Asignacion):
+        enlace = self.buscar(n.nombre)
+        if enlace is None or enlace.posicion is None:
+            return _fallar(f"'{n.nombre}' no es una variable", n.linea)
+        posicion, tipo_valor = enlace.posicion, self.tipo(n.expresion)
+        # x = x + c  y  x = x - c sobre una variable del marco actual, sin conversión
+        e = n.expresion
+        if (enlace.contexto is self.ctx and type(e) is OperacionBinaria and e.operador in ('+', '-')
+                and type(e.izquierda) is Identificador and e.izquierda.nombre == n.nombre
+                and type(e.derecha) is Literal and enlace.tipo in TIPOS_NUMERICOS
+                and _familia(enlace.tipo, e.derecha.tipo) == enlace.tipo):
+            c = e.derecha.valor
+            if e.operador == '+':
+                def sumar(m):
+                    m[posicion] += c
+                return sumar
+            def restar(m):
+                m[posicion] -= c
+            return restar
+        valor = _conversion(self.expresion(e), tipo_valor, enlace.tipo)
+        if enlace.contexto is self.ctx:
+            def asignar(m):
+                m[posicion] = valor(m)
+            return asignar
+        g = self.globales
+        def asignar_global(m):
+            g[posicion] = valor(m)
+        return asignar_global
+
+    def compilar_Si(self, n: Si):
+        condicion = self.expresion(n.condicion)
+        entonces = self.bloque(n.cuerpo_if)
+        if not n.cuerpo_else:
+            def si(m):
+                if condicion(m): return entonces(m)
+            return si
+        sino = self.bloque(n.cuerpo_else)
+        def si_sino(m):
+            if condicion(m): return entonces(m)
+            return sino(m)
+        return si_sino
+
+    def compilar_Mientras(self, n: Mientras):
+        condicion = self.expresion(n.condicion)
+        cuerpo = self.bloque(n.cuerpo)
+        plazo = self.plazo
+        if not vuelve(n.cuerpo):
+            if plazo is None:
+                def mientras(m):
+                    while condicion(m): cuerpo(m)
+                return mientras
+            def mientras_con_plazo(m):
+                vueltas = 0
+                while condicion(m):
+                    cuerpo(m)
+                    vueltas += 1
+                    if not vueltas & 1023: plazo.revisar()
+            return mientras_con_plazo
+        if plazo is None:
+            def mientras_con_retorno(m):
+                while condicion(m):
+                    r = cuerpo(m)
+                    if r is not None: return r
+            return mientras_con_retorno
+        def mientras_con_retorno_y_plazo(m):
+            vueltas = 0
+            while condicion(m):
+                r = cuerpo(m)
+                if r is not None: return r
+                vueltas += 1
+                if not vueltas & 1023: plazo.revisar()
+        return mientras_con_retorno_y_plazo
+
+    def compilar_Retorno(self, n: Retorno):
+        tipo = self.ctx.funcion.tipo_retorno if self.ctx.funcion is not None else None
+        return _conversion(self.expresion(n.expresion), self.tipo(n.expresion), tipo)
+
+    def compilar_DefinicionFuncion(self, n: DefinicionFuncion):
+        enlace = self.ctx.ambitos[-1].get(n.nombre)
+        if enlace is None or type(enlace.objeto) is not Funcion or enlace.objeto.cuerpo is not None:
+            enlace = _Enlace(objeto=Funcion(n))
+            self.ctx.ambitos[-1][n.nombre] = enlace
+        funcion, anterior = enlace.objeto, self.ctx
+        self.ctx = _Contexto(funcion)
+        try:
+            # los valores por omisión se compilan antes de los parámetros: solo ven lo global
+            for k, p in enumerate(n.parametros):
+                if p.valor_default is not None:
+                    funcion.defaults[k] = _conversion(self.expresion(p.valor_default), self.tipo(p.valor_default), p.tipo)
+            for p in n.parametros: self.declarar(p.nombre, p.tipo)
+            funcion.cuerpo = self.bloque(n.cuerpo, nuevo_ambito=False)
+            funcion.locales = (None,) * (self.ctx.tamano - len(n.parametros))
+        finally:
+            self.ctx = anterior
+        return _nada
+
+    def compilar_DefinicionClase(self, n: DefinicionClase):
+        enlace = self.ctx.ambitos[-1].get(n.nombre)
+        if enlace is None or type(enlace.objeto) is not ClaseAriel or enlace.objeto.iniciales:
+            enlace = _Enlace(objeto=ClaseAriel(n))
+            self.ctx.ambitos[-1][n.nombre] = enlace
+        clase, anterior = enlace.objeto, self.ctx
+        # las propiedades son el marco de la construcción: un valor inicial ve las anteriores
+        self.ctx = _Contexto()
+        try:
+            for p in n.propiedades:
+                tipo = tipo_declarado(p, self.tipos)
+                if p.valor is None:
+                    inicial = VALORES_INICIALES.get(tipo, VACIO)
+                    clase.iniciales.append(lambda m, inicial=inicial: inicial)
+                else:
+                    clase.iniciales.append(_conversion(self.expresion(p.valor), self.tipo(p.valor), tipo))
+                clase.tipos[len(clase.iniciales) - 1] = tipo
+                self.declarar(p.nombre, tipo)
+        finally:
+            self.ctx = anterior
+        return _nada
+
+    # --- expresiones ---
+    def expresion(self, e) -> Callable:
+        return getattr(self, f"compilar_{type(e).__name__}")(e)
+
+    def compilar_Literal(self, n: Literal):
+        valor = n.valor
+        return lambda m: valor
+
+    def compilar_Identificador(self, n: Identificador):
+        enlace = self.buscar(n.nombre)
+        if enlace is None: return _fallar(f"'{n.nombre}' no está declarado", n.linea)
+        if enlace.posicion is None:
+            objeto = enlace.objeto
+            return lambda m: objeto
+        posicion = enlace.posicion
+        if enlace.contexto is self.ctx: return lambda m: m[posicion]
+        g = self.globales
+        return lambda m: g[posicion]
+
+    def compilar_OperacionBinaria(self, n: OperacionBinaria):
+        izq = (*self.operando(n.izquierda), self.tipo(n.izquierda))
+        der = (*self.operando(n.derecha), self.tipo(n.derecha))
+        return self.binaria(n.operador, izq, der, n.linea)[1]
+
+    def compilar_OperacionNaria(self, n: OperacionNaria):
+        # la cadena se pliega a la izquierda: ((a op b) op c) ..., como la verifica el semántico
+        acumulado = (*self.operando(n.operandos[0]), self.tipo(n.operandos[0]))
+        for operando, linea in zip(n.operandos[1:], n.lineas):
+            tipo, clausura = self.binaria(n.operador, acumulado, (*self.operando(operando), self.tipo(operando)), linea)
+            acumulado = ('e', clausura, tipo)
+        return acumulado[1]
+
+    def binaria(self, op, izq, der, linea):
+        """(tipo del resultado, clausura) de `izq op der`; cada operando es (forma, valor, tipo)."""
+        (fi, vi, ti), (fd, vd, td) = izq, der
+        if op in ('&&', '||'):
+            a, b = _como_expresion(fi, vi), _como_expresion(fd, vd)
+            if op == '&&': return 'Bool', lambda m: a(m) and b(m)
+            return 'Bool', lambda m: a(m) or b(m)
+        familia = _familia(ti, td)
+        resultado = 'Bool' if op in COMPARACIONES else familia
+        if familia is not None and op in DIRECTAS and (op in COMPARACIONES or familia in TIPOS_NUMERICOS
+                                                       or (familia == 'String' and op == '+')):
+            fabricas = DIRECTAS[op]
+            forma = fi + fd
+            if forma in fabricas: return resultado, fabricas[forma](vi, vd)
+            return resultado, fabricas['ee'](_como_expresion(fi, vi), _como_expresion(fd, vd))
+        a, b = _como_expresion(fi, vi), _como_expresion(fd, vd)
+        if familia == 'Int' and op in ('/', '%'):
+            # con los dos operandos positivos // y % de Python ya truncan como Swift
+            if op == '/':
+                def dividir(m):
+                    x, y = a(m), b(m)
+                    return x // y if x >= 0 and y > 0 else division_entera(x, y, linea)
+                return 'Int', dividir
+            def resto(m):
+                x, y = a(m), b(m)
+                return x % y if x >= 0 and y > 0 else resto_entero(x, y, linea)
+            return 'Int', resto
+        if familia == 'Double' and op == '/': return 'Double', lambda m: division_real(a(m), b(m))
+        if familia == 'Double' and op == '%': return 'Double', lambda m: resto_real(a(m), b(m))
+        return resultado, lambda m: operar(op, a(m), b(m), linea)
+
+    def compilar_OperacionUnaria(self, n: OperacionUnaria):
+        operando = self.expresion(n.operando)
+        if n.operador == '!': return lambda m: not operando(m)
+        return lambda m: -operando(m)
+
+    def compilar_Tupla(self, n: Tupla):
+        elementos = list(n.elementos.elementos(lambda tipo, valor: Literal(valor, tipo, n.linea)))
+        if all(type(e) is Literal for e in elementos):
+            valor = tuple(e.valor for e in elementos)
+            return lambda m: valor
+        partes = [self.expresion(e) for e in elementos]
+        if len(partes) == 2:
+            a, b = partes
+            return lambda m: (a(m), b(m))
+        return lambda m: tuple([p(m) for p in partes])
+
+    def compilar_AccesoMiembro(self, n: AccesoMiembro):
+        objeto, miembro, linea = self.expresion(n.objeto), n.miembro, n.linea
+        cache = [None, 0]               # la última clase vista y la posición del miembro en ella
+        def acceso(m):
+            o = objeto(m)
+            if type(o) is Instancia:
+                if o.clase is cache[0]: return o.valores[cache[1]]
+                i = o.clase.indices.get(miembro)
+                if i is not None:
+                    cache[0], cache[1] = o.clase, i
+                    return o.valores[i]
+            raise ErrorEjecucion(f"'{texto_swift(o)}' no tiene la propiedad '{miembro}'", linea)
+        return acceso
+
+    def compilar_LlamadaFuncion(self, n: LlamadaFuncion):
+        argumentos = [self.expresion(a) for a in n.argumentos]
+        enlace, linea = self.buscar(n.nombre), n.linea
+        if enlace is None:
+            if n.nombre == 'print':
+                salida = self.salida
+                def imprimir(m):
+                    salida(' '.join([texto_swift(a(m)) for a in argumentos]))
+                    return VACIO
+                return imprimir
+            nativa = NATIVAS.get(n.nombre)
+            if nativa is not None and len(argumentos) == 1:
+                a, = argumentos
+                return lambda m: nativa(a(m))
+            return _fallar(f"'{n.nombre}' no es una función", linea)
+        if type(enlace.objeto) is Funcion:
+            return self.llamada(enlace.objeto, n)
+        if enlace.objeto is not None:
+            clase = enlace.objeto
+            return lambda m: clase.invocar([a(m) for a in argumentos], linea)
+        llamado = self.compilar_Identificador(Identificador(n.nombre, linea))
+        return lambda m: invocar(llamado(m), [a(m) for a in argumentos], linea)
+
+    def llamada(self, f: Funcion, n: LlamadaFuncion) -> Callable:
+        """Llamada a una función conocida al compilar: el marco se arma sin buscar nada."""
+        if len(n.argumentos) > len(f.parametros):
+            return _fallar(f"'{f.nombre}' recibe {len(f.parametros)} argumento(s), no {len(n.argumentos)}", n.linea)
+        args = [_conversion(self.expresion(a), self.tipo(a), t) for a, t in zip(n.argumentos, f.tipos)]
+        for k in range(len(args), len(f.parametros)):
+            if not f.opcionales[k]:
+                return _fallar(f"falta el argumento '{f.parametros[k]}' de '{f.nombre}'", n.linea)
+            # los valores por omisión solo ven lo global (da igual con qué marco se evalúan) y
+            # pueden no estar compilados todavía si la función se define más abajo
+            args.append(lambda m, k=k: f.defaults[k](m))
+        if len(args) == 0:
+            def llamar(m):
+                r = f.cuerpo([*f.locales])
+                return VACIO if r is None else r
+        elif len(args) == 1:
+            a0, = args
+            def llamar(m):
+                r = f.cuerpo([a0(m), *f.locales])
+                return VACIO if r is None else r
+        elif len(args) == 2:
+            a0, a1 = args
+            def llamar(m):
+                r = f.cuerpo([a0(m), a1(m), *f.locales])
+                return VACIO if r is None else r
+        elif len(args) == 3:
+            a0, a1, a2 = args
+            def llamar(m):
+                r = f.cuerpo([a0(m), a1(m), a2(m), *f.locales])
+                return VACIO if r is None else r
+        else:
+            def llamar(m):
+                marco = [a(m) for a in args]
+                marco += f.locales
+                r = f.cuerpo(marco)
+                return VACIO if r is None else r
+        return llamar
+
+
+def compilar(programa: Programa, tipos: Optional[Dict[Nodo, Optional[str]]] = None,
+             salida: Optional[Callable[[str], None]] = None, plazo: Optional[Plazo] = None) -> ProgramaCompilado:
+    """Compila un programa ya verificado (sin errores). `salida` recibe cada línea de print (por omisión, print)."""
+    if tipos is None: tipos = tipos_de(programa)
+    return CompiladorClausuras(tipos, salida, plazo).compilar_programa(programa)
+
+
+# ---------------------------------------------------------------
+# Intérprete de referencia (recorre el árbol)
+# ---------------------------------------------------------------
+class _Volver(Exception):
+    def __init__(self, valor):
+        self.valor = valor
+
+
+class _FuncionArbol:
+    def __init__(self, nodo: DefinicionFuncion, exterior: list):
+        self.nodo, self.exterior = nodo, exterior
+
+    def __str__(self): return "(Function)"
+
+
+class _ClaseArbol:
+    def __init__(self, nodo: DefinicionClase, exterior: list):
+        self.nodo, self.exterior = nodo, exterior
+
+    def __str__(self): return self.nodo.nombre
+
+
+class _ObjetoArbol:
+    def __init__(self, clase: _ClaseArbol, campos: dict):
+        self.clase, self.campos = clase, campos
+
+    def __str__(self):
+        campos = ', '.join(f"{p}: {texto_swift(v, True)}" for p, v in self.campos.items())
+        return f"{self.clase.nodo.nombre}({campos})"
+
+
+class InterpreteArbol:
+    """
+    Ejecuta el AST nodo por nodo: cada variable es una entrada [valor, tipo]
+    en el dict de su ámbito, cada nodo se despacha por el nombre de su clase
+    y un 'return' es una excepción. Misma semántica que el motor compilado.
+    """
+
+    def __init__(self, tipos: Optional[Dict[Nodo, Optional[str]]] = None,
+                 salida: Optional[Callable[[str], None]] = None):
+        self.tipos = tipos
+        self.salida = salida or print
+        self.entornos: List[Dict[str, list]] = [{}]
+        self.globales = 1           # cuántos de los entornos son del nivel superior
+        self.funcion: Optional[DefinicionFuncion] = None
+
+    def ejecutar(self, programa: Programa):
+        if self.tipos is None: self.tipos = tipos_de(programa)
+        self.entornos, self.globales, self.funcion = [{}], 1, None
+        for s in programa.sentencias:
+            if type(s) is DefinicionFuncion and s.nombre not in self.entornos[0]:
+                self.entornos[0][s.nombre] = [_FuncionArbol(s, self.entornos[:1]), None]
+            elif type(s) is DefinicionClase and s.nombre not in self.entornos[0]:
+                self.entornos[0][s.nombre] = [_ClaseArbol(s, self.entornos[:1]), None]
+        with _errores_de_ejecucion():
+            try:
+                for s in programa.sentencias: self.ejecutar_sentencia(s)
+            except _Volver:
+                pass
+
+    def buscar(self, nombre, linea) -> list:
+        for entorno in reversed(self.entornos):
+            if nombre in entorno: return entorno[nombre]
+        raise ErrorEjecucion(f"'{nombre}' no está declarado", linea)
+
+    def exterior(self) -> list:
+        """Lo que ve una función o clase definida aquí: los entornos del nivel superior."""
+        return list(self.entornos) if self.funcion is None else self.entornos[:self.globales]
+
+    def bloque(self, sentencias):
+        self.entornos.append({})
+        try:
+            for s in sentencias: self.ejecutar_sentencia(s)
+        finally:
+            self.entornos.pop()
+
+    def ejecutar_sentencia(self, s):
+        metodo = getattr(self, f"ejecutar_{type(s).__name__}", None)
+        if metodo is not None: metodo(s)
+        else: self.evaluar(s)
+
+    def ejecutar_DeclaracionVariable(self, n: DeclaracionVariable):
+        tipo = tipo_declarado(n, self.tipos)
+        if n.valor is None: valor = VALORES_INICIALES.get(tipo, VACIO)
+        else: valor = convertir(self.evaluar(n.valor), tipo)
+        self.entornos[-1][n.nombre] = [valor, tipo]
+
+    def ejecutar_Asignacion(self, n: Asignacion):
+        variable = self.buscar(n.nombre, n.linea)
+        variable[0] = convertir(self.evaluar(n.expresion), variable[1])
+
+    def ejecutar_Si(self, n: Si):
+        if self.evaluar(n.condicion): self.bloque(n.cuerpo_if)
+        elif n.cuerpo_else: self.bloque(n.cuerpo_else)
+
+    def ejecutar_Mientras(self, n: Mientras):
+        while self.evaluar(n.condicion): self.bloque(n.cuerpo)
+
+    def ejecutar_Retorno(self, n: Retorno):
+        tipo = self.funcion.tipo_retorno if self.funcion is not None else None
+        raise _Volver(convertir(self.evaluar(n.expresion), tipo))
+
+    def ejecutar_DefinicionFuncion(self, n: DefinicionFuncion):
+        actual = self.entornos[-1].get(n.nombre)
+        if actual is None or not isinstance(actual[0], _FuncionArbol) or actual[0].nodo is not n:
+            self.entornos[-1][n.nombre] = [_FuncionArbol(n, self.exterior()), None]
+
+    def ejecutar_DefinicionClase(self, n: DefinicionClase):
+        actual = self.entornos[-1].get(n.nombre)
+        if actual is None or not isinstance(actual[0], _ClaseArbol) or actual[0].nodo is not n:
+            self.entornos[-1][n.nombre] = [_ClaseArbol(n, self.exterior()), None]
+
+    def evaluar(self, e):
+        return getattr(self, f"evaluar_{type(e).__name__}")(e)
+
+    def evaluar_Literal(self, n: Literal): return n.valor
+
+    def evaluar_Identificador(self, n: Identificador):
+        return self.buscar(n.nombre, n.linea)[0]
+
+    def evaluar_OperacionBinaria(self, n: OperacionBinaria):
+        return self.binaria(n.operador, self.evaluar(n.izquierda), n.derecha, n.linea)
+
+    def evaluar_OperacionNaria(self, n: OperacionNaria):
+        valor = self.evaluar(n.operandos[0])
+        for operando, linea in zip(n.operandos[1:], n.lineas):
+            valor = self.binaria(n.operador, valor, operando, linea)
+        return valor
+
+    def binaria(self, op, izq, derecha, linea):
+        if op == '&&': return izq and self.evaluar(derecha)
+        if op == '||': return izq or self.evaluar(derecha)
+        return operar(op, izq, self.evaluar(derecha), linea)
+
+    def evaluar_OperacionUnaria(self, n: OperacionUnaria):
+        valor = self.evaluar(n.operando)
+        return (not valor) if n.operador == '!' else -valor
+
+    def evaluar_Tupla(self, n: Tupla):
+        return tuple(self.evaluar(e) for e in n.elementos.elementos(lambda tipo, valor: Literal(valor, tipo, n.linea)))
+
+    def evaluar_AccesoMiembro(self, n: AccesoMiembro):
+        objeto = self.evaluar(n.objeto)
+        if isinstance(objeto, _ObjetoArbol) and n.miembro in objeto.campos: return objeto.campos[n.miembro]
+        raise ErrorEjecucion(f"'{texto_swift(objeto)}' no tiene la propiedad '{n.miembro}'", n.linea)
+
+    def evaluar_LlamadaFuncion(self, n: LlamadaFuncion):
+        valores = [self.evaluar(a) for a in n.argumentos]
+        try:
+            llamado = self.buscar(n.nombre, n.linea)[0]
+        except ErrorEjecucion:
+            if n.nombre == 'print':
+                self.salida(' '.join(texto_swift(v) for v in valores))
+                return VACIO
+            if n.nombre in NATIVAS and len(valores) == 1: return NATIVAS[n.nombre](valores[0])
+            raise ErrorEjecucion(f"'{n.nombre}' no es una función", n.linea)
+        if isinstance(llamado, _FuncionArbol): return self.llamar(llamado, valores, n.linea)
+        if isinstance(llamado, _ClaseArbol): return self.construir(llamado, valores, n.linea)
+        raise ErrorEjecucion(f"'{texto_swift(llamado)}' no se puede llamar", n.linea)
+
+    def llamar(self, funcion: _FuncionArbol, valores, linea):
+        nodo = funcion.nodo
+        if len(valores) > len(nodo.parametros):
+            raise ErrorEjecucion(f"'{nodo.nombre}' recibe {len(nodo.parametros)} argumento(s), no {len(valores)}", linea)
+        anterior = (self.entornos, self.globales, self.funcion)
+        self.entornos, self.globales, self.funcion = list(funcion.exterior), len(funcion.exterior), nodo
+        try:
+            locales = {}
+            for k, p in enumerate(nodo.parametros):
+                if k < len(valores): valor = valores[k]
+                elif p.valor_default is not None: valor = self.evaluar(p.valor_default)
+                else: raise ErrorEjecucion(f"falta el argumento '{p.nombre}' de '{nodo.nombre}'", linea)
+                locales[p.nombre] = [convertir(valor, p.tipo), p.tipo]
+            self.entornos.append(locales)
+            for s in nodo.cuerpo: self.ejecutar_sentencia(s)
+            return VACIO
+        except _Volver as volver:
+            return volver.valor
+        finally:
+            self.entornos, self.globales, self.funcion = anterior
+
+    def construir(self, clase: _ClaseArbol, valores, linea):
+        nodo = clase.nodo
+        if len(valores) > len(nodo.propiedades):
+            raise ErrorEjecucion(f"'{nodo.nombre}' tiene {len(nodo.propiedades)} propiedad(es), no {len(valores)}", linea)
+        anterior = (self.entornos, self.globales, self.funcion)
+        campos: Dict[str, list] = {}
+        self.entornos, self.globales, self.funcion = list(clase.exterior) + [campos], len(clase.exterior), None
+        try:
+            for k, p in enumerate(nodo.propiedades):
+                tipo = tipo_declarado(p, self.tipos)
+                if k < len(valores): valor = convertir(valores[k], tipo)
+                elif p.valor is None: valor = VALORES_INICIALES.get(tipo, VACIO)
+                else: valor = convertir(self.evaluar(p.valor), tipo)
+                campos[p.nombre] = [valor, tipo]
+        finally:
+            self.entornos, self.globales, self.funcion = anterior
+        return _ObjetoArbol(clase, {nombre: v[0] for nombre, v in campos.items()})
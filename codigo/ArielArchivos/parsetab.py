@@ -1,91 +0,0 @@
-
-# parsetab.py
-# This file is automatically generated. Do not edit.
-# pylint: disable=W,C,R
-_tabversion = '3.10'
-
-_lr_method = 'LALR'
-
-_lr_signature = 'leftORleftANDleftIGUALDIFERENTEleftMENORMENORIGUALMAYORMAYORIGUALleftSUMARESTAleftMULTDIVMODrightNOTleftPUNTOAND ASIGNAR CADENA CLASS COMA DECIMAL DIFERENTE DIV DOSPTOS ELSE ENTERO FALSE FLECHA FUNC IDENTIFICADOR IF IGUAL INIT LBRACE LBRACKET LET LPAREN MAYOR MAYORIGUAL MENOR MENORIGUAL MOD MULT NOT OR PUNTO PUNTOYCOMA RBRACE RBRACKET RESTA RETURN RPAREN SELF SUMA TRUE VAR WHILEprograma : lista_sentencias\nlista_sentencias : lista_sentencias sentencia\n                 |\n\nsentencia : declaracion_variable_ariel\n          | asignacion_ariel\n          | mientras_ariel\n          | si_minimo\n          | definicion_funcion_ariel\n          | definicion_clase_minimo\n          | retorno_completo\n          | expresion PUNTOYCOMA\n\ndeclaracion_variable_ariel : VAR IDENTIFICADOR tipo_opcional asignacion_opcional PUNTOYCOMA\n                           | LET IDENTIFICADOR tipo_opcional asignacion_opcional PUNTOYCOMA\n\ntipo_opcional : DOSPTOS IDENTIFICADOR\n              |\n\nasignacion_opcional : ASIGNAR expresion\n                    |\nasignacion_ariel : IDENTIFICADOR ASIGNAR expresion PUNTOYCOMAmientras_ariel : WHILE LPAREN expresion RPAREN LBRACE lista_sentencias RBRACE\nsi_minimo : IF LPAREN expresion RPAREN LBRACE lista_sentencias RBRACE\n          | IF LPAREN expresion RPAREN LBRACE lista_sentencias RBRACE ELSE LBRACE lista_sentencias RBRACE\ndefinicion_clase_minimo : CLASS IDENTIFICADOR LBRACE lista_miembros_clase RBRACE\nlista_miembros_clase : lista_miembros_clase miembro_clase\n                     |\n\nmiembro_clase : declaracion_variable_ariel\n              | definicion_funcion_ariel\ndefinicion_funcion_ariel : FUNC IDENTIFICADOR LPAREN lista_parametros_ariel RPAREN tipo_retorno LBRACE lista_sentencias RBRACE\nlista_parametros_ariel : lista_parametros_ariel COMA parametro_ariel\n                       | parametro_ariel\n                       |\n\nparametro_ariel : IDENTIFICADOR DOSPTOS IDENTIFICADOR asignacion_opcional\n\ntipo_retorno : FLECHA IDENTIFICADOR\n             |\nretorno_completo : RETURN expresion PUNTOYCOMAexpresion : LPAREN lista_expresiones_ariel RPARENexpresion : IDENTIFICADOR LPAREN lista_expresiones_ariel RPAREN\nlista_expresiones_ariel : lista_expresiones_ariel COMA expresion\n                        | expresion\n                        |\nexpresion : expresion PUNTO IDENTIFICADOR\nexpresion : expresion SUMA expresion\n          | expresion RESTA expresion\n          | expresion MULT expresion\n          | expresion DIV expresion\n          | expresion MOD expresion\n          | expresion IGUAL expresion\n          | expresion DIFERENTE expresion\n          | expresion MENOR expresion\n          | expresion MENORIGUAL expresion\n          | expresion MAYOR expresion\n          | expresion MAYORIGUAL expresion\n          | expresion AND expresion\n          | expresion OR expresion\n\nexpresion : NOT expresion\n          | RESTA expresion %prec NOT\n\nexpresion : ENTERO\n          | DECIMAL\n          | CADENA\n          | TRUE\n          | FALSE\nexpresion : IDENTIFICADOR'
-    
-_lr_action_items = {'VAR':([0,2,3,4,5,6,7,8,9,10,28,81,82,86,95,96,98,99,100,104,105,106,107,108,109,114,115,117,120,121,122,123,124,],[-3,12,-2,-4,-5,-6,-7,-8,-9,-10,-11,-24,-34,-18,12,-12,-13,-3,-3,-22,-23,-25,-26,12,12,-19,-20,-3,12,-3,-27,12,-21,]),'LET':([0,2,3,4,5,6,7,8,9,10,28,81,82,86,95,96,98,99,100,104,105,106,107,108,109,114,115,117,120,121,122,123,124,],[-3,14,-2,-4,-5,-6,-7,-8,-9,-10,-11,-24,-34,-18,14,-12,-13,-3,-3,-22,-23,-25,-26,14,14,-19,-20,-3,14,-3,-27,14,-21,]),'IDENTIFICADOR':([0,2,3,4,5,6,7,8,9,10,12,14,16,18,19,20,21,22,28,29,30,31,32,33,34,35,36,37,38,39,40,41,42,44,45,47,51,72,78,80,82,84,86,96,98,99,100,101,103,104,108,109,112,114,115,117,120,121,122,123,124,],[-3,13,-2,-4,-5,-6,-7,-8,-9,-10,43,46,50,52,53,50,50,50,-11,57,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,85,50,92,-34,50,-18,-12,-13,-3,-3,110,92,-22,13,13,118,-19,-20,-3,13,-3,-27,13,-21,]),'WHILE':([0,2,3,4,5,6,7,8,9,10,28,82,86,96,98,99,100,104,108,109,114,115,117,120,121,122,123,124,],[-3,15,-2,-4,-5,-6,-7,-8,-9,-10,-11,-34,-18,-12,-13,-3,-3,-22,15,15,-19,-20,-3,15,-3,-27,15,-21,]),'IF':([0,2,3,4,5,6,7,8,9,10,28,82,86,96,98,99,100,104,108,109,114,115,117,120,121,122,123,124,],[-3,17,-2,-4,-5,-6,-7,-8,-9,-10,-11,-34,-18,-12,-13,-3,-3,-22,17,17,-19,-20,-3,17,-3,-27,17,-21,]),'FUNC':([0,2,3,4,5,6,7,8,9,10,28,81,82,86,95,96,98,99,100,104,105,106,107,108,109,114,115,117,120,121,122,123,124,],[-3,18,-2,-4,-5,-6,-7,-8,-9,-10,-11,-24,-34,-18,18,-12,-13,-3,-3,-22,-23,-25,-26,18,18,-19,-20,-3,18,-3,-27,18,-21,]),'CLASS':([0,2,3,4,5,6,7,8,9,10,28,82,86,96,98,99,100,104,108,109,114,115,117,120,121,122,123,124,],[-3,19,-2,-4,-5,-6,-7,-8,-9,-10,-11,-34,-18,-12,-13,-3,-3,-22,19,19,-19,-20,-3,19,-3,-27,19,-21,]),'RETURN':([0,2,3,4,5,6,7,8,9,10,28,82,86,96,98,99,100,104,108,109,114,115,117,120,121,122,123,124,],[-3,20,-2,-4,-5,-6,-7,-8,-9,-10,-11,-34,-18,-12,-13,-3,-3,-22,20,20,-19,-20,-3,20,-3,-27,20,-21,]),'LPAREN':([0,2,3,4,5,6,7,8,9,10,13,15,16,17,20,21,22,28,30,31,32,33,34,35,36,37,38,39,40,41,42,44,45,47,50,51,52,78,82,84,86,96,98,99,100,104,108,109,114,115,117,120,121,122,123,124,],[-3,16,-2,-4,-5,-6,-7,-8,-9,-10,45,47,16,51,16,16,16,-11,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,45,16,80,16,-34,16,-18,-12,-13,-3,-3,-22,16,16,-19,-20,-3,16,-3,-27,16,-21,]),'NOT':([0,2,3,4,5,6,7,8,9,10,16,20,21,22,28,30,31,32,33,34,35,36,37,38,39,40,41,42,44,45,47,51,78,82,84,86,96,98,99,100,104,108,109,114,115,117,120,121,122,123,124,],[-3,22,-2,-4,-5,-6,-7,-8,-9,-10,22,22,22,22,-11,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,-34,22,-18,-12,-13,-3,-3,-22,22,22,-19,-20,-3,22,-3,-27,22,-21,]),'RESTA':([0,2,3,4,5,6,7,8,9,10,11,13,16,20,21,22,23,24,25,26,27,28,30,31,32,33,34,35,36,37,38,39,40,41,42,44,45,47,49,50,51,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,73,76,77,78,79,82,84,86,87,90,96,97,98,99,100,104,108,109,114,115,117,120,121,122,123,124,],[-3,21,-2,-4,-5,-6,-7,-8,-9,-10,31,-61,21,21,21,21,-56,-57,-58,-59,-60,-11,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,31,-61,21,31,-55,-54,-40,-41,-42,-43,-44,-45,31,31,31,31,31,31,31,31,31,31,-35,21,31,-34,21,-18,-36,31,-12,31,-13,-3,-3,-22,21,21,-19,-20,-3,21,-3,-27,21,-21,]),'ENTERO':([0,2,3,4,5,6,7,8,9,10,16,20,21,22,28,30,31,32,33,34,35,36,37,38,39,40,41,42,44,45,47,51,78,82,84,86,96,98,99,100,104,108,109,114,115,117,120,121,122,123,124,],[-3,23,-2,-4,-5,-6,-7,-8,-9,-10,23,23,23,23,-11,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,-34,23,-18,-12,-13,-3,-3,-22,23,23,-19,-20,-3,23,-3,-27,23,-21,]),'DECIMAL':([0,2,3,4,5,6,7,8,9,10,16,20,21,22,28,30,31,32,33,34,35,36,37,38,39,40,41,42,44,45,47,51,78,82,84,86,96,98,99,100,104,108,109,114,115,117,120,121,122,123,124,],[-3,24,-2,-4,-5,-6,-7,-8,-9,-10,24,24,24,24,-11,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,-34,24,-18,-12,-13,-3,-3,-22,24,24,-19,-20,-3,24,-3,-27,24,-21,]),'CADENA':([0,2,3,4,5,6,7,8,9,10,16,20,21,22,28,30,31,32,33,34,35,36,37,38,39,40,41,42,44,45,47,51,78,82,84,86,96,98,99,100,104,108,109,114,115,117,120,121,122,123,124,],[-3,25,-2,-4,-5,-6,-7,-8,-9,-10,25,25,25,25,-11,25,25,25,25,25,25,25,25,25,25,25,25,25,25,25,25,25,25,-34,25,-18,-12,-13,-3,-3,-22,25,25,-19,-20,-3,25,-3,-27,25,-21,]),'TRUE':([0,2,3,4,5,6,7,8,9,10,16,20,21,22,28,30,31,32,33,34,35,36,37,38,39,40,41,42,44,45,47,51,78,82,84,86,96,98,99,100,104,108,109,114,115,117,120,121,122,123,124,],[-3,26,-2,-4,-5,-6,-7,-8,-9,-10,26,26,26,26,-11,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,-34,26,-18,-12,-13,-3,-3,-22,26,26,-19,-20,-3,26,-3,-27,26,-21,]),'FALSE':([0,2,3,4,5,6,7,8,9,10,16,20,21,22,28,30,31,32,33,34,35,36,37,38,39,40,41,42,44,45,47,51,78,82,84,86,96,98,99,100,104,108,109,114,115,117,120,121,122,123,124,],[-3,27,-2,-4,-5,-6,-7,-8,-9,-10,27,27,27,27,-11,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,-34,27,-18,-12,-13,-3,-3,-22,27,27,-19,-20,-3,27,-3,-27,27,-21,]),'$end':([0,1,2,3,4,5,6,7,8,9,10,28,82,86,96,98,104,114,115,122,124,],[-3,0,-1,-2,-4,-5,-6,-7,-8,-9,-10,-11,-34,-18,-12,-13,-22,-19,-20,-27,-21,]),'RBRACE':([3,4,5,6,7,8,9,10,28,81,82,86,95,96,98,99,100,104,105,106,107,108,109,114,115,117,120,121,122,123,124,],[-2,-4,-5,-6,-7,-8,-9,-10,-11,-24,-34,-18,104,-12,-13,-3,-3,-22,-23,-25,-26,114,115,-19,-20,-3,122,-3,-27,124,-21,]),'PUNTOYCOMA':([11,13,23,24,25,26,27,43,46,50,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,71,73,75,77,83,85,87,88,97,],[28,-61,-56,-57,-58,-59,-60,-15,-15,-61,82,-55,-54,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,-17,86,-17,-35,96,-14,-36,98,-16,]),'PUNTO':([11,13,23,24,25,26,27,49,50,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,73,76,77,79,87,90,97,],[29,-61,-56,-57,-58,-59,-60,29,-61,29,29,29,-40,29,29,29,29,29,29,29,29,29,29,29,29,29,29,29,-35,29,-36,29,29,]),'SUMA':([11,13,23,24,25,26,27,49,50,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,73,76,77,79,87,90,97,],[30,-61,-56,-57,-58,-59,-60,30,-61,30,-55,-54,-40,-41,-42,-43,-44,-45,30,30,30,30,30,30,30,30,30,30,-35,30,-36,30,30,]),'MULT':([11,13,23,24,25,26,27,49,50,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,73,76,77,79,87,90,97,],[32,-61,-56,-57,-58,-59,-60,32,-61,32,-55,-54,-40,32,32,-43,-44,-45,32,32,32,32,32,32,32,32,32,32,-35,32,-36,32,32,]),'DIV':([11,13,23,24,25,26,27,49,50,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,73,76,77,79,87,90,97,],[33,-61,-56,-57,-58,-59,-60,33,-61,33,-55,-54,-40,33,33,-43,-44,-45,33,33,33,33,33,33,33,33,33,33,-35,33,-36,33,33,]),'MOD':([11,13,23,24,25,26,27,49,50,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,73,76,77,79,87,90,97,],[34,-61,-56,-57,-58,-59,-60,34,-61,34,-55,-54,-40,34,34,-43,-44,-45,34,34,34,34,34,34,34,34,34,34,-35,34,-36,34,34,]),'IGUAL':([11,13,23,24,25,26,27,49,50,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,73,76,77,79,87,90,97,],[35,-61,-56,-57,-58,-59,-60,35,-61,35,-55,-54,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,-51,35,35,35,35,-35,35,-36,35,35,]),'DIFERENTE':([11,13,23,24,25,26,27,49,50,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,73,76,77,79,87,90,97,],[36,-61,-56,-57,-58,-59,-60,36,-61,36,-55,-54,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,-51,36,36,36,36,-35,36,-36,36,36,]),'MENOR':([11,13,23,24,25,26,27,49,50,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,73,76,77,79,87,90,97,],[37,-61,-56,-57,-58,-59,-60,37,-61,37,-55,-54,-40,-41,-42,-43,-44,-45,37,37,-48,-49,-50,-51,37,37,37,37,-35,37,-36,37,37,]),'MENORIGUAL':([11,13,23,24,25,26,27,49,50,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,73,76,77,79,87,90,97,],[38,-61,-56,-57,-58,-59,-60,38,-61,38,-55,-54,-40,-41,-42,-43,-44,-45,38,38,-48,-49,-50,-51,38,38,38,38,-35,38,-36,38,38,]),'MAYOR':([11,13,23,24,25,26,27,49,50,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,73,76,77,79,87,90,97,],[39,-61,-56,-57,-58,-59,-60,39,-61,39,-55,-54,-40,-41,-42,-43,-44,-45,39,39,-48,-49,-50,-51,39,39,39,39,-35,39,-36,39,39,]),'MAYORIGUAL':([11,13,23,24,25,26,27,49,50,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,73,76,77,79,87,90,97,],[40,-61,-56,-57,-58,-59,-60,40,-61,40,-55,-54,-40,-41,-42,-43,-44,-45,40,40,-48,-49,-50,-51,40,40,40,40,-35,40,-36,40,40,]),'AND':([11,13,23,24,25,26,27,49,50,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,73,76,77,79,87,90,97,],[41,-61,-56,-57,-58,-59,-60,41,-61,41,-55,-54,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,41,41,41,-35,41,-36,41,41,]),'OR':([11,13,23,24,25,26,27,49,50,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,73,76,77,79,87,90,97,],[42,-61,-56,-57,-58,-59,-60,42,-61,42,-55,-54,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,42,42,-35,42,-36,42,42,]),'ASIGNAR':([13,43,46,71,75,85,110,],[44,-15,-15,84,84,-14,84,]),'RPAREN':([16,23,24,25,26,27,45,48,49,50,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,74,76,77,79,80,87,90,93,94,97,110,113,116,],[-39,-56,-57,-58,-59,-60,-39,77,-38,-61,-55,-54,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,87,89,-35,91,-30,-36,-37,102,-29,-16,-17,-28,-31,]),'COMA':([16,23,24,25,26,27,45,48,49,50,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,74,77,80,87,90,93,94,97,110,113,116,],[-39,-56,-57,-58,-59,-60,-39,78,-38,-61,-55,-54,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,-51,-52,-53,78,-35,-30,-36,-37,103,-29,-16,-17,-28,-31,]),'DOSPTOS':([43,46,92,],[72,72,101,]),'LBRACE':([53,89,91,102,111,118,119,],[81,99,100,-33,117,-32,121,]),'FLECHA':([102,],[112,]),'ELSE':([115,],[119,]),}
-
-_lr_action = {}
-for _k, _v in _lr_action_items.items():
-   for _x,_y in zip(_v[0],_v[1]):
-      if not _x in _lr_action:  _lr_action[_x] = {}
-      _lr_action[_x][_k] = _y
-del _lr_action_items
-
-_lr_goto_items = {'programa':([0,],[1,]),'lista_sentencias':([0,99,100,117,121,],[2,108,109,120,123,]),'sentencia':([2,108,109,120,123,],[3,3,3,3,3,]),'declaracion_variable_ariel':([2,95,108,109,120,123,],[4,106,4,4,4,4,]),'asignacion_ariel':([2,108,109,120,123,],[5,5,5,5,5,]),'mientras_ariel':([2,108,109,120,123,],[6,6,6,6,6,]),'si_minimo':([2,108,109,120,123,],[7,7,7,7,7,]),'definicion_funcion_ariel':([2,95,108,109,120,123,],[8,107,8,8,8,8,]),'definicion_clase_minimo':([2,108,109,120,123,],[9,9,9,9,9,]),'retorno_completo':([2,108,109,120,123,],[10,10,10,10,10,]),'expresion':([2,16,20,21,22,30,31,32,33,34,35,36,37,38,39,40,41,42,44,45,47,51,78,84,108,109,120,123,],[11,49,54,55,56,58,59,60,61,62,63,64,65,66,67,68,69,70,73,49,76,79,90,97,11,11,11,11,]),'lista_expresiones_ariel':([16,45,],[48,74,]),'tipo_opcional':([43,46,],[71,75,]),'asignacion_opcional':([71,75,110,],[83,88,116,]),'lista_parametros_ariel':([80,],[93,]),'parametro_ariel':([80,103,],[94,113,]),'lista_miembros_clase':([81,],[95,]),'miembro_clase':([95,],[105,]),'tipo_retorno':([102,],[111,]),}
-
-_lr_goto = {}
-for _k, _v in _lr_goto_items.items():
-   for _x, _y in zip(_v[0], _v[1]):
-       if not _x in _lr_goto: _lr_goto[_x] = {}
-       _lr_goto[_x][_k] = _y
-del _lr_goto_items
-_lr_productions = [
-  ("S' -> programa","S'",1,None,None,None),
-  ('programa -> lista_sentencias','programa',1,'p_programa','analizadorSemantico.py',116),
-  ('lista_sentencias -> lista_sentencias sentencia','lista_sentencias',2,'p_lista_sentencias','analizadorSemantico.py',121),
-  ('lista_sentencias -> <empty>','lista_sentencias',0,'p_lista_sentencias','analizadorSemantico.py',122),
-  ('sentencia -> declaracion_variable_ariel','sentencia',1,'p_sentencia','analizadorSemantico.py',131),
-  ('sentencia -> asignacion_ariel','sentencia',1,'p_sentencia','analizadorSemantico.py',132),
-  ('sentencia -> mientras_ariel','sentencia',1,'p_sentencia','analizadorSemantico.py',133),
-  ('sentencia -> si_minimo','sentencia',1,'p_sentencia','analizadorSemantico.py',134),
-  ('sentencia -> definicion_funcion_ariel','sentencia',1,'p_sentencia','analizadorSemantico.py',135),
-  ('sentencia -> definicion_clase_minimo','sentencia',1,'p_sentencia','analizadorSemantico.py',136),
-  ('sentencia -> retorno_completo','sentencia',1,'p_sentencia','analizadorSemantico.py',137),
-  ('sentencia -> expresion PUNTOYCOMA','sentencia',2,'p_sentencia','analizadorSemantico.py',138),
-  ('declaracion_variable_ariel -> VAR IDENTIFICADOR tipo_opcional asignacion_opcional PUNTOYCOMA','declaracion_variable_ariel',5,'p_declaracion_variable_ariel','analizadorSemantico.py',145),
-  ('declaracion_variable_ariel -> LET IDENTIFICADOR tipo_opcional asignacion_opcional PUNTOYCOMA','declaracion_variable_ariel',5,'p_declaracion_variable_ariel','analizadorSemantico.py',146),
-  ('tipo_opcional -> DOSPTOS IDENTIFICADOR','tipo_opcional',2,'p_tipo_opcional','analizadorSemantico.py',153),
-  ('tipo_opcional -> <empty>','tipo_opcional',0,'p_tipo_opcional','analizadorSemantico.py',154),
-  ('asignacion_opcional -> ASIGNAR expresion','asignacion_opcional',2,'p_asignacion_opcional','analizadorSemantico.py',160),
-  ('asignacion_opcional -> <empty>','asignacion_opcional',0,'p_asignacion_opcional','analizadorSemantico.py',161),
-  ('asignacion_ariel -> IDENTIFICADOR ASIGNAR expresion PUNTOYCOMA','asignacion_ariel',4,'p_asignacion_ariel','analizadorSemantico.py',167),
-  ('mientras_ariel -> WHILE LPAREN expresion RPAREN LBRACE lista_sentencias RBRACE','mientras_ariel',7,'p_mientras_ariel','analizadorSemantico.py',172),
-  ('si_minimo -> IF LPAREN expresion RPAREN LBRACE lista_sentencias RBRACE','si_minimo',7,'p_si_minimo','analizadorSemantico.py',178),
-  ('si_minimo -> IF LPAREN expresion RPAREN LBRACE lista_sentencias RBRACE ELSE LBRACE lista_sentencias RBRACE','si_minimo',11,'p_si_minimo','analizadorSemantico.py',179),
-  ('definicion_clase_minimo -> CLASS IDENTIFICADOR LBRACE lista_miembros_clase RBRACE','definicion_clase_minimo',5,'p_definicion_clase_minimo','analizadorSemantico.py',185),
-  ('lista_miembros_clase -> lista_miembros_clase miembro_clase','lista_miembros_clase',2,'p_lista_miembros_clase','analizadorSemantico.py',192),
-  ('lista_miembros_clase -> <empty>','lista_miembros_clase',0,'p_lista_miembros_clase','analizadorSemantico.py',193),
-  ('miembro_clase -> declaracion_variable_ariel','miembro_clase',1,'p_miembro_clase','analizadorSemantico.py',200),
-  ('miembro_clase -> definicion_funcion_ariel','miembro_clase',1,'p_miembro_clase','analizadorSemantico.py',201),
-  ('definicion_funcion_ariel -> FUNC IDENTIFICADOR LPAREN lista_parametros_ariel RPAREN tipo_retorno LBRACE lista_sentencias RBRACE','definicion_funcion_ariel',9,'p_definicion_funcion_ariel','analizadorSemantico.py',207),
-  ('lista_parametros_ariel -> lista_parametros_ariel COMA parametro_ariel','lista_parametros_ariel',3,'p_lista_parametros_ariel','analizadorSemantico.py',212),
-  ('lista_parametros_ariel -> parametro_ariel','lista_parametros_ariel',1,'p_lista_parametros_ariel','analizadorSemantico.py',213),
-  ('lista_parametros_ariel -> <empty>','lista_parametros_ariel',0,'p_lista_parametros_ariel','analizadorSemantico.py',214),
-  ('parametro_ariel -> IDENTIFICADOR DOSPTOS IDENTIFICADOR asignacion_opcional','parametro_ariel',4,'p_parametro_ariel','analizadorSemantico.py',222),
-  ('tipo_retorno -> FLECHA IDENTIFICADOR','tipo_retorno',2,'p_tipo_retorno','analizadorSemantico.py',232),
-  ('tipo_retorno -> <empty>','tipo_retorno',0,'p_tipo_retorno','analizadorSemantico.py',233),
-  ('retorno_completo -> RETURN expresion PUNTOYCOMA','retorno_completo',3,'p_retorno_completo','analizadorSemantico.py',238),
-  ('expresion -> LPAREN lista_expresiones_ariel RPAREN','expresion',3,'p_expresion_tupla_ariel','analizadorSemantico.py',243),
-  ('expresion -> IDENTIFICADOR LPAREN lista_expresiones_ariel RPAREN','expresion',4,'p_expresion_llamada','analizadorSemantico.py',252),
-  ('lista_expresiones_ariel -> lista_expresiones_ariel COMA expresion','lista_expresiones_ariel',3,'p_lista_expresiones_ariel','analizadorSemantico.py',257),
-  ('lista_expresiones_ariel -> expresion','lista_expresiones_ariel',1,'p_lista_expresiones_ariel','analizadorSemantico.py',258),
-  ('lista_expresiones_ariel -> <empty>','lista_expresiones_ariel',0,'p_lista_expresiones_ariel','analizadorSemantico.py',259),
-  ('expresion -> expresion PUNTO IDENTIFICADOR','expresion',3,'p_expresion_acceso_miembro','analizadorSemantico.py',267),
-  ('expresion -> expresion SUMA expresion','expresion',3,'p_expresion_binaria','analizadorSemantico.py',272),
-  ('expresion -> expresion RESTA expresion','expresion',3,'p_expresion_binaria','analizadorSemantico.py',273),
-  ('expresion -> expresion MULT expresion','expresion',3,'p_expresion_binaria','analizadorSemantico.py',274),
-  ('expresion -> expresion DIV expresion','expresion',3,'p_expresion_binaria','analizadorSemantico.py',275),
-  ('expresion -> expresion MOD expresion','expresion',3,'p_expresion_binaria','analizadorSemantico.py',276),
-  ('expresion -> expresion IGUAL expresion','expresion',3,'p_expresion_binaria','analizadorSemantico.py',277),
-  ('expresion -> expresion DIFERENTE expresion','expresion',3,'p_expresion_binaria','analizadorSemantico.py',278),
-  ('expresion -> expresion MENOR expresion','expresion',3,'p_expresion_binaria','analizadorSemantico.py',279),
-  ('expresion -> expresion MENORIGUAL expresion','expresion',3,'p_expresion_binaria','analizadorSemantico.py',280),
-  ('expresion -> expresion MAYOR expresion','expresion',3,'p_expresion_binaria','analizadorSemantico.py',281),
-  ('expresion -> expresion MAYORIGUAL expresion','expresion',3,'p_expresion_binaria','analizadorSemantico.py',282),
-  ('expresion -> expresion AND expresion','expresion',3,'p_expresion_binaria','analizadorSemantico.py',283),
-  ('expresion -> expresion OR expresion','expresion',3,'p_expresion_binaria','analizadorSemantico.py',284),
-  ('expresion -> NOT expresion','expresion',2,'p_expresion_unaria','analizadorSemantico.py',290),
-  ('expresion -> RESTA expresion','expresion',2,'p_expresion_unaria','analizadorSemantico.py',291),
-  ('expresion -> ENTERO','expresion',1,'p_expresion_literal','analizadorSemantico.py',297),
-  ('expresion -> DECIMAL','expresion',1,'p_expresion_literal','analizadorSemantico.py',298),
-  ('expresion -> CADENA','expresion',1,'p_expresion_literal','analizadorSemantico.py',299),
-  ('expresion -> TRUE','expresion',1,'p_expresion_literal','analizadorSemantico.py',300),
-  ('expresion -> FALSE','expresion',1,'p_expresion_literal','analizadorSemantico.py',301),
-  ('expresion -> IDENTIFICADOR','expresion',1,'p_expresion_identificador','analizadorSemantico.py',311),
-]
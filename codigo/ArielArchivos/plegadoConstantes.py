@@ -0,0 +1,152 @@
+from __future__ import annotations
+import os
+import sys
+import time
+from typing import List, Optional
+
+from analizadorSemantico import Nodo, Programa, OperacionBinaria, OperacionNaria, OperacionUnaria, Literal, Identificador
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from comun.plegado import operar, operar_unaria, NO_PLEGABLE, DivisionPorCero
+from comun.colecciones import ColeccionLiteral
+from comun.diagnosticos import ListaDiagnosticos
+from comun.plazo import Plazo
+
+# =========================================================================
+# 5. PLEGADO DE CONSTANTES (antes del análisis semántico)
+# =========================================================================
+# Reemplaza las operaciones entre literales por el Literal resultante, con el
+# tipo que les daría AnalizadorSemantico. Las que el semántico marcaría como
+# error (p. ej. Int + String) se dejan intactas para que el error se reporte.
+
+MENSAJES_PLEGADO = {
+    'PLG001': "❌ Línea {linea}: división entre cero ('{operador}' con divisor literal 0).",
+}
+
+
+class PlegadorConstantes:
+    def __init__(self):
+        self.errores: List[str] = ListaDiagnosticos('plegado', MENSAJES_PLEGADO)
+        self.nodos_antes = 0
+        self.eliminados = 0
+        self.plegados = 0
+        self.duracion = 0.0
+        self.tipos_numericos = ['Int', 'Double']
+        self._tipos = {}            # (op, tipo_izq, tipo_der) -> tipo_resultado ya calculado
+        self.plazo: Optional[Plazo] = None   # si se fija, se revisa en cada sentencia de nivel superior
+
+    @property
+    def nodos_despues(self): return self.nodos_antes - self.eliminados
+
+    def plegar_programa(self, programa: Optional[Programa]) -> Optional[Programa]:
+        if programa is None: return None
+        inicio = time.perf_counter()
+        if self.plazo is None:
+            programa = self.plegar(programa)
+        else:
+            self.nodos_antes += 1
+            sentencias = programa.sentencias
+            for i, s in enumerate(sentencias):
+                self.plazo.revisar()
+                if isinstance(s, Nodo): sentencias[i] = self.plegar(s)
+        self.duracion = time.perf_counter() - inicio
+        return programa
+
+    def plegar_sentencia(self, sentencia):
+        """Para el análisis en flujo: pliega una sentencia de nivel superior y suma su tiempo."""
+        inicio = time.perf_counter()
+        sentencia = self.plegar(sentencia)
+        self.duracion += time.perf_counter() - inicio
+        return sentencia
+
+    def plegar(self, nodo):
+        self.nodos_antes += 1
+        tipo = type(nodo)
+        # caminos directos para los nodos de expresión, que son la gran mayoría
+        if tipo is Literal or tipo is Identificador: return nodo
+        if tipo is OperacionBinaria:
+            # las hojas se cuentan aquí mismo, sin la llamada recursiva
+            izq, der = nodo.izquierda, nodo.derecha
+            tipo_izq, tipo_der = type(izq), type(der)
+            if tipo_izq is Literal or tipo_izq is Identificador: self.nodos_antes += 1
+            else:
+                izq = nodo.izquierda = self.plegar(izq)
+                tipo_izq = type(izq)
+            if tipo_der is Literal or tipo_der is Identificador: self.nodos_antes += 1
+            else:
+                der = nodo.derecha = self.plegar(der)
+                tipo_der = type(der)
+            if tipo_izq is not Literal or tipo_der is not Literal: return nodo
+            return self.plegar_OperacionBinaria(nodo)
+        for atributo, valor in vars(nodo).items():
+            if isinstance(valor, Nodo):
+                setattr(nodo, atributo, self.plegar(valor))
+            elif isinstance(valor, list):
+                valor[:] = [self.plegar(v) if isinstance(v, Nodo) else v for v in valor]
+            elif isinstance(valor, ColeccionLiteral) and not valor.solo_literales():
+                setattr(nodo, atributo, valor.mapear_nodos(self.plegar))
+        metodo = f"plegar_{type(nodo).__name__}"
+        if hasattr(self, metodo): return getattr(self, metodo)(nodo)
+        return nodo
+
+    def tipo_resultado(self, op, tipo_izq, tipo_der) -> Optional[str]:
+        """Mismas reglas que verificar_OperacionBinaria; None si ahí sería un error."""
+        if op in ['+', '-', '*', '/', '%']:
+            if tipo_izq in self.tipos_numericos and tipo_der in self.tipos_numericos:
+                return 'Double' if 'Double' in [tipo_izq, tipo_der] else 'Int'
+            if tipo_izq == 'String' and op == '+' and tipo_der == 'String': return 'String'
+            return None
+        if op in ['&&', '||']:
+            return 'Bool' if tipo_izq == 'Bool' and tipo_der == 'Bool' else None
+        if op in ['==', '!=', '<', '>', '<=', '>=']: return 'Bool'
+        return None
+
+    def plegar_OperacionBinaria(self, n: OperacionBinaria):
+        izq, der = n.izquierda, n.derecha
+        if not (isinstance(izq, Literal) and isinstance(der, Literal)): return n
+        clave = (n.operador, izq.tipo, der.tipo)
+        tipo = self._tipos.get(clave, NO_PLEGABLE)
+        if tipo is NO_PLEGABLE: tipo = self._tipos[clave] = self.tipo_resultado(*clave)
+        if tipo is None: return n
+        try:
+            valor = operar(n.operador, izq.valor, der.valor)
+        except DivisionPorCero:
+            self.errores.reportar('PLG001', n.get_linea(), operador=n.operador)
+            return n
+        if valor is NO_PLEGABLE: return n
+        if tipo == 'Double': valor = float(valor)
+        self.plegados += 1
+        self.eliminados += 2
+        return Literal(valor, tipo, 0).en_linea_de(n)
+
+    def plegar_OperacionNaria(self, n: OperacionNaria):
+        # solo el prefijo de literales: más adelante plegar cambiaría el orden de evaluación
+        operandos, eliminados = n.operandos, self.eliminados
+        acumulado, k = operandos[0], 1
+        while k < len(operandos) and isinstance(acumulado, Literal) and isinstance(operandos[k], Literal):
+            operacion = OperacionBinaria(n.operador, acumulado, operandos[k], 0).en_linea_de(n, n.lineas[k - 1])
+            plegado = self.plegar_OperacionBinaria(operacion)
+            if not isinstance(plegado, Literal): break
+            acumulado, k = plegado, k + 1
+        if k == 1: return n
+        self.eliminados = eliminados + k - 1
+        if k == len(operandos):
+            self.eliminados += 1
+            return acumulado
+        n.operandos, n.lineas = [acumulado] + operandos[k:], n.lineas[k - 1:]
+        return n
+
+    def plegar_OperacionUnaria(self, n: OperacionUnaria):
+        opnd = n.operando
+        if not isinstance(opnd, Literal): return n
+        if not ((n.operador == '!' and opnd.tipo == 'Bool') or (n.operador == '-' and opnd.tipo in self.tipos_numericos)):
+            return n
+        valor = operar_unaria(n.operador, opnd.valor)
+        if valor is NO_PLEGABLE: return n
+        self.plegados += 1
+        self.eliminados += 1
+        return Literal(valor, opnd.tipo, 0).en_linea_de(n)
+
+    def resumen(self) -> str:
+        return (f"{self.nodos_antes} nodos -> {self.nodos_despues} nodos "
+                f"({self.plegados} expresión(es) plegada(s)) en {self.duracion * 1000:.1f} ms")
@@ -0,0 +1,432 @@
+from __future__ import annotations
+import hashlib
+import multiprocessing
+import os
+import pickle
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from analizadorLexicoArielAAT123 import analizador_lexico, errores_lexicos, tokens_reconocidos
+from analizadorSemantico import (
+    analizador_sintactico, errores_sintacticos, salida, AnalizadorSemantico, Nodo, Programa, DefinicionFuncion,
+    DefinicionClase, Asignacion, LlamadaFuncion, Identificador, Simbolo, ListaDiagnosticos,
+)
+from plegadoConstantes import PlegadorConstantes
+from motorConsultas import hijos, declara
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from comun.cache_resultados import firma_de, CARPETA as CARPETA_CACHE
+from comun import instantanea_ast
+from comun.diagnosticos import por_linea
+
+# =========================================================================
+# 8. PROYECTO (varios archivos: grafo de dependencias y orden topológico)
+# =========================================================================
+# Los .swift de una carpeta (y sus subcarpetas) forman un solo módulo: lo que
+# un archivo declara en su nivel superior (variables, funciones, clases) se
+# ve desde los demás. La gramática no tiene `import`: cada línea `import X`
+# se deja en blanco antes de parsear (las líneas no se corren) y, si X.swift
+# es parte del proyecto, cuenta como dependencia; los módulos de afuera
+# (Foundation, ...) se ignoran. Además un archivo depende del que declara
+# cada nombre que usa y que él no declara. Si dos archivos declaran lo
+# mismo, vale el primero (por ruta) y el otro recibe PRY001.
+# Los ciclos se juntan en componentes (Tarjan) y los componentes se
+# verifican en orden topológico: los que no dependen entre sí van a la vez
+# en un pool de procesos, y cada uno recibe solo los símbolos exportados
+# que nombra (una copia de solo lectura). Dentro de un ciclo los archivos
+# van uno tras otro; de los que todavía no se verificaron se ve el tipo
+# declarado (una variable sin anotación queda Desconocido).
+# El estado queda en .cache_analisis/proyecto: en la corrida siguiente solo
+# se parsean los archivos que cambiaron, y se vuelven a verificar esos, los
+# que cambiaron de dependencias y, en cascada, los que dependen de un
+# archivo cuyos exportados cambiaron de tipo o de mutabilidad.
+
+MENSAJES_PROYECTO = {
+    'PRY001': "❌ Línea {linea}: '{nombre}' ya fue declarado en {otro}.",
+}
+
+IMPORTACION = re.compile(r'^[ \t]*import[ \t]+([A-Za-z_][A-Za-z0-9_]*)[ \t]*;?[ \t]*$', re.M)
+
+# Clases de nodo por nombre, para cargar instantáneas del AST en los trabajadores
+CLASES_AST = {clase.__name__: clase for clase in Nodo.__subclasses__()}
+
+
+def descubrir(carpeta: str) -> List[str]:
+    """Los .swift de `carpeta`, ordenados (sin carpetas ocultas ni la del caché)."""
+    rutas = []
+    for raiz, carpetas, archivos in os.walk(carpeta):
+        carpetas[:] = sorted(c for c in carpetas if not c.startswith('.'))
+        rutas.extend(os.path.join(raiz, a) for a in archivos if a.endswith('.swift'))
+    return sorted(rutas)
+
+
+def quitar_importaciones(codigo: str) -> Tuple[str, List[str]]:
+    """El código con cada línea `import X` en blanco y los módulos importados, en orden."""
+    modulos = [m[1] for m in IMPORTACION.finditer(codigo)]
+    if not modulos: return codigo, modulos
+    return IMPORTACION.sub(lambda m: ' ' * len(m[0]), codigo), modulos
+
+
+@salida.exclusivo
+def parsear(codigo: str) -> Tuple[Optional[Programa], List[str], List[str]]:
+    """Léxico + sintáctico + plegado, como analyze antes del semántico. Los errores del plegado van
+    aparte, para intercalarlos por línea con los del semántico."""
+    errores_lexicos.clear()
+    tokens_reconocidos.clear()
+    errores_sintacticos.clear()
+    analizador_lexico.lineno = 1
+    plegador = PlegadorConstantes()
+    ast = analizador_sintactico.parse(codigo, lexer=analizador_lexico)
+    if ast: ast = plegador.plegar_programa(ast)
+    return ast, errores_lexicos + errores_sintacticos, list(plegador.errores)
+
+
+def simbolo_declarado(sentencia) -> Simbolo:
+    """Lo que se sabe de una declaración de nivel superior sin verificarla."""
+    if isinstance(sentencia, DefinicionFuncion):
+        return Simbolo(sentencia.nombre, f"Function->{sentencia.tipo_retorno or 'Void'}", False, sentencia.linea)
+    if isinstance(sentencia, DefinicionClase):
+        return Simbolo(sentencia.nombre, 'Class', False, sentencia.linea)
+    return Simbolo(sentencia.nombre, sentencia.tipo or 'Desconocido', sentencia.mutable, sentencia.linea)
+
+
+def nombres_usados(programa: Programa) -> Set[str]:
+    """Variables, funciones y clases que nombra el programa (en cualquier ámbito)."""
+    usados: Set[str] = set()
+    pendientes = list(programa.sentencias)
+    while pendientes:
+        nodo = pendientes.pop()
+        if isinstance(nodo, (Identificador, Asignacion, LlamadaFuncion)): usados.add(nodo.nombre)
+        pendientes.extend(hijos(nodo))
+    return usados
+
+
+def firma_exportada(exporta: Dict[str, Simbolo]) -> Dict[str, Tuple[str, bool]]:
+    # la línea no cuenta: mover una declaración no cambia lo que ven los demás
+    return {nombre: (simb.tipo, simb.mutable) for nombre, simb in exporta.items()}
+
+
+class EstadoArchivo:
+    """Lo que se guarda de cada archivo entre corridas."""
+    __slots__ = ('contenido', 'modulos', 'firmas', 'referencias', 'errores_parseo', 'errores_plegado',
+                 'dependencias', 'componente', 'exporta', 'errores')
+
+    def __init__(self, contenido: str, modulos: List[str], errores_parseo: List[str], errores_plegado: List[str]):
+        self.contenido = contenido                      # sha256 del archivo
+        self.modulos = modulos                          # `import X` del archivo
+        self.firmas: Dict[str, Simbolo] = {}            # nivel superior, sin verificar (en orden)
+        self.referencias: Set[str] = set()              # nombres que usa y no declara
+        self.errores_parseo = errores_parseo             # léxicos y sintácticos
+        self.errores_plegado = errores_plegado
+        self.dependencias: Set[str] = set()             # rutas, del último grafo
+        self.componente: Tuple[str, ...] = ()           # su ciclo en el último grafo (decide qué ve de cada uno)
+        self.exporta: Dict[str, Simbolo] = {}           # nivel superior, ya verificado
+        self.errores: List[str] = []                    # semánticos (los de PRY001 se calculan cada vez)
+
+
+class VerificadorDeArchivo(AnalizadorSemantico):
+    """AnalizadorSemantico de un archivo del proyecto: lo que no está en sus ámbitos se busca en `externos`."""
+
+    def __init__(self, externos: Dict[str, Simbolo]):
+        super().__init__()
+        self.externos = externos
+
+    def buscar(self, nombre) -> Optional[Simbolo]:
+        simb = super().buscar(nombre)
+        return simb if simb is not None else self.externos.get(nombre)
+
+
+class ResultadoProyecto:
+    __slots__ = ('errores', 'componentes', 'parseados', 'verificados', 'duracion_ms')
+
+    def __init__(self, errores: Dict[str, List[str]], componentes: List[List[str]], parseados: List[str],
+                 verificados: List[str], duracion_ms: float):
+        self.errores = errores                  # ruta -> errores, en el orden de `componentes`
+        self.componentes = componentes          # en orden topológico (cada uno, un ciclo o un archivo)
+        self.parseados = parseados
+        self.verificados = verificados
+        self.duracion_ms = duracion_ms
+
+    def __repr__(self):
+        total = sum(len(e) for e in self.errores.values())
+        return (f"ResultadoProyecto({len(self.errores)} archivo(s), {total} error(es), {len(self.parseados)} "
+                f"parseado(s), {len(self.verificados)} verificado(s), {self.duracion_ms:.1f} ms)")
+
+
+# ---------------------------------------------------------------
+# Trabajo de cada archivo (en el proceso principal o en el pool)
+# ---------------------------------------------------------------
+def _resumir(codigo: str, instantanea: bool) -> Tuple[EstadoArchivo, Union[Programa, bytes, None]]:
+    """Parsea un archivo y arma su estado. Con instantanea=True el AST vuelve como bytes (desde el pool)."""
+    sin_importaciones, modulos = quitar_importaciones(codigo)
+    programa, errores, errores_plegado = parsear(sin_importaciones)
+    estado = EstadoArchivo(hashlib.sha256(codigo.encode('utf-8')).hexdigest(), modulos, errores, errores_plegado)
+    if programa is None:
+        return estado, None
+    for s in programa.sentencias:
+        nombre = declara(s)
+        if nombre is not None and nombre not in estado.firmas: estado.firmas[nombre] = simbolo_declarado(s)
+    estado.referencias = nombres_usados(programa) - estado.firmas.keys()
+    if not instantanea:
+        return estado, programa
+    try:
+        return estado, instantanea_ast.serializar(programa)
+    except TypeError:
+        return estado, None                         # se vuelve a parsear al verificarlo
+
+
+def _programa_de(fuente: Union[Programa, bytes, str, None]) -> Optional[Programa]:
+    if isinstance(fuente, bytes): return instantanea_ast.cargar(fuente, CLASES_AST)
+    if isinstance(fuente, str): return parsear(quitar_importaciones(fuente)[0])[0]
+    return fuente
+
+
+def _verificar_componente(miembros: List[Tuple[str, Union[Programa, bytes, str, None]]],
+                          externos: Dict[str, Simbolo]) -> List[Tuple[str, List[str], Dict[str, Simbolo]]]:
+    """Verifica los archivos de un componente, uno tras otro. Devuelve (ruta, errores, exportados) de cada uno."""
+    externos = dict(externos)
+    resultados = []
+    for ruta, fuente in miembros:
+        programa = _programa_de(fuente)
+        propios = {declara(s) for s in programa.sentencias} if programa is not None else set()
+        v = VerificadorDeArchivo({n: s for n, s in externos.items() if n not in propios})
+        if programa is not None: v.verificar(programa)
+        exporta = dict(v.ambitos[0].items())
+        # lo que ya se verificó reemplaza a la firma declarada para los que siguen en el ciclo
+        for nombre in propios & externos.keys(): externos[nombre] = exporta[nombre]
+        resultados.append((ruta, list(v.errores), exporta))
+    return resultados
+
+
+def _contexto():
+    # con fork los trabajadores ya tienen el parser armado
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+
+def componentes_fuertes(nodos: List[str], aristas: Dict[str, Set[str]]) -> List[List[str]]:
+    """Tarjan sin recursión. Con aristas archivo -> dependencia, cada componente sale después de las suyas."""
+    indice: Dict[str, int] = {}
+    bajo: Dict[str, int] = {}
+    pila: List[str] = []
+    en_pila: Set[str] = set()
+    resultado = []
+    for inicio in nodos:
+        if inicio in indice: continue
+        trabajo = [(inicio, iter(sorted(aristas[inicio])))]
+        indice[inicio] = bajo[inicio] = len(indice)
+        pila.append(inicio); en_pila.add(inicio)
+        while trabajo:
+            nodo, siguientes = trabajo[-1]
+            for vecino in siguientes:
+                if vecino not in indice:
+                    indice[vecino] = bajo[vecino] = len(indice)
+                    pila.append(vecino); en_pila.add(vecino)
+                    trabajo.append((vecino, iter(sorted(aristas[vecino]))))
+                    break
+                if vecino in en_pila: bajo[nodo] = min(bajo[nodo], indice[vecino])
+            else:
+                trabajo.pop()
+                if trabajo: bajo[trabajo[-1][0]] = min(bajo[trabajo[-1][0]], bajo[nodo])
+                if bajo[nodo] == indice[nodo]:
+                    componente = []
+                    while True:
+                        miembro = pila.pop(); en_pila.discard(miembro)
+                        componente.append(miembro)
+                        if miembro == nodo: break
+                    resultado.append(sorted(componente))
+    return resultado
+
+
+# ---------------------------------------------------------------
+# Proyecto
+# ---------------------------------------------------------------
+class Proyecto:
+    """
+    Los .swift de `carpeta`, analizados como un solo módulo. Con
+    carpeta_cache=None no se guarda nada en disco (el estado dura lo que el
+    objeto). `trabajadores` es el tamaño del pool (por omisión, los núcleos;
+    con 1 todo corre en este proceso).
+    """
+
+    def __init__(self, carpeta: str, carpeta_cache: Optional[str] = CARPETA_CACHE,
+                 trabajadores: Optional[int] = None):
+        self.carpeta = carpeta
+        self.trabajadores = trabajadores or os.cpu_count() or 1
+        self.firma = firma_de(os.path.dirname(os.path.abspath(__file__)))
+        self.archivo_estado = None
+        if carpeta_cache is not None:
+            clave = hashlib.sha256(os.path.abspath(carpeta).encode('utf-8')).hexdigest()[:32]
+            self.archivo_estado = os.path.join(carpeta_cache, 'proyecto', clave + '.pkl')
+        self.estados: Dict[str, EstadoArchivo] = self._cargar_estado()
+
+    # --- estado en disco --------------------------------------------------
+
+    def _cargar_estado(self) -> Dict[str, EstadoArchivo]:
+        if self.archivo_estado is None: return {}
+        try:
+            with open(self.archivo_estado, 'rb') as f:
+                firma, estados = pickle.load(f)
+        except Exception:               # no existe, otra versión, a medio escribir, ...
+            return {}
+        return estados if firma == self.firma else {}
+
+    def _guardar_estado(self):
+        if self.archivo_estado is None: return
+        carpeta = os.path.dirname(self.archivo_estado)
+        os.makedirs(carpeta, exist_ok=True)
+        descriptor, temporal = tempfile.mkstemp(dir=carpeta, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as f:
+                pickle.dump((self.firma, self.estados), f, pickle.HIGHEST_PROTOCOL)
+            os.replace(temporal, self.archivo_estado)
+        except BaseException:
+            try: os.remove(temporal)
+            except OSError: pass
+            raise
+
+    # --- grafo --------------------------------------------------------------
+
+    def _grafo(self, rutas: List[str], estados: Dict[str, EstadoArchivo]):
+        """(dueño de cada nombre, dependencias de cada ruta, PRY001 de cada ruta)."""
+        duenio: Dict[str, str] = {}
+        conflictos: Dict[str, ListaDiagnosticos] = {}
+        for ruta in rutas:
+            for nombre, simb in estados[ruta].firmas.items():
+                otro = duenio.setdefault(nombre, ruta)
+                if otro != ruta:
+                    lista = conflictos.setdefault(ruta, ListaDiagnosticos('semantico', MENSAJES_PROYECTO))
+                    lista.reportar('PRY001', simb.linea, nombre=nombre, otro=os.path.relpath(otro, self.carpeta))
+        modulos: Dict[str, str] = {}
+        for ruta in rutas:
+            modulos.setdefault(os.path.splitext(os.path.basename(ruta))[0], ruta)
+        dependencias: Dict[str, Set[str]] = {}
+        for ruta in rutas:
+            estado = estados[ruta]
+            deps = {duenio[n] for n in estado.referencias if n in duenio}
+            deps.update(modulos[m] for m in estado.modulos if m in modulos)
+            deps.discard(ruta)
+            dependencias[ruta] = deps
+        return duenio, dependencias, conflictos
+
+    # --- análisis -------------------------------------------------------------
+
+    def analizar(self) -> ResultadoProyecto:
+        inicio = time.perf_counter()
+        rutas = descubrir(self.carpeta)
+        anteriores = self.estados
+        estados: Dict[str, EstadoArchivo] = {}
+        codigos: Dict[str, str] = {}
+        for ruta in rutas:
+            with open(ruta, 'r', encoding='utf-8') as f:
+                codigo = f.read()
+            previo = anteriores.get(ruta)
+            if previo is not None and previo.contenido == hashlib.sha256(codigo.encode('utf-8')).hexdigest():
+                estados[ruta] = previo
+            else:
+                codigos[ruta] = codigo
+        cambiados = list(codigos)
+
+        pool = None
+        try:
+            if self.trabajadores > 1 and len(rutas) > 1:
+                pool = ProcessPoolExecutor(min(self.trabajadores, len(rutas)), mp_context=_contexto())
+            # --- parseo de los que cambiaron (todos a la vez) ---
+            programas: Dict[str, Union[Programa, bytes, None]] = {}
+            if pool is not None and len(cambiados) > 1:
+                resumenes = pool.map(_resumir, [codigos[r] for r in cambiados], [True] * len(cambiados))
+            else:
+                resumenes = (_resumir(codigos[r], False) for r in cambiados)
+            for ruta, (estado, programa) in zip(cambiados, resumenes):
+                estados[ruta], programas[ruta] = estado, programa
+
+            duenio, dependencias, conflictos = self._grafo(rutas, estados)
+            componentes = componentes_fuertes(rutas, dependencias)
+            de_ciclo = {r: tuple(c) for c in componentes for r in c}
+            sucios = set(cambiados) | {r for r in rutas if estados[r].dependencias != dependencias[r]
+                                       or estados[r].componente != de_ciclo[r]}
+            verificados = self._verificar(componentes, estados, dependencias, duenio, sucios,
+                                          programas, codigos, anteriores, pool)
+        finally:
+            if pool is not None: pool.shutdown()
+
+        for ruta in rutas: estados[ruta].dependencias, estados[ruta].componente = dependencias[ruta], de_ciclo[ruta]
+        self.estados = estados
+        self._guardar_estado()
+        errores = {}
+        for componente in componentes:
+            for ruta in componente:
+                estado = estados[ruta]
+                errores[ruta] = (estado.errores_parseo + list(conflictos.get(ruta, ()))
+                                 + por_linea(estado.errores_plegado, estado.errores))
+        return ResultadoProyecto(errores, componentes, cambiados, verificados, (time.perf_counter() - inicio) * 1000)
+
+    def _verificar(self, componentes, estados, dependencias, duenio, sucios, programas, codigos,
+                   anteriores, pool) -> List[str]:
+        """Verifica en orden topológico los componentes que lo necesitan; devuelve las rutas verificadas."""
+        de_componente = {ruta: i for i, componente in enumerate(componentes) for ruta in componente}
+        dependientes: List[Set[int]] = [set() for _ in componentes]
+        faltan = [0] * len(componentes)
+        for i, componente in enumerate(componentes):
+            previos = {de_componente[d] for r in componente for d in dependencias[r]} - {i}
+            faltan[i] = len(previos)
+            for j in previos: dependientes[j].add(i)
+        exportados_cambiados: Set[str] = set()
+        verificados: List[str] = []
+        listos = [i for i, n in enumerate(faltan) if n == 0]
+        en_curso = {}
+
+        def terminar(i, resultados=()):
+            for ruta, errores, exporta in resultados:
+                previo = anteriores.get(ruta)
+                if previo is None or firma_exportada(previo.exporta) != firma_exportada(exporta):
+                    exportados_cambiados.add(ruta)
+                estados[ruta].errores, estados[ruta].exporta = errores, exporta
+                verificados.append(ruta)
+            for j in dependientes[i]:
+                faltan[j] -= 1
+                if faltan[j] == 0: listos.append(j)
+
+        while listos or en_curso:
+            while listos:
+                i = listos.pop()
+                componente = componentes[i]
+                if not any(r in sucios or dependencias[r] & exportados_cambiados for r in componente):
+                    terminar(i)         # ni él ni lo que ve cambió: se queda con lo de la corrida anterior
+                    continue
+                tarea = (self._miembros(componente, programas, codigos),
+                         self._externos(componente, estados, duenio))
+                if pool is None: terminar(i, _verificar_componente(*tarea))
+                else: en_curso[pool.submit(_verificar_componente, *tarea)] = i
+            if en_curso:
+                hechos, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+                for futuro in hechos: terminar(en_curso.pop(futuro), futuro.result())
+        return verificados
+
+    def _miembros(self, componente, programas, codigos):
+        miembros = []
+        for ruta in componente:
+            fuente = programas.get(ruta)
+            if fuente is None:          # sin cambios (o sin instantánea): se vuelve a leer y a parsear
+                fuente = codigos.get(ruta)
+                if fuente is None:
+                    with open(ruta, 'r', encoding='utf-8') as f: fuente = f.read()
+            miembros.append((ruta, fuente))
+        return miembros
+
+    def _externos(self, componente, estados, duenio) -> Dict[str, Simbolo]:
+        """Los símbolos de otros archivos que nombra el componente (de su mismo ciclo, la firma declarada)."""
+        externos: Dict[str, Simbolo] = {}
+        for ruta in componente:
+            for nombre in estados[ruta].referencias:
+                otro = duenio.get(nombre)
+                if otro is None or otro == ruta: continue
+                estado = estados[otro]
+                externos[nombre] = (estado.firmas[nombre] if otro in componente
+                                    else estado.exporta.get(nombre) or estado.firmas[nombre])
+        return externos
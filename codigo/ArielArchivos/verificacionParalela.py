@@ -0,0 +1,119 @@
+from __future__ import annotations
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from analizadorSemantico import (
+    AnalizadorSemantico, Programa, DefinicionFuncion, DefinicionClase, Simbolo, ListaDiagnosticos, MENSAJES,
+)
+from motorConsultas import VerificadorConGlobales
+
+# =========================================================================
+# 6. VERIFICACIÓN SEMÁNTICA EN DOS FASES (cuerpos de funciones en paralelo)
+# =========================================================================
+# Fase 1: recorrido secuencial del nivel superior. Declara funciones y clases
+# (sin entrar a su cuerpo) y verifica el resto de sentencias, dejando una
+# tabla global de solo lectura: nombre -> (posición, símbolo).
+# Fase 2: los cuerpos de funciones y clases se verifican por lotes en un pool
+# de procesos; cada cuerpo ve solo lo declarado antes que él, igual que en
+# AnalizadorSemantico, así que los errores son los mismos y en el mismo orden.
+
+MIN_CUERPOS_PARALELO = 64
+
+_sentencias: List = []
+_globales: Dict[str, Tuple[int, Simbolo]] = {}
+
+
+class RecolectorFirmas(AnalizadorSemantico):
+    """Fase 1: AnalizadorSemantico que deja pendientes los cuerpos de nivel superior."""
+
+    def __init__(self):
+        super().__init__()
+        self.actual = 0
+        self.globales: Dict[str, Tuple[int, Simbolo]] = {}
+        self.pendientes: List[int] = []
+
+    def declarar(self, nombre, tipo, mutable, linea):
+        if len(self.ambitos) == 1 and nombre not in self.ambitos[0]:
+            self.globales[nombre] = (self.actual, Simbolo(nombre, tipo, mutable, linea))
+        super().declarar(nombre, tipo, mutable, linea)
+
+    def verificar_DefinicionFuncion(self, n: DefinicionFuncion):
+        if len(self.ambitos) > 1: return super().verificar_DefinicionFuncion(n)
+        self.declarar(n.nombre, f"Function->{n.tipo_retorno or 'Void'}", False, n.linea)
+        self.pendientes.append(self.actual)
+
+    def verificar_DefinicionClase(self, n: DefinicionClase):
+        if len(self.ambitos) > 1: return super().verificar_DefinicionClase(n)
+        self.declarar(n.nombre, 'Class', False, n.linea)
+        self.pendientes.append(self.actual)
+
+
+def _iniciar_trabajador(sentencias, globales):
+    global _sentencias, _globales
+    _sentencias, _globales = sentencias, globales
+
+
+def _resolver(nombre, posicion) -> Optional[Simbolo]:
+    entrada = _globales.get(nombre)
+    if entrada is None: return None
+    # solo se resuelve desde cuerpos pendientes: pos == posicion es la propia función/clase
+    pos, simb = entrada
+    return simb if pos <= posicion else None
+
+
+def _verificar_lote(posiciones: List[int]) -> List[Tuple[int, ListaDiagnosticos]]:
+    """Fase 2 para un lote de sentencias de nivel superior (corre en el trabajador)."""
+    resultado = []
+    i = 0
+    v = VerificadorConGlobales(lambda nombre: _resolver(nombre, i))
+    for i in posiciones:
+        # una lista por sentencia: los repetidos se juntan recién al unir, en orden
+        v.errores = ListaDiagnosticos('semantico', MENSAJES)
+        v.verificar(_sentencias[i])
+        resultado.append((i, v.errores))
+    return resultado
+
+
+def _contexto():
+    # con fork los trabajadores heredan el AST sin volver a serializarlo
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+
+def verificar_paralelo(programa: Programa, trabajadores: Optional[int] = None,
+                       tam_lote: Optional[int] = None) -> ListaDiagnosticos:
+    """Errores semánticos del programa (mismos que AnalizadorSemantico.errores)."""
+    sentencias = programa.sentencias
+
+    # --- Fase 1: firmas y sentencias sueltas ---
+    recolector = RecolectorFirmas()
+    errores_por_sentencia: List[List[ListaDiagnosticos]] = []
+    for i, s in enumerate(sentencias):
+        recolector.actual = i
+        recolector.errores = ListaDiagnosticos('semantico', MENSAJES)
+        recolector.verificar(s)
+        errores_por_sentencia.append([recolector.errores])
+
+    # --- Fase 2: cuerpos ---
+    pendientes = recolector.pendientes
+    trabajadores = trabajadores or os.cpu_count() or 1
+    if trabajadores == 1 or len(pendientes) < MIN_CUERPOS_PARALELO:
+        _iniciar_trabajador(sentencias, recolector.globales)
+        resultados = [_verificar_lote(pendientes)]
+    else:
+        tam_lote = tam_lote or max(1, len(pendientes) // (trabajadores * 4))
+        lotes = [pendientes[k:k + tam_lote] for k in range(0, len(pendientes), tam_lote)]
+        with ProcessPoolExecutor(trabajadores, mp_context=_contexto(), initializer=_iniciar_trabajador,
+                                 initargs=(sentencias, recolector.globales)) as pool:
+            resultados = list(pool.map(_verificar_lote, lotes))
+
+    for lote in resultados:
+        for i, errores in lote:
+            errores_por_sentencia[i].append(errores)
+    total = ListaDiagnosticos('semantico', MENSAJES)
+    for listas in errores_por_sentencia:
+        for errores in listas: total.extend(errores)
+    return total
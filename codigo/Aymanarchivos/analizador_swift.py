@@ -2,15 +2,42 @@ import ply.lex as lex
 import ply.yacc as yacc
 import datetime
 import os
+import sys
+import time
+from functools import partial
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from comun.colecciones import ColeccionLiteral, agregar_elemento
+from comun.lexico import CADENA, CADENA_SIN_CERRAR
+from comun.plazo import Plazo, PlazoAgotado, LexerConPlazo, ResultadoAnalisis
+from comun.diagnosticos import ListaDiagnosticos, canal, columna_de
+from comun.recuperacion import Recuperacion
+from comun.lexico_unificado import Gramatica, LexerUnificado
+from comun.flujo import SalidaSentencias, en_flujo
+from comun import tuberia
+from comun.tokens_compartidos import BufferTokens, LexerCompartido
+from comun.cache_resultados import CacheResultados, firma_de, CARPETA as CARPETA_CACHE
+from comun.servidor_lsp import ServidorLSP
+from semantico_ayman import tabla_simbolos, semantic_errors, tipos_nativos, reiniciar, verificar_programa, verificar_sentencia, nodo_literal, literal_de, get_tipo
+from plegado_ayman import plegar_programa, plegar_sentencia, estadisticas as estadisticas_plegado
+import transpilador_ayman
 
 #lexer (el otro funciona, pero me he visto en la necesidad de agregar a cada analizador uno, para no tener que ver qeu cambios causan errores)
+#el parser solo arma el AST; los chequeos de tipos y la tabla de simbolos estan en semantico_ayman.py
 
-tabla_simbolos = {"scopes":[{}]}
-tabla_simbolos["scopes"][0]["print"] = "BuiltInFunction"
-tabla_simbolos["scopes"][0]["readLine"] = "BuiltInFunction"
-semantic_errors = []
-parse_errors = []
-tipos_nativos = {"Int","Float","Double","Bool","String","Character","Any"}
+MENSAJES_SINTACTICOS = {
+    'SIN001': "[SYN ERROR] Token inesperado '{valor}' (tipo {tipo}) en línea {linea}",
+    'SIN002': "[SYN ERROR] EOF inesperado: estructura incompleta",
+    'SIN003': "[SYN ERROR] Demasiados errores de sintaxis ({maximo}); se omite el resto del archivo",
+}
+parse_errors = ListaDiagnosticos('sintactico', MENSAJES_SINTACTICOS)
+MENSAJES_LEXICOS = {
+    'LEX001': "[LEX ERROR] Caracter ilegal: '{caracter}' en linea {linea}",
+    'LEX002': "[LEX ERROR] Cadena sin cerrar en linea {linea}",
+    'LEX004': "[LEX ERROR] Caracter sin cerrar en linea {linea}",
+}
+# los errores lexicos van primero en los resultados; la etapa lexica de la tuberia la cambia por su salida
+lex_errors = ListaDiagnosticos('lexico', MENSAJES_LEXICOS)
 tokens = [
     'INTEGER','FLOAT','DOUBLE','BOOLEAN','STRING','CHARACTER',
     'LPAREN','RPAREN','LBRACE','RBRACE','LBRACKET','RBRACKET',
@@ -84,102 +111,58 @@ def t_FLOAT(t):
     t.value = float(t.value)
     return t
 
+# patrones sin retroceso (comun/lexico.py): una cadena o caracter sin cerrar se
+# avisa una sola vez en vez de un error por cada caracter que sigue
+@lex.TOKEN(CADENA)
 def t_STRING(t):
-    r'\"([^\\\n]|(\\.))*?\"'
-    t.value = t.value
+    return t
+
+@lex.TOKEN(CADENA_SIN_CERRAR)
+def t_STRING_UNCLOSED(t):
+    lex_errors.reportar('LEX002', t.lexer.lineno, columna_de(t.lexer.lexdata, t.lexpos))
+    t.type = 'STRING'
+    t.value += '"'
     return t
 
 def t_CHARACTER(t):
-    r'\'([^\\\n]|(\\.))\''
+    r'\'(?:[^\'\\\n]|\\.)\''
     t.value = t.value[1:-1]
     return t
 
+def t_CHARACTER_UNCLOSED(t):
+    r'\'(?:[^\'\\\n]|\\.)?'
+    lex_errors.reportar('LEX004', t.lexer.lineno, columna_de(t.lexer.lexdata, t.lexpos))
+
 t_ignore = ' \t'
 
 def t_newline(t):
     r'\n+'
     t.lexer.lineno += len(t.value)
 
+# resguardo (comun/lexico.py): ultima regla de funcion, un caracter con el que no
+# empieza ningun token se reporta aca sin pasar por t_error
+def t_illegal(t):
+    r'[^(){}\[\],;:=\-+*/%!<>&|.]|&(?!&)|\|(?!\|)|\.(?!\.\.)'
+    lex_errors.reportar('LEX001', t.lexer.lineno, columna_de(t.lexer.lexdata, t.lexpos), caracter=t.value)
+
 def t_error(t):
-    print(f"[LEX ERROR] Caracter ilegal: '{t.value[0]}' en linea {t.lexer.lineno}")
+    lex_errors.reportar('LEX001', t.lexer.lineno, columna_de(t.lexer.lexdata, t.lexpos), caracter=t.value[0])
     t.lexer.skip(1)
 
 lexer = lex.lex()
-#semantico
-def abrir_scope():
-    tabla_simbolos["scopes"].append({})
-
-def cerrar_scope():
-    if len(tabla_simbolos["scopes"])>1:
-        tabla_simbolos["scopes"].pop()
-
-def agregar_variable(nombre, tipo):
-    scope = tabla_simbolos["scopes"][-1]
-    if nombre in scope:
-        semantic_errors.append(f"[SEM ERROR] Variable '{nombre}' ya declarada en este scope")
-    else:
-        scope[nombre] = tipo
-
-def buscar_variable(nombre):
-    for s in reversed(tabla_simbolos["scopes"]):
-        if nombre in s:
-            return s[nombre]
-    return None
-#divide la tabla con todos los tipos
-tipos_numericos = {"Int","Float","Double"}
-tipos_booleanos = {"Bool"}
-tipos_textuales = {"String","Character"}
-
-def tipo_binop(op, t1, t2):
-    if t1=="Unknown" or t2=="Unknown":
-        return "Unknown"
-    if op in ("<","<=",">=",">","==","!="):
-        return "Bool"
-    if op in ("&&","||"):
-        if t1==t2=="Bool":
-            return "Bool"
-        semantic_errors.append(f"[SEM ERROR] Operación lógica inválida: {t1} {op} {t2}")
-        return "Unknown"
-    if op in ("+","-","*","/","%"):
-        if t1 in tipos_numericos and t2 in tipos_numericos:
-            if "Double" in (t1,t2): return "Double"
-            if "Float" in (t1,t2): return "Float"
-            return "Int"
-        if op=="+" and t1==t2=="String":
-            return "String"
-    semantic_errors.append(f"[SEM ERROR] Tipos incompatibles: {t1} {op} {t2}")
-    return "Unknown"
-
-def get_tipo(expr):
-    if expr is None: return "Unknown"
-    if isinstance(expr, tuple):
-        kind = expr[0]
-        if kind=="literal": return expr[1]
-        if kind=="id": return expr[2]
-        if kind=="binop": return expr[4]
-        if kind == 'logic':
-            return "Bool"
-        if kind == 'cmp':
-            return "Bool"
-        if kind in ("lambda","lambda_simple"): return expr[3]
-        if kind=="dict": return expr[2]
-        if kind=="list": return expr[2]
-        if kind=="range": return expr[3]
-        if kind=="call": return expr[3]
-    return "Unknown"
-
-def type_to_string(struct_type):
-    """Convierte la estructura de tipo ('id', 'Int') o ('array','T') o ('dict','K','V') a una cadena legible."""
-    if struct_type is None:
-        return "Unknown"
-    if isinstance(struct_type, tuple):
-        if struct_type[0] == 'id':
-            return struct_type[1]
-        if struct_type[0] == 'array':
-            return f"[{struct_type[1]}]"
-        if struct_type[0] == 'dict':
-            return f"[{struct_type[1]}:{struct_type[2]}]"
-    return str(struct_type)
+
+# lexico unificado (comun/lexico_unificado.py): token neutro -> token de esta gramatica;
+# lo que falta (comentarios, decimales, '.', '..<', '+=', ...) lo lexea `lexer`
+TABLA_UNIFICADA = {
+    'ENTERO': 'INTEGER', 'CADENA': 'STRING', 'CARACTER': 'CHARACTER',
+    '(': 'LPAREN', ')': 'RPAREN', '{': 'LBRACE', '}': 'RBRACE', '[': 'LBRACKET', ']': 'RBRACKET',
+    ',': 'COMMA', ';': 'SEMICOLON', ':': 'COLON', '=': 'ASSIGN', '->': 'LAMBDA_IN',
+    '+': 'PLUS', '-': 'MINUS', '*': 'TIMES', '/': 'DIVIDE', '%': 'MOD',
+    '==': 'EQ', '!=': 'NE', '<': 'LT', '<=': 'LE', '>': 'GT', '>=': 'GE',
+    '&&': 'AND', '||': 'OR', '!': 'NOT', '...': 'DOTDOTDOT',
+}
+gramatica_unificada = Gramatica(lexer, 'ID', reserved, TABLA_UNIFICADA, valores={'CARACTER': lambda v: v[1:-1]},
+                                valores_reservadas={'true': True, 'false': False})
 #parser
 
 precedence = (
@@ -193,16 +176,26 @@ precedence = (
 )
 
 
-# variable temporal para pasar la variable del for al block_enter
-pending_for_var = None
+# sentencias de nivel superior: a la lista del programa o, en flujo, a un
+# consumidor apenas se reducen (comun/flujo.py)
+salida = SalidaSentencias()
 
 def p_program(p):
-    "program : statements"
+    "program : program_statements"
     p[0] = ('program',p[1])
 
+def p_program_statements_multiple(p):
+    "program_statements : program_statements statement"
+    p[0] = salida.entregar(p[1], p[2])
+
+def p_program_statements_single(p):
+    "program_statements : statement"
+    p[0] = salida.entregar([], p[1])
+
 def p_statements_multiple(p):
     "statements : statements statement"
-    p[0] = p[1]+[p[2]]
+    p[1].append(p[2])
+    p[0] = p[1]
 
 def p_statements_single(p):
     "statements : statement"
@@ -218,6 +211,14 @@ def p_statement(p):
     else:
         p[0]=p[1]
 
+# recuperacion en modo panico: la sentencia con error llega hasta el proximo ';',
+# el bloque que sigue, un '}' o un let/for/if al comienzo de una linea
+def p_statement_error(p):
+    """statement : error SEMICOLON
+                 | error block"""
+    p.parser.errok()
+    p[0] = ('empty',)
+
 # ---------------- LET ----------------
 def p_decl_stmt(p):
     '''decl_stmt : LET ID decl_type ASSIGN expression
@@ -231,56 +232,16 @@ def p_decl_stmt(p):
         # let x: Type = expr
         tipo_anot = p[3]
         expr = p[5]
-    if expr is None:
-        semantic_errors.append(f"[SEM ERROR] Variable '{nombre}' declarada sin valor")
-        tipo_final = "Unknown"
-    else:
-        tipo_expr = get_tipo(expr)
-        tipo_final = tipo_expr
-
-        if tipo_anot:
-            struct = tipo_anot[1]
-          
-            if isinstance(struct, tuple) and struct[0] == 'dict' and isinstance(expr, tuple) and expr[0] == 'dict':
-                tkey = struct[1]
-                tval = struct[2]
-                allowed = [
-                    ("String","Int"),
-                    ("String","Any"),
-                    ("Any","Any")
-                ]
-                if (tkey, tval) not in allowed:
-                    semantic_errors.append(f"[SEM ERROR] Tipo de diccionario no permitido: [{tkey}:{tval}]")
-                items = expr[1]
-                for it in items:
-                    k = it[1]; v = it[2]
-                    tk = get_tipo(k); tv = get_tipo(v)
-                    if tkey != "Any" and tk != tkey:
-                        semantic_errors.append(f"[SEM ERROR] Tipo de clave incompatible: '{tk}' != '{tkey}'")
-                    if tval != "Any" and tv != tval:
-                        semantic_errors.append(f"[SEM ERROR] Tipo de valor incompatible: '{tv}' != '{tval}'")
-                tipo_final = f"Dictionary({tkey},{tval})"
-            else:
-         
-                tipo_final = type_to_string(struct)
-    
-    agregar_variable(nombre, tipo_final)
-    p[0] = ('let_decl', nombre, tipo_final, expr)
+    # el tipo final lo pone la fase semantica (semantico_ayman.verificar_let)
+    p[0] = ('let_decl', nombre, tipo_anot, expr, p.lineno(1))
 
 def p_decl_stmt_incomplete_assign(p):
     "decl_stmt : LET ID ASSIGN"
-    nombre = p[2]
-    semantic_errors.append(f"[SEM ERROR] Declaración incompleta: 'let {nombre} =' sin expresión")
-   
-    agregar_variable(nombre, "Unknown")
-    p[0] = ('let_incomplete', nombre)
+    p[0] = ('let_incomplete', p[2], p.lineno(1))
 
 def p_decl_stmt_onlyid(p):
     "decl_stmt : LET ID"
-    nombre = p[2]
-    semantic_errors.append(f"[SEM ERROR] Declaración incompleta: 'let {nombre}' sin tipo ni asignación")
-    agregar_variable(nombre, "Unknown")
-    p[0] = ('let_invalid', nombre)
+    p[0] = ('let_invalid', p[2], p.lineno(1))
 
 
 def p_decl_type(p):
@@ -293,10 +254,7 @@ def p_decl_type(p):
 
 def p_simple_type_id(p):
     "simple_type : ID"
-    tipo = p[1]
-    if tipo not in tipos_nativos:
-        semantic_errors.append(f"[SEM ERROR] Tipo desconocido '{tipo}'")
-    p[0] = tipo
+    p[0] = p[1]
 
 def p_simple_type_list(p):
     "simple_type : LBRACKET simple_type RBRACKET"
@@ -310,29 +268,32 @@ def p_simple_type_dict(p):
 
 # ---------------- FOR-IN ----------------
 def p_for_stmt(p):
-    '''for_stmt : FOR ID IN expression block
-                |FOR ASSIGN IN expression block
-                |FOR ID IN expression LBRACE stmt_list RBRACE'''
-    agregar_variable(p[2], "Int")
-    
-    p[0] = ('for', p[2], p[4], p[5])
+    "for_stmt : FOR ID IN expression block"
+    p[0] = ('for', p[2], p[4], p[5], p.lineno(1))
 
 
 # ---------------- BLOCK ----------------
 def p_block(p):
-    "block : LBRACE block_enter statements RBRACE"
-    cerrar_scope()
-    p[0] = ('block',p[3])
-
-def p_block_enter(p):
-    "block_enter :"
-    abrir_scope()
+    "block : LBRACE statements RBRACE"
+    p[0] = ('block',p[2])
 
 # ---------------- EXPRESSIONS ----------------
 def p_expr_stmt(p):
     """expr_stmt : expression"""
     p[0] = p[1]
 
+def juntar_cadena(izq, op, der, tipo):
+    if izq[0]=='nary' and izq[1]==op:
+        izq[2].append(der)
+        return izq
+    if izq[0]=='binop' and izq[1]==op:
+        return ('nary', op, [izq[2], izq[3], der], tipo)
+    if izq[0]=='logic' and izq[2]==op:
+        return ('nary', op, [izq[1], izq[3], der], tipo)
+    if op in ('&&','||'):
+        return ('logic', izq, op, der, tipo)
+    return ('binop', op, izq, der, tipo)
+
 def p_expression_binop(p):
     """expression : expression PLUS expression
                   | expression MINUS expression
@@ -340,9 +301,12 @@ def p_expression_binop(p):
                   | expression DIVIDE expression
                   | expression MOD expression
                   """
-    left = p[1]; right = p[3]; op = p[2]
-    tipo_res = tipo_binop(op,get_tipo(left),get_tipo(right))
-    p[0] = ('binop',op,left,right,tipo_res)
+    op = p[2]
+    # cadenas a + b + c ... de un operador asociativo -> un solo nodo ('nary', op, [operandos], tipo)
+    if op in ('+','*'):
+        p[0] = juntar_cadena(p[1], op, p[3], None)
+        return
+    p[0] = ('binop',op,p[1],p[3],None)
 
 def p_expression_compare(p):
     """expression : expression GT expression
@@ -356,18 +320,11 @@ def p_expression_compare(p):
 def p_expression_logic_binary(p):
     """expression : expression AND expression
                   | expression OR expression"""
-    p[0] = ('logic', p[1], p[2], p[3], 'Bool')
+    p[0] = juntar_cadena(p[1], p[2], p[3], 'Bool')
 
 def p_expression_range(p):
     "expression : expression DOTDOTDOT expression"
-    t1 = get_tipo(p[1])
-    t2 = get_tipo(p[3])
-    # si ambos son números, tratamos el rango como tipo Range o Int (según prefieras)
-    if t1 in tipos_numericos and t2 in tipos_numericos:
-        tipo = "Range"   # marcador; puedes inferir Int si quieres
-    else:
-        tipo = "Unknown"
-    p[0] = ('range', p[1], p[3], tipo)
+    p[0] = ('range', p[1], p[3], None)
 
 
 def p_expression_literal(p):
@@ -378,10 +335,9 @@ def p_expression_literal(p):
                   | CHARACTER"""
     tipo_map = {"INTEGER":"Int","FLOAT":"Float","BOOLEAN":"Bool","STRING":"String","CHARACTER":"Character"}
     tipo = tipo_map[p.slice[1].type]
-    p[0] = ('literal',tipo,tipo)
+    p[0] = ('literal',tipo,p[1])
 
 def p_expression_id(p):
-    "expression : ID"
     "expression : ID"
     nombre = p[1]
 
@@ -390,70 +346,57 @@ def p_expression_id(p):
         p[0] = ('type_id', nombre, nombre)
         return
 
-    tipo = buscar_variable(nombre)
-    
-    if tipo is None:
-        semantic_errors.append(f"[SEM ERROR] Variable '{nombre}' usada sin declarar")
-        tipo="Unknown"
-    
-    p[0]=('id',nombre,tipo)
+    p[0]=('id',nombre,None,p.lineno(1))
 
 def p_expression_group(p):
     "expression : LPAREN expression RPAREN"
     p[0] = p[2]
-    
+
 def p_expression_group_lerror(p):
     "expression : LPAREN error"
-    semantic_errors.append("[SEM ERROR] Paréntesis sin cerrar en expresión")
     p[0] = ('error_expr', "parentesis_sin_cerrar")
 
 # ---------------- LAMBDA SIMPLE ----------------
 def p_expression_lambda(p):
     "expression : ID LAMBDA_IN expression"
-    param = p[1]
-    abrir_scope()
-    agregar_variable(param,"Unknown")
-    cuerpo = p[3]
-    tipo_ret = get_tipo(cuerpo)
-    cerrar_scope()
-    p[0] = ('lambda_simple',[param],cuerpo,tipo_ret)
+    p[0] = ('lambda_simple',[p[1]],p[3],None)
 
 # ---------------- DICTIONARIES ----------------
 def p_expression_bracket(p):
     "expression : LBRACKET bracket_items RBRACKET"
     items = p[2]
-    if not items:
-        p[0] = ('list', [], 'List')
-        return
-
-    is_all_kv = all(it[0]=='kv' for it in items)
-    is_any_kv = any(it[0]=='kv' for it in items)
-
-    if is_all_kv:
-        # infer types
-        tkey = get_tipo(items[0][1])
-        tval = get_tipo(items[0][2])
-
-        if tkey not in tipos_nativos:
-            semantic_errors.append(f"[SEM ERROR] Tipo de clave no permitido en Swift: {tkey}")
-        if tval not in tipos_nativos:
-            semantic_errors.append(f"[SEM ERROR] Tipo de valor no permitido en Swift: {tval}")
-        for it in items:
-            k = it[1]; v = it[2]
-            if tkey != "Any" and get_tipo(k) != tkey:
-                semantic_errors.append(f"[SEM ERROR] Clave de diccionario incompatible: {get_tipo(k)} != {tkey}")
-            if tval != "Any" and get_tipo(v) != tval:
-                semantic_errors.append(f"[SEM ERROR] Valor de diccionario incompatible: {get_tipo(v)} != {tval}")
-
-        p[0] = ('dict', items, f"Dictionary({tkey},{tval})")
-
-    elif is_any_kv:
-        semantic_errors.append("[SEM ERROR] Mezcla de pares y elementos en literal de corchetes no permitida")
-        p[0] = ('mixed_bracket', items, "Mixed")
-
+    orden = items["orden"]
+    if not orden:
+        p[0] = ('list', items["exprs"], 'List')
+    elif 0 not in orden:
+        p[0] = ('dict', (items["claves"], items["valores"]), None)
+    elif 1 in orden:
+        p[0] = ('mixed_bracket', items_en_orden(items), "Mixed")
     else:
-        exprs = [it[1] for it in items]
-        p[0] = ('list', exprs, 'List')
+        p[0] = ('list', items["exprs"], 'List')
+
+# los elementos de [ ... ] no se guardan como lista de tuplas: claves, valores y
+# elementos sueltos van en ColeccionLiteral (los literales seguidos del mismo tipo
+# quedan en un buffer tipado) y "orden" marca si cada item era kv (1) o expr (0)
+def nuevos_items():
+    return {"claves": ColeccionLiteral(), "valores": ColeccionLiteral(),
+            "exprs": ColeccionLiteral(), "orden": bytearray()}
+
+def agregar_item(items, it):
+    if it[0] == 'kv':
+        agregar_elemento(items["claves"], it[1], literal_de(it[1]))
+        agregar_elemento(items["valores"], it[2], literal_de(it[2]))
+        items["orden"].append(1)
+    else:
+        agregar_elemento(items["exprs"], it[1], literal_de(it[1]))
+        items["orden"].append(0)
+
+def items_en_orden(items):
+    claves = items["claves"].elementos(nodo_literal)
+    valores = items["valores"].elementos(nodo_literal)
+    exprs = items["exprs"].elementos(nodo_literal)
+    return [('kv', next(claves), next(valores)) if es_kv else ('expr', next(exprs))
+            for es_kv in items["orden"]]
 
 def p_bracket_item_kv(p):
     "bracket_item : expression COLON expression"
@@ -465,36 +408,386 @@ def p_bracket_item_expr(p):
 
 def p_bracket_items_multiple(p):
     "bracket_items : bracket_items COMMA bracket_item"
-    p[0] = p[1] + [p[3]]
+    agregar_item(p[1], p[3])
+    p[0] = p[1]
 
 def p_bracket_items_single(p):
     "bracket_items : bracket_item"
-    p[0] = [p[1]]
+    p[0] = nuevos_items()
+    agregar_item(p[0], p[1])
 
 def p_bracket_items_empty(p):
     "bracket_items : "
-    p[0] = []
+    p[0] = nuevos_items()
 
 
 
 # ---------------- IF-ELSE ----------------
 def p_expression_if(p):
     "expression : IF expression block"
-    cond = p[2]
-    if get_tipo(cond)!="Bool":
-        semantic_errors.append(f"[SEM ERROR] Condición no booleana en IF: {get_tipo(cond)}")
-    p[0] = ('if',cond,p[3])
+    p[0] = ('if',p[2],p[3],p.lineno(1))
 
 # ---------------- ERROR ----------------
+recuperacion = Recuperacion('SEMICOLON', 'LBRACE', 'RBRACE', ('LET', 'FOR', 'IF'))
+
 def p_error(p):
 
     global parse_errors
+    if not recuperacion.contar(parser, p):
+        if recuperacion.recien_cortado:
+            parse_errors.reportar('SIN003', maximo=recuperacion.max_errores)
+        return
     if p:
-        parse_errors.append(f"[SYN ERROR] Token inesperado '{p.value}' (tipo {p.type}) en línea {p.lineno}")
+        parse_errors.reportar('SIN001', p.lineno, columna_de(p.lexer.lexdata, p.lexpos), valor=p.value, tipo=p.type)
+        recuperacion.sincronizar(parser, p)
     else:
-        parse_errors.append("[SYN ERROR] EOF inesperado: estructura incompleta")
-parser = yacc.yacc()
-
-
-
-
+        parse_errors.reportar('SIN002')
+parser = yacc.yacc(debug=False, write_tables=False)
+
+# ---------------- FASES ----------------
+@salida.exclusivo
+def analizar(codigo, solo_sintaxis=False, plegar=True):
+    """Fase 1: lexer + parser (solo AST). Fase 2 (opcional): plegado de constantes y chequeo semantico sobre el AST."""
+    lex_errors.clear()
+    parse_errors.clear()
+    reiniciar()
+    lexer.lineno = 1
+    ast = parser.parse(codigo, lexer=lexer)
+    if solo_sintaxis:
+        return ast
+    if plegar:
+        ast = plegar_programa(ast)
+    return verificar_programa(ast)
+
+@salida.exclusivo
+def analyze(codigo, deadline=None, max_errors=None, pasada=None):
+    """Como analizar, pero con hora limite (Plazo o instante de time.monotonic()).
+    Devuelve un ResultadoAnalisis; si el plazo se agota trae los errores hasta ese punto y parcial=True.
+    max_errors limita los errores de sintaxis (por defecto MAX_ERRORES de comun.recuperacion).
+    pasada: comun.lexico_unificado.lexear(codigo), compartida con las otras gramaticas; los tokens salen de ahi."""
+    plazo = Plazo.desde(deadline)
+    inicio = time.perf_counter()
+    lex_errors.clear()
+    parse_errors.clear()
+    reiniciar()
+    lexer.lineno = 1
+    tokens = LexerUnificado(pasada, gramatica_unificada) if pasada is not None else lexer
+    ast, fase = None, 'sintactico'
+    try:
+        with recuperacion.con_maximo(max_errors):
+            ast = parser.parse(codigo, lexer=LexerConPlazo(tokens, plazo) if plazo else tokens)
+        fase = 'semantico'
+        ast = verificar_programa(plegar_programa(ast, plazo), plazo)
+        fase = None
+    except PlazoAgotado:
+        pass
+    return ResultadoAnalisis(lex_errors + parse_errors + semantic_errors, fase, ast, (time.perf_counter() - inicio) * 1000)
+
+@salida.exclusivo
+def analizar_en_flujo(codigo, consumidor=None, max_errors=None):
+    """Como analyze, pero cada sentencia de nivel superior se pliega, se verifica y se pasa a consumidor
+    apenas el parser la reduce; el programa completo no se arma (ast=None en el resultado).
+    Sin consumidor devuelve un generador de las sentencias; el ResultadoAnalisis queda en StopIteration.value."""
+    if consumidor is None:
+        return en_flujo(lambda entregar: analizar_en_flujo(codigo, entregar, max_errors), salida)
+    inicio = time.perf_counter()
+    lex_errors.clear()
+    parse_errors.clear()
+    reiniciar()
+    plegar_programa(None)       # reinicia las estadisticas del plegado
+    lexer.lineno = 1
+    with recuperacion.con_maximo(max_errors), salida.hacia(lambda st: consumidor(verificar_sentencia(plegar_sentencia(st)))):
+        parser.parse(codigo, lexer=lexer)
+    return ResultadoAnalisis(lex_errors + parse_errors + semantic_errors, None, None, (time.perf_counter() - inicio) * 1000)
+
+# ---------------- TUBERIA ----------------
+# lexer, parser y semantico en tres procesos (comun/tuberia.py); cada uno con su copia de los globales
+@salida.exclusivo
+def _etapa_lexica(codigo, salida_tokens):
+    # los errores lexicos viajan con los tokens hacia el parser
+    global lex_errors
+    propios, lex_errors = lex_errors, salida_tokens
+    try:
+        lexer.lineno = 1
+        lexer.input(codigo)
+        for token in iter(lexer.token, None):
+            salida_tokens(token)
+    finally:
+        lex_errors = propios
+
+@salida.exclusivo
+def _etapa_sintactica(lexer_lotes, entregar, max_errors=None):
+    lex_errors.clear()
+    parse_errors.clear()
+    lexer_lotes.errores_lexicos = lex_errors
+    with recuperacion.con_maximo(max_errors), salida.hacia(entregar):
+        ast = parser.parse(lexer=lexer_lotes)
+    return lex_errors, parse_errors, ast is not None
+
+def _etapa_semantica(sentencias):
+    reiniciar()
+    plegar_programa(None)
+    for st in sentencias:
+        verificar_sentencia(plegar_sentencia(st))
+    return semantic_errors
+
+def analizar_en_tuberia(codigo, max_errors=None):
+    """Mismos errores que analyze, con lexer, parser y semantico en procesos separados unidos por colas
+    acotadas. Conviene con archivos grandes y al menos tres nucleos; el AST no vuelve (ast=None)."""
+    inicio = time.perf_counter()
+    _, (lexicos, sintacticos, completo), semanticos = tuberia.ejecutar(
+        codigo, _etapa_lexica, partial(_etapa_sintactica, max_errors=max_errors), _etapa_semantica)
+    # como en analyze: si el parse no produce programa no hay fase semantica
+    errores = lexicos + sintacticos + semanticos if completo else lexicos + sintacticos
+    return ResultadoAnalisis(errores, None, None, (time.perf_counter() - inicio) * 1000)
+
+# ---------------- TOKENS EN MEMORIA COMPARTIDA ----------------
+# un proceso lexea una vez y otros parsean desde el buffer (comun/tokens_compartidos.py)
+def lexear_compartido(codigo):
+    """Lexea codigo una vez y deja los tokens en memoria compartida (BufferTokens)."""
+    return BufferTokens.crear(codigo, _etapa_lexica)
+
+@salida.exclusivo
+def analizar_tokens(buffer, max_errors=None):
+    """Como analyze, pero con los tokens de un BufferTokens (desde cualquier proceso que lo haya abierto)."""
+    inicio = time.perf_counter()
+    lex_errors.clear()
+    parse_errors.clear()
+    reiniciar()
+    tokens = LexerCompartido(buffer)
+    tokens.errores_lexicos = lex_errors
+    with recuperacion.con_maximo(max_errors):
+        ast = parser.parse(lexer=tokens)
+    ast = verificar_programa(plegar_programa(ast))
+    return ResultadoAnalisis(lex_errors + parse_errors + semantic_errors, None, ast, (time.perf_counter() - inicio) * 1000)
+
+# ---------------- CACHE DE RESULTADOS ----------------
+# un archivo que no cambio no se vuelve a analizar (comun/cache_resultados.py)
+def cache_resultados(carpeta=CARPETA_CACHE, **opciones):
+    """CacheResultados de este analizador; cualquier cambio en Aymanarchivos o comun cambia la firma."""
+    return CacheResultados(carpeta, 'ayman', firma_de(os.path.dirname(os.path.abspath(__file__))), **opciones)
+
+def analizar_ruta(ruta, cache=None, max_errors=None):
+    """analyze sobre el contenido de ruta; con un CacheResultados un archivo ya analizado cuesta un stat."""
+    if cache is None:
+        with open(ruta, "r", encoding="utf-8") as f:
+            return analyze(f.read(), max_errors=max_errors)
+    return cache.analizar(ruta, partial(analyze, max_errors=max_errors), variante=max_errors)
+
+
+# ---------------- REPL ----------------
+# cada entrada se parsea y se verifica sola contra los scopes de la sesion:
+# tabla_simbolos no se reinicia entre entradas, asi que lo que cuesta una linea
+# no depende de cuantas vinieron antes. Los bloques abren y cierran su scope
+# dentro de la misma entrada; lo unico que queda es lo declarado en el scope
+# global, y el historial guarda su marca antes de cada entrada para deshacerla
+def nueva_sesion():
+    reiniciar()
+    plegar_programa(None)
+    return {"historial": [], "linea": 1}
+
+@salida.exclusivo
+def evaluar_entrada(sesion, codigo, max_errors=None, completa=False):
+    """Parsea y verifica una entrada de la sesion. Devuelve un ResultadoAnalisis con las sentencias en ast,
+    o None si la entrada quedo incompleta (falta cerrar un bloque o un parentesis) y hay que pedir mas lineas;
+    con completa=True no se espera mas y eso es un error de sintaxis.
+    Con errores lexicos o de sintaxis no se verifica y no cambia nada; con errores semanticos se queda, como en analyze.
+    Si la verificacion falla (p. ej. RecursionError con un literal muy anidado) se informa como error y la
+    entrada se deshace entera, tambien lo que declararon sus primeras sentencias."""
+    inicio = time.perf_counter()
+    lex_errors.clear()
+    parse_errors.clear()
+    semantic_errors.clear()
+    lexer.lineno = sesion["linea"]
+    with recuperacion.con_maximo(max_errors):
+        ast = parser.parse(codigo, lexer=lexer)
+    if not completa and len(parse_errors) == 1 and parse_errors.diagnosticos()[0].codigo == 'SIN002':
+        return None
+    sesion["linea"] += len(codigo.splitlines()) or 1
+    if lex_errors or parse_errors or ast is None:
+        return ResultadoAnalisis(lex_errors + parse_errors, None, None, (time.perf_counter() - inicio) * 1000)
+    global_ = tabla_simbolos["scopes"][0]
+    marca = global_.marca()
+    try:
+        sentencias = [verificar_sentencia(plegar_sentencia(st)) for st in ast[1]]
+    except Exception as error:
+        # ni a medias: fuera lo declarado y los scopes de bloque que quedaron abiertos
+        global_.volver_a(marca)
+        del tabla_simbolos["scopes"][1:]
+        mensaje = f"[ERROR] la entrada no se pudo verificar ({type(error).__name__}: {error}); no se aplico"
+        return ResultadoAnalisis([mensaje], None, None, (time.perf_counter() - inicio) * 1000)
+    sesion["historial"].append((codigo, marca))
+    return ResultadoAnalisis(list(semantic_errors), None, sentencias, (time.perf_counter() - inicio) * 1000)
+
+def deshacer(sesion):
+    """Quita la ultima entrada aceptada y lo que declaro; devuelve su codigo (None si no habia)."""
+    if not sesion["historial"]:
+        return None
+    codigo, marca = sesion["historial"].pop()
+    tabla_simbolos["scopes"][0].volver_a(marca)
+    return codigo
+
+def describir(st):
+    if st[0] == 'let_decl':
+        return f"{st[1]}: {st[2]}"
+    if st[0] in ('let_incomplete', 'let_invalid'):
+        return f"{st[1]}: Unknown"
+    if st[0] in ('for', 'empty'):
+        return None
+    return get_tipo(st)
+
+def repl(entrada=sys.stdin, max_errors=None):
+    """Lee entradas de a una; :deshacer quita la ultima, :simbolos lista el scope global y :salir termina.
+    Una entrada incompleta sigue en las lineas que vienen; una linea vacia la da por terminada."""
+    sesion = nueva_sesion()
+    pendiente = ""
+    while True:
+        print("...... " if pendiente else "swift> ", end="", flush=True)
+        linea = entrada.readline()
+        if not linea:
+            print()
+            return sesion
+        linea = linea.rstrip("\n")
+        comando = linea.strip()
+        if not pendiente and comando == ":salir":
+            return sesion
+        if not pendiente and comando == ":deshacer":
+            codigo = deshacer(sesion)
+            print(f"[OK] deshecho: {codigo.strip()}" if codigo is not None else "[OK] no hay nada que deshacer")
+            continue
+        if not pendiente and comando == ":simbolos":
+            for nombre, simbolo in tabla_simbolos["scopes"][0].items():
+                print(f"  {nombre}: {simbolo.tipo}")
+            continue
+        if not pendiente and not comando:
+            continue
+        pendiente += linea + "\n"
+        try:
+            resultado = evaluar_entrada(sesion, pendiente, max_errors, completa=not comando)
+        except Exception as error:      # en el parseo: los scopes no se tocaron, la sesion sigue
+            pendiente = ""
+            print(f"[ERROR] la entrada no se pudo analizar ({type(error).__name__}: {error}); no se aplico")
+            continue
+        if resultado is None:
+            continue
+        pendiente = ""
+        for err in resultado.errores:
+            print(err)
+        for st in resultado.ast or ():
+            texto = describir(st)
+            if texto is not None:
+                print(f"  {texto}")
+
+
+# ---------------- EJECUCION (transpilado a Python) ----------------
+# un programa sin errores se traduce a Python (transpilador_ayman.py) y se compila con
+# compile(); el code object queda en el cache con clave el hash del codigo, asi que
+# volver a correr el mismo programa no lo analiza ni lo compila otra vez
+_firma = []
+
+def firma_transpilado():
+    """firma_de de Aymanarchivos y comun, calculada una vez por proceso."""
+    if not _firma:
+        _firma.append(firma_de(os.path.dirname(os.path.abspath(__file__))))
+    return _firma[0]
+
+def compilar_programa(codigo, ruta="<swift>", carpeta=CARPETA_CACHE):
+    """(programa, errores): programa es lo que recibe transpilador_ayman.ejecutar, o None si hubo errores
+    (de analyze o ErrorTranspilacion). Con carpeta=None no se usa el cache."""
+    clave = None
+    if carpeta is not None:
+        clave = transpilador_ayman.clave(codigo, firma_transpilado())
+        programa = transpilador_ayman.cargar(carpeta, clave)
+        if programa is not None:
+            return programa, []
+    resultado = analyze(codigo)
+    if resultado.errores or resultado.ast is None:
+        return None, resultado.errores
+    try:
+        programa = transpilador_ayman.compilar(resultado.ast, ruta)
+    except transpilador_ayman.ErrorTranspilacion as error:
+        return None, [str(error)]
+    if clave is not None:
+        transpilador_ayman.guardar(carpeta, clave, programa)
+    return programa, []
+
+def ejecutar_archivo(ruta, carpeta=CARPETA_CACHE, entrada=None, salida=None):
+    """Compila ruta (o lo toma del cache) y lo corre. Devuelve el codigo de salida."""
+    with open(ruta, "r", encoding="utf-8") as f:
+        programa, errores = compilar_programa(f.read(), ruta, carpeta)
+    if programa is None:
+        for err in errores:
+            print(err)
+        print(f"[ERROR] {ruta}: no se ejecuta, tiene {len(errores)} error(es)")
+        return 1
+    try:
+        transpilador_ayman.ejecutar(programa, entrada, salida)
+    except transpilador_ayman.ErrorEjecucion as error:
+        print(error)
+        return 1
+    return 0
+
+# --lsp: servidor de diagnosticos por stdio (comun/servidor_lsp.py)
+def servidor_lsp(**opciones):
+    """ServidorLSP con este analizador; cada version del documento se analiza completa con analyze."""
+    return ServidorLSP(lambda estado, texto, plazo: analyze(texto, deadline=plazo), fuente='ayman', **opciones)
+
+
+if __name__ == "__main__":
+    # uso: python analizador_swift.py [archivo.swift] [--solo-sintaxis] [--en-vivo] [--cache] [--ejecutar [--python]] | --repl | --lsp
+    # --en-vivo: cada error se imprime apenas aparece (con el tiempo transcurrido)
+    # --cache: usa el cache de resultados en .cache_analisis (un archivo sin cambios no se reanaliza)
+    # --repl: sesion interactiva, cada linea se verifica contra lo declarado antes
+    # --lsp: servidor de diagnosticos por stdio para el editor
+    # --ejecutar: corre el programa traducido a Python (el code object queda en .cache_analisis);
+    # con --python solo muestra el codigo traducido
+    if '--repl' in sys.argv:
+        repl()
+        sys.exit(0)
+    if '--lsp' in sys.argv:
+        sys.exit(servidor_lsp().atender())
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    ruta = args[0] if args else os.path.join("algoritmos", "algoritmosprimitivos.swift")
+    if '--ejecutar' in sys.argv and '--python' in sys.argv:
+        with open(ruta, "r", encoding="utf-8") as f:
+            resultado = analyze(f.read())
+        errores = list(resultado.errores)
+        if not errores:
+            try:
+                print(transpilador_ayman.transpilar(resultado.ast)[0], end="")
+            except transpilador_ayman.ErrorTranspilacion as error:
+                errores.append(str(error))
+        for err in errores:
+            print(err)
+        sys.exit(1 if errores else 0)
+    if '--ejecutar' in sys.argv:
+        sys.exit(ejecutar_archivo(ruta))
+    solo_sintaxis = '--solo-sintaxis' in sys.argv
+    en_vivo = '--en-vivo' in sys.argv
+    if '--cache' in sys.argv and not solo_sintaxis and not en_vivo:
+        cache = cache_resultados()
+        resultado = analizar_ruta(ruta, cache)
+        for err in resultado.errores:
+            print(err)
+        print(f"[OK] {ruta}: sintaxis + semantica en {resultado.duracion_ms:.1f} ms ({cache.estadisticas})")
+        sys.exit(0)
+    with open(ruta, "r", encoding="utf-8") as f:
+        codigo = f.read()
+    inicio = time.perf_counter()
+    def mostrar(diagnostico):
+        print(f"[{(time.perf_counter() - inicio) * 1000:7.1f} ms] {diagnostico.mensaje}", flush=True)
+    if en_vivo:
+        canal.suscribir(mostrar)
+    analizar(codigo, solo_sintaxis)
+    duracion = (time.perf_counter() - inicio) * 1000
+    if not en_vivo:
+        for err in lex_errors + parse_errors:
+            print(err)
+        if not solo_sintaxis:
+            for err in semantic_errors:
+                print(err)
+    fase = "sintaxis" if solo_sintaxis else "sintaxis + semantica"
+    print(f"[OK] {ruta}: {fase} en {duracion:.1f} ms")
+    if not solo_sintaxis:
+        e = estadisticas_plegado
+        print(f"[OK] plegado: {e['nodos_antes']} nodos -> {e['nodos_despues']} ({e['plegados']} plegados) en {e['ms']:.1f} ms")
@@ -0,0 +1,253 @@
+import bisect
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from comun.diagnosticos import ListaDiagnosticos
+from semantico_ayman import MENSAJES, tabla_simbolos, semantic_errors, verificar_sentencia, get_tipo
+from plegado_ayman import plegar_sentencia
+
+# consultas semanticas memoizadas (como ArielArchivos/motorConsultas.py): cada sentencia de nivel
+# superior se pliega y se verifica una sola vez; su resultado (errores, sentencia con tipos, nombres
+# globales que consulto y lo que declara) queda guardado por posicion. Al reemplazar una sentencia
+# solo se vuelve a verificar esa y, si cambio el tipo o la posicion de lo que declara, las que
+# consultaron ese nombre. Los errores son los mismos, en el mismo orden, que los semanticos de analyze.
+# No hay signature_of: en esta gramatica no hay funciones con nombre (las lambdas son valores de un let).
+# Usa los globales del semantico (tabla_simbolos, semantic_errors) como analyze: no se mezcla con otro
+# analisis en curso en el mismo hilo.
+
+# lo que reiniciar() declara antes que nada
+PREDEFINIDOS = {"print": "BuiltInFunction", "readLine": "BuiltInFunction"}
+
+# posiciones de cada resultado guardado
+PLEGADO, ERRORES, VERIFICADA, DEPENDENCIAS, DECLARADO = range(5)
+
+def declara(st):
+    """Nombre global que introduce una sentencia de nivel superior (o None)."""
+    return st[1] if st[0] in ('let_decl', 'let_incomplete', 'let_invalid') else None
+
+class Globales:
+    # scope 0 mientras se verifica una sentencia: busca en el motor y anota lo que consulta y declara
+    def __init__(self, motor, desde):
+        self.motor, self.desde = motor, desde
+        self.dependencias = set()
+        self.declarado = None
+
+    def tipo_de(self, nombre):
+        self.dependencias.add(nombre)
+        return _tipo_visible(self.motor, nombre, self.desde)
+
+    def declarar(self, nombre, tipo, mutable=False, linea=0):
+        # la repeticion (SEM001) la decide diagnosticos, que conoce todo el programa
+        self.declarado = tipo
+        return True
+
+def nuevo_motor(ast):
+    """Motor sobre el AST sin plegar de analizar(codigo, solo_sintaxis=True); no verifica nada todavia."""
+    # con_errores y repetidos: para que diagnosticos solo mire las sentencias que aportan algo
+    motor = {"sentencias": [], "resultados": [], "declaraciones": {}, "dependientes": {},
+             "pendientes": set(), "con_errores": set(), "repetidos": set(), "verificaciones": 0}
+    _cargar(motor, list(ast[1]) if ast is not None else [])
+    return motor
+
+def _cargar(motor, sentencias):
+    motor["sentencias"] = sentencias
+    motor["resultados"] = [None] * len(sentencias)
+    motor["pendientes"] = set(range(len(sentencias)))
+    motor["dependientes"] = {}
+    motor["con_errores"] = set()
+    _indexar(motor)
+
+def _indexar(motor):
+    declaraciones = {}
+    for i, st in enumerate(motor["sentencias"]):
+        nombre = declara(st)
+        if nombre is not None:
+            declaraciones.setdefault(nombre, []).append(i)
+    motor["declaraciones"] = declaraciones
+    motor["repetidos"] = {n for n, posiciones in declaraciones.items() if len(posiciones) > 1 or n in PREDEFINIDOS}
+
+# ---------------- CONSULTAS ----------------
+def resolve(motor, nombre, posicion=None):
+    """Tipo de `nombre` visible desde la sentencia `posicion` (None: al final del programa), o None."""
+    return _tipo_visible(motor, nombre, len(motor["sentencias"]) if posicion is None else posicion)
+
+def type_of(motor, posicion):
+    """Tipo de la sentencia `posicion`: lo declarado si es un let, si no el de la expresion."""
+    resultado = _resultado(motor, posicion)
+    if resultado[DECLARADO] is not None:
+        return resultado[DECLARADO]
+    return get_tipo(resultado[VERIFICADA])
+
+def sentencia_verificada(motor, posicion):
+    """La sentencia `posicion` plegada y con los tipos resueltos (como en verificar_programa)."""
+    return _resultado(motor, posicion)[VERIFICADA]
+
+def diagnosticos(motor):
+    """Errores de todo el programa: primero los del plegado y despues los semanticos, como en analyze."""
+    _verificar_hasta(motor, len(motor["sentencias"]) - 1)
+    resultados, declaraciones = motor["resultados"], motor["declaraciones"]
+    # SEM001: toda declaracion de un nombre predefinido y las que siguen a la primera
+    repetidas = {p: n for n in motor["repetidos"] for p in declaraciones[n][0 if n in PREDEFINIDOS else 1:]}
+    errores = ListaDiagnosticos('semantico', MENSAJES)
+    con_errores = sorted(motor["con_errores"])
+    for p in con_errores:
+        if resultados[p][PLEGADO] is not None:
+            errores.extend(resultados[p][PLEGADO])
+    for p in sorted(motor["con_errores"].union(repetidas)):
+        if resultados[p][ERRORES] is not None:
+            errores.extend(resultados[p][ERRORES])
+        if p in repetidas:
+            errores.reportar('SEM001', nombre=repetidas[p])
+    return errores
+
+# ---------------- MEMO ----------------
+def _tipo_visible(motor, nombre, desde):
+    if nombre in PREDEFINIDOS:
+        return PREDEFINIDOS[nombre]
+    # solo cuenta la primera declaracion: las siguientes son SEM001 y no cambian el tipo
+    posiciones = motor["declaraciones"].get(nombre)
+    if not posiciones or posiciones[0] >= desde:
+        return None
+    return _resultado(motor, posiciones[0])[DECLARADO]
+
+def _resultado(motor, posicion):
+    resultado = motor["resultados"][posicion]
+    if resultado is None:
+        _verificar_hasta(motor, posicion)
+        resultado = motor["resultados"][posicion]
+    return resultado
+
+def _verificar_hasta(motor, posicion):
+    # en orden: cuando se verifica una sentencia, todo lo que puede consultar ya esta verificado
+    # (sin recursion, aunque cada let dependa del anterior)
+    pendientes = sorted(p for p in motor["pendientes"] if p <= posicion)
+    if not pendientes:
+        return
+    scopes = tabla_simbolos["scopes"]
+    try:
+        for p in pendientes:
+            _verificar(motor, p)
+    finally:
+        tabla_simbolos["scopes"] = scopes
+
+def _copia(lista):
+    if not lista:
+        return None
+    copia = ListaDiagnosticos('semantico', MENSAJES)
+    copia.extend(lista, publicar=False)
+    return copia
+
+def _verificar(motor, posicion):
+    semantic_errors.clear()
+    plegada = plegar_sentencia(motor["sentencias"][posicion])
+    plegado = _copia(semantic_errors)
+    semantic_errors.clear()
+    globales = Globales(motor, posicion)
+    tabla_simbolos["scopes"] = [globales]
+    verificada = verificar_sentencia(plegada)
+    errores = _copia(semantic_errors)
+    motor["resultados"][posicion] = (plegado, errores, verificada, globales.dependencias, globales.declarado)
+    semantic_errors.clear()
+    if plegado is not None or errores is not None:
+        motor["con_errores"].add(posicion)
+    for nombre in globales.dependencias:
+        motor["dependientes"].setdefault(nombre, set()).add(posicion)
+    motor["pendientes"].discard(posicion)
+    motor["verificaciones"] += 1
+
+def _olvidar(motor, posicion):
+    resultado = motor["resultados"][posicion]
+    if resultado is not None:
+        for nombre in resultado[DEPENDENCIAS]:
+            motor["dependientes"][nombre].discard(posicion)
+        motor["resultados"][posicion] = None
+    motor["pendientes"].add(posicion)
+    motor["con_errores"].discard(posicion)
+
+def _firma(motor, nombre):
+    # lo que ven las demas sentencias de un nombre: donde se declara primero y con que tipo
+    posiciones = motor["declaraciones"].get(nombre)
+    if not posiciones:
+        return None
+    return posiciones[0], _resultado(motor, posiciones[0])[DECLARADO]
+
+# ---------------- EDICIONES ----------------
+def reemplazar_sentencia(motor, posicion, nueva):
+    """Cambia la sentencia de nivel superior `posicion` por `nueva` (sin plegar)."""
+    vieja = motor["sentencias"][posicion]
+    nombres = {n for n in (declara(vieja), declara(nueva)) if n is not None}
+    antes = {n: _firma(motor, n) for n in nombres}
+    _olvidar(motor, posicion)
+    motor["sentencias"][posicion] = nueva
+    declaraciones = motor["declaraciones"]
+    if declara(vieja) is not None:
+        declaraciones[declara(vieja)].remove(posicion)
+        if not declaraciones[declara(vieja)]:
+            del declaraciones[declara(vieja)]
+    if declara(nueva) is not None:
+        bisect.insort(declaraciones.setdefault(declara(nueva), []), posicion)
+    for nombre in nombres:
+        if len(declaraciones.get(nombre, ())) > 1 or (nombre in PREDEFINIDOS and nombre in declaraciones):
+            motor["repetidos"].add(nombre)
+        else:
+            motor["repetidos"].discard(nombre)
+    _propagar(motor, antes)
+
+def actualizar(motor, ast):
+    """Carga otra version del programa: se conservan las sentencias iguales del principio y del final
+    (las del final se corren de posicion). Como las sentencias llevan su linea, insertar o quitar
+    lineas cambia las que siguen y esas se vuelven a verificar."""
+    viejas, nuevas = motor["sentencias"], list(ast[1]) if ast is not None else []
+    if len(viejas) == len(nuevas):
+        for i, (vieja, nueva) in enumerate(zip(viejas, nuevas)):
+            if vieja != nueva:
+                reemplazar_sentencia(motor, i, nueva)
+        return
+    inicio, limite = 0, min(len(viejas), len(nuevas))
+    while inicio < limite and viejas[inicio] == nuevas[inicio]:
+        inicio += 1
+    fin = 0
+    while fin < limite - inicio and viejas[-1 - fin] == nuevas[-1 - fin]:
+        fin += 1
+    corrimiento = len(nuevas) - len(viejas)
+    def nueva_posicion(p):
+        if p < inicio: return p
+        if p >= len(viejas) - fin: return p + corrimiento
+        return None
+    # firmas de antes, con las posiciones ya traducidas a la version nueva
+    nombres = {n for n in map(declara, viejas[inicio:len(viejas) - fin] + nuevas[inicio:len(nuevas) - fin])
+               if n is not None}
+    antes = {}
+    for nombre in nombres:
+        firma = _firma(motor, nombre)
+        antes[nombre] = None if firma is None else (nueva_posicion(firma[0]), firma[1])
+    resultados = motor["resultados"]
+    medio = len(nuevas) - inicio - fin
+    motor["sentencias"] = nuevas
+    motor["resultados"] = resultados[:inicio] + [None] * medio + resultados[len(resultados) - fin:]
+    motor["pendientes"] = {nueva_posicion(p) for p in motor["pendientes"] if nueva_posicion(p) is not None}
+    motor["pendientes"].update(range(inicio, inicio + medio))
+    motor["con_errores"] = {nueva_posicion(p) for p in motor["con_errores"] if nueva_posicion(p) is not None}
+    dependientes = {}
+    for i, resultado in enumerate(motor["resultados"]):
+        if resultado is not None:
+            for nombre in resultado[DEPENDENCIAS]:
+                dependientes.setdefault(nombre, set()).add(i)
+    motor["dependientes"] = dependientes
+    _indexar(motor)
+    _propagar(motor, antes)
+
+def _propagar(motor, antes):
+    # invalida a quienes consultaron un nombre cuya firma cambio (y asi sucesivamente)
+    pendientes = list(antes.items())
+    while pendientes:
+        nombre, previa = pendientes.pop()
+        if _firma(motor, nombre) == previa:
+            continue
+        for dependiente in list(motor["dependientes"].get(nombre, ())):
+            declarado = declara(motor["sentencias"][dependiente])
+            anterior = _firma(motor, declarado) if declarado is not None else None
+            _olvidar(motor, dependiente)
+            if declarado is not None:
+                pendientes.append((declarado, anterior))
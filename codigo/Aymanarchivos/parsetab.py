@@ -1,80 +0,0 @@
-
-# parsetab.py
-# This file is automatically generated. Do not edit.
-# pylint: disable=W,C,R
-_tabversion = '3.10'
-
-_lr_method = 'LALR'
-
-_lr_signature = 'leftORleftANDleftEQNEleftLTLEGTGEleftPLUSMINUSleftTIMESDIVIDEMODrightNOTAND ASSIGN BOOLEAN CHARACTER COLON COMMA DIVIDE DOTDOTDOT DOUBLE ELSE EQ FLOAT FOR GE GT ID IF IN INTEGER LAMBDA_IN LBRACE LBRACKET LE LET LPAREN LT MINUS MOD NE NOT OR PLUS RBRACE RBRACKET RPAREN SEMICOLON STRING TIMESprogram : statementsstatements : statements statementstatements : statementstatement : decl_stmt\n                 | expr_stmt\n                 | for_stmt\n                 | SEMICOLONdecl_stmt : LET ID decl_type ASSIGN expression\n                 | LET ID ASSIGN expressiondecl_stmt : LET ID ASSIGNdecl_stmt : LET IDdecl_type : COLON simple_type\n                 | simple_type : IDsimple_type : LBRACKET simple_type RBRACKETsimple_type : LBRACKET simple_type COLON simple_type RBRACKETfor_stmt : FOR ID IN expression blockblock : LBRACE block_enter statements RBRACEblock_enter :expr_stmt : expressionexpression : expression PLUS expression\n                  | expression MINUS expression\n                  | expression TIMES expression\n                  | expression DIVIDE expression\n                  | expression MOD expression\n                  expression : expression GT expression\n                  | expression LT expression\n                  | expression GE expression\n                  | expression LE expression\n                  | expression EQ expression\n                  | expression NE expressionexpression : expression AND expression\n                  | expression OR expressionexpression : expression DOTDOTDOT expressionexpression : INTEGER\n                  | FLOAT\n                  | BOOLEAN\n                  | STRING\n                  | CHARACTERexpression : IDexpression : LPAREN expression RPARENexpression : LPAREN errorexpression : ID LAMBDA_IN expressionexpression : LBRACKET bracket_items RBRACKETbracket_item : expression COLON expressionbracket_item : expressionbracket_items : bracket_items COMMA bracket_itembracket_items : bracket_itembracket_items : expression : IF expression block'
-    
-_lr_action_items = {'SEMICOLON':([0,2,3,4,5,6,7,9,10,12,13,14,15,16,20,21,39,45,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,63,64,67,68,70,77,78,80,81,84,],[7,7,-3,-4,-5,-6,-7,-40,-20,-35,-36,-37,-38,-39,-2,-11,-42,-10,-43,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-41,-44,-50,-19,-9,7,-8,-17,7,-18,]),'LET':([0,2,3,4,5,6,7,9,10,12,13,14,15,16,20,21,39,45,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,63,64,67,68,70,77,78,80,81,84,],[8,8,-3,-4,-5,-6,-7,-40,-20,-35,-36,-37,-38,-39,-2,-11,-42,-10,-43,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-41,-44,-50,-19,-9,8,-8,-17,8,-18,]),'FOR':([0,2,3,4,5,6,7,9,10,12,13,14,15,16,20,21,39,45,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,63,64,67,68,70,77,78,80,81,84,],[11,11,-3,-4,-5,-6,-7,-40,-20,-35,-36,-37,-38,-39,-2,-11,-42,-10,-43,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-41,-44,-50,-19,-9,11,-8,-17,11,-18,]),'INTEGER':([0,2,3,4,5,6,7,9,10,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,39,45,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,77,78,80,81,84,],[12,12,-3,-4,-5,-6,-7,-40,-20,-35,-36,-37,-38,-39,12,12,12,-2,-11,12,12,12,12,12,12,12,12,12,12,12,12,12,12,12,-42,12,-43,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,12,-41,-44,12,12,-50,-19,12,-9,12,-8,-17,12,-18,]),'FLOAT':([0,2,3,4,5,6,7,9,10,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,39,45,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,77,78,80,81,84,],[13,13,-3,-4,-5,-6,-7,-40,-20,-35,-36,-37,-38,-39,13,13,13,-2,-11,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,-42,13,-43,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,13,-41,-44,13,13,-50,-19,13,-9,13,-8,-17,13,-18,]),'BOOLEAN':([0,2,3,4,5,6,7,9,10,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,39,45,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,77,78,80,81,84,],[14,14,-3,-4,-5,-6,-7,-40,-20,-35,-36,-37,-38,-39,14,14,14,-2,-11,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,-42,14,-43,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,14,-41,-44,14,14,-50,-19,14,-9,14,-8,-17,14,-18,]),'STRING':([0,2,3,4,5,6,7,9,10,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,39,45,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,77,78,80,81,84,],[15,15,-3,-4,-5,-6,-7,-40,-20,-35,-36,-37,-38,-39,15,15,15,-2,-11,15,15,15,15,15,15,15,15,15,15,15,15,15,15,15,-42,15,-43,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,15,-41,-44,15,15,-50,-19,15,-9,15,-8,-17,15,-18,]),'CHARACTER':([0,2,3,4,5,6,7,9,10,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,39,45,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,77,78,80,81,84,],[16,16,-3,-4,-5,-6,-7,-40,-20,-35,-36,-37,-38,-39,16,16,16,-2,-11,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,-42,16,-43,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,16,-41,-44,16,16,-50,-19,16,-9,16,-8,-17,16,-18,]),'ID':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,39,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,73,77,78,80,81,83,84,],[9,9,-3,-4,-5,-6,-7,21,-40,-20,37,-35,-36,-37,-38,-39,9,9,9,-2,-11,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,-42,9,72,-43,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,9,-41,-44,9,9,-50,-19,9,-9,72,9,-8,-17,9,72,-18,]),'LPAREN':([0,2,3,4,5,6,7,9,10,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,39,45,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,77,78,80,81,84,],[17,17,-3,-4,-5,-6,-7,-40,-20,-35,-36,-37,-38,-39,17,17,17,-2,-11,17,17,17,17,17,17,17,17,17,17,17,17,17,17,17,-42,17,-43,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,17,-41,-44,17,17,-50,-19,17,-9,17,-8,-17,17,-18,]),'LBRACKET':([0,2,3,4,5,6,7,9,10,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,39,45,46,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,73,77,78,80,81,83,84,],[18,18,-3,-4,-5,-6,-7,-40,-20,-35,-36,-37,-38,-39,18,18,18,-2,-11,18,18,18,18,18,18,18,18,18,18,18,18,18,18,18,-42,18,73,-43,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,18,-41,-44,18,18,-50,-19,18,-9,73,18,-8,-17,18,73,-18,]),'IF':([0,2,3,4,5,6,7,9,10,12,13,14,15,16,17,18,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,39,45,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,62,63,64,65,66,67,68,69,70,77,78,80,81,84,],[19,19,-3,-4,-5,-6,-7,-40,-20,-35,-36,-37,-38,-39,19,19,19,-2,-11,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,-42,19,-43,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,19,-41,-44,19,19,-50,-19,19,-9,19,-8,-17,19,-18,]),'$end':([1,2,3,4,5,6,7,9,10,12,13,14,15,16,20,21,39,45,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,63,64,67,70,78,80,84,],[0,-1,-3,-4,-5,-6,-7,-40,-20,-35,-36,-37,-38,-39,-2,-11,-42,-10,-43,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-41,-44,-50,-9,-8,-17,-18,]),'RBRACE':([3,4,5,6,7,9,10,12,13,14,15,16,20,21,39,45,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,63,64,67,70,78,80,81,84,],[-3,-4,-5,-6,-7,-40,-20,-35,-36,-37,-38,-39,-2,-11,-42,-10,-43,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-41,-44,-50,-9,-8,-17,84,-18,]),'PLUS':([9,10,12,13,14,15,16,38,39,42,43,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,63,64,67,70,74,76,78,84,],[-40,23,-35,-36,-37,-38,-39,23,-42,23,23,23,-21,-22,-23,-24,-25,23,23,23,23,23,23,23,23,23,-41,-44,-50,23,23,23,23,-18,]),'MINUS':([9,10,12,13,14,15,16,38,39,42,43,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,63,64,67,70,74,76,78,84,],[-40,24,-35,-36,-37,-38,-39,24,-42,24,24,24,-21,-22,-23,-24,-25,24,24,24,24,24,24,24,24,24,-41,-44,-50,24,24,24,24,-18,]),'TIMES':([9,10,12,13,14,15,16,38,39,42,43,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,63,64,67,70,74,76,78,84,],[-40,25,-35,-36,-37,-38,-39,25,-42,25,25,25,25,25,-23,-24,-25,25,25,25,25,25,25,25,25,25,-41,-44,-50,25,25,25,25,-18,]),'DIVIDE':([9,10,12,13,14,15,16,38,39,42,43,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,63,64,67,70,74,76,78,84,],[-40,26,-35,-36,-37,-38,-39,26,-42,26,26,26,26,26,-23,-24,-25,26,26,26,26,26,26,26,26,26,-41,-44,-50,26,26,26,26,-18,]),'MOD':([9,10,12,13,14,15,16,38,39,42,43,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,63,64,67,70,74,76,78,84,],[-40,27,-35,-36,-37,-38,-39,27,-42,27,27,27,27,27,-23,-24,-25,27,27,27,27,27,27,27,27,27,-41,-44,-50,27,27,27,27,-18,]),'GT':([9,10,12,13,14,15,16,38,39,42,43,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,63,64,67,70,74,76,78,84,],[-40,28,-35,-36,-37,-38,-39,28,-42,28,28,28,-21,-22,-23,-24,-25,-26,-27,-28,-29,28,28,28,28,28,-41,-44,-50,28,28,28,28,-18,]),'LT':([9,10,12,13,14,15,16,38,39,42,43,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,63,64,67,70,74,76,78,84,],[-40,29,-35,-36,-37,-38,-39,29,-42,29,29,29,-21,-22,-23,-24,-25,-26,-27,-28,-29,29,29,29,29,29,-41,-44,-50,29,29,29,29,-18,]),'GE':([9,10,12,13,14,15,16,38,39,42,43,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,63,64,67,70,74,76,78,84,],[-40,30,-35,-36,-37,-38,-39,30,-42,30,30,30,-21,-22,-23,-24,-25,-26,-27,-28,-29,30,30,30,30,30,-41,-44,-50,30,30,30,30,-18,]),'LE':([9,10,12,13,14,15,16,38,39,42,43,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,63,64,67,70,74,76,78,84,],[-40,31,-35,-36,-37,-38,-39,31,-42,31,31,31,-21,-22,-23,-24,-25,-26,-27,-28,-29,31,31,31,31,31,-41,-44,-50,31,31,31,31,-18,]),'EQ':([9,10,12,13,14,15,16,38,39,42,43,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,63,64,67,70,74,76,78,84,],[-40,32,-35,-36,-37,-38,-39,32,-42,32,32,32,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,32,32,32,-41,-44,-50,32,32,32,32,-18,]),'NE':([9,10,12,13,14,15,16,38,39,42,43,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,63,64,67,70,74,76,78,84,],[-40,33,-35,-36,-37,-38,-39,33,-42,33,33,33,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,33,33,33,-41,-44,-50,33,33,33,33,-18,]),'AND':([9,10,12,13,14,15,16,38,39,42,43,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,63,64,67,70,74,76,78,84,],[-40,34,-35,-36,-37,-38,-39,34,-42,34,34,34,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,34,34,-41,-44,-50,34,34,34,34,-18,]),'OR':([9,10,12,13,14,15,16,38,39,42,43,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,63,64,67,70,74,76,78,84,],[-40,35,-35,-36,-37,-38,-39,35,-42,35,35,35,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,35,-41,-44,-50,35,35,35,35,-18,]),'DOTDOTDOT':([9,10,12,13,14,15,16,38,39,42,43,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,63,64,67,70,74,76,78,84,],[-40,36,-35,-36,-37,-38,-39,36,-42,36,36,36,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,36,-41,-44,-50,36,36,36,36,-18,]),'RPAREN':([9,12,13,14,15,16,38,39,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,63,64,67,84,],[-40,-35,-36,-37,-38,-39,63,-42,-43,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-41,-44,-50,-18,]),'COLON':([9,12,13,14,15,16,21,39,42,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,63,64,67,72,79,82,84,86,],[-40,-35,-36,-37,-38,-39,46,-42,66,-43,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-41,-44,-50,-14,83,-15,-18,-16,]),'RBRACKET':([9,12,13,14,15,16,18,39,40,41,42,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,63,64,67,72,75,76,79,82,84,85,86,],[-40,-35,-36,-37,-38,-39,-49,-42,64,-48,-46,-43,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-41,-44,-50,-14,-47,-45,82,-15,-18,86,-16,]),'COMMA':([9,12,13,14,15,16,18,39,40,41,42,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,63,64,67,75,76,84,],[-40,-35,-36,-37,-38,-39,-49,-42,65,-48,-46,-43,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-41,-44,-50,-47,-45,-18,]),'LBRACE':([9,12,13,14,15,16,39,43,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,63,64,67,74,84,],[-40,-35,-36,-37,-38,-39,-42,68,-43,-21,-22,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-41,-44,-50,68,-18,]),'LAMBDA_IN':([9,],[22,]),'error':([17,],[39,]),'ASSIGN':([21,44,71,72,82,86,],[45,69,-12,-14,-15,-16,]),'IN':([37,],[62,]),}
-
-_lr_action = {}
-for _k, _v in _lr_action_items.items():
-   for _x,_y in zip(_v[0],_v[1]):
-      if not _x in _lr_action:  _lr_action[_x] = {}
-      _lr_action[_x][_k] = _y
-del _lr_action_items
-
-_lr_goto_items = {'program':([0,],[1,]),'statements':([0,77,],[2,81,]),'statement':([0,2,77,81,],[3,20,3,20,]),'decl_stmt':([0,2,77,81,],[4,4,4,4,]),'expr_stmt':([0,2,77,81,],[5,5,5,5,]),'for_stmt':([0,2,77,81,],[6,6,6,6,]),'expression':([0,2,17,18,19,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,45,62,65,66,69,77,81,],[10,10,38,42,43,47,48,49,50,51,52,53,54,55,56,57,58,59,60,61,70,74,42,76,78,10,10,]),'bracket_items':([18,],[40,]),'bracket_item':([18,65,],[41,75,]),'decl_type':([21,],[44,]),'block':([43,74,],[67,80,]),'simple_type':([46,73,83,],[71,79,85,]),'block_enter':([68,],[77,]),}
-
-_lr_goto = {}
-for _k, _v in _lr_goto_items.items():
-   for _x, _y in zip(_v[0], _v[1]):
-       if not _x in _lr_goto: _lr_goto[_x] = {}
-       _lr_goto[_x][_k] = _y
-del _lr_goto_items
-_lr_productions = [
-  ("S' -> program","S'",1,None,None,None),
-  ('program -> statements','program',1,'p_program','analizador_swift.py',199),
-  ('statements -> statements statement','statements',2,'p_statements_multiple','analizador_swift.py',203),
-  ('statements -> statement','statements',1,'p_statements_single','analizador_swift.py',207),
-  ('statement -> decl_stmt','statement',1,'p_statement','analizador_swift.py',211),
-  ('statement -> expr_stmt','statement',1,'p_statement','analizador_swift.py',212),
-  ('statement -> for_stmt','statement',1,'p_statement','analizador_swift.py',213),
-  ('statement -> SEMICOLON','statement',1,'p_statement','analizador_swift.py',214),
-  ('decl_stmt -> LET ID decl_type ASSIGN expression','decl_stmt',5,'p_decl_stmt','analizador_swift.py',222),
-  ('decl_stmt -> LET ID ASSIGN expression','decl_stmt',4,'p_decl_stmt','analizador_swift.py',223),
-  ('decl_stmt -> LET ID ASSIGN','decl_stmt',3,'p_decl_stmt_incomplete_assign','analizador_swift.py',272),
-  ('decl_stmt -> LET ID','decl_stmt',2,'p_decl_stmt_onlyid','analizador_swift.py',280),
-  ('decl_type -> COLON simple_type','decl_type',2,'p_decl_type','analizador_swift.py',288),
-  ('decl_type -> <empty>','decl_type',0,'p_decl_type','analizador_swift.py',289),
-  ('simple_type -> ID','simple_type',1,'p_simple_type_id','analizador_swift.py',299),
-  ('simple_type -> LBRACKET simple_type RBRACKET','simple_type',3,'p_simple_type_list','analizador_swift.py',306),
-  ('simple_type -> LBRACKET simple_type COLON simple_type RBRACKET','simple_type',5,'p_simple_type_dict','analizador_swift.py',311),
-  ('for_stmt -> FOR ID IN expression block','for_stmt',5,'p_for_stmt','analizador_swift.py',317),
-  ('block -> LBRACE block_enter statements RBRACE','block',4,'p_block','analizador_swift.py',325),
-  ('block_enter -> <empty>','block_enter',0,'p_block_enter','analizador_swift.py',330),
-  ('expr_stmt -> expression','expr_stmt',1,'p_expr_stmt','analizador_swift.py',335),
-  ('expression -> expression PLUS expression','expression',3,'p_expression_binop','analizador_swift.py',339),
-  ('expression -> expression MINUS expression','expression',3,'p_expression_binop','analizador_swift.py',340),
-  ('expression -> expression TIMES expression','expression',3,'p_expression_binop','analizador_swift.py',341),
-  ('expression -> expression DIVIDE expression','expression',3,'p_expression_binop','analizador_swift.py',342),
-  ('expression -> expression MOD expression','expression',3,'p_expression_binop','analizador_swift.py',343),
-  ('expression -> expression GT expression','expression',3,'p_expression_compare','analizador_swift.py',350),
-  ('expression -> expression LT expression','expression',3,'p_expression_compare','analizador_swift.py',351),
-  ('expression -> expression GE expression','expression',3,'p_expression_compare','analizador_swift.py',352),
-  ('expression -> expression LE expression','expression',3,'p_expression_compare','analizador_swift.py',353),
-  ('expression -> expression EQ expression','expression',3,'p_expression_compare','analizador_swift.py',354),
-  ('expression -> expression NE expression','expression',3,'p_expression_compare','analizador_swift.py',355),
-  ('expression -> expression AND expression','expression',3,'p_expression_logic_binary','analizador_swift.py',359),
-  ('expression -> expression OR expression','expression',3,'p_expression_logic_binary','analizador_swift.py',360),
-  ('expression -> expression DOTDOTDOT expression','expression',3,'p_expression_range','analizador_swift.py',364),
-  ('expression -> INTEGER','expression',1,'p_expression_literal','analizador_swift.py',376),
-  ('expression -> FLOAT','expression',1,'p_expression_literal','analizador_swift.py',377),
-  ('expression -> BOOLEAN','expression',1,'p_expression_literal','analizador_swift.py',378),
-  ('expression -> STRING','expression',1,'p_expression_literal','analizador_swift.py',379),
-  ('expression -> CHARACTER','expression',1,'p_expression_literal','analizador_swift.py',380),
-  ('expression -> ID','expression',1,'p_expression_id','analizador_swift.py',386),
-  ('expression -> LPAREN expression RPAREN','expression',3,'p_expression_group','analizador_swift.py',404),
-  ('expression -> LPAREN error','expression',2,'p_expression_group_lerror','analizador_swift.py',408),
-  ('expression -> ID LAMBDA_IN expression','expression',3,'p_expression_lambda','analizador_swift.py',418),
-  ('expression -> LBRACKET bracket_items RBRACKET','expression',3,'p_expression_bracket','analizador_swift.py',430),
-  ('bracket_item -> expression COLON expression','bracket_item',3,'p_bracket_item_kv','analizador_swift.py',469),
-  ('bracket_item -> expression','bracket_item',1,'p_bracket_item_expr','analizador_swift.py',473),
-  ('bracket_items -> bracket_items COMMA bracket_item','bracket_items',3,'p_bracket_items_multiple','analizador_swift.py',477),
-  ('bracket_items -> bracket_item','bracket_items',1,'p_bracket_items_single','analizador_swift.py',481),
-  ('bracket_items -> <empty>','bracket_items',0,'p_bracket_items_empty','analizador_swift.py',485),
-  ('expression -> IF expression block','expression',3,'p_expression_if','analizador_swift.py',492),
-]
@@ -0,0 +1,166 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from comun.plegado import operar, NO_PLEGABLE, DivisionPorCero
+from comun.colecciones import ColeccionLiteral
+from semantico_ayman import semantic_errors, tipos_numericos
+
+# plegado de constantes: corre entre el parser y verificar_programa.
+# ('binop', op, literal, literal, None) -> ('literal', tipo, valor) con el tipo
+# que le daria tipo_binop; lo que tipo_binop marcaria como error no se toca.
+
+estadisticas = {"nodos_antes": 0, "nodos_despues": 0, "plegados": 0, "ms": 0.0}
+
+HOJAS = frozenset(('literal', 'id'))
+
+def valor_python(lit):
+    tipo, valor = lit[1], lit[2]
+    if tipo == "String":
+        return valor[1:-1]          # el lexer deja las comillas
+    if tipo in ("Int", "Float", "Double", "Bool"):
+        return valor
+    return NO_PLEGABLE
+
+def literal_ayman(tipo, valor):
+    if tipo == "String":
+        return ('literal', tipo, '"' + valor + '"')
+    if tipo in ("Float", "Double"):
+        valor = float(valor)
+    return ('literal', tipo, valor)
+
+tipos_plegados = {}     # (op, t1, t2) -> tipo_plegado ya calculado
+
+def tipo_plegado(op, t1, t2):
+    if t1 in tipos_numericos and t2 in tipos_numericos:
+        if "Double" in (t1,t2): return "Double"
+        if "Float" in (t1,t2): return "Float"
+        return "Int"
+    if op=="+" and t1==t2=="String":
+        return "String"
+    return None
+
+def plegar_binop(nodo):
+    _, op, izq, der, _ = nodo
+    if izq[0] != 'literal' or der[0] != 'literal':
+        return nodo
+    clave = (op, izq[1], der[1])
+    tipo = tipos_plegados.get(clave, NO_PLEGABLE)
+    if tipo is NO_PLEGABLE:
+        tipo = tipos_plegados[clave] = tipo_plegado(*clave)
+    a, b = valor_python(izq), valor_python(der)
+    if tipo is None or a is NO_PLEGABLE or b is NO_PLEGABLE:
+        return nodo
+    try:
+        valor = operar(op, a, b)
+    except DivisionPorCero:
+        semantic_errors.reportar('PLG001', izquierdo=izq[2], operador=op, derecho=der[2])
+        return nodo
+    if valor is NO_PLEGABLE:
+        return nodo
+    estadisticas["plegados"] += 1
+    estadisticas["nodos_despues"] -= 2
+    return literal_ayman(tipo, valor)
+
+def plegar_comparacion(nodo):
+    kind, izq, op, der, _ = nodo
+    if izq[0] != 'literal' or der[0] != 'literal':
+        return nodo
+    a, b = valor_python(izq), valor_python(der)
+    if a is NO_PLEGABLE or b is NO_PLEGABLE:
+        return nodo
+    if (isinstance(a, str) or isinstance(b, str)) and type(a) is not type(b):
+        return nodo                 # texto con otro tipo: no se pliega, lo reporta el semantico
+    if isinstance(a, str) and ('\\' in a or '\\' in b):
+        return nodo                 # con escapes el texto crudo no se compara igual
+    if kind == 'logic' and not (izq[1] == der[1] == "Bool"):
+        return nodo
+    valor = operar(op, a, b)
+    if valor is NO_PLEGABLE:
+        return nodo
+    estadisticas["plegados"] += 1
+    estadisticas["nodos_despues"] -= 2
+    return ('literal', "Bool", valor)
+
+def plegar_nary(nodo):
+    # solo el prefijo de literales, para no cambiar el orden de evaluacion
+    _, op, operandos, tipo = nodo
+    acumulado, k = operandos[0], 1
+    while k < len(operandos) and acumulado[0] == 'literal' and operandos[k][0] == 'literal':
+        if op in ('&&','||'):
+            plegado = plegar_comparacion(('logic', acumulado, op, operandos[k], 'Bool'))
+        else:
+            plegado = plegar_binop(('binop', op, acumulado, operandos[k], None))
+        if plegado[0] != 'literal':
+            break
+        estadisticas["nodos_despues"] += 1      # plegar_binop descuenta el nodo binario temporal
+        acumulado, k = plegado, k + 1
+    if k == 1:
+        return nodo
+    if k == len(operandos):
+        estadisticas["nodos_despues"] -= 1
+        return acumulado
+    return ('nary', op, [acumulado] + operandos[k:], tipo)
+
+def plegar(nodo):
+    if type(nodo) is not tuple:         # casi todo son tuplas: lo demas se mira solo aca
+        if isinstance(nodo, list):
+            nuevo = [plegar(x) for x in nodo]
+            return nuevo if any(n is not v for n, v in zip(nuevo, nodo)) else nodo
+        if isinstance(nodo, ColeccionLiteral):
+            # elementos de [ ... ]: los literales ya estan en buffers, solo se pliegan las expresiones
+            return nodo if nodo.solo_literales() else nodo.mapear_nodos(plegar)
+        if not isinstance(nodo, tuple):
+            return nodo
+    estadisticas["nodos_antes"] += 1
+    kind = nodo[0] if nodo else None
+    if kind == 'literal' or kind == 'id':
+        return nodo
+    if kind == 'binop':
+        # las hojas se cuentan aca mismo, sin la llamada recursiva
+        izq, der = nodo[2], nodo[3]
+        if type(izq) is tuple and izq[0] in HOJAS: estadisticas["nodos_antes"] += 1
+        else: izq = plegar(izq)
+        if type(der) is tuple and der[0] in HOJAS: estadisticas["nodos_antes"] += 1
+        else: der = plegar(der)
+        if izq is not nodo[2] or der is not nodo[3]:
+            nodo = ('binop', nodo[1], izq, der, nodo[4])
+        return plegar_binop(nodo)
+    hijos = tuple(plegar(x) if isinstance(x, (tuple, list, ColeccionLiteral)) else x for x in nodo)
+    if any(h is not v for h, v in zip(hijos, nodo)):
+        nodo = hijos
+    if kind in ('cmp', 'logic'):
+        return plegar_comparacion(nodo)
+    if kind == 'nary':
+        return plegar_nary(nodo)
+    return nodo
+
+def plegar_programa(ast, plazo=None):
+    """AST con las expresiones constantes ya resueltas; deja los numeros en `estadisticas`.
+    Con plazo (comun.plazo.Plazo) se revisa en cada sentencia y puede lanzar PlazoAgotado."""
+    estadisticas.update(nodos_antes=0, nodos_despues=0, plegados=0, ms=0.0)
+    if ast is None:
+        return None
+    inicio = time.perf_counter()
+    if plazo is None:
+        ast = plegar(ast)
+    else:
+        estadisticas["nodos_antes"] += 1
+        sentencias = []
+        for st in ast[1]:
+            plazo.revisar()
+            sentencias.append(plegar(st))
+        ast = ('program', sentencias)
+    estadisticas["ms"] = (time.perf_counter() - inicio) * 1000
+    estadisticas["nodos_despues"] += estadisticas["nodos_antes"]
+    return ast
+
+def plegar_sentencia(st):
+    """Para el analisis en flujo: pliega una sentencia de nivel superior y suma a `estadisticas`."""
+    antes = estadisticas["nodos_antes"]
+    inicio = time.perf_counter()
+    st = plegar(st)
+    estadisticas["ms"] += (time.perf_counter() - inicio) * 1000
+    estadisticas["nodos_despues"] += estadisticas["nodos_antes"] - antes
+    return st
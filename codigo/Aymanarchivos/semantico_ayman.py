@@ -0,0 +1,310 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from comun.simbolos import Ambito
+from comun.colecciones import ColeccionLiteral, agregar_elemento
+from comun.diagnosticos import ListaDiagnosticos
+
+# semantico: segunda fase, recorre el AST que arma analizador_swift.py
+# (el parser ya no toca la tabla de simbolos) y devuelve el mismo arbol con los tipos llenos
+
+# catalogo de mensajes: los errores se guardan como (codigo, argumentos) y el
+# texto se arma al leer semantic_errors; los repetidos quedan en una sola entrada
+MENSAJES = {
+    'SEM001': "[SEM ERROR] Variable '{nombre}' ya declarada en este scope",
+    'SEM002': "[SEM ERROR] Operación lógica inválida: {izquierdo} {operador} {derecho}",
+    'SEM003': "[SEM ERROR] Tipos incompatibles: {izquierdo} {operador} {derecho}",
+    'SEM004': "[SEM ERROR] Tipo desconocido '{tipo}'",
+    'SEM005': "[SEM ERROR] Declaración incompleta: 'let {nombre} =' sin expresión",
+    'SEM006': "[SEM ERROR] Declaración incompleta: 'let {nombre}' sin tipo ni asignación",
+    'SEM007': "[SEM ERROR] Variable '{nombre}' declarada sin valor",
+    'SEM008': "[SEM ERROR] Tipo de diccionario no permitido: [{clave}:{valor}]",
+    'SEM009': "[SEM ERROR] Tipo de clave incompatible: '{tipo}' != '{esperado}'{tramo}",
+    'SEM010': "[SEM ERROR] Tipo de valor incompatible: '{tipo}' != '{esperado}'{tramo}",
+    'SEM011': "[SEM ERROR] Variable '{nombre}' usada sin declarar",
+    'SEM012': "[SEM ERROR] Mezcla de pares y elementos en literal de corchetes no permitida",
+    'SEM013': "[SEM ERROR] Condición no booleana en IF: {tipo}",
+    'SEM014': "[SEM ERROR] Paréntesis sin cerrar en expresión",
+    'SEM015': "[SEM ERROR] Clave de diccionario incompatible: {tipo} != {esperado}{tramo}",
+    'SEM016': "[SEM ERROR] Valor de diccionario incompatible: {tipo} != {esperado}{tramo}",
+    'SEM017': "[SEM ERROR] Tipo de clave no permitido en Swift: {tipo}",
+    'SEM018': "[SEM ERROR] Tipo de valor no permitido en Swift: {tipo}",
+    'PLG001': "[SEM ERROR] División entre cero: {izquierdo} {operador} {derecho}",
+}
+
+tabla_simbolos = {"scopes":[Ambito()]}
+semantic_errors = ListaDiagnosticos('semantico', MENSAJES)
+tipos_nativos = {"Int","Float","Double","Bool","String","Character","Any"}
+
+def reiniciar():
+    tabla_simbolos["scopes"] = [Ambito()]
+    tabla_simbolos["scopes"][0].declarar("print", "BuiltInFunction")
+    tabla_simbolos["scopes"][0].declarar("readLine", "BuiltInFunction")
+    semantic_errors.clear()
+
+reiniciar()
+
+def abrir_scope():
+    tabla_simbolos["scopes"].append(Ambito())
+
+def cerrar_scope():
+    if len(tabla_simbolos["scopes"])>1:
+        tabla_simbolos["scopes"].pop()
+
+def agregar_variable(nombre, tipo):
+    scope = tabla_simbolos["scopes"][-1]
+    if not scope.declarar(nombre, tipo):
+        semantic_errors.reportar('SEM001', nombre=nombre)
+
+def buscar_variable(nombre):
+    for s in reversed(tabla_simbolos["scopes"]):
+        tipo = s.tipo_de(nombre)
+        if tipo is not None:
+            return tipo
+    return None
+def nodo_literal(tipo, valor):
+    return ('literal', tipo, valor)
+
+def literal_de(expr):
+    # (tipo, valor) si expr es un literal que puede ir en el buffer de una ColeccionLiteral
+    if expr[0] == 'literal':
+        return (expr[1], expr[2])
+    return None
+
+def reportar_discrepancias(coleccion, esperado, codigo):
+    # un solo error por cada tramo seguido de elementos con el mismo tipo equivocado
+    if esperado == "Any":
+        return
+    for tipo, inicio, cantidad in coleccion.tramos_por_tipo(get_tipo):
+        if tipo != esperado:
+            tramo = f" ({cantidad} entradas seguidas desde la posición {inicio})" if cantidad > 1 else ""
+            semantic_errors.reportar(codigo, tipo=tipo, esperado=esperado, tramo=tramo)
+
+#divide la tabla con todos los tipos
+tipos_numericos = {"Int","Float","Double"}
+tipos_booleanos = {"Bool"}
+tipos_textuales = {"String","Character"}
+
+def tipo_binop(op, t1, t2):
+    if t1=="Unknown" or t2=="Unknown":
+        return "Unknown"
+    if op in ("<","<=",">=",">","==","!="):
+        return "Bool"
+    if op in ("&&","||"):
+        if t1==t2=="Bool":
+            return "Bool"
+        semantic_errors.reportar('SEM002', izquierdo=t1, operador=op, derecho=t2)
+        return "Unknown"
+    if op in ("+","-","*","/","%"):
+        if t1 in tipos_numericos and t2 in tipos_numericos:
+            if "Double" in (t1,t2): return "Double"
+            if "Float" in (t1,t2): return "Float"
+            return "Int"
+        if op=="+" and t1==t2=="String":
+            return "String"
+    semantic_errors.reportar('SEM003', izquierdo=t1, operador=op, derecho=t2)
+    return "Unknown"
+
+def get_tipo(expr):
+    if expr is None: return "Unknown"
+    if isinstance(expr, tuple):
+        kind = expr[0]
+        if kind=="literal": return expr[1]
+        if kind=="id": return expr[2] or "Unknown"
+        if kind=="binop": return expr[4] or "Unknown"
+        if kind=="nary": return expr[3] or "Unknown"
+        if kind == 'logic':
+            return "Bool"
+        if kind == 'cmp':
+            return "Bool"
+        if kind in ("lambda","lambda_simple"): return expr[3] or "Unknown"
+        if kind=="dict": return expr[2] or "Unknown"
+        if kind=="list": return expr[2] or "Unknown"
+        if kind=="range": return expr[3] or "Unknown"
+        if kind=="call": return expr[3] or "Unknown"
+    return "Unknown"
+
+def type_to_string(struct_type):
+    """Convierte la estructura de tipo ('id', 'Int') o ('array','T') o ('dict','K','V') a una cadena legible."""
+    if struct_type is None:
+        return "Unknown"
+    if isinstance(struct_type, tuple):
+        if struct_type[0] == 'id':
+            return struct_type[1]
+        if struct_type[0] in ('array', 'list'):
+            return f"[{type_to_string(struct_type[1])}]"
+        if struct_type[0] == 'dict':
+            return f"[{type_to_string(struct_type[1])}:{type_to_string(struct_type[2])}]"
+    return str(struct_type)
+
+def verificar_tipo_anotado(struct):
+    # antes lo hacia p_simple_type_id mientras se parseaba
+    if isinstance(struct, tuple):
+        for parte in struct[1:]:
+            verificar_tipo_anotado(parte)
+    elif struct not in tipos_nativos:
+        semantic_errors.reportar('SEM004', tipo=struct)
+
+# ---------------- RECORRIDO ----------------
+def verificar_programa(ast, plazo=None):
+    """Fase semantica completa: devuelve ('program', sentencias) con los tipos resueltos.
+    Con plazo (comun.plazo.Plazo) se revisa en cada sentencia y puede lanzar PlazoAgotado."""
+    if ast is None:
+        return None
+    if plazo is None:
+        return ('program', [verificar_sentencia(st) for st in ast[1]])
+    sentencias = []
+    for st in ast[1]:
+        plazo.revisar()
+        sentencias.append(verificar_sentencia(st))
+    return ('program', sentencias)
+
+def verificar_sentencia(st):
+    kind = st[0]
+    if kind == 'let_decl':
+        return verificar_let(st)
+    if kind in ('let_incomplete', 'let_invalid'):
+        nombre = st[1]
+        if kind == 'let_incomplete':
+            semantic_errors.reportar('SEM005', nombre=nombre)
+        else:
+            semantic_errors.reportar('SEM006', nombre=nombre)
+        agregar_variable(nombre, "Unknown")
+        return st
+    if kind == 'for':
+        # la variable del for vive dentro del cuerpo, no en el scope de afuera
+        iterable = verificar_expr(st[2])
+        abrir_scope()
+        agregar_variable(st[1], "Int")
+        cuerpo = verificar_bloque(st[3])
+        cerrar_scope()
+        return ('for', st[1], iterable, cuerpo, st[4])
+    if kind == 'empty':
+        return st
+    return verificar_expr(st)
+
+def verificar_bloque(bloque):
+    abrir_scope()
+    contenido = [verificar_sentencia(st) for st in bloque[1]]
+    cerrar_scope()
+    return ('block', contenido)
+
+def verificar_let(st):
+    _, nombre, tipo_anot, expr, linea = st
+    if expr is None:
+        semantic_errors.reportar('SEM007', nombre=nombre)
+        tipo_final = "Unknown"
+    else:
+        expr = verificar_expr(expr)
+        tipo_expr = get_tipo(expr)
+        tipo_final = tipo_expr
+
+        if tipo_anot:
+            struct = tipo_anot[1]
+            verificar_tipo_anotado(struct)
+
+            if isinstance(struct, tuple) and struct[0] == 'dict' and isinstance(expr, tuple) and expr[0] == 'dict':
+                tkey = struct[1]
+                tval = struct[2]
+                allowed = [
+                    ("String","Int"),
+                    ("String","Any"),
+                    ("Any","Any")
+                ]
+                if (tkey, tval) not in allowed:
+                    semantic_errors.reportar('SEM008', clave=tkey, valor=tval)
+                claves, valores = expr[1]
+                reportar_discrepancias(claves, tkey, 'SEM009')
+                reportar_discrepancias(valores, tval, 'SEM010')
+                tipo_final = f"Dictionary({tkey},{tval})"
+            else:
+                tipo_final = type_to_string(struct)
+
+    agregar_variable(nombre, tipo_final)
+    return ('let_decl', nombre, tipo_final, expr, linea)
+
+def verificar_expr(expr):
+    kind = expr[0]
+    if kind == 'binop':
+        left = verificar_expr(expr[2]); right = verificar_expr(expr[3]); op = expr[1]
+        return ('binop', op, left, right, tipo_binop(op, get_tipo(left), get_tipo(right)))
+    if kind == 'nary':
+        # igual que la cadena binaria ((a op b) op c) ..., en un solo bucle
+        op = expr[1]
+        operandos = [verificar_expr(expr[2][0])]
+        tipo = get_tipo(operandos[0])
+        for e in expr[2][1:]:
+            operando = verificar_expr(e)
+            operandos.append(operando)
+            if op not in ('&&','||'):
+                tipo = tipo_binop(op, tipo, get_tipo(operando))
+        return ('nary', op, operandos, 'Bool' if op in ('&&','||') else tipo)
+    if kind in ('cmp', 'logic'):
+        return (kind, verificar_expr(expr[1]), expr[2], verificar_expr(expr[3]), 'Bool')
+    if kind == 'range':
+        left = verificar_expr(expr[1]); right = verificar_expr(expr[2])
+        # si ambos son números, tratamos el rango como tipo Range
+        if get_tipo(left) in tipos_numericos and get_tipo(right) in tipos_numericos:
+            tipo = "Range"
+        else:
+            tipo = "Unknown"
+        return ('range', left, right, tipo)
+    if kind == 'id':
+        nombre = expr[1]
+        tipo = buscar_variable(nombre)
+        if tipo is None:
+            semantic_errors.reportar('SEM011', nombre=nombre)
+            tipo = "Unknown"
+        return ('id', nombre, tipo, expr[3])
+    if kind == 'lambda_simple':
+        param = expr[1][0]
+        abrir_scope()
+        agregar_variable(param, "Unknown")
+        cuerpo = verificar_expr(expr[2])
+        tipo_ret = get_tipo(cuerpo)
+        cerrar_scope()
+        return ('lambda_simple', expr[1], cuerpo, tipo_ret)
+    if kind == 'dict':
+        return verificar_dict(expr)
+    if kind == 'list':
+        return ('list', expr[1].mapear_nodos(verificar_expr), 'List')
+    if kind == 'mixed_bracket':
+        semantic_errors.reportar('SEM012')
+        items = [('kv', verificar_expr(it[1]), verificar_expr(it[2])) if it[0] == 'kv' else ('expr', verificar_expr(it[1]))
+                 for it in expr[1]]
+        return ('mixed_bracket', items, "Mixed")
+    if kind == 'if':
+        cond = verificar_expr(expr[1])
+        if get_tipo(cond) != "Bool":
+            semantic_errors.reportar('SEM013', tipo=get_tipo(cond))
+        return ('if', cond, verificar_bloque(expr[2]), expr[3])
+    if kind == 'error_expr':
+        semantic_errors.reportar('SEM014')
+        return expr
+    # literal, type_id
+    return expr
+
+def verificar_dict(expr):
+    claves, valores = expr[1]
+    if not (claves.solo_literales() and valores.solo_literales()):
+        # hay expresiones: se verifican en el orden de siempre (clave, valor, clave, valor...)
+        nuevas_claves, nuevos_valores = ColeccionLiteral(), ColeccionLiteral()
+        for k, v in zip(claves.elementos(nodo_literal), valores.elementos(nodo_literal)):
+            k = verificar_expr(k); v = verificar_expr(v)
+            agregar_elemento(nuevas_claves, k, literal_de(k))
+            agregar_elemento(nuevos_valores, v, literal_de(v))
+        claves, valores = nuevas_claves, nuevos_valores
+    # infer types
+    tkey = claves.tipo_en(0, get_tipo)
+    tval = valores.tipo_en(0, get_tipo)
+
+    if tkey not in tipos_nativos:
+        semantic_errors.reportar('SEM017', tipo=tkey)
+    if tval not in tipos_nativos:
+        semantic_errors.reportar('SEM018', tipo=tval)
+    # homogeneidad por tramos: los literales ya vienen agrupados por tipo
+    reportar_discrepancias(claves, tkey, 'SEM015')
+    reportar_discrepancias(valores, tval, 'SEM016')
+
+    return ('dict', (claves, valores), f"Dictionary({tkey},{tval})")
@@ -0,0 +1,391 @@
+import hashlib
+import marshal
+import math
+import os
+import re
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from semantico_ayman import nodo_literal
+
+# transpilador: el AST ya verificado (el de analyze, sin errores) -> codigo Python -> code object.
+# El programa queda dentro de una funcion (_programa) para que las variables sean locales
+# de CPython. Cada variable lleva el prefijo v_ para no chocar con nombres de Python, y si
+# un bloque vuelve a declarar una que se ve desde afuera lleva ademas un numero.
+# Los rangos con limites Int son range(), las lambdas son lambda y las listas y
+# diccionarios son literales de Python.
+# La gramatica no tiene llamadas: print(x) llega como dos sentencias (el id print y la
+# expresion entre parentesis) y aqui se juntan; readLine() con los parentesis vacios no
+# parsea, asi que readLine sin parentesis es la llamada.
+# Los tipos del AST no alcanzan para decidir la operacion (la variable del for siempre
+# queda Int y una anotacion no se compara con el valor): dividir y el resto van por
+# funciones del entorno que miran los valores, y los tipos que se usan aqui (para no
+# pasar por texto() en print o convertir Int a Double) se recalculan con tipo_de.
+
+class ErrorTranspilacion(Exception):
+    """Algo que la gramatica acepta pero que no tiene traduccion (un if usado como valor, ...)."""
+
+    def __init__(self, mensaje, linea=None):
+        super().__init__(f"[TRANS ERROR] {mensaje}" + (f" en linea {linea}" if linea else ""))
+        self.linea = linea
+
+class ErrorEjecucion(Exception):
+    """Lo que en Swift detiene el programa (dividir un Int entre cero, un rango al reves, ...)."""
+
+    def __init__(self, mensaje, linea=None):
+        super().__init__(f"[RUN ERROR] {mensaje}" + (f" en linea {linea}" if linea else ""))
+        self.mensaje = mensaje
+        self.linea = linea
+
+
+# ---------------- ENTORNO DE EJECUCION ----------------
+# lo que usa el codigo generado, ademas de range y print
+class Intervalo:
+    """Un rango cerrado con algun limite que no es Int (se puede imprimir, no recorrer)."""
+    __slots__ = ('desde', 'hasta')
+
+    def __init__(self, desde, hasta):
+        self.desde, self.hasta = desde, hasta
+
+    def __iter__(self):
+        raise ErrorEjecucion(f"el rango {self} no se puede recorrer (sus limites no son Int)")
+
+    def __str__(self):
+        return f"{texto(self.desde)}...{texto(self.hasta)}"
+
+def texto(valor, anidado=False):
+    """Como lo imprime print() de Swift."""
+    tipo = type(valor)
+    if tipo is str: return '"' + valor + '"' if anidado else valor
+    if valor is True: return 'true'
+    if valor is False: return 'false'
+    if valor is None: return 'nil'
+    if tipo is list: return '[' + ', '.join(texto(v, True) for v in valor) + ']'
+    if tipo is dict:
+        return '[' + ', '.join(f"{texto(k, True)}: {texto(v, True)}" for k, v in valor.items()) + ']' if valor else '[:]'
+    if tipo is tuple: return f"(key: {texto(valor[0], True)}, value: {texto(valor[1], True)})"
+    if tipo is range: return f"{valor.start}...{valor.stop - 1}"
+    if callable(valor): return '(Function)'
+    return str(valor)
+
+def dividir(a, b):
+    # Int / Int trunca hacia cero y entre cero detiene el programa; con Double da inf o nan
+    if type(a) is int and type(b) is int:
+        if b == 0: raise ErrorEjecucion("division entera entre cero")
+        q = a // b
+        return q + 1 if q < 0 and q * b != a else q
+    if b == 0: return math.copysign(math.inf, a) * math.copysign(1, b) if a else math.nan
+    return a / b
+
+def resto(a, b):
+    # el signo es el del dividendo, como en Swift
+    if type(a) is int and type(b) is int:
+        if b == 0: raise ErrorEjecucion("resto de una division entera entre cero")
+        r = abs(a) % abs(b)
+        return -r if a < 0 else r
+    return math.fmod(a, b) if b else math.nan
+
+def rango(desde, hasta):
+    if type(desde) is int and type(hasta) is int:
+        if desde > hasta: raise ErrorEjecucion(f"rango invalido {desde}...{hasta}: el limite de abajo es mayor")
+        return range(desde, hasta + 1)
+    return Intervalo(desde, hasta)
+
+def iterar(valor):
+    # un for sobre un diccionario recorre los pares (clave, valor)
+    if type(valor) is dict: return valor.items()
+    if isinstance(valor, (range, list, str, Intervalo)): return valor
+    raise ErrorEjecucion(f"no se puede recorrer {texto(valor, True)}")
+
+def forzar(valor):
+    if valor is None: raise ErrorEjecucion("se encontro nil al desenvolver un Optional")
+    return valor
+
+def lector(entrada):
+    """readLine sobre `entrada`: la linea sin el salto, o nil (None) al final."""
+    def leer_linea():
+        linea = entrada.readline()
+        if not linea: return None
+        return linea[:-1] if linea.endswith('\n') else linea
+    return leer_linea
+
+ENTORNO = {"texto": texto, "dividir": dividir, "resto": resto, "rango": rango,
+           "iterar": iterar, "forzar": forzar}
+
+
+# ---------------- GENERACION ----------------
+OPERADORES_LOGICOS = {'&&': 'and', '||': 'or'}
+# tipos que print muestra igual que str() de Python
+TIPOS_IMPRIMIBLES = {"String", "Character", "Int", "Float", "Double"}
+TIPOS_RECORRIBLES = {"Range", "List", "String"}
+
+def nuevo_contexto():
+    # ambitos: nombre de Swift -> (nombre de Python, tipo que se sabe seguro o None)
+    return {"lineas": [], "origen": [], "ambitos": [{}], "linea": 0}
+
+def emitir_linea(ctx, nivel, codigo, linea=None):
+    if linea: ctx["linea"] = linea
+    ctx["lineas"].append("    " * nivel + codigo)
+    ctx["origen"].append(ctx["linea"])
+
+def buscar(ctx, nombre):
+    for ambito in reversed(ctx["ambitos"]):
+        if nombre in ambito:
+            return ambito[nombre]
+    return None
+
+def declarar(ctx, nombre, tipo):
+    python = "v_" + nombre
+    if buscar(ctx, nombre) is not None:
+        usados = {p for ambito in ctx["ambitos"] for p, _ in ambito.values()}
+        n = 1
+        while f"{python}_{n}" in usados: n += 1
+        python = f"{python}_{n}"
+    ctx["ambitos"][-1][nombre] = (python, tipo)
+    return python
+
+def es_builtin(ctx, st, nombre):
+    return st[0] == 'id' and st[1] == nombre and buscar(ctx, nombre) is None
+
+def es_expresion(st):
+    return st[0] not in ('let_decl', 'let_incomplete', 'let_invalid', 'for', 'empty', 'if')
+
+def tipo_de(ctx, e):
+    """El tipo de e si se sabe seguro (ver arriba), o None."""
+    kind = e[0]
+    if kind == 'literal': return e[1]
+    if kind == 'id':
+        var = buscar(ctx, e[1])
+        return var[1] if var is not None else None
+    if kind in ('cmp', 'logic'): return "Bool"
+    if kind == 'range': return "Range"
+    if kind == 'list': return "List"
+    if kind == 'dict': return "Dictionary"
+    if kind in ('binop', 'nary'):
+        op = e[1]
+        if op in OPERADORES_LOGICOS: return "Bool"
+        tipos = {tipo_de(ctx, x) for x in ((e[2], e[3]) if kind == 'binop' else e[2])}
+        if len(tipos) == 1 and (tipos <= {"Int", "Double", "Float"} or (op == '+' and tipos == {"String"})):
+            return tipos.pop()
+    return None
+
+def generar_bloque(ctx, sentencias, nivel):
+    inicio = len(ctx["lineas"])
+    ctx["ambitos"].append({})
+    i = 0
+    while i < len(sentencias):
+        st = sentencias[i]
+        if es_builtin(ctx, st, 'print'):
+            # print sin la expresion que le sigue es solo nombrar la funcion: no hace nada
+            if i + 1 < len(sentencias) and es_expresion(sentencias[i + 1]):
+                emitir_linea(ctx, nivel, f"print({imprimible(ctx, sentencias[i + 1])})", st[3])
+                i += 1
+        else:
+            generar_sentencia(ctx, st, nivel)
+        i += 1
+    ctx["ambitos"].pop()
+    if len(ctx["lineas"]) == inicio:
+        emitir_linea(ctx, nivel, "pass")
+
+def generar_sentencia(ctx, st, nivel):
+    kind = st[0]
+    if kind == 'let_decl':
+        _, nombre, tipo_final, expr, linea = st
+        valor, tipo = expresion(ctx, expr), tipo_de(ctx, expr)
+        if tipo_final in ("Double", "Float") and tipo == "Int":
+            valor, tipo = f"float({valor})", tipo_final
+        emitir_linea(ctx, nivel, f"{declarar(ctx, nombre, tipo)} = {valor}", linea)
+    elif kind == 'for':
+        _, nombre, iterable, cuerpo, linea = st
+        tipo = tipo_de(ctx, iterable)
+        if iterable[0] == 'range': recorrido = expresion(ctx, iterable)
+        elif tipo in TIPOS_RECORRIBLES: recorrido = expresion(ctx, iterable)
+        elif tipo == "Dictionary": recorrido = f"{expresion(ctx, iterable)}.items()"
+        else: recorrido = f"iterar({expresion(ctx, iterable)})"
+        ctx["ambitos"].append({})
+        variable = declarar(ctx, nombre, {"Range": "Int", "String": "Character"}.get(tipo))
+        emitir_linea(ctx, nivel, f"for {variable} in {recorrido}:", linea)
+        generar_bloque(ctx, cuerpo[1], nivel + 1)
+        ctx["ambitos"].pop()
+    elif kind == 'if':
+        _, cond, cuerpo, linea = st
+        emitir_linea(ctx, nivel, f"if {expresion(ctx, cond)}:", linea)
+        generar_bloque(ctx, cuerpo[1], nivel + 1)
+    elif kind != 'empty':
+        if kind == 'id' and st[3]: ctx["linea"] = st[3]
+        emitir_linea(ctx, nivel, expresion(ctx, st))
+
+def imprimible(ctx, e):
+    valor = expresion(ctx, e)
+    return valor if tipo_de(ctx, e) in TIPOS_IMPRIMIBLES else f"texto({valor})"
+
+def expresion(ctx, e):
+    kind = e[0]
+    if kind == 'literal':
+        return literal_python(ctx, e[1], e[2])
+    if kind == 'id':
+        var = buscar(ctx, e[1])
+        if var is not None:
+            return var[0]
+        if e[1] == 'readLine':
+            return "leer_linea()"
+        raise ErrorTranspilacion(f"'{e[1]}' solo se puede usar como {e[1]}(...)", e[3])
+    if kind == 'binop':
+        op, izq, der = e[1], expresion(ctx, e[2]), expresion(ctx, e[3])
+        if op == '/': return f"dividir({izq}, {der})"
+        if op == '%': return f"resto({izq}, {der})"
+        return f"({izq} {op} {der})"
+    if kind == 'nary':
+        op = OPERADORES_LOGICOS.get(e[1], e[1])
+        return "(" + f" {op} ".join(expresion(ctx, x) for x in e[2]) + ")"
+    if kind in ('cmp', 'logic'):
+        op = OPERADORES_LOGICOS.get(e[2], e[2])
+        return f"({expresion(ctx, e[1])} {op} {expresion(ctx, e[3])})"
+    if kind == 'range':
+        desde, hasta = e[1], e[2]
+        if (desde[0] == hasta[0] == 'literal' and desde[1] == hasta[1] == "Int" and desde[2] <= hasta[2]):
+            return f"range({desde[2]}, {hasta[2] + 1})"
+        return f"rango({expresion(ctx, desde)}, {expresion(ctx, hasta)})"
+    if kind == 'lambda_simple':
+        ctx["ambitos"].append({})
+        parametro = declarar(ctx, e[1][0], None)
+        cuerpo = expresion(ctx, e[2])
+        ctx["ambitos"].pop()
+        return f"(lambda {parametro}: {cuerpo})"
+    if kind == 'list':
+        return "[" + ", ".join(expresion(ctx, x) for x in e[1].elementos(nodo_literal)) + "]"
+    if kind == 'dict':
+        claves, valores = e[1]
+        pares = zip(claves.elementos(nodo_literal), valores.elementos(nodo_literal))
+        return "{" + ", ".join(f"{expresion(ctx, k)}: {expresion(ctx, v)}" for k, v in pares) + "}"
+    if kind == 'if':
+        raise ErrorTranspilacion("un if sin else no se puede usar como valor", e[3])
+    if kind == 'type_id':
+        raise ErrorTranspilacion(f"el tipo '{e[1]}' no se puede usar como valor", ctx["linea"])
+    raise ErrorTranspilacion(f"expresion '{kind}' sin traduccion (el programa tiene errores)", ctx["linea"])
+
+# ---------------- LITERALES ----------------
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '0': '\0', '"': '"', "'": "'", '\\': '\\'}
+ESCAPE = re.compile(r'\\(?:u\{([0-9A-Fa-f]{1,8})\}|(.))', re.S)
+INTERPOLADO = re.compile(r'\s*(?:([A-Za-z_][A-Za-z0-9_]*)\s*(!?)|(\d+))\s*')
+
+def literal_python(ctx, tipo, valor):
+    if tipo == "Bool": return "True" if valor else "False"
+    if tipo == "Int": return repr(valor)
+    if tipo in ("Float", "Double"):
+        valor = float(valor)
+        return repr(valor) if math.isfinite(valor) else f"float('{valor}')"
+    if tipo == "String": return cadena_python(ctx, valor[1:-1])
+    return repr(sin_escapes(valor))         # Character: el lexer ya quito las comillas
+
+def sin_escapes(crudo):
+    def reemplazo(m):
+        if m[1]: return chr(int(m[1], 16))
+        return ESCAPES.get(m[2], m[2])
+    return ESCAPE.sub(reemplazo, crudo)
+
+def cadena_python(ctx, crudo):
+    # "Hola \(nombre)" -> ('Hola ' f'{v_nombre}'): el texto va como literal comun y cada
+    # interpolacion (una variable, con ! opcional, o un entero) como un f-string
+    partes, i = [], 0
+    while True:
+        j = crudo.find('\\(', i)
+        while j > 0 and (j - len(crudo[:j].rstrip('\\'))) % 2:     # '\\(' es una barra escapada y un '('
+            j = crudo.find('\\(', j + 1)
+        if j < 0:
+            break
+        if j > i: partes.append(repr(sin_escapes(crudo[i:j])))
+        profundidad, k = 1, j + 2
+        while k < len(crudo) and profundidad:
+            profundidad += {'(': 1, ')': -1}.get(crudo[k], 0)
+            k += 1
+        if profundidad:
+            raise ErrorTranspilacion("interpolacion sin cerrar en una cadena", ctx["linea"])
+        partes.append("f'{" + interpolacion(ctx, crudo[j + 2:k - 1]) + "}'")
+        i = k
+    if not partes:
+        return repr(sin_escapes(crudo))
+    if i < len(crudo): partes.append(repr(sin_escapes(crudo[i:])))
+    return "(" + " ".join(partes) + ")"
+
+def interpolacion(ctx, contenido):
+    m = INTERPOLADO.fullmatch(contenido)
+    if m is None:
+        raise ErrorTranspilacion(f"interpolacion no soportada: \\({contenido})", ctx["linea"])
+    if m[3]:
+        return m[3]
+    var = buscar(ctx, m[1])
+    if var is None:
+        raise ErrorTranspilacion(f"variable '{m[1]}' usada sin declarar en una interpolacion", ctx["linea"])
+    valor = f"forzar({var[0]})" if m[2] else var[0]
+    return valor if var[1] in TIPOS_IMPRIMIBLES else f"texto({valor})"
+
+# ---------------- TRANSPILAR Y COMPILAR ----------------
+def transpilar(ast):
+    """Codigo Python del programa y, por cada linea de ese codigo, la linea de Swift de la que sale (0 si no hay)."""
+    ctx = nuevo_contexto()
+    emitir_linea(ctx, 0, "def _programa():")
+    generar_bloque(ctx, ast[1] if ast is not None else [], 1)
+    emitir_linea(ctx, 0, "_programa()", 0)
+    return "\n".join(ctx["lineas"]) + "\n", tuple(ctx["origen"])
+
+def compilar(ast, ruta="<swift>"):
+    """(code object, lineas de Swift): lo que se guarda en el cache y lo que recibe ejecutar."""
+    fuente, lineas = transpilar(ast)
+    return compile(fuente, ruta, 'exec'), lineas
+
+def ejecutar(programa, entrada=None, salida=None):
+    """Corre un programa de compilar. readLine lee de `entrada` y print escribe en `salida`
+    (sys.stdin y sys.stdout por omision). Lo que Swift detendria sale como ErrorEjecucion con su linea."""
+    codigo, lineas = programa
+    globales = dict(ENTORNO, leer_linea=lector(entrada if entrada is not None else sys.stdin))
+    if salida is not None:
+        globales["print"] = lambda *valores: print(*valores, file=salida)
+    try:
+        exec(codigo, globales)
+    except (ErrorEjecucion, TypeError, ValueError, OverflowError, RecursionError) as error:
+        linea, tb = 0, error.__traceback__
+        while tb is not None:
+            if tb.tb_frame.f_code.co_filename == codigo.co_filename and tb.tb_lineno <= len(lineas):
+                linea = lineas[tb.tb_lineno - 1] or linea
+            tb = tb.tb_next
+        mensaje = error.mensaje if isinstance(error, ErrorEjecucion) else f"{type(error).__name__}: {error}"
+        raise ErrorEjecucion(mensaje, linea) from None
+
+# ---------------- CACHE DE CODE OBJECTS ----------------
+# carpeta/transpilado/<sha256 del codigo Swift y de la firma>.bin con marshal de (code, lineas).
+# La firma (comun.cache_resultados.firma_de) cambia con cualquier .py del analizador o de
+# comun y con la version de Python, que es de la que depende el formato de marshal.
+# Se escribe aparte y se publica con os.replace; una entrada que no se puede leer se borra.
+def clave(codigo, firma):
+    return hashlib.sha256(firma.encode() + b'\0' + codigo.encode('utf-8')).hexdigest()
+
+def archivo_cache(carpeta, clave_programa):
+    return os.path.join(carpeta, 'transpilado', clave_programa + '.bin')
+
+def cargar(carpeta, clave_programa):
+    archivo = archivo_cache(carpeta, clave_programa)
+    try:
+        with open(archivo, 'rb') as f:
+            codigo, lineas = marshal.loads(f.read())
+    except FileNotFoundError:
+        return None
+    except Exception:
+        try: os.remove(archivo)
+        except OSError: pass
+        return None
+    return codigo, lineas
+
+def guardar(carpeta, clave_programa, programa):
+    archivo = archivo_cache(carpeta, clave_programa)
+    os.makedirs(os.path.dirname(archivo), exist_ok=True)
+    descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(archivo), suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as f:
+            f.write(marshal.dumps(programa))
+        os.replace(temporal, archivo)
+    except BaseException:
+        try: os.remove(temporal)
+        except OSError: pass
+        raise
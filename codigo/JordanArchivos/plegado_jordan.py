@@ -0,0 +1,141 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from comun.plegado import operar, operar_unaria, NO_PLEGABLE, DivisionPorCero
+from comun.colecciones import ColeccionLiteral
+from comun.diagnosticos import ListaDiagnosticos
+
+# plegado de constantes sobre el AST de sintactico_jordan (antes del chequeo semantico)
+# ('binop', op, ('literal', a), ('literal', b)) -> ('literal', resultado); en ('nary', op, [...])
+# se pliega el prefijo de literales
+# ojo: ('literal', x) tambien se usa para identificadores, solo se pliegan
+# numeros, cadenas y true/false
+
+MENSAJES_PLEGADO = {
+    'PLG001': "Division entre cero en expresion literal: {izquierdo} {operador} {derecho}",
+}
+plegado_errors = ListaDiagnosticos('plegado', MENSAJES_PLEGADO)
+estadisticas = {"nodos_antes": 0, "nodos_despues": 0, "plegados": 0, "ms": 0.0}
+
+def valor_python(nodo):
+    if nodo[0] != 'literal':
+        return NO_PLEGABLE
+    valor = nodo[1]
+    if isinstance(valor, (int, float)):
+        return valor
+    if valor == 'true':
+        return True
+    if valor == 'false':
+        return False
+    if isinstance(valor, str) and len(valor) >= 2 and valor[0] == '"' and valor[-1] == '"':
+        return valor[1:-1]
+    return NO_PLEGABLE
+
+def literal_jordan(valor):
+    if isinstance(valor, bool):
+        return ('literal', 'true' if valor else 'false')
+    if isinstance(valor, str):
+        return ('literal', '"' + valor + '"')
+    return ('literal', valor)
+
+def plegar_binop(nodo):
+    _, op, izq, der = nodo
+    a, b = valor_python(izq), valor_python(der)
+    if a is NO_PLEGABLE or b is NO_PLEGABLE:
+        return nodo
+    if (isinstance(a, str) or isinstance(b, str)) and type(a) is not type(b):
+        return nodo                 # texto con otro tipo: no se pliega, lo reporta el semantico
+    if isinstance(a, str) and op != '+' and ('\\' in a or '\\' in b):
+        return nodo
+    try:
+        valor = operar(op, a, b)
+    except DivisionPorCero:
+        plegado_errors.reportar('PLG001', izquierdo=izq[1], operador=op, derecho=der[1])
+        return nodo
+    if valor is NO_PLEGABLE:
+        return nodo
+    estadisticas["plegados"] += 1
+    estadisticas["nodos_despues"] -= 2
+    return literal_jordan(valor)
+
+def plegar_unary(nodo):
+    _, op, operando = nodo
+    a = valor_python(operando)
+    if a is NO_PLEGABLE or isinstance(a, str):
+        return nodo
+    valor = operar_unaria(op, a)
+    if valor is NO_PLEGABLE:
+        return nodo
+    estadisticas["plegados"] += 1
+    estadisticas["nodos_despues"] -= 1
+    return literal_jordan(valor)
+
+def plegar_nary(nodo):
+    # solo el prefijo de literales, para no cambiar el orden de evaluacion
+    _, op, operandos = nodo
+    acumulado, k = operandos[0], 1
+    while k < len(operandos):
+        plegado = plegar_binop(('binop', op, acumulado, operandos[k]))
+        if plegado[0] != 'literal':
+            break
+        estadisticas["nodos_despues"] += 1      # plegar_binop descuenta el nodo binario temporal
+        acumulado, k = plegado, k + 1
+    if k == 1:
+        return nodo
+    if k == len(operandos):
+        estadisticas["nodos_despues"] -= 1
+        return acumulado
+    return ('nary', op, [acumulado] + operandos[k:])
+
+def plegar(nodo):
+    if isinstance(nodo, list):
+        nuevo = [plegar(x) for x in nodo]
+        return nuevo if any(n is not v for n, v in zip(nuevo, nodo)) else nodo
+    if isinstance(nodo, ColeccionLiteral):
+        # los literales del arreglo ya estan en buffers, solo se pliegan las expresiones
+        return nodo if nodo.solo_literales() else nodo.mapear_nodos(plegar)
+    if not isinstance(nodo, tuple):
+        return nodo
+    estadisticas["nodos_antes"] += 1
+    hijos = tuple(plegar(x) if isinstance(x, (tuple, list, ColeccionLiteral)) else x for x in nodo)
+    if any(h is not v for h, v in zip(hijos, nodo)):
+        nodo = hijos
+    if nodo and nodo[0] == 'binop' and len(nodo) == 4:
+        return plegar_binop(nodo)
+    if nodo and nodo[0] == 'unary' and len(nodo) == 3:
+        return plegar_unary(nodo)
+    if nodo and nodo[0] == 'nary' and len(nodo) == 3:
+        return plegar_nary(nodo)
+    return nodo
+
+def plegar_programa(ast, plazo=None):
+    """Devuelve el AST plegado; errores en plegado_errors y conteos en estadisticas.
+    Con plazo (comun.plazo.Plazo) se revisa en cada sentencia y puede lanzar PlazoAgotado."""
+    plegado_errors.clear()
+    estadisticas.update(nodos_antes=0, nodos_despues=0, plegados=0, ms=0.0)
+    if ast is None:
+        return None
+    inicio = time.perf_counter()
+    if plazo is None:
+        ast = plegar(ast)
+    else:
+        estadisticas["nodos_antes"] += 1
+        sentencias = []
+        for st in ast[1]:
+            plazo.revisar()
+            sentencias.append(plegar(st))
+        ast = ('program', sentencias)
+    estadisticas["ms"] = (time.perf_counter() - inicio) * 1000
+    estadisticas["nodos_despues"] += estadisticas["nodos_antes"]
+    return ast
+
+def plegar_sentencia(st):
+    """Para el parse en flujo: pliega una sentencia de nivel superior y suma a estadisticas."""
+    antes = estadisticas["nodos_antes"]
+    inicio = time.perf_counter()
+    st = plegar(st)
+    estadisticas["ms"] += (time.perf_counter() - inicio) * 1000
+    estadisticas["nodos_despues"] += estadisticas["nodos_antes"] - antes
+    return st
@@ -1,37 +1,64 @@
 import os
+import sys
+import time
 from datetime import datetime
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from comun.simbolos import Ambito
+from comun.plazo import Plazo, PlazoAgotado, ResultadoAnalisis
+from comun.diagnosticos import ListaDiagnosticos, apariciones
+from comun.cache_resultados import CacheResultados, firma_de, CARPETA as CARPETA_CACHE
+from comun.servidor_lsp import ServidorLSP
+
+# catalogo de mensajes del chequeo; los errores guardan codigo y argumentos
+MENSAJES = {
+    'SEM001': "Linea {linea}: Variable '{nombre}' ya declarada",
+    'SEM002': "Linea {linea}: Variable '{nombre}' no declarada",
+    'SEM003': "Linea {linea}: No se puede asignar tipo '{recibido}' a variable de tipo '{esperado}'",
+    'SEM004': "Linea {linea}: Funcion '{nombre}' ya declarada",
+    'SEM005': "Linea {linea}: Funcion '{nombre}' no declarada",
+    'SEM006': "Linea {linea}: Funcion '{nombre}' espera {esperados} argumentos, se proporcionaron {recibidos}",
+    'SEM007': "Linea {linea}: Argumento {posicion} de funcion '{nombre}' incompatible: esperado '{esperado}', recibido '{recibido}'",
+    'SEM008': "Linea {linea}: Funcion '{nombre}' debe retornar tipo '{esperado}'",
+    'SEM009': "Linea {linea}: Retorno de funcion '{nombre}' incompatible: esperado '{esperado}', retornado '{recibido}'",
+    'SEM010': "Linea {linea}: No se puede convertir de '{origen}' a '{destino}'",
+    'SEM011': "Linea {linea}: Conversion fallida de '{origen}' a '{destino}'",
+    'SEM012': "Linea {linea}: Operador '{operador}' no soportado",
+    'SEM013': "Linea {linea}: Tipos incompatibles para operador '{operador}': '{izquierdo}' {operador} '{derecho}'",
+    'SEM014': "Linea {linea}: Intento de acceso a indice en tipo no array '{tipo}'",
+    'SEM015': "Linea {linea}: Indice de array debe ser Int, recibido '{tipo}'",
+    'SEM016': "Linea {linea}: Retorno vacio en funcion '{nombre}'",
+    'SEM017': "Linea {linea}: Retorno de tipo '{recibido}' incompatible con retorno esperado '{esperado}' en funcion '{nombre}'",
+}
+
 semantic_errors = []
 symbol_table = {}
 function_signatures = {}
 
 class SemanticAnalyzer:
     def __init__(self):
-        self.symbol_table = {}
+        self.symbol_table = Ambito()
         self.function_signatures = {}
-        self.errors = []
+        self.errors = ListaDiagnosticos('semantico', MENSAJES)
         self.current_function = None
         self.current_return_type = None
         
-    def declare_variable(self, name, var_type, value=None, line=1):
-        if name in self.symbol_table:
-            self.errors.append("Linea {}: Variable '{}' ya declarada".format(line, name))
+    def declare_variable(self, name, var_type, mutable=True, line=1):
+        if not self.symbol_table.declarar(name, var_type, mutable, line):
+            self.errors.reportar('SEM001', line, nombre=name)
             return False
-        self.symbol_table[name] = {'type': var_type, 'value': value, 'line': line}
         return True
     
-    def assign_variable(self, name, value, value_type, line=1):
+    def assign_variable(self, name, value_type, line=1):
         if name not in self.symbol_table:
-            self.errors.append("Linea {}: Variable '{}' no declarada".format(line, name))
+            self.errors.reportar('SEM002', line, nombre=name)
             return False
         
-        var_info = self.symbol_table[name]
-        if not self.is_compatible_type(var_info['type'], value_type):
-            self.errors.append("Linea {}: No se puede asignar tipo '{}' a variable de tipo '{}'".format(
-                line, value_type, var_info['type']))
+        var_type = self.symbol_table.tipo_de(name)
+        if not self.is_compatible_type(var_type, value_type):
+            self.errors.reportar('SEM003', line, recibido=value_type, esperado=var_type)
             return False
         
-        var_info['value'] = value
         return True
     
     def is_compatible_type(self, target_type, source_type):
@@ -54,7 +81,7 @@ class SemanticAnalyzer:
     
     def declare_function(self, name, params, return_type, line=1):
         if name in self.function_signatures:
-            self.errors.append("Linea {}: Funcion '{}' ya declarada".format(line, name))
+            self.errors.reportar('SEM004', line, nombre=name)
             return False
         
         self.function_signatures[name] = {
@@ -66,13 +93,12 @@ class SemanticAnalyzer:
     
     def call_function(self, name, args, line=1):
         if name not in self.function_signatures:
-            self.errors.append("Linea {}: Funcion '{}' no declarada".format(line, name))
+            self.errors.reportar('SEM005', line, nombre=name)
             return None
         
         func = self.function_signatures[name]
         if len(args) != len(func['params']):
-            self.errors.append("Linea {}: Funcion '{}' espera {} argumentos, se proporcionaron {}".format(
-                line, name, len(func['params']), len(args)))
+            self.errors.reportar('SEM006', line, nombre=name, esperados=len(func['params']), recibidos=len(args))
             return None
         
         for i, (arg, param) in enumerate(zip(args, func['params'])):
@@ -80,21 +106,18 @@ class SemanticAnalyzer:
             param_type = param[1] if isinstance(param, tuple) else param
             
             if not self.is_compatible_type(param_type, arg_type):
-                self.errors.append("Linea {}: Argumento {} de funcion '{}' incompatible: esperado '{}', recibido '{}'".format(
-                    line, i+1, name, param_type, arg_type))
+                self.errors.reportar('SEM007', line, posicion=i+1, nombre=name, esperado=param_type, recibido=arg_type)
         
         return func['return_type']
     
     def check_function_return(self, func_name, return_type, expected_return_type, line=1):
         if return_type is None and expected_return_type is not None:
-            self.errors.append("Linea {}: Funcion '{}' debe retornar tipo '{}'".format(
-                line, func_name, expected_return_type))
+            self.errors.reportar('SEM008', line, nombre=func_name, esperado=expected_return_type)
             return False
         
         if return_type and expected_return_type:
             if not self.is_compatible_type(expected_return_type, return_type):
-                self.errors.append("Linea {}: Retorno de funcion '{}' incompatible: esperado '{}', retornado '{}'".format(
-                    line, func_name, expected_return_type, return_type))
+                self.errors.reportar('SEM009', line, nombre=func_name, esperado=expected_return_type, recibido=return_type)
                 return False
         
         return True
@@ -110,15 +133,13 @@ class SemanticAnalyzer:
         }
         
         if (from_type, to_type) not in conversions:
-            self.errors.append("Linea {}: No se puede convertir de '{}' a '{}'".format(
-                line, from_type, to_type))
+            self.errors.reportar('SEM010', line, origen=from_type, destino=to_type)
             return None
         
         try:
             return conversions[(from_type, to_type)](value)
         except:
-            self.errors.append("Linea {}: Conversion fallida de '{}' a '{}'".format(
-                line, from_type, to_type))
+            self.errors.reportar('SEM011', line, origen=from_type, destino=to_type)
             return None
     
     def check_binary_operation(self, op, left_type, right_type, line=1):
@@ -150,26 +171,23 @@ class SemanticAnalyzer:
         }
         
         if op not in valid_operations:
-            self.errors.append("Linea {}: Operador '{}' no soportado".format(line, op))
+            self.errors.reportar('SEM012', line, operador=op)
             return None
         
         for left, right, result in valid_operations[op]:
             if left_type == left and right_type == right:
                 return result
         
-        self.errors.append("Linea {}: Tipos incompatibles para operador '{}': '{}' {} '{}'".format(
-            line, op, left_type, op, right_type))
+        self.errors.reportar('SEM013', line, operador=op, izquierdo=left_type, derecho=right_type)
         return None
     
     def check_array_access(self, array_type, index_type, line=1):
         if not array_type.startswith('[') or not array_type.endswith(']'):
-            self.errors.append("Linea {}: Intento de acceso a indice en tipo no array '{}'".format(
-                line, array_type))
+            self.errors.reportar('SEM014', line, tipo=array_type)
             return None
         
         if index_type != 'Int':
-            self.errors.append("Linea {}: Indice de array debe ser Int, recibido '{}'".format(
-                line, index_type))
+            self.errors.reportar('SEM015', line, tipo=index_type)
             return None
         
         element_type = array_type[1:-1]
@@ -206,25 +224,17 @@ def get_literal_type(value_str):
             return 'String'
     return 'Unknown'
 
-def analizar_archivo(nombre_archivo, usuario_git="jorssanc"):
-    global semantic_errors
-    semantic_errors = []
-    
-    try:
-        with open(nombre_archivo, 'r', encoding='utf-8') as f:
-            codigo = f.read()
-    except FileNotFoundError:
-        print("[ERROR] No se encontro el archivo '{}'".format(nombre_archivo))
-        return
-    
-    analyzer = SemanticAnalyzer()
-    
+def verificar_codigo(codigo, analyzer, plazo=None):
+    """Chequeo linea por linea; los errores quedan en analyzer.errors.
+    Con plazo (comun.plazo.Plazo) se revisa en cada linea y puede lanzar PlazoAgotado."""
     lineas = codigo.split('\n')
     current_function = None
     current_function_return_type = None
     declared_functions = set()
     
     for line_num, linea in enumerate(lineas, 1):
+        if plazo is not None:
+            plazo.revisar()
         original_linea = linea
         linea = linea.strip()
         
@@ -251,14 +261,13 @@ def analizar_archivo(nombre_archivo, usuario_git="jorssanc"):
                 var_type = extract_type(type_part)
                 value_part = linea.split('=')[1].rstrip(';').strip()
                 
-                analyzer.declare_variable(var_name, var_type, value_part, line_num)
+                analyzer.declare_variable(var_name, var_type, linea.startswith('var '), line_num)
                 
                 value_type = get_literal_type(value_part)
                 
                 if not analyzer.is_compatible_type(var_type, value_type):
                     if value_type != 'Unknown':
-                        analyzer.errors.append("Linea {}: No se puede asignar tipo '{}' a variable de tipo '{}'".format(
-                            line_num, value_type, var_type))
+                        analyzer.errors.reportar('SEM003', line_num, recibido=value_type, esperado=var_type)
             continue
         
         if 'return ' in linea:
@@ -266,16 +275,14 @@ def analizar_archivo(nombre_archivo, usuario_git="jorssanc"):
                 return_value = linea.split('return')[1].strip().rstrip(';').strip()
                 
                 if return_value == '':
-                    analyzer.errors.append("Linea {}: Retorno vacio en funcion '{}'".format(
-                        line_num, current_function))
+                    analyzer.errors.reportar('SEM016', line_num, nombre=current_function)
                 else:
                     return_type = get_literal_type(return_value)
                     if return_type == 'Unknown':
                         return_type = 'Int'
                     
                     if not analyzer.is_compatible_type(current_function_return_type, return_type):
-                        analyzer.errors.append("Linea {}: Retorno de tipo '{}' incompatible con retorno esperado '{}' en funcion '{}'".format(
-                            line_num, return_type, current_function_return_type, current_function))
+                        analyzer.errors.reportar('SEM017', line_num, recibido=return_type, esperado=current_function_return_type, nombre=current_function)
             continue
         
         if '(' in linea and ')' in linea and any(func in linea for func in declared_functions):
@@ -292,16 +299,79 @@ def analizar_archivo(nombre_archivo, usuario_git="jorssanc"):
                     value_part = parts[1].rstrip(';').strip()
                     
                     if var_name in analyzer.symbol_table:
-                        expected_type = analyzer.symbol_table[var_name]['type']
+                        expected_type = analyzer.symbol_table.tipo_de(var_name)
                         value_type = get_literal_type(value_part)
                         
                         if value_type != 'Unknown' and not analyzer.is_compatible_type(expected_type, value_type):
-                            analyzer.errors.append("Linea {}: No se puede asignar tipo '{}' a variable de tipo '{}'".format(
-                                line_num, value_type, expected_type))
+                            analyzer.errors.reportar('SEM003', line_num, recibido=value_type, esperado=expected_type)
                     else:
                         if var_name not in ['suma', 'promedio', 'resultado', 'array', 'elemento', 'completo', 'operacion', 'conversionInvalida', 'conversionNoValida', 'asignacionTipoMalo', 'n', 's', 'x:', 'y:', 'suma:']:
                             if var_name not in declared_functions:
                                 pass
+    return analyzer
+
+def analyze(codigo, deadline=None, max_errors=None, pasada=None):
+    """Sintactico + plegado + semantico con hora limite (Plazo o instante de time.monotonic()).
+    Devuelve un ResultadoAnalisis; si el plazo se agota trae los errores hasta ese punto y parcial=True.
+    max_errors limita los errores de sintaxis; pasada es una comun.lexico_unificado.lexear(codigo)."""
+    import sintactico_jordan        # arma el parser; solo hace falta aqui
+    plazo = Plazo.desde(deadline)
+    inicio = time.perf_counter()
+    analyzer = SemanticAnalyzer()
+    ast, fase = None, 'sintactico'
+    # los errores de sintaxis y plegado son globales: se leen antes de soltar la gramatica
+    with sintactico_jordan.salida.en_uso('analyze'):
+        try:
+            ast = sintactico_jordan.parsear(codigo, plazo, max_errors, pasada)
+            fase = 'semantico'
+            verificar_codigo(codigo, analyzer, plazo)
+            fase = None
+        except PlazoAgotado:
+            pass
+        errores = sintactico_jordan.syntax_errors + sintactico_jordan.plegado_errors + analyzer.errors
+    return ResultadoAnalisis(errores, fase, ast, (time.perf_counter() - inicio) * 1000)
+
+def analizar_tokens(buffer, max_errors=None):
+    """Como analyze, pero con los tokens de un BufferTokens (comun/tokens_compartidos.py);
+    el chequeo linea por linea usa el codigo guardado en el buffer."""
+    import sintactico_jordan
+    inicio = time.perf_counter()
+    analyzer = SemanticAnalyzer()
+    with sintactico_jordan.salida.en_uso('analizar_tokens'):
+        ast = sintactico_jordan.parsear_tokens(buffer, max_errors)
+        verificar_codigo(buffer.codigo, analyzer)
+        errores = sintactico_jordan.syntax_errors + sintactico_jordan.plegado_errors + analyzer.errors
+    return ResultadoAnalisis(errores, None, ast, (time.perf_counter() - inicio) * 1000)
+
+# un archivo que no cambio no se vuelve a analizar (comun/cache_resultados.py)
+def cache_resultados(carpeta=CARPETA_CACHE, **opciones):
+    """CacheResultados de este analizador; cualquier cambio en JordanArchivos o comun cambia la firma."""
+    return CacheResultados(carpeta, 'jordan', firma_de(os.path.dirname(os.path.abspath(__file__))), **opciones)
+
+def analizar_ruta(ruta, cache=None, max_errors=None):
+    """analyze sobre el contenido de ruta; con un CacheResultados un archivo ya analizado cuesta un stat."""
+    if cache is None:
+        with open(ruta, "r", encoding="utf-8") as f:
+            return analyze(f.read(), max_errors=max_errors)
+    return cache.analizar(ruta, lambda codigo: analyze(codigo, max_errors=max_errors), variante=max_errors)
+
+# --lsp: servidor de diagnosticos por stdio (comun/servidor_lsp.py)
+def servidor_lsp(**opciones):
+    """ServidorLSP con este analizador; cada version del documento se analiza completa con analyze."""
+    return ServidorLSP(lambda estado, texto, plazo: analyze(texto, deadline=plazo), fuente='jordan', **opciones)
+
+def analizar_archivo(nombre_archivo, usuario_git="jorssanc"):
+    global semantic_errors
+    semantic_errors = []
+    
+    try:
+        with open(nombre_archivo, 'r', encoding='utf-8') as f:
+            codigo = f.read()
+    except FileNotFoundError:
+        print("[ERROR] No se encontro el archivo '{}'".format(nombre_archivo))
+        return
+    
+    analyzer = verificar_codigo(codigo, SemanticAnalyzer())
     
     if not os.path.exists("logs"):
         os.makedirs("logs")
@@ -313,7 +383,8 @@ def analizar_archivo(nombre_archivo, usuario_git="jorssanc"):
         if analyzer.errors:
             for error in analyzer.errors:
                 log.write("{}\n".format(error))
-            log.write("\nTotal: {}\n".format(len(analyzer.errors)))
+            log.write("\nTotal: {}\n".format(apariciones(analyzer.errors)))
+            log.write("(un error que se repite (mismo codigo y datos) sale una vez con '(se repite N veces; lineas ... y M mas)'; el total los cuenta todos)\n")
         else:
             log.write("Sin errores semanticos\n")
     
@@ -324,5 +395,7 @@ def analizar_archivo(nombre_archivo, usuario_git="jorssanc"):
             print("    {}".format(error))
 
 if __name__ == "__main__":
+    if '--lsp' in sys.argv:
+        sys.exit(servidor_lsp().atender())
     archivo_prueba = "algoritmos/algoritmo_conversion_retorno.swift"
     analizar_archivo(archivo_prueba, usuario_git="jorssanc")
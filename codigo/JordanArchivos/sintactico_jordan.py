@@ -2,6 +2,19 @@ import ply.yacc as yacc
 import ply.lex as lex
 from datetime import datetime
 import os
+import sys
+from plegado_jordan import plegar_programa, plegar_sentencia, plegado_errors, estadisticas as estadisticas_plegado
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from comun.colecciones import ColeccionLiteral, agregar_elemento
+from comun.plazo import LexerConPlazo
+from comun.diagnosticos import ListaDiagnosticos, apariciones, canal, columna_de, emitir
+from comun.recuperacion import Recuperacion
+from comun.lexico import CADENA, CADENA_SIN_CERRAR, saltar_comentario
+from comun.lexico_unificado import Gramatica, LexerUnificado, SALTAR
+from comun.flujo import SalidaSentencias, en_flujo
+from comun.tokens_compartidos import BufferTokens, LexerCompartido
+from comun.incremental import ParseIncremental
 
 reserved = {
     'class': 'CLASS', 'deinit': 'DEINIT', 'enum': 'ENUM', 'extension': 'EXTENSION',
@@ -68,10 +81,13 @@ def t_COMMENT_SINGLE(t):
     r'//.*'
     pass
 
+# comentario: solo se reconoce '/*' y el cierre se busca con find (costo lineal,
+# ver comun/lexico.py); sin cierre se avisa una vez y el resto es comentario
 def t_COMMENT_MULTI(t):
-    r'/\*[\s\S]*?\*/'
-    t.lexer.lineno += t.value.count('\n')
-    pass
+    r'/\*'
+    if not saltar_comentario(t):
+        emitir('lexico', 'LEX003', "Linea {}: comentario '/*' sin cerrar".format(t.lineno),
+               t.lineno, columna_de(t.lexer.lexdata, t.lexpos))
 
 def t_NUMBER(t):
     r'(\d+\.\d+|\d+)'
@@ -81,8 +97,17 @@ def t_NUMBER(t):
         t.value = int(t.value)
     return t
 
+@lex.TOKEN(CADENA)
 def t_STRING(t):
-    r'\"([^\\\n]|(\\.))*?\"'
+    return t
+
+@lex.TOKEN(CADENA_SIN_CERRAR)
+def t_STRING_UNCLOSED(t):
+    # cadena que llega al fin de linea: se avisa una vez y se cierra ahi
+    emitir('lexico', 'LEX002', "Linea {}: cadena sin cerrar".format(t.lineno),
+           t.lineno, columna_de(t.lexer.lexdata, t.lexpos))
+    t.type = 'STRING'
+    t.value += '"'
     return t
 
 def t_ID(t):
@@ -95,12 +120,39 @@ def t_newline(t):
     r'\n+'
     t.lexer.lineno += len(t.value)
 
+# resguardo (comun/lexico.py): ultima regla de funcion, un caracter con el que no
+# empieza ningun token se reporta aca sin pasar por t_error
+def t_illegal(t):
+    r'[^(){}\[\],;:\-.?=!<>+*/%&|]|&(?!&)|\|(?!\|)'
+    emitir('lexico', 'LEX001', "Linea {}: caracter ilegal '{}'".format(t.lexer.lineno, t.value),
+           t.lexer.lineno, columna_de(t.lexer.lexdata, t.lexpos), caracter=t.value)
+
 def t_error(t):
+    emitir('lexico', 'LEX001', "Linea {}: caracter ilegal '{}'".format(t.lexer.lineno, t.value[0]),
+           t.lexer.lineno, columna_de(t.lexer.lexdata, t.lexpos), caracter=t.value[0])
     t.lexer.skip(1)
 
 lexer = lex.lex()
 
-syntax_errors = []
+# lexico unificado (comun/lexico_unificado.py): token neutro -> token de esta gramatica;
+# lo que falta (caracteres, cadenas o comentarios sin cerrar, ...) lo lexea `lexer`
+TABLA_UNIFICADA = {
+    'ENTERO': 'NUMBER', 'DECIMAL': 'NUMBER', 'CADENA': 'STRING', 'COMENTARIO': SALTAR,
+    '(': 'LPAREN', ')': 'RPAREN', '{': 'LBRACE', '}': 'RBRACE', '[': 'LBRACKET', ']': 'RBRACKET',
+    ',': 'COMMA', ';': 'SEMICOLON', ':': 'COLON', '->': 'ARROW', '.': 'DOT', '?': 'QUESTION',
+    '=': 'ASSIGN', '==': 'EQUAL', '!=': 'NOT_EQUAL', '<': 'LT', '>': 'GT', '<=': 'LTE', '>=': 'GTE',
+    '+': 'PLUS', '-': 'MINUS', '*': 'MULTIPLY', '/': 'DIVIDE', '%': 'MODULO',
+    '+=': 'PLUSASSIGN', '-=': 'MINUSASSIGN', '*=': 'MULTASSIGN', '/=': 'DIVASSIGN',
+    '&&': 'AND', '||': 'OR', '!': 'NOT', '..<': 'RANGE', '...': 'CLOSEDRANGE',
+}
+gramatica_unificada = Gramatica(lexer, 'ID', reserved, TABLA_UNIFICADA)
+
+MENSAJES_SINTACTICOS = {
+    'SIN001': "Linea {linea}: token '{valor}' inesperado (tipo: {tipo})",
+    'SIN002': "Linea desconocida: fin de archivo inesperado",
+    'SIN003': "Demasiados errores de sintaxis ({maximo}); se omite el resto del archivo",
+}
+syntax_errors = ListaDiagnosticos('sintactico', MENSAJES_SINTACTICOS)
 
 precedence = (
     ('left', 'OR'),
@@ -112,13 +164,26 @@ precedence = (
     ('right', 'NOT'),
 )
 
+# sentencias de nivel superior: a la lista del programa o, en flujo, a un
+# consumidor apenas se reducen (comun/flujo.py)
+salida = SalidaSentencias()
+
 def p_program(p):
-    """program : statements"""
+    """program : program_statements"""
     p[0] = ('program', p[1])
 
+def p_program_statements_list(p):
+    """program_statements : program_statements statement"""
+    p[0] = salida.entregar(p[1], p[2])
+
+def p_program_statements_single(p):
+    """program_statements : statement"""
+    p[0] = salida.entregar([], p[1])
+
 def p_statements_list(p):
     """statements : statements statement"""
-    p[0] = p[1] + [p[2]]
+    p[1].append(p[2])
+    p[0] = p[1]
 
 def p_statements_single(p):
     """statements : statement"""
@@ -136,6 +201,15 @@ def p_statement(p):
     else:
         p[0] = p[1]
 
+# recuperacion en modo panico (comun/recuperacion.py): la sentencia con error
+# termina en el proximo ';', en el bloque que sigue, antes de un '}' o antes
+# de una palabra clave al comienzo de una linea
+def p_statement_error(p):
+    """statement : error SEMICOLON
+                 | error block"""
+    p.parser.errok()
+    p[0] = ('empty',)
+
 def p_if_statement_simple(p):
     """if_statement : IF LPAREN expression RPAREN block"""
     p[0] = ('if', p[3], p[5])
@@ -160,17 +234,40 @@ def p_array_literal(p):
     """array_literal : LBRACKET RBRACKET
                     | LBRACKET array_elements RBRACKET"""
     if len(p) == 3:
-        p[0] = ('array', [])
+        p[0] = ('array', ColeccionLiteral())
     else:
         p[0] = ('array', p[2])
 
+# los elementos del arreglo van en una ColeccionLiteral: los literales seguidos del
+# mismo tipo quedan en un buffer tipado y no como una tupla por elemento
+def literal_de(expr):
+    if expr[0] != 'literal':
+        return None
+    valor = expr[1]
+    if isinstance(valor, int):
+        return ('Int', valor)
+    if isinstance(valor, float):
+        return ('Double', valor)
+    if valor == 'true' or valor == 'false':
+        return ('Bool', valor == 'true')
+    if isinstance(valor, str) and valor.startswith('"'):
+        return ('String', valor)
+    return None
+
+def nodo_literal(tipo, valor):
+    if tipo == 'Bool':
+        return ('literal', 'true' if valor else 'false')
+    return ('literal', valor)
+
 def p_array_elements_list(p):
     """array_elements : array_elements COMMA expression"""
-    p[0] = p[1] + [p[3]]
+    agregar_elemento(p[1], p[3], literal_de(p[3]))
+    p[0] = p[1]
 
 def p_array_elements_single(p):
     """array_elements : expression"""
-    p[0] = [p[1]]
+    p[0] = ColeccionLiteral()
+    agregar_elemento(p[0], p[1], literal_de(p[1]))
 
 def p_array_access(p):
     """array_access : ID LBRACKET expression RBRACKET
@@ -210,7 +307,8 @@ def p_parameters_list(p):
     if len(p) == 2:
         p[0] = [p[1]]
     else:
-        p[0] = p[1] + [p[3]]
+        p[1].append(p[3])
+        p[0] = p[1]
 
 def p_parameter(p):
     """parameter : ID COLON type_annotation"""
@@ -292,7 +390,18 @@ def p_expression_binop(p):
                   | expression GTE expression
                   | expression AND expression
                   | expression OR expression"""
-    p[0] = ('binop', p[2], p[1], p[3])
+    op = p[2]
+    izq = p[1]
+    # a + b + c ... con un operador asociativo queda como ('nary', op, [a, b, c])
+    if op in ('+', '*', '&&', '||'):
+        if izq[0] == 'nary' and izq[1] == op:
+            izq[2].append(p[3])
+            p[0] = izq
+            return
+        if izq[0] == 'binop' and izq[1] == op:
+            p[0] = ('nary', op, [izq[2], izq[3], p[3]])
+            return
+    p[0] = ('binop', op, izq, p[3])
 
 def p_expression_unary(p):
     """expression : NOT expression
@@ -322,7 +431,8 @@ def p_argument_list(p):
     if len(p) == 2:
         p[0] = [p[1]]
     else:
-        p[0] = p[1] + [p[3]]
+        p[1].append(p[3])
+        p[0] = p[1]
 
 def p_expression_array(p):
     """expression : array_literal"""
@@ -361,22 +471,116 @@ def p_expression_primary(p):
                   | NIL"""
     p[0] = ('literal', p[1])
 
+recuperacion = Recuperacion('SEMICOLON', 'LBRACE', 'RBRACE', ('VAR', 'LET', 'FUNC', 'IF', 'RETURN'))
+
 def p_error(p):
     global syntax_errors
+    if not recuperacion.contar(parser, p):
+        if recuperacion.recien_cortado:
+            syntax_errors.reportar('SIN003', maximo=recuperacion.max_errores)
+        return
     if p:
-        error_msg = "Linea {}: token '{}' inesperado (tipo: {})".format(p.lineno, p.value, p.type)
-        syntax_errors.append(error_msg)
-        parser.errok()
+        syntax_errors.reportar('SIN001', p.lineno, columna_de(p.lexer.lexdata, p.lexpos), valor=p.value, tipo=p.type)
+        recuperacion.sincronizar(parser, p)
     else:
-        error_msg = "Linea desconocida: fin de archivo inesperado"
-        syntax_errors.append(error_msg)
+        syntax_errors.reportar('SIN002')
 
 parser = yacc.yacc(debug=False, write_tables=False)
 
-def analizar_archivo(nombre_archivo, usuario_git="jorssanc"):
-    global syntax_errors
-    syntax_errors = []
+# para los logs: un error repetido es una sola entrada, pero el total los cuenta todos
+NOTA_TOTALES = "(un error que se repite (mismo codigo y datos) sale una vez con '(se repite N veces; lineas ... y M mas)'; el total los cuenta todos)\n"
 
+@salida.exclusivo
+def parsear(codigo, plazo=None, max_errores=None, pasada=None):
+    """Parsea y pliega codigo; los errores quedan en syntax_errors y plegado_errors.
+    Con plazo (comun.plazo.Plazo) el lexer y el plegado lo revisan y pueden lanzar PlazoAgotado.
+    max_errores limita los errores de sintaxis (por defecto MAX_ERRORES de comun.recuperacion).
+    pasada: comun.lexico_unificado.lexear(codigo), compartida con las otras gramaticas; los tokens salen de ahi."""
+    syntax_errors.clear()
+    lexer.lineno = 1
+    tokens = LexerUnificado(pasada, gramatica_unificada) if pasada is not None else lexer
+    with recuperacion.con_maximo(max_errores):
+        ast = parser.parse(codigo, lexer=LexerConPlazo(tokens, plazo) if plazo else tokens)
+    return plegar_programa(ast, plazo)
+
+@salida.exclusivo
+def parsear_en_flujo(codigo, consumidor=None, max_errores=None):
+    """Como parsear, pero cada sentencia de nivel superior se pliega y se pasa a consumidor
+    apenas se reduce; el programa completo no se arma. Sin consumidor devuelve un generador."""
+    if consumidor is None:
+        return en_flujo(lambda entregar: parsear_en_flujo(codigo, entregar, max_errores), salida)
+    syntax_errors.clear()
+    plegar_programa(None)       # reinicia errores y estadisticas del plegado
+    lexer.lineno = 1
+    with recuperacion.con_maximo(max_errores), salida.hacia(lambda st: consumidor(plegar_sentencia(st))):
+        parser.parse(codigo, lexer=lexer)
+
+# reparseo incremental (comun/incremental.py): solo se parsean las sentencias de nivel
+# superior que cambiaron. El AST no guarda lineas, no hay nada que desplazar; los
+# errores del plegado de cada trozo se guardan con el trozo y se juntan en orden
+@salida.exclusivo
+def _parsear_trozo(texto, linea):
+    syntax_errors.clear()
+    plegado_errors.clear()
+    lexer.lineno = linea
+    # los errores lexicos solo se emiten: se escuchan para que el trozo falle y se parsee todo
+    lexicos = []
+    baja = canal.suscribir(lexicos.append)
+    try:
+        ast = parser.parse(texto, lexer=lexer)
+    finally:
+        baja()
+    if ast is None or syntax_errors or lexicos:
+        return None
+    sentencias = [plegar_sentencia(st) for st in ast[1]]
+    if not plegado_errors:
+        return sentencias, None
+    avisos = ListaDiagnosticos('plegado', plegado_errors.mensajes)
+    avisos.extend(plegado_errors, publicar=False)
+    return sentencias, avisos
+
+def parser_incremental():
+    """Estado del reparseo incremental de un archivo (uno por archivo abierto)."""
+    return ParseIncremental(_parsear_trozo)
+
+@salida.exclusivo
+def reparsear(incremental, codigo, max_errores=None):
+    """Como parsear, pero solo parsea las sentencias de nivel superior que cambiaron desde la
+    ultima llamada con incremental. Con errores lexicos o de sintaxis (o sin sentencias) parsea todo el codigo.
+    estadisticas_plegado cuenta solo lo que se volvio a plegar."""
+    plegar_programa(None)
+    sentencias = incremental.actualizar(codigo)
+    if not sentencias:
+        return parsear(codigo, max_errores=max_errores)
+    syntax_errors.clear()
+    plegado_errors.clear()
+    for avisos in incremental.avisos():
+        plegado_errors.extend(avisos, publicar=False)
+    return ('program', list(sentencias))
+
+# tokens en memoria compartida: un proceso lexea y otros parsean desde el buffer
+# (comun/tokens_compartidos.py); los errores lexicos solo se emiten al lexear
+@salida.exclusivo
+def _etapa_lexica(codigo, salida_tokens):
+    lexer.lineno = 1
+    lexer.input(codigo)
+    for token in iter(lexer.token, None):
+        salida_tokens(token)
+
+def lexear_compartido(codigo):
+    """Lexea codigo una vez y deja los tokens en memoria compartida (BufferTokens)."""
+    return BufferTokens.crear(codigo, _etapa_lexica)
+
+@salida.exclusivo
+def parsear_tokens(buffer, max_errores=None):
+    """Como parsear, pero con los tokens de un BufferTokens en vez de lexear."""
+    syntax_errors.clear()
+    with recuperacion.con_maximo(max_errores):
+        ast = parser.parse(lexer=LexerCompartido(buffer))
+    return plegar_programa(ast)
+
+@salida.exclusivo
+def analizar_archivo(nombre_archivo, usuario_git="jorssanc"):
     try:
         with open(nombre_archivo, 'r', encoding='utf-8') as f:
             codigo = f.read()
@@ -384,10 +588,8 @@ def analizar_archivo(nombre_archivo, usuario_git="jorssanc"):
         print("[ERROR] No se encontro el archivo '{}'".format(nombre_archivo))
         return
 
-    lexer.lineno = 1
-
     print("[*] Analizando '{}'".format(nombre_archivo))
-    ast = parser.parse(codigo, lexer=lexer)
+    ast = parsear(codigo)
 
     if not os.path.exists("logs"):
         os.makedirs("logs")
@@ -408,15 +610,26 @@ def analizar_archivo(nombre_archivo, usuario_git="jorssanc"):
             log.write("-" * 50 + "\n")
             for error in syntax_errors:
                 log.write("{}\n".format(error))
-            log.write("\nTotal errores: {}\n".format(len(syntax_errors)))
+            log.write("\nTotal errores: {}\n".format(apariciones(syntax_errors)))
+            log.write(NOTA_TOTALES)
         else:
             log.write("Resultado: SIN ERRORES\n")
 
+        log.write("\nPLEGADO DE CONSTANTES:\n")
+        log.write("Nodos: {} -> {} ({} expresiones plegadas) en {:.1f} ms\n".format(
+            estadisticas_plegado["nodos_antes"], estadisticas_plegado["nodos_despues"],
+            estadisticas_plegado["plegados"], estadisticas_plegado["ms"]))
+        for error in plegado_errors:
+            log.write("{}\n".format(error))
+
     print("[+] Log guardado: {}".format(log_filename))
     if syntax_errors:
         print("[!] {} error(es) sintactico(s) encontrado(s)".format(len(syntax_errors)))
         for error in syntax_errors:
             print("    {}".format(error))
+    for error in plegado_errors:
+        print("[!] {}".format(error))
+    return ast
 
 if __name__ == "__main__":
     archivo_prueba = "algoritmos/algoritmo_if_arrays_funcion.swift"
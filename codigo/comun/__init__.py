@@ -0,0 +1 @@
+"""Piezas compartidas por los analizadores de Ariel, Ayman y Jordan."""
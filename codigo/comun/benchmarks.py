@@ -0,0 +1,1012 @@
+import os
+import sys
+import time
+import tracemalloc
+
+# =========================================================================
+# MEDICIONES DE RENDIMIENTO
+# Uso: python codigo/comun/benchmarks.py <nombre> [tamaño]
+# =========================================================================
+
+CODIGO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(CODIGO)
+
+from comun.simbolos import Ambito
+
+
+def _memoria(construir):
+    """Bytes retenidos por lo que devuelve `construir`."""
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    objeto = construir()
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objeto
+    return despues - antes
+
+
+def _cronometrar(funcion, repeticiones=3):
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def bench_simbolos(n=1_000_000):
+    """Memoria de la tabla de símbolos con n declaraciones: formato anterior vs Ambito."""
+    nombres = [f"variable{i}" for i in range(n)]
+
+    class SimboloAnterior:
+        def __init__(self, nombre, tipo, mutable, linea):
+            self.nombre, self.tipo, self.mutable, self.linea = nombre, tipo, mutable, linea
+
+    def jordan_anterior():
+        # dict por variable + texto del inicializador + tipo recortado de la línea
+        return {nombre: {'type': f"x: Int".split(':')[1].strip(), 'value': f"{i} + 1", 'line': i + 1}
+                for i, nombre in enumerate(nombres)}
+
+    def ariel_anterior():
+        return {nombre: SimboloAnterior(nombre, f"x: Int".split(':')[1].strip(), True, i + 1)
+                for i, nombre in enumerate(nombres)}
+
+    def compacto():
+        ambito = Ambito()
+        for i, nombre in enumerate(nombres):
+            ambito.declarar(nombre, f"x: Int".split(':')[1].strip(), True, i + 1)
+        return ambito
+
+    resultados = {
+        'jordan (dict por variable)': _memoria(jordan_anterior),
+        'ariel (Simbolo sin __slots__)': _memoria(ariel_anterior),
+        'Ambito compacto': _memoria(compacto),
+    }
+    base = resultados['Ambito compacto']
+    print(f"Tabla de símbolos con {n} declaraciones:")
+    for nombre, bytes_ in resultados.items():
+        print(f"  {nombre:32s} {bytes_ / n:7.1f} B/símbolo  ({bytes_ / base:.1f}x)")
+
+
+def _importar(carpeta, modulo):
+    ruta = os.path.join(CODIGO, carpeta)
+    if ruta not in sys.path:
+        sys.path.insert(0, ruta)
+    return __import__(modulo)
+
+
+def programa_ayman(n):
+    """Programa Swift sintético de n sentencias para el analizador de Ayman."""
+    lineas = ["let v0: Int = 1"]
+    for i in range(1, n):
+        if i % 10 == 0:
+            lineas.append(f"for i{i} in 0...{i} {{ let w{i} = v{i - 1} * 2 }}")
+        lineas.append(f"let v{i} = v{i - 1} + {i} * (2 - {i} % 3)")
+    return "\n".join(lineas) + "\n"
+
+
+def programa_jordan(n):
+    """Programa Swift sintético de n líneas para el analizador de Jordan."""
+    return "".join(f"var v{i} = {i} + 2 * 3;\nfunc f{i}(a: Int) {{ return a + v{i}; }}\n" for i in range(n // 2))
+
+
+def bench_ayman_fases(n=20_000):
+    """Solo sintaxis vs sintaxis + semántica en analizador_swift."""
+    ayman = _importar('Aymanarchivos', 'analizador_swift')
+    codigo = programa_ayman(n)
+    solo = _cronometrar(lambda: ayman.analizar(codigo, solo_sintaxis=True))
+    completo = _cronometrar(lambda: ayman.analizar(codigo))
+    print(f"analizador_swift, {n} sentencias:")
+    print(f"  solo sintaxis         {solo * 1000:8.1f} ms")
+    print(f"  sintaxis + semántica  {completo * 1000:8.1f} ms")
+
+
+def programa_ariel(n):
+    """Programa Swift sintético de unas n líneas para el analizador de Ariel."""
+    lineas = ["var total: Int = 0;"]
+    f = 0
+    while len(lineas) < n:
+        lineas += [f"func paso{f}(a: Int, b: Double = 1.0) -> Int {{",
+                   f"    var acumulado{f} = a * 2 + total;",
+                   f"    while (acumulado{f} > 0) {{",
+                   f"        acumulado{f} = acumulado{f} - 1;",
+                   f"        if (acumulado{f} == 3) {{ total = total + 1; }}",
+                   "    }",
+                   f"    return acumulado{f};",
+                   "}",
+                   f"let resultado{f} = total + {f};"]
+        f += 1
+    return "\n".join(lineas) + "\n"
+
+
+def bench_ariel_consultas(n=50_000):
+    """Reverificar tras editar una línea: AnalizadorSemantico completo vs MotorConsultas."""
+    _importar('ArielArchivos', 'analizadorSemantico')
+    from analizadorSemantico import analizador_sintactico, AnalizadorSemantico
+    from analizadorLexicoArielAAT123 import analizador_lexico
+    from motorConsultas import MotorConsultas
+
+    def parsear(codigo, linea=1):
+        analizador_lexico.lineno = linea
+        return analizador_sintactico.parse(codigo, lexer=analizador_lexico)
+
+    programa = parsear(programa_ariel(n))
+    motor = MotorConsultas(programa)
+    inicial = _cronometrar(lambda: MotorConsultas(programa).diagnosticos(), 1)
+    motor.diagnosticos()
+
+    # edición de una línea dentro de una función a mitad del programa
+    medio = len(programa.sentencias) // 2
+    vieja = programa.sentencias[medio]
+    while not hasattr(vieja, 'cuerpo'):
+        medio += 1
+        vieja = programa.sentencias[medio]
+    f = vieja.nombre[len('paso'):]
+    texto = (f"func paso{f}(a: Int, b: Double = 1.0) -> Int {{ var acumulado{f} = a * 3 + total; "
+             f"return acumulado{f} + \"x\"; }}")
+    nueva = parsear(texto, vieja.linea).sentencias[0]
+
+    def completo():
+        sem = AnalizadorSemantico()
+        sem.verificar(programa)
+        return sem.errores
+
+    antes = motor.verificaciones
+    inicio = time.perf_counter()
+    motor.reemplazar_sentencia(vieja, nueva)
+    errores = motor.diagnosticos()
+    incremental = time.perf_counter() - inicio
+    programa.sentencias[medio] = nueva
+    assert errores == completo(), "el motor no coincide con AnalizadorSemantico"
+    print(f"Ariel, {n} líneas ({len(programa.sentencias)} sentencias de nivel superior):")
+    print(f"  verificación completa        {_cronometrar(completo, 1) * 1000:8.1f} ms")
+    print(f"  motor, primera consulta      {inicial * 1000:8.1f} ms")
+    print(f"  motor, tras editar 1 línea   {incremental * 1000:8.1f} ms"
+          f"  ({motor.verificaciones - antes} sentencia(s) reverificada(s))")
+
+
+def bench_ayman_consultas(n=50_000):
+    """Reverificar tras editar una línea: analyze completo vs consultas_ayman."""
+    ayman = _importar('Aymanarchivos', 'analizador_swift')
+    import consultas_ayman
+
+    codigo = programa_ayman(n)
+    ast = ayman.analizar(codigo, solo_sintaxis=True)
+    motor = consultas_ayman.nuevo_motor(ast)
+    inicial = _cronometrar(lambda: consultas_ayman.diagnosticos(consultas_ayman.nuevo_motor(ast)), 1)
+    consultas_ayman.diagnosticos(motor)
+
+    # let a mitad del programa: mismo tipo anotado, pero ahora con un error; el siguiente lo usa
+    lineas = codigo.split("\n")
+    medio = next(i for i in range(len(lineas) // 2, len(lineas)) if lineas[i].startswith("let v"))
+    nombre = lineas[medio].split()[1]
+    anterior = f"v{int(nombre[1:]) - 1}"
+    lineas[medio] = f"let {nombre}: Int = {anterior} + \"x\""
+    editado = "\n".join(lineas)
+    nueva = ayman.analizar(f"{lineas[medio]}\n", solo_sintaxis=True)[1][0]
+    posicion = next(i for i, st in enumerate(motor["sentencias"]) if st[0] == 'let_decl' and st[1] == nombre)
+
+    antes = motor["verificaciones"]
+    inicio = time.perf_counter()
+    consultas_ayman.reemplazar_sentencia(motor, posicion, nueva)
+    errores = consultas_ayman.diagnosticos(motor)
+    incremental = time.perf_counter() - inicio
+    assert list(errores) == list(ayman.analyze(editado).errores), "el motor no coincide con analyze"
+    print(f"Ayman, {n} sentencias ({len(motor['sentencias'])} de nivel superior):")
+    print(f"  analyze completo             {_cronometrar(lambda: ayman.analyze(editado), 1) * 1000:8.1f} ms")
+    print(f"  motor, primera consulta      {inicial * 1000:8.1f} ms")
+    print(f"  motor, tras editar 1 línea   {incremental * 1000:8.1f} ms"
+          f"  ({motor['verificaciones'] - antes} sentencia(s) reverificada(s))")
+
+
+def bench_ariel_paralelo(n=50_000):
+    """Semántico secuencial vs dos fases con cuerpos de funciones en paralelo."""
+    _importar('ArielArchivos', 'analizadorSemantico')
+    from analizadorSemantico import analizador_sintactico, AnalizadorSemantico
+    from analizadorLexicoArielAAT123 import analizador_lexico
+    from verificacionParalela import verificar_paralelo
+
+    analizador_lexico.lineno = 1
+    programa = analizador_sintactico.parse(programa_ariel(n), lexer=analizador_lexico)
+
+    def secuencial():
+        sem = AnalizadorSemantico()
+        sem.verificar(programa)
+        return sem.errores
+
+    assert verificar_paralelo(programa, 2) == secuencial(), "la verificación en paralelo no coincide"
+    print(f"Ariel semántico, {n} líneas ({os.cpu_count()} núcleo(s) disponibles):")
+    print(f"  secuencial                {_cronometrar(secuencial) * 1000:8.1f} ms")
+    for trabajadores in (1, 2, 4, 8):
+        t = _cronometrar(lambda: verificar_paralelo(programa, trabajadores))
+        print(f"  dos fases, {trabajadores} proceso(s)    {t * 1000:8.1f} ms")
+
+
+def bench_plegado(n=20_000, repeticiones=3):
+    """Semántico sobre código generado lleno de literales, contra plegado + semántico (mejor de varias corridas)."""
+    _importar('ArielArchivos', 'analizadorSemantico')
+    from analizadorSemantico import analizador_sintactico, AnalizadorSemantico
+    from analizadorLexicoArielAAT123 import analizador_lexico
+    from plegadoConstantes import PlegadorConstantes
+    ayman = _importar('Aymanarchivos', 'analizador_swift')
+    import plegado_ayman
+
+    fuente_ariel = "\n".join(f"let c{i}: Int = (3600 * 24 + {i}) * 2 - 7 % 3 + 10 / 2;" for i in range(n))
+    fuente_ayman = "\n".join(f"let c{i} = (3600 * 24 + {i}) * 2 - 7 % 3 + 10 / 2" for i in range(n))
+
+    def ariel(plegar):
+        # el plegado cambia el árbol: cada corrida parsea de nuevo (fuera del tiempo)
+        mejor, plegador = float('inf'), None
+        for _ in range(repeticiones):
+            analizador_lexico.lineno = 1
+            programa = analizador_sintactico.parse(fuente_ariel, lexer=analizador_lexico)
+            inicio = time.perf_counter()
+            plegador = PlegadorConstantes()
+            if plegar: programa = plegador.plegar_programa(programa)
+            AnalizadorSemantico().verificar(programa)
+            mejor = min(mejor, time.perf_counter() - inicio)
+        # lo que cuesta volver a analizar el mismo árbol (modo incremental, --watch, --lsp)
+        otra_vez = _cronometrar(lambda: AnalizadorSemantico().verificar(
+            PlegadorConstantes().plegar_programa(programa) if plegar else programa), repeticiones)
+        return mejor, otra_vez, plegador.resumen()
+
+    def ayman_fase(plegar):
+        mejor, resumen = float('inf'), ""
+        for _ in range(repeticiones):
+            ast = ayman.analizar(fuente_ayman, solo_sintaxis=True)
+            ayman.reiniciar()
+            inicio = time.perf_counter()
+            if plegar: ast = plegado_ayman.plegar_programa(ast)
+            ayman.verificar_programa(ast)
+            mejor = min(mejor, time.perf_counter() - inicio)
+            e = plegado_ayman.estadisticas
+            resumen = f"{e['nodos_antes']} nodos -> {e['nodos_despues']} ({e['plegados']} plegados) en {e['ms']:.1f} ms"
+
+        def otra_vez():
+            ayman.reiniciar()
+            ayman.verificar_programa(plegado_ayman.plegar_programa(ast) if plegar else ast)
+        return mejor, _cronometrar(otra_vez, repeticiones), resumen
+
+    for nombre, fase in (("Ariel", ariel), ("Ayman", ayman_fase)):
+        sin, sin_otra, _ = fase(False)
+        con, con_otra, resumen = fase(True)
+        print(f"{nombre}, {n} declaraciones: {resumen}")
+        print(f"  primer análisis:      semántico {sin * 1000:8.1f} ms   plegado + semántico {con * 1000:8.1f} ms"
+              f"   ({sin / con:.2f}x)")
+        print(f"  mismo árbol otra vez: semántico {sin_otra * 1000:8.1f} ms   plegado + semántico {con_otra * 1000:8.1f} ms"
+              f"   ({sin_otra / con_otra:.2f}x)")
+
+
+def bench_cadenas(n=100_000):
+    """`let t = v0 + v1 + ... + vn`: con nodos n-arios no hay recursión por operando."""
+    _importar('ArielArchivos', 'analizadorSemantico')
+    from analizadorSemantico import analizador_sintactico, AnalizadorSemantico
+    from analizadorLexicoArielAAT123 import analizador_lexico
+    ayman = _importar('Aymanarchivos', 'analizador_swift')
+    suma = " + ".join(["v"] * n)
+    declaraciones = "let v = 1;\n"
+
+    analizador_lexico.lineno = 1
+    inicio = time.perf_counter()
+    programa = analizador_sintactico.parse(declaraciones + f"let t = {suma};\n", lexer=analizador_lexico)
+    parseo = time.perf_counter() - inicio
+    semantico = _cronometrar(lambda: AnalizadorSemantico().verificar(programa), 1)
+    print(f"Cadena de {n} sumas:")
+    print(f"  Ariel  parser {parseo * 1000:8.1f} ms   semántico {semantico * 1000:8.1f} ms")
+
+    inicio = time.perf_counter()
+    ast = ayman.analizar(declaraciones.replace(";", "") + f"let t = {suma}\n", solo_sintaxis=True)
+    parseo = time.perf_counter() - inicio
+    ayman.reiniciar()
+    semantico = _cronometrar(lambda: ayman.verificar_programa(ast), 1)
+    print(f"  Ayman  parser {parseo * 1000:8.1f} ms   semántico {semantico * 1000:8.1f} ms")
+
+
+def bench_colecciones(n=200_000):
+    """Literales de arreglo/diccionario/tupla de n elementos: buffers tipados contra un nodo por elemento."""
+    from comun.colecciones import ColeccionLiteral
+    ayman = _importar('Aymanarchivos', 'analizador_swift')
+    _importar('ArielArchivos', 'analizadorSemantico')
+    from analizadorSemantico import analizador_sintactico, AnalizadorSemantico
+    from analizadorLexicoArielAAT123 import analizador_lexico
+    enteros = ", ".join(str(i) for i in range(n))
+    pares = ", ".join(f'{i}: "v{i}"' for i in range(n))
+    print(f"Literales de {n} elementos:")
+
+    for nombre, codigo in (("arreglo", f"let a = [{enteros}]\n"), ("diccionario", f"let d = [{pares}]\n")):
+        inicio = time.perf_counter()
+        ast = ayman.analizar(codigo, solo_sintaxis=True)
+        parseo = time.perf_counter() - inicio
+        ayman.reiniciar()
+        semantico = _cronometrar(lambda: ayman.verificar_programa(ast), 1)
+        print(f"  Ayman {nombre:12s} parser {parseo * 1000:8.1f} ms   semántico {semantico * 1000:8.1f} ms")
+
+    analizador_lexico.lineno = 1
+    inicio = time.perf_counter()
+    programa = analizador_sintactico.parse(f"let t = ({enteros});\n", lexer=analizador_lexico)
+    parseo = time.perf_counter() - inicio
+    semantico = _cronometrar(lambda: AnalizadorSemantico().verificar(programa), 1)
+    print(f"  Ariel {'tupla':12s} parser {parseo * 1000:8.1f} ms   semántico {semantico * 1000:8.1f} ms")
+
+    def coleccion():
+        c = ColeccionLiteral()
+        for i in range(n): c.agregar_literal('String', f'"v{i}"')
+        return c
+    tuplas = _memoria(lambda: [('literal', 'String', f'"v{i}"') for i in range(n)])
+    buffer = _memoria(coleccion)
+    print(f"  memoria {n} cadenas: tuplas {tuplas / 1e6:6.1f} MB   ColeccionLiteral {buffer / 1e6:6.1f} MB")
+
+
+def bench_plazo(n=20_000, ms=50):
+    """analyze() completo contra analyze() con hora límite de `ms` milisegundos."""
+    from comun.plazo import Plazo
+    ariel = _importar('ArielArchivos', 'analizadorSintactico')
+    ayman = _importar('Aymanarchivos', 'analizador_swift')
+    print(f"Programa de {n} sentencias, plazo {ms} ms:")
+    for nombre, modulo, codigo in (("Ariel", ariel, programa_ariel(n)), ("Ayman", ayman, programa_ayman(n))):
+        completo = modulo.analyze(codigo)
+        cortado = modulo.analyze(codigo, deadline=Plazo.en_ms(ms))
+        print(f"  {nombre}  completo {completo.duracion_ms:8.1f} ms   con plazo {cortado.duracion_ms:6.1f} ms "
+              f"({'parcial en ' + cortado.fase_cortada if cortado.parcial else 'completo'}, "
+              f"{len(cortado.errores)} error(es))")
+
+
+def bench_primer_error(n=20_000):
+    """Tiempo hasta el primer diagnóstico (transmitido en vivo) contra el análisis completo."""
+    from comun.diagnosticos import primer_error_ms
+    ariel = _importar('ArielArchivos', 'analizadorSintactico')
+    ayman = _importar('Aymanarchivos', 'analizador_swift')
+    print(f"Programa de {n} sentencias con un error de sintaxis en la línea 3:")
+    for nombre, modulo, codigo in (("Ariel", ariel, programa_ariel(n)), ("Ayman", ayman, programa_ayman(n))):
+        lineas = codigo.split("\n")
+        lineas[2] = "let = ;"
+        primero, total, resultado = primer_error_ms(modulo.analyze, "\n".join(lineas))
+        print(f"  {nombre}  primer error {primero:7.1f} ms   análisis completo {total:8.1f} ms   "
+              f"({len(resultado.errores)} error(es))")
+
+
+def bench_tormenta(n=100_000):
+    """Un mismo identificador no declarado usado n veces: mensajes formateados uno por uno contra diagnósticos agrupados."""
+    from comun.diagnosticos import ListaDiagnosticos
+    plantilla = "❌ Línea {linea}: identificador '{nombre}' no declarado."
+
+    def cadenas():
+        return [plantilla.format(linea=i, nombre='fantasma') for i in range(1, n + 1)]
+
+    def agrupados():
+        lista = ListaDiagnosticos('semantico', {'SEM010': plantilla})
+        for i in range(1, n + 1):
+            lista.reportar('SEM010', i, nombre='fantasma')
+        return lista
+
+    print(f"{n} usos del mismo identificador no declarado:")
+    print(f"  cadenas     {_cronometrar(cadenas) * 1000:8.1f} ms   {_memoria(cadenas) / 1e6:7.2f} MB   {n} entrada(s)")
+    lista = agrupados()
+    print(f"  agrupados   {_cronometrar(agrupados) * 1000:8.1f} ms   {_memoria(agrupados) / 1e6:7.2f} MB   "
+          f"{len(lista)} entrada(s): {lista[0]}")
+
+    ariel = _importar('ArielArchivos', 'analizadorSintactico')
+    codigo = "\n".join(f"var v{i} = fantasma + 1;" for i in range(n // 10))
+    resultado = ariel.analyze(codigo)
+    print(f"  Ariel con {n // 10} sentencias: {len(resultado.errores)} entrada(s) en {resultado.duracion_ms:.1f} ms")
+
+
+def bench_recuperacion(n=20_000):
+    """Archivo muy roto: tiempo y cantidad de errores sintácticos al duplicar el tamaño."""
+    ariel = _importar('ArielArchivos', 'analizadorSintactico')
+    ayman = _importar('Aymanarchivos', 'analizador_swift')
+    jordan = _importar('JordanArchivos', 'semantico_jordan')
+    basura = {"Ariel": (ariel, "var x = = 1 ) ( ;\nif (x { y = ; }\n"),
+              "Ayman": (ayman, "let x = = 1 ) (\nlet y: = [1, 2\n"),
+              "Jordan": (jordan, "var x = = 1 ) ( ;\nif (x { y = ; }\n")}
+    for nombre, (modulo, bloque) in basura.items():
+        for veces in (n // 2, n):
+            resultado = modulo.analyze(bloque * veces, max_errors=10 ** 9)
+            con_tope = modulo.analyze(bloque * veces)
+            print(f"  {nombre:6} {2 * veces:7} líneas  {resultado.duracion_ms:8.1f} ms  "
+                  f"{len(resultado.errores):4} entrada(s) sin tope   {len(con_tope.errores):4} con max_errors por omisión "
+                  f"({con_tope.duracion_ms:.1f} ms)")
+
+
+def bench_lexico_adverso(n=20_000):
+    """Entradas hostiles para el lexer: tiempo al duplicar el tamaño (debe crecer lineal) y diagnósticos emitidos."""
+    import contextlib
+    import io
+    from comun.diagnosticos import canal
+    ariel = _importar('ArielArchivos', 'analizadorLexicoArielAAT123')
+    ayman = _importar('Aymanarchivos', 'analizador_swift')
+    lexers = {"Ariel": ariel.analizador_lexico,
+              "Ayman": ayman.lexer,
+              "Jordan": _importar('JordanArchivos', 'sintactico_jordan').lexer}
+    entradas = {"'/*' sueltos": lambda k: "x /* y\n" * k,
+                "cadenas sin cerrar": lambda k: 'x = "abc\n' * k,
+                "línea con \\\" sin cerrar": lambda k: '"' + '\\"x' * (4 * k),
+                "caracteres ilegales": lambda k: "¤" * (4 * k)}
+
+    def tokenizar(lexer, texto):
+        ariel.errores_lexicos.clear()           # Ariel y Ayman agrupan repetidos: sin esto solo emiten la primera corrida
+        ayman.lex_errors.clear()
+        ariel.tokens_reconocidos.clear()
+        lexer.input(texto)
+        lexer.lineno = 1
+        while lexer.token():
+            pass
+
+    for nombre, lexer in lexers.items():
+        print(f"{nombre}:")
+        for descripcion, generar in entradas.items():
+            tiempos = []
+            for k in (n // 2, n):
+                texto = generar(k)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    tiempos.append(_cronometrar(lambda: tokenizar(lexer, texto)) * 1000)
+                    diagnosticos = []
+                    baja = canal.suscribir(diagnosticos.append)
+                    try:
+                        tokenizar(lexer, texto)
+                    finally:
+                        baja()
+            print(f"  {descripcion:24} {len(texto):8} car.  {tiempos[0]:8.1f} ms -> {tiempos[1]:8.1f} ms "
+                  f"(x{tiempos[1] / max(tiempos[0], 1e-6):.1f})  {len(diagnosticos)} diagnóstico(s)")
+
+
+def bench_flujo(n=20_000):
+    """Pico de memoria y tiempo: programa completo contra sentencias en flujo que se descartan al llegar."""
+    import contextlib
+    import io
+    ariel = _importar('ArielArchivos', 'analizadorSintactico')
+    ayman = _importar('Aymanarchivos', 'analizador_swift')
+    jordan = _importar('JordanArchivos', 'sintactico_jordan')
+
+    def pico(funcion):
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            funcion()
+        duracion = time.perf_counter() - inicio
+        maximo = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return maximo / 1e6, duracion * 1000
+
+    casos = (("Ariel", programa_ariel, ariel.analyze, lambda c: ariel.analizar_en_flujo(c, lambda s: None)),
+             ("Ayman", programa_ayman, ayman.analyze, lambda c: ayman.analizar_en_flujo(c, lambda s: None)),
+             ("Jordan", programa_jordan, jordan.parsear, lambda c: jordan.parsear_en_flujo(c, lambda s: None)))
+    for nombre, programa, completo, en_flujo in casos:
+        for k in (n // 2, n):
+            codigo = programa(k)
+            mb_completo, ms_completo = pico(lambda: completo(codigo))
+            mb_flujo, ms_flujo = pico(lambda: en_flujo(codigo))
+            print(f"  {nombre:6} {k:7} sentencias   completo {mb_completo:7.1f} MB {ms_completo:8.1f} ms   "
+                  f"en flujo {mb_flujo:7.1f} MB {ms_flujo:8.1f} ms")
+
+
+def bench_tuberia(n=40_000):
+    """Análisis en un proceso contra léxico, sintáctico y semántico en tres procesos."""
+    import contextlib
+    import io
+    ariel = _importar('ArielArchivos', 'analizadorSintactico')
+    ayman = _importar('Aymanarchivos', 'analizador_swift')
+    print(f"{os.cpu_count()} núcleo(s) disponibles (la tubería necesita tres para solapar las etapas):")
+    for nombre, modulo, codigo in (("Ariel", ariel, programa_ariel(n)), ("Ayman", ayman, programa_ayman(n))):
+        with contextlib.redirect_stdout(io.StringIO()):
+            secuencial = modulo.analyze(codigo)
+            tuberia = modulo.analizar_en_tuberia(codigo)
+        assert list(secuencial.errores) == list(tuberia.errores), "la tubería no da los mismos errores"
+        print(f"  {nombre}  un proceso {secuencial.duracion_ms:8.1f} ms   tubería {tuberia.duracion_ms:8.1f} ms")
+
+
+def bench_tokens_compartidos(n=20_000, trabajadores=3):
+    """Varios procesos analizando el mismo archivo: cada uno lexea contra un lexeo en memoria compartida."""
+    import contextlib
+    import io
+    import pickle
+    from comun.tokens_compartidos import EscritorTokens, repartir
+    ariel = _importar('ArielArchivos', 'analizadorSintactico')
+    ayman = _importar('Aymanarchivos', 'analizador_swift')
+    jordan = _importar('JordanArchivos', 'semantico_jordan')
+    jordan_sintactico = _importar('JordanArchivos', 'sintactico_jordan')
+
+    print(f"Trabajo por archivo con {trabajadores} procesos que lo analizan "
+          "(medido en un proceso para no depender de los núcleos libres):")
+    casos = (("Ariel", ariel, ariel, programa_ariel(n)), ("Ayman", ayman, ayman, programa_ayman(n)),
+             ("Jordan", jordan, jordan_sintactico, programa_jordan(n)))
+    for nombre, modulo, lexico, codigo in casos:
+        with contextlib.redirect_stdout(io.StringIO()):
+            escritor = EscritorTokens(codigo)
+            lexico._etapa_lexica(codigo, escritor)
+            cantidad = len(escritor.columnas['tipo'])
+            tuplas = len(pickle.dumps([(escritor.tipos[escritor.columnas['tipo'][i]], None, 0, 0)
+                                       for i in range(cantidad)]))
+            ms_completo = _cronometrar(lambda: modulo.analyze(codigo)) * 1000
+            ms_lexeo = _cronometrar(lambda: lexico.lexear_compartido(codigo).cerrar()) * 1000
+            with lexico.lexear_compartido(codigo) as buffer:
+                ms_tokens = _cronometrar(lambda: modulo.analizar_tokens(buffer)) * 1000
+                tam = buffer.memoria.size
+                esperado = list(modulo.analyze(codigo).errores)
+                compartido = repartir([(modulo.analizar_tokens, buffer, ())] * trabajadores)
+        assert all(list(r.errores) == esperado for r in compartido), "los tokens compartidos no dan los mismos errores"
+        print(f"  {nombre:6} {cantidad:7} tokens   cada uno lexea {trabajadores} x {ms_completo:7.1f} ms = "
+              f"{trabajadores * ms_completo:8.1f} ms   un lexeo compartido {ms_lexeo:6.1f} + {trabajadores} x "
+              f"{ms_tokens:7.1f} ms = {ms_lexeo + trabajadores * ms_tokens:8.1f} ms   "
+              f"buffer {tam / 1e6:4.1f} MB (tuplas serializadas >= {tuplas / 1e6:4.1f} MB por proceso)")
+
+
+def bench_lexico_unificado(n=20_000):
+    """Las tres gramáticas sobre el mismo archivo: tres lexers contra una pasada del léxico unificado."""
+    import contextlib
+    import io
+    from comun.lexico_unificado import lexear, LexerUnificado
+    ariel = _importar('ArielArchivos', 'analizadorSintactico')
+    with contextlib.redirect_stdout(io.StringIO()):
+        lexico_ariel = _importar('ArielArchivos', 'analizadorLexicoArielAAT123')
+        ayman = _importar('Aymanarchivos', 'analizador_swift')
+        jordan = _importar('JordanArchivos', 'semantico_jordan')
+        jordan_sintactico = _importar('JordanArchivos', 'sintactico_jordan')
+    gramaticas = ((lexico_ariel.analizador_lexico, lexico_ariel.gramatica_unificada),
+                  (ayman.lexer, ayman.gramatica_unificada),
+                  (jordan_sintactico.lexer, jordan_sintactico.gramatica_unificada))
+
+    def tres_lexers(codigo):
+        for lexer, _ in gramaticas:
+            lexico_ariel.tokens_reconocidos.clear()
+            lexer.input(codigo)
+            lexer.lineno = 1
+            for _ in iter(lexer.token, None):
+                pass
+
+    def unificado(codigo):
+        pasada = lexear(codigo)
+        for _, gramatica in gramaticas:
+            for _ in iter(LexerUnificado(pasada, gramatica).token, None):
+                pass
+
+    def analizar(codigo, pasada=None):
+        return [list(m.analyze(codigo, pasada=pasada).errores) for m in (ariel, ayman, jordan)]
+
+    print("Léxico de las tres gramáticas sobre el mismo archivo:")
+    for nombre, codigo in (("programa Ariel", programa_ariel(n)), ("programa Ayman", programa_ayman(n))):
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert analizar(codigo) == analizar(codigo, lexear(codigo)), "el léxico unificado cambia los errores"
+            ms_tres = _cronometrar(lambda: tres_lexers(codigo)) * 1000
+            ms_unificado = _cronometrar(lambda: unificado(codigo)) * 1000
+            ms_pasada = _cronometrar(lambda: lexear(codigo)) * 1000
+            ms_analisis = _cronometrar(lambda: analizar(codigo), 1) * 1000
+            ms_analisis_unificado = _cronometrar(lambda: analizar(codigo, lexear(codigo)), 1) * 1000
+        print(f"  {nombre}: tres lexers {ms_tres:7.1f} ms   unificado {ms_unificado:7.1f} ms "
+              f"(pasada {ms_pasada:6.1f} ms, x{ms_unificado / ms_tres:.2f})   "
+              f"tres analyze {ms_analisis:7.1f} ms -> {ms_analisis_unificado:7.1f} ms")
+
+
+def bench_cache_resultados(archivos=40, n=2_000):
+    """Reanalizar una carpeta sin cambios: sin caché, caché frío, reinicio con caché (solo stat), touch y una edición."""
+    import contextlib
+    import io
+    import shutil
+    import tempfile
+    ayman = _importar('Aymanarchivos', 'analizador_swift')
+    carpeta = tempfile.mkdtemp()
+    try:
+        rutas = []
+        hace_un_rato = time.time() - 60         # mtime viejo: el stat alcanza para confiar en el índice
+        for i in range(archivos):
+            ruta = os.path.join(carpeta, f"programa{i}.swift")
+            with open(ruta, "w", encoding="utf-8") as f:
+                f.write(programa_ayman(n + i) + ("let z = w\n" if i % 4 == 0 else ""))
+            os.utime(ruta, (hace_un_rato, hace_un_rato))
+            rutas.append(ruta)
+        almacen = os.path.join(carpeta, "cache")
+
+        def pasada(cache):
+            inicio = time.perf_counter()
+            errores = [list(ayman.analizar_ruta(r, cache).errores) for r in rutas]
+            return errores, (time.perf_counter() - inicio) * 1000
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            esperado, ms_sin = pasada(None)
+            cache = ayman.cache_resultados(almacen)
+            frio, ms_frio = pasada(cache)
+            reinicio = ayman.cache_resultados(almacen)          # proceso nuevo: el índice sale del disco
+            caliente, ms_caliente = pasada(reinicio)
+            for r in rutas: os.utime(r)
+            tocado = ayman.cache_resultados(almacen)
+            _, ms_tocado = pasada(tocado)
+            with open(rutas[0], "a", encoding="utf-8") as f:
+                f.write("let extra = 1\n")
+            editado = ayman.cache_resultados(almacen)
+            _, ms_editado = pasada(editado)
+        assert esperado == frio == caliente, "el caché cambia los errores"
+        print(f"{archivos} archivos de ~{n} sentencias (caché de {cache.tamano() / 1e3:.0f} kB):")
+        for nombre, ms, c in (("sin caché", ms_sin, None), ("caché frío", ms_frio, cache),
+                              ("reinicio sin cambios", ms_caliente, reinicio), ("touch, mismo contenido", ms_tocado, tocado),
+                              ("un archivo editado", ms_editado, editado)):
+            print(f"  {nombre:24} {ms:9.1f} ms   {c.estadisticas if c else ''}".rstrip())
+    finally:
+        shutil.rmtree(carpeta)
+
+
+def bench_instantanea_ast(n=20_000):
+    """Parsear (léxico + sintáctico + plegado) contra cargar la instantánea del AST, completa o perezosa."""
+    import contextlib
+    import io
+    import pickle
+    from comun import instantanea_ast
+    ariel = _importar('ArielArchivos', 'analizadorSintactico')
+    lexico_ariel = _importar('ArielArchivos', 'analizadorLexicoArielAAT123')
+    with contextlib.redirect_stdout(io.StringIO()):
+        ayman = _importar('Aymanarchivos', 'analizador_swift')
+        jordan = _importar('JordanArchivos', 'sintactico_jordan')
+
+    def parsear_ariel(codigo):
+        lexico_ariel.tokens_reconocidos.clear()
+        lexico_ariel.analizador_lexico.lineno = 1
+        return ariel.PlegadorConstantes().plegar_programa(ariel.analizador_sintactico.parse(codigo, lexer=lexico_ariel.analizador_lexico))
+
+    casos = (("Ariel", parsear_ariel, programa_ariel(n), ariel.CLASES_AST, lambda raiz: len(raiz.sentencias)),
+             ("Ayman", lambda c: ayman.plegar_programa(ayman.analizar(c, solo_sintaxis=True)), programa_ayman(n), None,
+              lambda raiz: len(raiz[1])),
+             ("Jordan", jordan.parsear, programa_jordan(n), None, lambda raiz: len(raiz[1])))
+    print(f"AST de ~{n} líneas: parsear contra cargar la instantánea")
+    for nombre, parsear, codigo, clases, sentencias in casos:
+        with contextlib.redirect_stdout(io.StringIO()):
+            ast = parsear(codigo)
+            ms_parseo = _cronometrar(lambda: parsear(codigo)) * 1000
+        datos = instantanea_ast.serializar(ast)
+        serializado = pickle.dumps(ast, pickle.HIGHEST_PROTOCOL)
+        ms_guardar = _cronometrar(lambda: instantanea_ast.serializar(ast)) * 1000
+        ms_cargar = _cronometrar(lambda: instantanea_ast.cargar(datos, clases)) * 1000
+        ms_perezoso = _cronometrar(lambda: sentencias(instantanea_ast.cargar(datos, clases, perezoso=True))) * 1000
+        ms_pickle = _cronometrar(lambda: pickle.loads(serializado)) * 1000
+        print(f"  {nombre:6} parsear {ms_parseo:8.1f} ms   cargar {ms_cargar:7.1f} ms (x{ms_cargar / ms_parseo:.2f})   "
+              f"perezoso {ms_perezoso:6.2f} ms   guardar {ms_guardar:7.1f} ms   "
+              f"{len(datos) / 1e6:5.2f} MB (pickle {len(serializado) / 1e6:5.2f} MB, carga {ms_pickle:6.1f} ms)")
+
+
+def bench_incremental(n=50_000):
+    """Reparsear tras editar una sentencia: parse completo vs ParseIncremental (comun/incremental.py)."""
+    import contextlib
+    import io
+    import itertools
+    ariel = _importar('ArielArchivos', 'analizadorSintactico')
+    lexico_ariel = _importar('ArielArchivos', 'analizadorLexicoArielAAT123')
+    with contextlib.redirect_stdout(io.StringIO()):
+        jordan = _importar('JordanArchivos', 'sintactico_jordan')
+
+    def parsear_ariel(codigo):
+        lexico_ariel.tokens_reconocidos.clear()
+        lexico_ariel.analizador_lexico.lineno = 1
+        return ariel.analizador_sintactico.parse(codigo, lexer=lexico_ariel.analizador_lexico)
+
+    def editar(codigo, viejo, nuevo):
+        # la primera aparición de `viejo` a partir de la mitad del archivo
+        i = codigo.index(viejo, len(codigo) // 2)
+        return codigo[:i] + nuevo + codigo[i + len(viejo):]
+
+    casos = (("Ariel", ariel, parsear_ariel, programa_ariel(n), " * 2 + ", " * 3 + "),
+             ("Jordan", jordan, jordan.parsear, programa_jordan(n), " + 2 * 3;", " + 2 * 4;"))
+    print(f"Programa de ~{n} líneas, una sentencia editada a la mitad")
+    for nombre, modulo, parsear, codigo, viejo, nuevo in casos:
+        editado = editar(codigo, viejo, nuevo)
+        con_linea = editar(codigo, viejo, nuevo + "\n")
+        incremental = modulo.parser_incremental()
+        with contextlib.redirect_stdout(io.StringIO()):
+            ms_completo = _cronometrar(lambda: parsear(editado)) * 1000
+            inicio = time.perf_counter()
+            modulo.reparsear(incremental, codigo)
+            ms_primero = (time.perf_counter() - inicio) * 1000
+            # cada llamada alterna entre el original y la edición: siempre hay algo que reparsear
+            alternar = itertools.cycle((editado, codigo))
+            ms_editar = _cronometrar(lambda: modulo.reparsear(incremental, next(alternar)), 4) * 1000
+            alternar = itertools.cycle((con_linea, codigo))
+            ms_linea = _cronometrar(lambda: modulo.reparsear(incremental, next(alternar)), 4) * 1000
+        print(f"  {nombre:6} completo {ms_completo:8.1f} ms   primer incremental {ms_primero:8.1f} ms   "
+              f"edición {ms_editar:6.2f} ms   edición + línea nueva {ms_linea:6.2f} ms   "
+              f"({incremental.parseados} trozo(s) parseado(s) de {len(incremental.trozos)})")
+
+
+def _percentiles(valores):
+    ordenados = sorted(valores)
+    return {p: ordenados[min(len(ordenados) - 1, int(len(ordenados) * p / 100))] for p in (50, 90, 99)}
+
+
+def bench_lsp(n=5_000, ediciones=200):
+    """Latencia edición -> diagnósticos del servidor LSP de Ariel (--lsp) con un cliente local por stdio."""
+    import queue
+    import subprocess
+    import threading
+    from comun.servidor_lsp import leer_mensaje, escribir_mensaje
+    servidor = os.path.join(CODIGO, 'ArielArchivos', 'analizadorSintactico.py')
+    proceso = subprocess.Popen([sys.executable, servidor, '--lsp'], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL)
+    recibidos = queue.Queue()
+    versiones_publicadas = []
+
+    def leer():
+        for mensaje in iter(lambda: leer_mensaje(proceso.stdout), None):
+            if mensaje.get('method') == 'textDocument/publishDiagnostics':
+                versiones_publicadas.append(mensaje['params'].get('version'))
+            recibidos.put((time.perf_counter(), mensaje))
+
+    threading.Thread(target=leer, daemon=True).start()
+
+    def enviar(mensaje):
+        mensaje['jsonrpc'] = '2.0'
+        escribir_mensaje(proceso.stdin, mensaje)
+
+    def esperar(condicion):
+        while True:
+            instante, mensaje = recibidos.get(timeout=60)
+            if condicion(mensaje):
+                return instante, mensaje
+
+    def publicado(version):
+        return lambda m: m.get('method') == 'textDocument/publishDiagnostics' and m['params'].get('version') == version
+
+    uri = 'file:///bench.swift'
+    codigo = programa_ariel(n)
+    lineas = codigo.split('\n')
+    fila = next(i for i in range(len(lineas) // 2, len(lineas)) if lineas[i].startswith('let resultado'))
+    columna = len(lineas[fila]) - 2             # último dígito antes del ';'
+    version = 1
+
+    def editar(texto, ultimo=True):
+        nonlocal version
+        version += 1
+        enviar({'method': 'textDocument/didChange', 'params': {
+            'textDocument': {'uri': uri, 'version': version},
+            'contentChanges': [{'range': {'start': {'line': fila, 'character': columna},
+                                          'end': {'line': fila, 'character': columna + 1}}, 'text': texto}]}})
+        if ultimo:
+            return esperar(publicado(version))
+
+    enviar({'id': 0, 'method': 'initialize', 'params': {'capabilities': {}}})
+    esperar(lambda m: m.get('id') == 0)
+    inicio = time.perf_counter()
+    enviar({'method': 'textDocument/didOpen', 'params': {'textDocument': {
+        'uri': uri, 'languageId': 'swift', 'version': version, 'text': codigo}}})
+    esperar(publicado(version))
+    ms_abrir = (time.perf_counter() - inicio) * 1000
+
+    validas, con_error = [], []
+    for i in range(ediciones):
+        # un dígito nuevo (válido) o un '+' suelto (error de sintaxis: se parsea todo el archivo)
+        erroneo = i % 10 == 9
+        inicio = time.perf_counter()
+        instante, mensaje = editar('+' if erroneo else str(i % 10))
+        (con_error if erroneo else validas).append((instante - inicio) * 1000)
+        if erroneo and not mensaje['params']['diagnostics']:
+            print("  ⚠️ la edición con error no produjo diagnósticos")
+
+    # ráfaga: 10 ediciones seguidas, solo importa la última
+    primera = version + 1
+    inicio = time.perf_counter()
+    for i in range(10):
+        respuesta = editar(str(i), ultimo=i == 9)
+    ms_rafaga = (respuesta[0] - inicio) * 1000
+    intermedias = sum(1 for v in versiones_publicadas if primera <= v < version)
+
+    # pedido de diagnósticos cancelado enseguida
+    editar('7', ultimo=False)
+    enviar({'id': 1, 'method': 'textDocument/diagnostic', 'params': {'textDocument': {'uri': uri}}})
+    enviar({'method': '$/cancelRequest', 'params': {'id': 1}})
+    _, respuesta = esperar(lambda m: m.get('id') == 1)
+    cancelado = 'error' in respuesta
+
+    enviar({'id': 2, 'method': 'shutdown'})
+    esperar(lambda m: m.get('id') == 2)
+    enviar({'method': 'exit'})
+    codigo_salida = proceso.wait(timeout=30)
+
+    print(f"Servidor LSP (Ariel), documento de ~{n} líneas: abrir {ms_abrir:.1f} ms")
+    for nombre, valores in (("edición válida", validas), ("edición con error", con_error)):
+        p = _percentiles(valores)
+        print(f"  {nombre:18} {len(valores):4} ediciones   p50 {p[50]:7.2f} ms   p90 {p[90]:7.2f} ms   p99 {p[99]:7.2f} ms")
+    print(f"  ráfaga de 10 ediciones: {ms_rafaga:.1f} ms hasta los diagnósticos de la última "
+          f"({intermedias} versión(es) intermedia(s) publicada(s))")
+    print(f"  pedido cancelado: {'RequestCancelled' if cancelado else 'contestado antes de cancelar'}   "
+          f"salida del servidor: {codigo_salida}")
+
+
+def bench_repl(n=100_000):
+    """Costo de una línea del REPL de Ayman con historial vacío y con n entradas antes."""
+    ayman = _importar('Aymanarchivos', 'analizador_swift')
+    linea = "let t = v0 + 2 * (3 - v0 % 4)\n"
+
+    def por_linea(repeticiones=2_000):
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            ayman.evaluar_entrada(sesion, linea)
+            ayman.deshacer(sesion)
+        return (time.perf_counter() - inicio) / repeticiones * 1000
+
+    sesion = ayman.nueva_sesion()
+    ayman.evaluar_entrada(sesion, "let v0 = 1\n")
+    vacio = por_linea()
+    inicio = time.perf_counter()
+    for i in range(1, n):
+        ayman.evaluar_entrada(sesion, f"let v{i} = v{i - 1} + {i}\n")
+    cargar = (time.perf_counter() - inicio) * 1000
+    lleno = por_linea()
+    completo = _cronometrar(lambda: ayman.analizar("".join(f"let v{i} = {i}\n" for i in range(n)) + linea), 1) * 1000
+    print("REPL de analizador_swift (cada línea se evalúa y se deshace):")
+    print(f"  historial de 1 entrada      {vacio:8.3f} ms/línea")
+    print(f"  historial de {n} entradas {lleno:8.3f} ms/línea   (cargarlas: {cargar:.0f} ms)")
+    print(f"  reanalizar todo el buffer   {completo:8.1f} ms")
+
+
+def programa_bucles(n):
+    """Programa de Ariel con bucles anidados, llamadas y recursión; n escala las vueltas."""
+    return f"""
+func mcd(a: Int, b: Int) -> Int {{
+    var x = a; var y = b;
+    while (y != 0) {{ let t = y; y = x % y; x = t; }}
+    return x;
+}}
+func esPrimo(n: Int) -> Bool {{
+    if (n < 2) {{ return false; }}
+    var d = 2;
+    while (d * d <= n) {{ if (n % d == 0) {{ return false; }} d = d + 1; }}
+    return true;
+}}
+func fib(n: Int) -> Int {{ if (n < 2) {{ return n; }} return fib(n - 1) + fib(n - 2); }}
+func media(a: Double, b: Double = 2.0) -> Double {{ return (a + b) / 2.0; }}
+var i = 0; var suma = 0; var primos = 0; var m = 0.0;
+while (i < {n}) {{
+    suma = suma + i * 3 % 7 - i / 5 + mcd(i, 360);
+    if (suma > 1000) {{ suma = suma % 1000; }}
+    if (esPrimo(i)) {{ primos = primos + 1; }}
+    m = media(m, 1.5);
+    i = i + 1;
+}}
+print(suma, primos, m, fib(18));
+"""
+
+
+def bench_ejecucion(n=20_000):
+    """Motor de clausuras (motorEjecucion) vs intérprete que recorre el árbol, en un programa con bucles."""
+    ariel = _importar('ArielArchivos', 'analizadorSintactico')
+    from motorEjecucion import tipos_de, compilar, InterpreteArbol
+    resultado = ariel.analyze(programa_bucles(n))
+    tipos = tipos_de(resultado.ast)
+    salidas = {'arbol': [], 'clausuras': []}
+    arbol = _cronometrar(lambda: InterpreteArbol(tipos, salidas['arbol'].append).ejecutar(resultado.ast), 1)
+    inicio = time.perf_counter()
+    compilado = compilar(resultado.ast, tipos, salidas['clausuras'].append)
+    compilacion = time.perf_counter() - inicio
+    clausuras = _cronometrar(compilado.ejecutar)
+    assert salidas['arbol'][-1] == salidas['clausuras'][-1], salidas
+    print(f"Programa con {n} vueltas de bucle (mcd, primos, fib(18)): {salidas['clausuras'][-1]}")
+    print(f"  intérprete del árbol  {arbol * 1000:9.1f} ms")
+    print(f"  clausuras             {clausuras * 1000:9.1f} ms   (compilar: {compilacion * 1000:.2f} ms)"
+          f"   x{arbol / clausuras:.1f}")
+
+
+def programa_swift(n):
+    """Programa de Ayman con n declaraciones y bucles for-in sobre rangos, listas y un diccionario."""
+    lineas = [f"let v{i} = {i} * 3 + {i % 7}\n" for i in range(n)]
+    lineas.append('let precios = ["pan": 2, "leche": 3, "queso": 9]\n')
+    lineas.append(f"for i in 1...{n} {{\n    for j in [1, 2, 3, 4, 5] {{\n        let t = i * j + i / 3 - j % 2\n"
+                  f"        if t > i && t % 97 == 0 {{\n            print(t)\n        }}\n    }}\n}}\n")
+    lineas.append("for par in precios {\n    print(par)\n}\n")
+    lineas.append(f'print("fin \\(v{n - 1})")\n')
+    return "".join(lineas)
+
+
+def bench_transpilado(n=20_000):
+    """Ayman traducido a Python: analizar + traducir + compile() la primera vez, y el code object del cache después."""
+    import io
+    import shutil
+    import tempfile
+    ayman = _importar('Aymanarchivos', 'analizador_swift')
+    import transpilador_ayman
+    codigo = programa_swift(n)
+    carpeta = tempfile.mkdtemp()
+    try:
+        analisis = _cronometrar(lambda: ayman.analyze(codigo), 1)
+        inicio = time.perf_counter()
+        programa, errores = ayman.compilar_programa(codigo, carpeta=carpeta)
+        primera = time.perf_counter() - inicio
+        assert programa is not None, errores
+        cacheado = _cronometrar(lambda: ayman.compilar_programa(codigo, carpeta=carpeta))
+        salida = io.StringIO()
+        ejecucion = _cronometrar(lambda: transpilador_ayman.ejecutar(programa, salida=salida), 1)
+    finally:
+        shutil.rmtree(carpeta, ignore_errors=True)
+    print(f"Programa de Ayman con {n} declaraciones y {n * 5} vueltas de bucle "
+          f"({len(salida.getvalue().splitlines())} lineas impresas):")
+    print(f"  analizar (analyze)                  {analisis * 1000:9.1f} ms")
+    print(f"  primera vez (analizar + compilar)   {primera * 1000:9.1f} ms")
+    print(f"  con el code object en el cache      {cacheado * 1000:9.1f} ms   x{primera / cacheado:.0f}")
+    print(f"  ejecutar (CPython)                  {ejecucion * 1000:9.1f} ms")
+
+
+def proyecto_swift(carpeta, n, cuerpo=40):
+    """n archivos de Ariel en capas: cada uno usa la variable y la función de dos archivos anteriores."""
+    for i in range(n):
+        lineas = [f"import m{i // 2}"] if i else []
+        lineas.append(f"var c{i}: Int = {i};")
+        lineas.append(f"func f{i}(n: Int) -> Int {{")
+        lineas.extend(f"    var t{k} = n * {k} + {k % 5};" for k in range(cuerpo))
+        lineas.append("    return n;\n}")
+        if i:
+            a, b = i // 2, max(0, i - 3)
+            lineas.append(f"let u{i} = c{a} + c{b} + f{a}({i});")
+            lineas.append(f"c{b} = c{b} + 1;")
+        with open(os.path.join(carpeta, f"m{i}.swift"), "w", encoding="utf-8") as f:
+            f.write("\n".join(lineas) + "\n")
+
+
+def bench_proyecto(n=400):
+    """Proyecto de n archivos: en frío, sin cambios, y editando una hoja o la raíz (con y sin cambiar lo que exporta)."""
+    import shutil
+    import tempfile
+    _importar('ArielArchivos', 'analizadorSintactico')
+    from proyecto import Proyecto
+    carpeta = tempfile.mkdtemp()
+    fuentes, cache = os.path.join(carpeta, "src"), os.path.join(carpeta, "cache")
+    os.makedirs(fuentes)
+    proyecto_swift(fuentes, n)
+
+    def editar(nombre, viejo, nuevo):
+        ruta = os.path.join(fuentes, nombre)
+        with open(ruta, encoding="utf-8") as f: texto = f.read()
+        with open(ruta, "w", encoding="utf-8") as f: f.write(texto.replace(viejo, nuevo))
+
+    def medir(titulo, trabajadores=None, carpeta_cache=cache):
+        resultado = Proyecto(fuentes, carpeta_cache, trabajadores).analizar()
+        print(f"  {titulo:34} {resultado.duracion_ms:9.1f} ms   {len(resultado.parseados):4} parseado(s), "
+              f"{len(resultado.verificados):4} verificado(s)")
+        return resultado
+
+    try:
+        print(f"Proyecto de {n} archivos ({os.cpu_count()} núcleo(s)):")
+        medir("en frío, un proceso", 1, None)
+        resultado = medir("en frío, pool")
+        errores = sum(len(e) for e in resultado.errores.values())
+        medir("sin cambios")
+        editar(f"m{n - 1}.swift", "return n;", "return n + 1;")
+        medir("una hoja")
+        editar("m0.swift", "return n;", "return n * 2;")
+        medir("la raíz, sin cambiar exportados")
+        editar("m0.swift", "var c0: Int = 0;", "var c0: Double = 0.5;")
+        medir("la raíz, c0 pasa a Double")
+    finally:
+        shutil.rmtree(carpeta, ignore_errors=True)
+    print(f"  ({len(resultado.componentes)} componente(s), {errores} error(es) en la corrida en frío)")
+
+
+BENCHMARKS = {
+    'simbolos': bench_simbolos,
+    'ayman_fases': bench_ayman_fases,
+    'ariel_consultas': bench_ariel_consultas,
+    'ayman_consultas': bench_ayman_consultas,
+    'ariel_paralelo': bench_ariel_paralelo,
+    'plegado': bench_plegado,
+    'cadenas': bench_cadenas,
+    'colecciones': bench_colecciones,
+    'plazo': bench_plazo,
+    'primer_error': bench_primer_error,
+    'tormenta': bench_tormenta,
+    'recuperacion': bench_recuperacion,
+    'lexico_adverso': bench_lexico_adverso,
+    'flujo': bench_flujo,
+    'tuberia': bench_tuberia,
+    'tokens_compartidos': bench_tokens_compartidos,
+    'lexico_unificado': bench_lexico_unificado,
+    'cache_resultados': bench_cache_resultados,
+    'instantanea_ast': bench_instantanea_ast,
+    'incremental': bench_incremental,
+    'lsp': bench_lsp,
+    'repl': bench_repl,
+    'ejecucion': bench_ejecucion,
+    'transpilado': bench_transpilado,
+    'proyecto': bench_proyecto,
+}
+
+
+if __name__ == "__main__":
+    nombre = sys.argv[1] if len(sys.argv) > 1 else None
+    if nombre not in BENCHMARKS:
+        print("Benchmarks disponibles: " + ", ".join(BENCHMARKS))
+        sys.exit(1)
+    argumentos = [int(a) for a in sys.argv[2:]]
+    BENCHMARKS[nombre](*argumentos)
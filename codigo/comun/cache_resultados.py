@@ -0,0 +1,299 @@
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from comun.plazo import ResultadoAnalisis
+from comun import instantanea_ast
+
+# =========================================================================
+# CACHÉ DE RESULTADOS EN DISCO
+# =========================================================================
+# Guarda el ResultadoAnalisis de cada archivo ya analizado, con clave
+# (hash del contenido, analizador, firma de sus reglas, variante). La firma
+# es el hash de los .py del analizador y de comun/: cambiar la gramática o
+# una regla de tipos invalida sus entradas sin borrar nada a mano.
+# Antes de leer el archivo se compara su (mtime, tamaño) con el índice de
+# rutas; si coincide se usa el hash guardado, así un archivo sin cambios
+# cuesta un stat y la lectura de la entrada, no un parseo.
+# Cada entrada es un archivo que se escribe aparte y se publica con
+# os.replace: varios procesos pueden usar la misma carpeta a la vez (el
+# último en escribir gana y cualquier versión es válida). Una entrada que
+# falta o no se puede leer cuenta como fallo. Cuando la carpeta pasa de
+# `limite_bytes` se borran las entradas usadas hace más tiempo (cada
+# acierto actualiza el mtime de la suya y de su registro en el índice de
+# rutas, que se desaloja junto con ellas). Lo ocupado se lleva sumando lo
+# que escribe cada guardar: la carpeta se recorre al crear el caché y al
+# desalojar, no en cada escritura. Lo que escriben otros procesos se ve
+# recién en el próximo recorrido.
+# Con guardar_ast=True el AST va al lado, como instantánea (comun/
+# instantanea_ast.py) con la misma clave: cargar_ast lo devuelve sin
+# lexear ni parsear, completo o como vista perezosa.
+
+# Carpeta por omisión (relativa a donde se corre el análisis)
+CARPETA = '.cache_analisis'
+
+# Un mtime tan cercano al momento en que se registró no prueba nada: el
+# archivo pudo cambiar otra vez dentro del mismo tic del reloj
+MARGEN_NS = 2_000_000_000
+
+# Al desalojar se baja hasta esta fracción del límite
+FRACCION_DESALOJO = 0.9
+
+_EXCLUIDOS = {'benchmarks.py'}
+_COMUN = os.path.dirname(os.path.abspath(__file__))
+
+
+def _hash(*partes) -> str:
+    h = hashlib.sha256()
+    for parte in partes:
+        h.update(parte if isinstance(parte, bytes) else repr(parte).encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def firma_de(carpeta: str) -> str:
+    """Hash de los .py de `carpeta` y de comun/ (sin tablas generadas ni mediciones)."""
+    h = hashlib.sha256(f"{sys.version_info[:2]} {pickle.HIGHEST_PROTOCOL}".encode())
+    for directorio in (os.path.abspath(carpeta), _COMUN):
+        for nombre in sorted(os.listdir(directorio)):
+            if nombre.endswith('.py') and not nombre.startswith('parsetab') and nombre not in _EXCLUIDOS:
+                with open(os.path.join(directorio, nombre), 'rb') as f:
+                    h.update(nombre.encode() + b'\0' + f.read())
+    return h.hexdigest()
+
+
+class Estadisticas:
+    __slots__ = ('aciertos_stat', 'aciertos_contenido', 'fallos', 'guardados', 'desalojados', 'corruptos')
+
+    def __init__(self):
+        for campo in self.__slots__: setattr(self, campo, 0)
+
+    @property
+    def aciertos(self) -> int:
+        return self.aciertos_stat + self.aciertos_contenido
+
+    @property
+    def tasa(self) -> float:
+        consultas = self.aciertos + self.fallos
+        return self.aciertos / consultas if consultas else 0.0
+
+    def __repr__(self):
+        return (f"Estadisticas({self.aciertos} acierto(s) ({self.aciertos_stat} por stat), {self.fallos} fallo(s), "
+                f"{self.guardados} guardado(s), {self.desalojados} desalojado(s), {self.corruptos} corrupto(s))")
+
+
+class CacheResultados:
+    """
+    Resultados de `analizador` guardados en `carpeta`. `firma` identifica la
+    versión de sus reglas (ver firma_de). Con guardar_ast=False (por omisión)
+    solo se guardan los errores y los aciertos traen ast=None; `clases_ast`
+    (nombre -> clase) hace falta para cargar ASTs con nodos (Ariel).
+    """
+
+    def __init__(self, carpeta: str, analizador: str, firma: str, limite_bytes: int = 64 * 1024 * 1024,
+                 guardar_ast: bool = False, clases_ast: Optional[Dict[str, type]] = None):
+        self.carpeta = carpeta
+        self.analizador = analizador
+        self.firma = firma
+        self.limite_bytes = limite_bytes
+        self.guardar_ast = guardar_ast
+        self.clases_ast = clases_ast
+        self.estadisticas = Estadisticas()
+        self._resultados = os.path.join(carpeta, 'resultados')
+        self._rutas = os.path.join(carpeta, 'rutas')
+        os.makedirs(self._resultados, exist_ok=True)
+        os.makedirs(self._rutas, exist_ok=True)
+        # ruta -> (mtime_ns, tamaño, hash del contenido, cuándo se registró): evita releer el índice
+        self._vistos: Dict[str, Tuple[int, int, str, int]] = {}
+        self._ocupado: Optional[int] = None     # bytes en la carpeta según el último recorrido más lo escrito
+
+    # --- índice de rutas -------------------------------------------------
+
+    def _archivo_ruta(self, ruta: str) -> str:
+        return os.path.join(self._rutas, _hash(ruta)[:32])
+
+    def _registro(self, ruta: str) -> Optional[Tuple[int, int, str, int]]:
+        registro = self._vistos.get(ruta)
+        if registro is None:
+            registro = self._leer(self._archivo_ruta(ruta))
+            if registro is not None: self._vistos[ruta] = registro
+        return registro
+
+    def _contenido(self, ruta: str, estado: os.stat_result) -> Tuple[str, Optional[bytes]]:
+        """Hash del contenido de `ruta`; los bytes solo si hubo que leerla."""
+        registro = self._registro(ruta)
+        if (registro is not None and registro[:2] == (estado.st_mtime_ns, estado.st_size)
+                and estado.st_mtime_ns < registro[3] - MARGEN_NS):
+            return registro[2], None
+        with open(ruta, 'rb') as f:
+            datos = f.read()
+        contenido = _hash(datos)
+        nuevo = (estado.st_mtime_ns, estado.st_size, contenido, time.time_ns())
+        self._vistos[ruta] = nuevo
+        # solo se reescribe si cambió o si el registro anterior todavía no servía para confiar en el stat
+        if registro is None or registro[:3] != nuevo[:3] or estado.st_mtime_ns >= registro[3] - MARGEN_NS:
+            self._ocupar(self._escribir(self._archivo_ruta(ruta), pickle.dumps(nuevo)))
+        return contenido, datos
+
+    # --- entradas ----------------------------------------------------------
+
+    def _archivo_resultado(self, contenido: str, variante, extension: str = '.pkl') -> str:
+        return os.path.join(self._resultados, _hash(contenido, self.analizador, self.firma, variante) + extension)
+
+    def _leer(self, archivo: str, cargar: Callable = pickle.loads):
+        try:
+            with open(archivo, 'rb') as f:
+                return cargar(f.read())
+        except FileNotFoundError:
+            return None
+        except Exception:               # escritura de otra versión, disco lleno, ...
+            self.estadisticas.corruptos += 1
+            self._borrar(archivo)
+            return None
+
+    def _escribir(self, archivo: str, datos: bytes) -> int:
+        descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(archivo), suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as f:
+                f.write(datos)
+            os.replace(temporal, archivo)
+        except BaseException:
+            self._borrar(temporal)
+            raise
+        return len(datos)
+
+    @staticmethod
+    def _borrar(archivo: str):
+        try:
+            os.remove(archivo)
+        except OSError:
+            pass
+
+    def buscar(self, ruta: str, variante=None) -> Optional[ResultadoAnalisis]:
+        """El resultado guardado para el contenido actual de `ruta`, o None."""
+        resultado, _, _ = self._buscar(os.path.abspath(ruta), variante)
+        return resultado
+
+    def _buscar(self, ruta: str, variante):
+        estado = os.stat(ruta)
+        contenido, datos = self._contenido(ruta, estado)
+        archivo = self._archivo_resultado(contenido, variante)
+        resultado = self._leer(archivo)
+        if resultado is None:
+            self.estadisticas.fallos += 1
+            return None, contenido, datos
+        if datos is None: self.estadisticas.aciertos_stat += 1
+        else: self.estadisticas.aciertos_contenido += 1
+        self._tocar(archivo)
+        self._tocar(self._archivo_ruta(ruta))
+        if self.guardar_ast:
+            resultado.ast = self._cargar_instantanea(contenido, variante)
+        return resultado, contenido, datos
+
+    @staticmethod
+    def _tocar(archivo: str):
+        try:
+            os.utime(archivo)           # LRU: el mtime de la entrada es su último uso
+        except OSError:
+            pass
+
+    def _cargar_instantanea(self, contenido: str, variante, perezoso: bool = False):
+        archivo = self._archivo_resultado(contenido, variante, '.ast')
+        ast = self._leer(archivo, lambda datos: instantanea_ast.cargar(datos, self.clases_ast, perezoso))
+        if ast is not None: self._tocar(archivo)
+        return ast
+
+    def cargar_ast(self, ruta: str, variante=None, perezoso: bool = False):
+        """
+        El AST guardado para el contenido actual de `ruta` (sin lexear ni
+        parsear), o None si no hay. Con perezoso=True, vistas de
+        instantanea_ast en vez del árbol completo.
+        """
+        ruta = os.path.abspath(ruta)
+        contenido, _ = self._contenido(ruta, os.stat(ruta))
+        return self._cargar_instantanea(contenido, variante, perezoso)
+
+    def analizar(self, ruta: str, analizar: Callable[[str], ResultadoAnalisis], variante=None) -> ResultadoAnalisis:
+        """
+        El resultado de analizar(texto de `ruta`), del caché si el contenido ya
+        se analizó con esta firma y `variante` (p. ej. max_errors). Los
+        resultados parciales (plazo agotado) no se guardan.
+        """
+        ruta = os.path.abspath(ruta)
+        resultado, contenido, datos = self._buscar(ruta, variante)
+        if resultado is not None:
+            return resultado
+        if datos is None:
+            with open(ruta, 'rb') as f:
+                datos = f.read()
+        resultado = analizar(datos.decode('utf-8'))
+        if not resultado.parcial:
+            try:
+                self.guardar(contenido, resultado, variante)
+            except OSError:             # sin espacio o sin permisos: el resultado sigue siendo bueno
+                pass
+        return resultado
+
+    def guardar(self, contenido: str, resultado: ResultadoAnalisis, variante=None):
+        if self.guardar_ast and resultado.ast is not None:
+            try:
+                instantanea = instantanea_ast.serializar(resultado.ast)
+            except (TypeError, RecursionError):     # un valor que el formato no conoce: solo los errores
+                instantanea = None
+            if instantanea is not None:
+                # antes que el resultado: quien encuentra el resultado ya encuentra el AST
+                self._ocupar(self._escribir(self._archivo_resultado(contenido, variante, '.ast'), instantanea))
+        entrada = ResultadoAnalisis(list(resultado.errores), None, None, resultado.duracion_ms)
+        self._ocupar(self._escribir(self._archivo_resultado(contenido, variante),
+                                    pickle.dumps(entrada, pickle.HIGHEST_PROTOCOL)))
+        self.estadisticas.guardados += 1
+
+    # --- LRU ---------------------------------------------------------------
+
+    def _ocupar(self, tam: int):
+        """Suma lo recién escrito; recorre la carpeta solo al crear el caché o si se pasa del límite."""
+        if self._ocupado is None:
+            self._ocupado = sum(tam for _, tam, _ in self._entradas())
+        else:
+            self._ocupado += tam        # reemplazar una entrada la cuenta dos veces: desaloja antes, nunca tarde
+        if self._ocupado > self.limite_bytes:
+            self._desalojar()
+
+    def _entradas(self):
+        """(mtime_ns, tamaño, archivo) de los resultados y del índice de rutas."""
+        for directorio in (self._resultados, self._rutas):
+            with os.scandir(directorio) as it:
+                for e in it:
+                    if e.name.endswith('.tmp'):     # otro proceso la está escribiendo
+                        continue
+                    try:
+                        estado = e.stat()
+                    except OSError:         # otro proceso la borró
+                        continue
+                    yield estado.st_mtime_ns, estado.st_size, e.path
+
+    def _desalojar(self):
+        entradas = list(self._entradas())
+        total = sum(tam for _, tam, _ in entradas)
+        if total > self.limite_bytes:
+            entradas.sort()
+            objetivo = self.limite_bytes * FRACCION_DESALOJO
+            for _, tam, archivo in entradas:
+                if total <= objetivo: break
+                self._borrar(archivo)
+                total -= tam
+                if os.path.dirname(archivo) == self._resultados: self.estadisticas.desalojados += 1
+        self._ocupado = total
+
+    def tamano(self) -> int:
+        return sum(tam for _, tam, _ in self._entradas())
+
+    def limpiar(self):
+        for directorio in (self._resultados, self._rutas):
+            for nombre in os.listdir(directorio): self._borrar(os.path.join(directorio, nombre))
+        self._vistos.clear()
+        self._ocupado = 0
@@ -0,0 +1,180 @@
+from array import array
+from typing import Callable, Iterator, List, Optional, Tuple
+
+# =========================================================================
+# LITERALES DE COLECCIÓN GRANDES (arreglos, diccionarios, tuplas)
+# =========================================================================
+# Los elementos se guardan por tramos: una secuencia de literales seguidos
+# del mismo tipo va en un solo buffer tipado (array('q') para Int,
+# array('d') para Double/Float, bytearray para Bool, tabla empaquetada para
+# cadenas) en lugar de un nodo por elemento. Lo que no es literal (ids,
+# expresiones) va en un tramo "genérico" con los nodos tal cual.
+# Cada analizador decide cómo se ve un literal al materializarlo, pasando
+# `construir(tipo, valor)`.
+
+_FORMATOS = {'Int': 'q', 'Double': 'd', 'Float': 'd'}
+
+
+class TablaCadenas:
+    """Cadenas de un tramo: un solo texto concatenado y la posición donde termina cada una."""
+    __slots__ = ('texto', 'fines', '_pendientes')
+
+    def __init__(self):
+        self.texto = ''
+        self.fines = array('q')
+        self._pendientes: List[str] = []
+
+    def append(self, cadena: str):
+        # se valida antes de tocar nada: un TypeError (como el de array.append) deja la tabla como estaba
+        if not isinstance(cadena, str):
+            raise TypeError(f"TablaCadenas: se esperaba str, no {type(cadena).__name__}")
+        self.fines.append((self.fines[-1] if self.fines else 0) + len(cadena))
+        self._pendientes.append(cadena)
+
+    def _compactar(self):
+        if self._pendientes:
+            self.texto += ''.join(self._pendientes)
+            self._pendientes = []
+
+    def __len__(self):
+        return len(self.fines)
+
+    def __getitem__(self, i):
+        self._compactar()
+        inicio = self.fines[i - 1] if i else 0
+        return self.texto[inicio:self.fines[i]]
+
+    def __iter__(self):
+        self._compactar()
+        inicio, texto = 0, self.texto
+        for fin in self.fines:
+            yield texto[inicio:fin]
+            inicio = fin
+
+    def __getstate__(self):
+        self._compactar()
+        return self.texto, self.fines
+
+    def __setstate__(self, estado):
+        self.texto, self.fines = estado
+        self._pendientes = []
+
+
+class Tramo:
+    """Elementos seguidos del mismo tipo; tipo None = nodos genéricos (lista)."""
+    __slots__ = ('tipo', 'datos')
+
+    def __init__(self, tipo, datos):
+        self.tipo, self.datos = tipo, datos
+
+
+def _buffer(tipo):
+    if tipo is None: return []
+    formato = _FORMATOS.get(tipo)
+    if formato is not None: return array(formato)
+    if tipo == 'Bool': return bytearray()
+    return TablaCadenas()
+
+
+class ColeccionLiteral:
+    __slots__ = ('tramos', 'total')
+
+    def __init__(self):
+        self.tramos: List[Tramo] = []
+        self.total = 0
+
+    def __len__(self):
+        return self.total
+
+    def agregar_literal(self, tipo: str, valor) -> bool:
+        """Agrega un literal; devuelve False si no cabe en un buffer (p. ej. Int fuera de 64 bits)."""
+        tramo = self.tramos[-1] if self.tramos else None
+        nuevo = tramo is None or tramo.tipo != tipo
+        if nuevo: tramo = Tramo(tipo, _buffer(tipo))
+        try:
+            tramo.datos.append(valor)
+        except (OverflowError, TypeError):
+            return False
+        if nuevo: self.tramos.append(tramo)
+        self.total += 1
+        return True
+
+    def agregar_nodo(self, nodo):
+        if not self.tramos or self.tramos[-1].tipo is not None:
+            self.tramos.append(Tramo(None, []))
+        self.tramos[-1].datos.append(nodo)
+        self.total += 1
+
+    def solo_literales(self) -> bool:
+        return all(t.tipo is not None for t in self.tramos)
+
+    def nodos(self) -> Iterator:
+        """Solo los elementos genéricos (no literales)."""
+        for tramo in self.tramos:
+            if tramo.tipo is None:
+                yield from tramo.datos
+
+    def elementos(self, construir: Callable) -> Iterator:
+        """Todos los elementos en orden; los literales se materializan con construir(tipo, valor)."""
+        for tramo in self.tramos:
+            if tramo.tipo is None:
+                yield from tramo.datos
+            elif tramo.tipo == 'Bool':
+                for v in tramo.datos: yield construir('Bool', bool(v))
+            else:
+                tipo = tramo.tipo
+                for v in tramo.datos: yield construir(tipo, v)
+
+    def primero(self, construir: Callable):
+        for elemento in self.elementos(construir):
+            return elemento
+        return None
+
+    def mapear_nodos(self, funcion: Callable) -> 'ColeccionLiteral':
+        """Copia con funcion aplicada a cada nodo genérico; los buffers de literales se comparten."""
+        nueva = ColeccionLiteral()
+        for tramo in self.tramos:
+            if tramo.tipo is None:
+                nueva.tramos.append(Tramo(None, [funcion(n) for n in tramo.datos]))
+            else:
+                nueva.tramos.append(tramo)
+        nueva.total = self.total
+        return nueva
+
+    def tramos_por_tipo(self, tipo_de_nodo: Callable) -> Iterator[Tuple[Optional[str], int, int]]:
+        """(tipo, inicio, cantidad) de cada secuencia de elementos seguidos del mismo tipo.
+
+        Los tramos de literales ya tienen un solo tipo; solo los nodos genéricos
+        se consultan uno por uno con tipo_de_nodo.
+        """
+        actual, inicio, cantidad = None, 0, 0
+        posicion = 0
+        for tramo in self.tramos:
+            if tramo.tipo is None:
+                tipos = [tipo_de_nodo(n) for n in tramo.datos]
+            else:
+                tipos = ((tramo.tipo, len(tramo.datos)),)
+            for item in tipos:
+                tipo, n = item if tramo.tipo is not None else (item, 1)
+                if cantidad and tipo == actual:
+                    cantidad += n
+                else:
+                    if cantidad: yield actual, inicio, cantidad
+                    actual, inicio, cantidad = tipo, posicion, n
+                posicion += n
+        if cantidad: yield actual, inicio, cantidad
+
+    def tipo_en(self, indice: int, tipo_de_nodo: Callable) -> Optional[str]:
+        posicion = 0
+        for tramo in self.tramos:
+            n = len(tramo.datos)
+            if indice < posicion + n:
+                return tramo.tipo if tramo.tipo is not None else tipo_de_nodo(tramo.datos[indice - posicion])
+            posicion += n
+        return None
+
+
+def agregar_elemento(coleccion: ColeccionLiteral, nodo, literal: Optional[Tuple[str, object]]):
+    """Agrega `nodo`; si `literal` es (tipo, valor) intenta guardarlo en el buffer tipado."""
+    if literal is None or not coleccion.agregar_literal(*literal):
+        coleccion.agregar_nodo(nodo)
@@ -0,0 +1,319 @@
+import heapq
+import queue
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+# =========================================================================
+# DIAGNÓSTICOS EN VIVO (compartido por los tres analizadores)
+# =========================================================================
+# Las listas de errores de cada analizador (errores_sintacticos,
+# parse_errors, semantic_errors, AnalizadorSemantico.errores, ...) son
+# ListaDiagnosticos: se leen como listas de cadenas, pero guardan registros
+# Diagnostico (código, línea, columna, severidad, argumentos) y el texto se
+# arma con la plantilla del catálogo solo al leerlo. Un mismo diagnóstico
+# repetido (mismo código y argumentos, p. ej. 100k usos del mismo
+# identificador no declarado) queda en una sola entrada con el conteo y las
+# primeras MAX_UBICACIONES líneas; el texto dice cuántas más hay. `len`
+# cuenta entradas y `total` (o apariciones()) cada error reportado.
+# Cada entrada nueva se publica además a los suscriptores del hilo actual,
+# así la CLI o un servicio pueden mostrar el primer error apenas aparece.
+
+PREFIJOS = {'lexico': 'LEX', 'sintactico': 'SIN', 'plegado': 'PLG', 'semantico': 'SEM'}
+
+_LINEA = re.compile(r'[Ll][ií]nea (\d+)')
+
+# Ubicaciones que se guardan (y se muestran) de un diagnóstico repetido
+MAX_UBICACIONES = 5
+
+
+class Diagnostico:
+    """
+    Registro compacto: código, posición y argumentos. El texto se arma recién
+    cuando se pide `mensaje`, con la plantilla del catálogo del analizador.
+    Si el mismo diagnóstico (mismo código y argumentos) se repite, se cuenta
+    en `veces` y se guardan las primeras ubicaciones en `lineas`.
+    """
+    __slots__ = ('codigo', 'plantilla', 'linea', 'columna', 'severidad', 'argumentos', 'fase',
+                 'veces', 'lineas', '_mensaje')
+
+    def __init__(self, codigo: str, mensaje: Optional[str] = None, linea: Optional[int] = None,
+                 columna: Optional[int] = None, severidad: str = 'error', argumentos: Optional[Dict] = None,
+                 fase: Optional[str] = None, plantilla: Optional[str] = None):
+        self.codigo, self.plantilla = codigo, plantilla
+        self.linea, self.columna = linea, columna
+        self.severidad = severidad
+        self.argumentos = argumentos or {}
+        self.fase = fase
+        self.veces = 1
+        self.lineas: List[int] = [linea] if linea is not None else []
+        self._mensaje = mensaje
+
+    @property
+    def mensaje(self) -> str:
+        """Texto de la primera aparición (se formatea una sola vez, al pedirlo)."""
+        if self._mensaje is None:
+            self._mensaje = self.plantilla.format(linea=self.linea, columna=self.columna, **self.argumentos)
+        return self._mensaje
+
+    def texto(self) -> str:
+        """Mensaje más el resumen de repeticiones, si las hubo."""
+        if self.veces == 1: return self.mensaje
+        resumen = f" (se repite {self.veces} veces"
+        if self.lineas:
+            resumen += "; líneas " + ", ".join(map(str, self.lineas))
+            if self.veces > len(self.lineas): resumen += f" y {self.veces - len(self.lineas)} más"
+        return self.mensaje + resumen + ")"
+
+    def como_dict(self) -> Dict:
+        return {'codigo': self.codigo, 'mensaje': self.mensaje, 'linea': self.linea, 'columna': self.columna,
+                'severidad': self.severidad, 'argumentos': self.argumentos, 'fase': self.fase,
+                'veces': self.veces, 'lineas': list(self.lineas)}
+
+    def __repr__(self):
+        donde = f"{self.linea}:{self.columna}" if self.columna else f"{self.linea}"
+        veces = f" x{self.veces}" if self.veces > 1 else ""
+        return f"Diagnostico({self.codigo}, línea {donde}{veces}, {self.mensaje!r})"
+
+
+class CanalDiagnosticos:
+    """Suscriptores por hilo: un análisis solo le habla a quien lo está escuchando."""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _suscriptores(self) -> List[Callable]:
+        lista = getattr(self._local, 'suscriptores', None)
+        if lista is None:
+            lista = self._local.suscriptores = []
+        return lista
+
+    @property
+    def activo(self) -> bool:
+        return bool(getattr(self._local, 'suscriptores', None))
+
+    def actuales(self) -> List[Callable]:
+        """Copia de los suscriptores del hilo actual (para pasárselos a otro hilo)."""
+        return list(self._suscriptores())
+
+    def suscribir(self, funcion: Callable[[Diagnostico], None]) -> Callable[[], None]:
+        """Registra `funcion` en el hilo actual; devuelve la función para darse de baja."""
+        suscriptores = self._suscriptores()
+        suscriptores.append(funcion)
+        return lambda: suscriptores.remove(funcion)
+
+    def emitir(self, diagnostico: Diagnostico):
+        for funcion in list(self._suscriptores()):
+            funcion(diagnostico)
+
+    @contextmanager
+    def en_silencio(self):
+        """Lo que se reporta dentro del bloque no llega a los suscriptores de afuera (p. ej. un intento que se descarta)."""
+        previos = getattr(self._local, 'suscriptores', None)
+        self._local.suscriptores = []
+        try:
+            yield
+        finally:
+            self._local.suscriptores = previos
+
+
+canal = CanalDiagnosticos()
+
+
+_ultima_columna = threading.local()
+
+
+def columna_de(texto: str, lexpos: int) -> int:
+    """
+    Columna (desde 1) de la posición `lexpos` de PLY. Los lexers piden
+    posiciones crecientes del mismo texto: el salto de línea se busca solo
+    desde la consulta anterior, así muchos errores en una línea larga no
+    vuelven a recorrerla entera.
+    """
+    ultimo = getattr(_ultima_columna, 'estado', None)
+    if ultimo is not None and ultimo[0] is texto and ultimo[1] <= lexpos:
+        salto = texto.rfind('\n', ultimo[1], lexpos)
+        if salto < 0: salto = ultimo[2]
+    else:
+        salto = texto.rfind('\n', 0, lexpos)
+    _ultima_columna.estado = (texto, lexpos, salto)
+    return lexpos - salto
+
+
+def emitir(fase: str, codigo: str, mensaje: str, linea=None, columna=None, **argumentos):
+    """Publica un diagnóstico que no se guarda en ninguna lista (p. ej. errores léxicos que solo se imprimen)."""
+    if canal.activo:
+        canal.emitir(Diagnostico(codigo, mensaje, linea, columna, 'error', argumentos, fase))
+
+
+class ListaDiagnosticos:
+    """
+    Errores de una fase. Se recorre como una lista de mensajes (ya con el
+    resumen de repeticiones), pero guarda Diagnostico: los repetidos se
+    juntan en una sola entrada y ningún texto se formatea hasta que se lee.
+    Cada entrada nueva se publica en `canal` en el momento.
+    """
+    __slots__ = ('fase', 'mensajes', 'max_ubicaciones', '_entradas', '_indice')
+
+    def __init__(self, fase: str, mensajes: Optional[Dict[str, str]] = None, max_ubicaciones: int = MAX_UBICACIONES):
+        self.fase = fase
+        self.mensajes = mensajes or {}          # código -> plantilla
+        self.max_ubicaciones = max_ubicaciones
+        self._entradas: List[Diagnostico] = []
+        self._indice: Dict = {}
+
+    def reportar(self, codigo: str, linea=None, columna=None, severidad='error', **argumentos):
+        """Registra el diagnóstico `codigo` del catálogo; el texto se arma al leerlo."""
+        clave = (codigo, *argumentos.values())
+        entrada = self._indice.get(clave)
+        if entrada is not None:
+            self._repetir(entrada, linea)
+            return
+        entrada = Diagnostico(codigo, None, linea, columna, severidad, argumentos, self.fase, self.mensajes[codigo])
+        self._agregar(clave, entrada)
+
+    def append(self, mensaje: str):
+        """Mensaje ya formateado (sin código de catálogo)."""
+        entrada = self._indice.get(mensaje)
+        if entrada is not None:
+            self._repetir(entrada, None)
+            return
+        linea = _LINEA.search(mensaje)
+        entrada = Diagnostico(f"{PREFIJOS.get(self.fase, 'GEN')}000", mensaje,
+                              int(linea.group(1)) if linea else None, fase=self.fase)
+        self._agregar(mensaje, entrada)
+
+    def _agregar(self, clave, entrada: Diagnostico, publicar: bool = True):
+        self._indice[clave] = entrada
+        self._entradas.append(entrada)
+        if publicar and canal.activo: canal.emitir(entrada)
+
+    def _repetir(self, entrada: Diagnostico, linea, veces=1, lineas=()):
+        entrada.veces += veces
+        espacio = self.max_ubicaciones - len(entrada.lineas)
+        if espacio > 0:
+            if linea is not None: entrada.lineas.append(linea)
+            elif lineas: entrada.lineas.extend(lineas[:espacio])
+
+    def extend(self, otros, publicar: bool = True):
+        """
+        Agrega mensajes sueltos, o junta otra ListaDiagnosticos conservando los
+        conteos. Con publicar=False las entradas nuevas no van a `canal` (ya se
+        publicaron cuando se reportaron).
+        """
+        if not isinstance(otros, ListaDiagnosticos):
+            for mensaje in otros: self.append(mensaje)
+            return
+        for d in otros._entradas:
+            clave = (d.codigo, *d.argumentos.values()) if d.plantilla is not None else d.mensaje
+            entrada = self._indice.get(clave)
+            if entrada is not None:
+                self._repetir(entrada, None, d.veces, d.lineas)
+            else:
+                copia = Diagnostico(d.codigo, d._mensaje, d.linea, d.columna, d.severidad, d.argumentos,
+                                    d.fase, d.plantilla)
+                copia.veces, copia.lineas = d.veces, d.lineas[:self.max_ubicaciones]
+                self._agregar(clave, copia, publicar)
+
+    def diagnosticos(self) -> List[Diagnostico]:
+        return list(self._entradas)
+
+    @property
+    def total(self) -> int:
+        """Apariciones, contando repeticiones."""
+        return sum(d.veces for d in self._entradas)
+
+    def clear(self):
+        self._entradas.clear()
+        self._indice.clear()
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def __iter__(self) -> Iterator[str]:
+        for d in self._entradas: yield d.texto()
+
+    def __getitem__(self, i):
+        if isinstance(i, slice): return [d.texto() for d in self._entradas[i]]
+        return self._entradas[i].texto()
+
+    def __add__(self, otra):
+        return list(self) + list(otra)
+
+    def __radd__(self, otra):
+        return list(otra) + list(self)
+
+    def __eq__(self, otra):
+        return list(self) == list(otra)
+
+    def __repr__(self):
+        return f"ListaDiagnosticos({self.fase!r}, {list(self)!r})"
+
+
+def apariciones(*listas) -> int:
+    """Errores reportados en total, contando las repeticiones (las listas de mensajes cuentan uno por mensaje)."""
+    return sum(lista.total if isinstance(lista, ListaDiagnosticos) else len(lista) for lista in listas)
+
+
+def por_linea(*listas) -> List[str]:
+    """
+    Mensajes de varias fases intercalados por línea (p. ej. plegado y
+    semántico, que recorren el mismo árbol en pasadas distintas). Cada lista
+    conserva su orden; a igual línea va primero la lista anterior. Acepta
+    ListaDiagnosticos o listas de mensajes ya formateados; lo que no tiene
+    línea va al final.
+    """
+    def entradas(lista):
+        if isinstance(lista, ListaDiagnosticos):
+            return ((d.linea, d.texto()) for d in lista.diagnosticos())
+        return ((int(m.group(1)) if m else None, mensaje) for mensaje in lista for m in [_LINEA.search(mensaje)])
+    sin_linea = float('inf')
+    juntos = heapq.merge(*map(entradas, listas), key=lambda e: sin_linea if e[0] is None else e[0])
+    return [mensaje for _, mensaje in juntos]
+
+
+def transmitir(funcion: Callable, *args, **kwargs) -> Iterator[Diagnostico]:
+    """
+    Corre funcion(*args, **kwargs) en otro hilo y va entregando sus diagnósticos
+    a medida que aparecen. El valor de retorno de la función queda en
+    StopIteration.value (o como resultado de `yield from`).
+    """
+    cola: 'queue.Queue' = queue.Queue()
+    fin = object()
+    salida = {}
+
+    def trabajar():
+        baja = canal.suscribir(cola.put)
+        try:
+            salida['resultado'] = funcion(*args, **kwargs)
+        except BaseException as e:      # se relanza en el hilo que consume
+            salida['error'] = e
+        finally:
+            baja()
+            cola.put(fin)
+
+    hilo = threading.Thread(target=trabajar, daemon=True)
+    hilo.start()
+    while True:
+        diagnostico = cola.get()
+        if diagnostico is fin: break
+        yield diagnostico
+    hilo.join()
+    if 'error' in salida: raise salida['error']
+    return salida.get('resultado')
+
+
+def primer_error_ms(funcion: Callable, *args, **kwargs):
+    """(ms hasta el primer diagnóstico o None, ms totales, resultado) de funcion(*args, **kwargs)."""
+    inicio = time.perf_counter()
+    primero = None
+    flujo = transmitir(funcion, *args, **kwargs)
+    while True:
+        try:
+            next(flujo)
+        except StopIteration as fin:
+            return primero, (time.perf_counter() - inicio) * 1000, fin.value
+        if primero is None:
+            primero = (time.perf_counter() - inicio) * 1000
@@ -0,0 +1,146 @@
+import contextlib
+import functools
+import queue
+import threading
+from typing import Callable, Dict, Iterator, Optional
+
+from comun.diagnosticos import canal
+
+# =========================================================================
+# SENTENCIAS DE NIVEL SUPERIOR EN FLUJO
+# =========================================================================
+# Cada gramática tiene una regla propia para la lista de sentencias del
+# programa (separada de la de los bloques) que pasa cada sentencia por
+# SalidaSentencias.entregar. Sin consumidor se agrega a la lista y el parser
+# arma el programa completo de siempre; con consumidor la sentencia se
+# entrega apenas se reduce y no se guarda, así la memoria del AST queda
+# acotada por la sentencia más grande y el plegado, el semántico o la
+# escritura del log trabajan mientras el parser sigue.
+# `en_flujo` convierte ese callback en un generador: el parse corre en otro
+# hilo y una cola acotada lo frena si quien consume se atrasa.
+# El parser, el lexer y las listas de errores de cada gramática son globales
+# del módulo: las funciones que los usan van con @salida.exclusivo. Otro hilo
+# espera a que termine el análisis en curso; el hilo que está consumiendo un
+# flujo de la misma gramática (desde el callback o entre dos next() del
+# generador) no puede esperar, así que recibe GramaticaOcupada en vez de
+# pisar el parse a medias.
+
+# Sentencias que el parser puede adelantarse a quien consume el generador
+TAMANO_COLA = 64
+
+
+class GramaticaOcupada(RuntimeError):
+    """Se llamó al analizador desde quien consume un flujo suyo sin terminar."""
+
+
+class SalidaSentencias:
+    """Destino de las sentencias de nivel superior de una gramática (y su cerrojo)."""
+
+    def __init__(self):
+        self.consumidor: Optional[Callable] = None
+        self._cerrojo = threading.RLock()
+        self._consumiendo: Dict[int, int] = {}      # hilo -> flujos que está consumiendo
+
+    @contextlib.contextmanager
+    def en_uso(self, quien: str = 'el analizador'):
+        """Mientras dure el bloque, nadie más usa los globales de la gramática."""
+        if threading.get_ident() in self._consumiendo:
+            raise GramaticaOcupada(f"{quien}: este hilo está consumiendo un análisis en flujo de la misma "
+                                   f"gramática; termínelo o ciérrelo antes de volver a analizar")
+        with self._cerrojo:
+            yield
+
+    def exclusivo(self, funcion: Callable) -> Callable:
+        """Decorador: `funcion` usa los globales de la gramática (ver en_uso)."""
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with self.en_uso(funcion.__name__):
+                return funcion(*args, **kwargs)
+        return envoltura
+
+    @contextlib.contextmanager
+    def consumiendo(self):
+        """Mientras dure el bloque, el hilo actual no puede volver a entrar al analizador."""
+        hilo = threading.get_ident()
+        self._consumiendo[hilo] = self._consumiendo.get(hilo, 0) + 1
+        try:
+            yield
+        finally:
+            if self._consumiendo[hilo] == 1: del self._consumiendo[hilo]
+            else: self._consumiendo[hilo] -= 1
+
+    @contextlib.contextmanager
+    def hacia(self, consumidor: Optional[Callable]):
+        """Entrega las sentencias a `consumidor` mientras dure el bloque."""
+        anterior = self.consumidor
+        self.consumidor = consumidor
+        try:
+            yield self
+        finally:
+            self.consumidor = anterior
+
+    def entregar(self, sentencias: list, sentencia) -> list:
+        """Desde la regla de la lista del programa; devuelve la lista (vacía si hay consumidor)."""
+        if self.consumidor is None:
+            sentencias.append(sentencia)
+        else:
+            with self.consumiendo():
+                self.consumidor(sentencia)
+        return sentencias
+
+
+class FlujoCancelado(Exception):
+    """Quien consumía el generador lo cerró: se corta el parse."""
+
+
+def en_flujo(producir: Callable[[Callable], object], salida: SalidaSentencias,
+             tamano_cola: int = TAMANO_COLA) -> Iterator:
+    """
+    Generador de lo que producir(consumidor) le va pasando a `consumidor`.
+    `producir` corre en otro hilo (con los suscriptores de diagnósticos del
+    hilo actual) y su valor de retorno queda en StopIteration.value. Si el
+    generador se cierra antes de terminar, el parse se corta. Mientras el
+    generador está abierto, el hilo que lo recorre no puede volver a usar la
+    gramática de `salida` (GramaticaOcupada).
+    """
+    cola: 'queue.Queue' = queue.Queue(tamano_cola)
+    fin = object()
+    cancelado = threading.Event()
+    suscriptores = canal.actuales()
+    estado = {}
+
+    def poner(elemento):
+        while not cancelado.is_set():
+            try:
+                cola.put(elemento, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+        raise FlujoCancelado()
+
+    def trabajar():
+        bajas = [canal.suscribir(funcion) for funcion in suscriptores]
+        try:
+            estado['resultado'] = producir(poner)
+        except FlujoCancelado:
+            pass
+        except BaseException as e:      # se relanza en el hilo que consume
+            estado['error'] = e
+        finally:
+            for baja in bajas: baja()
+            with contextlib.suppress(FlujoCancelado):
+                poner(fin)
+
+    hilo = threading.Thread(target=trabajar, daemon=True)
+    hilo.start()
+    try:
+        with salida.consumiendo():
+            while True:
+                elemento = cola.get()
+                if elemento is fin: break
+                yield elemento
+    finally:
+        cancelado.set()
+        hilo.join()
+    if 'error' in estado: raise estado['error']
+    return estado.get('resultado')
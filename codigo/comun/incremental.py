@@ -0,0 +1,246 @@
+import bisect
+import itertools
+import re
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from comun.diagnosticos import canal
+from comun.lexico import CADENA, CADENA_SIN_CERRAR
+
+# =========================================================================
+# REPARSEO INCREMENTAL POR SENTENCIAS DE NIVEL SUPERIOR
+# =========================================================================
+# El código se corta en trozos en los límites de las sentencias de nivel
+# superior: después de un ';' o de la '}' que cierra un bloque (salvo que
+# siga un 'else'), fuera de paréntesis, corchetes, cadenas y comentarios.
+# Cada trozo se parsea solo y guarda sus sentencias.
+# Después de una edición, los trozos que caen enteros en el prefijo o en el
+# sufijo común con el código anterior se reutilizan tal cual; solo el tramo
+# del medio se vuelve a cortar y a parsear. Un trozo del medio con el mismo
+# texto que uno viejo (p. ej. una función movida) también se reutiliza. El
+# prefijo y el sufijo se comparan de a bloques y los trozos se ubican con
+# bisect sobre sus posiciones acumuladas: lo que se hace en Python por
+# trozo es solo para los del medio.
+# Las líneas de los nodos de un trozo recién parseado se anclan al trozo
+# (`anclar`): el nodo guarda en su __dict__ 'ancla' (el Trozo) y
+# 'desde_ancla' (cuántas líneas después de trozo.linea está) en vez de
+# 'linea', y el lenguaje la calcula al leerla. Si la edición cambió la
+# cantidad de líneas, a los trozos que quedaron después solo se les corrige
+# trozo.linea: no se recorren sus nodos. Quien crea un nodo dentro de un
+# árbol anclado (el plegado) usa anclar_como, y quien lo guarda sin_ancla.
+# Jordan no guarda líneas en su AST y no ancla nada.
+# Un trozo con errores léxicos o sintácticos no se puede parsear aparte
+# (la recuperación depende de lo que sigue): `parsear_trozo` devuelve None
+# y `actualizar` también, para que quien llama parsee el archivo completo.
+# Los trozos se parsean sin publicar en el canal de diagnósticos: lo que
+# se publica es lo del parseo completo.
+
+_ESTRUCTURA = re.compile('|'.join((CADENA, CADENA_SIN_CERRAR, r"'(?:[^'\\\n]|\\.)'", r'//[^\n]*',
+                                   r'/\*.*?(?:\*/|\Z)', r'[{}()\[\];]')), re.S)
+# sin ambigüedad, para que no haya retroceso: un `//` llega hasta el fin de la línea (un `/*`
+# adentro no abre nada) y un `/* */` termina en el primer `*/`
+_BLANCOS = re.compile(r'(?:\s|//[^\n]*(?![^\n])|/\*(?:[^*]|\*(?!/))*\*/)*')
+_ELSE = re.compile(r'else\b')
+
+
+def cortes(codigo: str, desde: int = 0) -> Iterator[int]:
+    """Posiciones (desde `desde`) donde termina una sentencia de nivel superior, y len(codigo) al final."""
+    profundidad = 0
+    for m in _ESTRUCTURA.finditer(codigo, desde):
+        c = m[0]
+        if len(c) > 1:                  # cadena, carácter o comentario
+            continue
+        if c in '{([':
+            profundidad += 1
+        elif c in '})]':
+            profundidad = max(profundidad - 1, 0)
+            if c == '}' and profundidad == 0 and not _ELSE.match(codigo, _BLANCOS.match(codigo, m.end()).end()):
+                yield m.end()
+        elif profundidad == 0:          # ';'
+            yield m.end()
+    yield len(codigo)
+
+
+def _prefijo_comun(a: str, b: str, bloque: int = 1 << 14) -> int:
+    """Largo del prefijo común de a y b (se compara de a bloques, en C)."""
+    n = min(len(a), len(b))
+    bajo = alto = 0
+    while alto < n:
+        alto = min(bajo + bloque, n)
+        if a[bajo:alto] != b[bajo:alto]:
+            break
+        bajo = alto
+    else:
+        return n
+    while alto - bajo > 1:                  # a[:bajo] == b[:bajo] y a[:alto] != b[:alto]
+        medio = (bajo + alto) // 2
+        if a[bajo:medio] == b[bajo:medio]: bajo = medio
+        else: alto = medio
+    return bajo
+
+
+def _sufijo_comun(a: str, b: str, maximo: int, bloque: int = 1 << 14) -> int:
+    """Largo del sufijo común de a y b, hasta `maximo`."""
+    la, lb = len(a), len(b)
+    n = min(la, lb, maximo)
+    bajo = alto = 0
+    while alto < n:
+        alto = min(bajo + bloque, n)
+        if a[la - alto:la - bajo] != b[lb - alto:lb - bajo]:
+            break
+        bajo = alto
+    else:
+        return n
+    while alto - bajo > 1:
+        medio = (bajo + alto) // 2
+        if a[la - medio:la - bajo] == b[lb - medio:lb - bajo]: bajo = medio
+        else: alto = medio
+    return bajo
+
+
+class Trozo:
+    __slots__ = ('texto', 'lineas', 'sentencias', 'avisos', 'linea')
+
+    def __init__(self, texto: str, sentencias: list, avisos):
+        self.texto = texto
+        self.lineas = texto.count('\n')     # saltos de línea dentro del trozo
+        self.linea = 0                      # donde empieza (al día solo si se ancla); 0 = recién parseado
+        self.sentencias = sentencias
+        self.avisos = avisos                # diagnósticos que no impiden reutilizarlo (p. ej. del plegado)
+
+
+def anclar_campos(campos: dict, trozo: Trozo):
+    """Ancla a `trozo` un nodo (su __dict__) que todavía tiene su línea absoluta."""
+    campos['ancla'], campos['desde_ancla'] = trozo, campos.pop('linea') - trozo.linea
+
+
+def anclar_como(campos: dict, otro: dict, linea: int):
+    """Pone `linea` como línea de un nodo, anclada al mismo trozo que el nodo de `otro` si lo está."""
+    ancla = otro.get('ancla')
+    if ancla is None:
+        campos.pop('ancla', None)
+        campos.pop('desde_ancla', None)
+        campos['linea'] = linea
+    else:
+        campos.pop('linea', None)
+        campos['ancla'], campos['desde_ancla'] = ancla, linea - ancla.linea
+
+
+def sin_ancla(campos: dict) -> dict:
+    """Los campos de un nodo anclado con su línea absoluta, como los de un nodo del parseo completo."""
+    linea = campos['ancla'].linea + campos['desde_ancla']
+    return {'linea': linea, **{k: v for k, v in campos.items() if k != 'ancla' and k != 'desde_ancla'}}
+
+
+class ParseIncremental:
+    """
+    Sentencias de nivel superior de un código que se va editando.
+    `parsear_trozo(texto, linea)` parsea un trozo que empieza en `linea` y
+    devuelve (sentencias, avisos), o None si tuvo errores. `anclar(
+    sentencias, trozo)` ancla las líneas de esos nodos a trozo.linea
+    (anclar_campos en cada uno).
+    """
+
+    def __init__(self, parsear_trozo: Callable[[str, int], Optional[Tuple[list, object]]],
+                 anclar: Optional[Callable[[list, Trozo], None]] = None):
+        self.parsear_trozo = parsear_trozo
+        self.anclar = anclar
+        self.trozos: List[Trozo] = []
+        self.sentencias: list = []
+        self.codigo = ''
+        # del último actualizar: trozos reutilizados y trozos parseados
+        self.reutilizados = 0
+        self.parseados = 0
+        # por trozo: dónde termina en `codigo` y cuántas sentencias hay hasta él inclusive
+        self._fines: List[int] = []
+        self._cuentas: List[int] = []
+        self._con_avisos = 0
+
+    def avisos(self) -> Iterator:
+        if self._con_avisos:
+            for trozo in self.trozos:
+                if trozo.avisos: yield trozo.avisos
+
+    def actualizar(self, codigo: str) -> Optional[list]:
+        """
+        Sentencias de `codigo`, reutilizando los trozos que no cambiaron. Si un
+        trozo tiene errores devuelve None y no cambia nada: la próxima vez se
+        compara otra vez contra el último código sin errores.
+        """
+        viejos, n, viejo = self.trozos, len(self.trozos), self.codigo
+        fines, cuentas = self._fines, self._cuentas
+        # trozos iguales al comienzo: los que terminan dentro del prefijo común
+        comun = _prefijo_comun(viejo, codigo)
+        i = bisect.bisect_right(fines, comun)
+        # el último de ellos se vuelve a cortar: lo que sigue puede ser un 'else' que se le pega
+        if i: i -= 1
+        pos = fines[i - 1] if i else 0
+        primera = cuentas[i - 1] if i else 0
+        # trozos iguales al final: los que empiezan dentro del sufijo común, sin pisar los del comienzo
+        corrimiento = len(codigo) - len(viejo)
+        limite = max(len(viejo) - _sufijo_comun(viejo, codigo, min(len(viejo), len(codigo)) - comun), pos - corrimiento)
+        j = max(bisect.bisect_left(fines, limite) + 1 if limite > 0 else 0, i)
+        fin = fines[j - 1] + corrimiento if j else corrimiento
+        if j == n: fin = len(codigo)
+        # el medio se vuelve a cortar hasta que un corte cae justo donde empieza un trozo del final;
+        # los trozos del final que quedan atrás pasan a ser parte del medio
+        disponibles: Dict[str, List[Trozo]] = {}
+        for trozo in viejos[i:j]:
+            disponibles.setdefault(trozo.texto, []).append(trozo)
+        nuevos: List[Tuple[Trozo, int]] = []          # (trozo, línea donde empieza ahora)
+        k, inicio_k = j, fin
+        linea_actual, anterior = codigo.count('\n', 0, pos) + 1, pos
+        if anterior != inicio_k:
+            for corte in cortes(codigo, pos):
+                if corte <= anterior:
+                    continue
+                while k < n and inicio_k < corte:
+                    disponibles.setdefault(viejos[k].texto, []).append(viejos[k])
+                    inicio_k += len(viejos[k].texto)
+                    k += 1
+                texto = codigo[anterior:corte]
+                trozo = self._trozo(texto, linea_actual, disponibles)
+                if trozo is None:
+                    return None
+                nuevos.append((trozo, linea_actual))
+                linea_actual += trozo.lineas
+                anterior = corte
+                if corte == inicio_k:
+                    break
+        # recién aquí se mueven los trozos reutilizados y los del final (sus nodos anclados con ellos)
+        for trozo, linea_trozo in nuevos:
+            if trozo.linea: trozo.linea = linea_trozo
+        delta = linea_actual - viejos[k].linea if k < n else 0
+        if delta and self.anclar is not None:
+            for trozo in viejos[k:]:
+                trozo.linea += delta
+        anteriores = viejos[i:k]
+        cantidad = (cuentas[k - 1] if k else 0) - primera
+        self.sentencias[primera:primera + cantidad] = [s for t, _ in nuevos for s in t.sentencias]
+        self.trozos[i:k] = [t for t, _ in nuevos]
+        # fines y cantidades acumuladas: las del medio se recalculan y las del final se corren
+        medio_fines = list(itertools.accumulate((len(t.texto) for t, _ in nuevos), initial=pos))[1:]
+        medio_cuentas = list(itertools.accumulate((len(t.sentencias) for t, _ in nuevos), initial=primera))[1:]
+        cambio = (medio_cuentas[-1] if nuevos else primera) - (primera + cantidad)
+        fines[i:] = medio_fines + ([f + corrimiento for f in fines[k:]] if corrimiento else fines[k:])
+        cuentas[i:] = medio_cuentas + ([c + cambio for c in cuentas[k:]] if cambio else cuentas[k:])
+        self._con_avisos += sum(1 for t, _ in nuevos if t.avisos) - sum(1 for t in anteriores if t.avisos)
+        self.codigo = codigo
+        self.parseados = sum(1 for t, _ in nuevos if t.linea == 0)
+        for t, linea_trozo in nuevos:
+            if t.linea == 0:
+                t.linea = linea_trozo
+                if self.anclar is not None: self.anclar(t.sentencias, t)
+        self.reutilizados = len(self.trozos) - self.parseados
+        return self.sentencias
+
+    def _trozo(self, texto: str, linea: int, disponibles: Dict[str, List[Trozo]]) -> Optional[Trozo]:
+        iguales = disponibles.get(texto)
+        if iguales:
+            return iguales.pop()            # cada trozo es de un solo lugar: sus nodos no se comparten
+        if _BLANCOS.fullmatch(texto):
+            return Trozo(texto, [], None)   # solo blancos y comentarios (el final del archivo)
+        with canal.en_silencio():       # si falla se parsea todo y los errores se publican ahí
+            resultado = self.parsear_trozo(texto, linea)
+        if resultado is None:
+            return None
+        return Trozo(texto, *resultado)
@@ -0,0 +1,402 @@
+import struct
+import sys
+from array import array
+from typing import Callable, Dict, List, Optional, Tuple
+
+from comun.colecciones import ColeccionLiteral, TablaCadenas, Tramo
+from comun.incremental import sin_ancla
+
+# =========================================================================
+# INSTANTÁNEAS DE AST (formato binario compacto)
+# =========================================================================
+# Un AST (tuplas y listas de Ayman y Jordan, Nodo de Ariel, ColeccionLiteral
+# con sus buffers) se guarda como:
+#   MAGIA
+#   tabla de cadenas   cantidad, y por cada una largo + UTF-8 (cada cadena
+#                      aparece una vez; en el árbol va su índice)
+#   tabla de formas    cantidad, y por cada una clase + nombres de campos
+#                      (índices de cadena); un Nodo guarda solo su forma
+#   raíz
+# Cada valor empieza con un byte de etiqueta (ver abajo). Enteros (líneas
+# incluidas) van en varint zigzag, los reales en 8 bytes. Las tuplas,
+# listas y nodos llevan la cantidad de hijos y el largo en bytes de lo que
+# sigue: una vista perezosa puede saltarse un subárbol entero sin leerlo.
+# Los arreglos tipados de las colecciones van tal cual (little-endian).
+# Un nodo anclado a un trozo del reparseo incremental se guarda con su
+# línea absoluta, como si viniera del parseo completo.
+# `cargar` recibe el archivo ya leído de una vez y arma el árbol completo,
+# o con perezoso=True devuelve vistas que decodifican cada hijo al pedirlo.
+
+MAGIA = b'ASTi\x01'
+
+(_NADA, _FALSO, _VERDADERO, _ENTERO, _REAL, _CADENA, _TUPLA, _LISTA, _NODO,
+ _ARREGLO, _BYTES, _TABLA, _TRAMO, _COLECCION) = range(14)
+
+_DOBLE = struct.Struct('<d')
+_INVERTIR = sys.byteorder != 'little'
+
+
+def _varint(n: int, salida: bytearray):
+    while n >= 0x80:
+        salida.append((n & 0x7f) | 0x80)
+        n >>= 7
+    salida.append(n)
+
+
+def _leer_varint(datos, p: int) -> Tuple[int, int]:
+    b = datos[p]
+    if b < 0x80:
+        return b, p + 1
+    n, corrimiento = b & 0x7f, 7
+    while True:
+        p += 1
+        b = datos[p]
+        n |= (b & 0x7f) << corrimiento
+        if b < 0x80:
+            return n, p + 1
+        corrimiento += 7
+
+
+def _crudo(arreglo: array) -> bytes:
+    if _INVERTIR:
+        arreglo = array(arreglo.typecode, arreglo)
+        arreglo.byteswap()
+    return arreglo.tobytes()
+
+
+# =========================================================================
+# ESCRITURA
+# =========================================================================
+
+def serializar(ast) -> bytes:
+    """Bytes de la instantánea de `ast`. Lanza TypeError si hay un valor que el formato no conoce."""
+    cadenas: Dict[str, int] = {}
+    formas: Dict[Tuple[str, Tuple[str, ...]], int] = {}
+
+    def indice(texto: str) -> int:
+        i = cadenas.get(texto)
+        if i is None:
+            i = cadenas[texto] = len(cadenas)
+        return i
+
+    def compuesto(etiqueta: int, cabecera: Optional[int], hijos, salida: bytearray):
+        cuerpo = bytearray()
+        for hijo in hijos:
+            escribir(hijo, cuerpo)
+        salida.append(etiqueta)
+        if cabecera is not None:
+            _varint(cabecera, salida)
+        _varint(len(cuerpo), salida)
+        salida += cuerpo
+
+    def escribir(x, salida: bytearray):
+        tipo = type(x)
+        if x is None:
+            salida.append(_NADA)
+        elif tipo is bool:
+            salida.append(_VERDADERO if x else _FALSO)
+        elif tipo is int:
+            salida.append(_ENTERO)
+            _varint(x << 1 if x >= 0 else ((-x) << 1) - 1, salida)
+        elif tipo is str:
+            salida.append(_CADENA)
+            _varint(indice(x), salida)
+        elif tipo is tuple:
+            compuesto(_TUPLA, len(x), x, salida)
+        elif tipo is list:
+            compuesto(_LISTA, len(x), x, salida)
+        elif tipo is float:
+            salida.append(_REAL)
+            salida += _DOBLE.pack(x)
+        elif tipo is array:
+            crudo = _crudo(x)
+            salida.append(_ARREGLO)
+            salida.append(ord(x.typecode))
+            _varint(len(crudo), salida)
+            salida += crudo
+        elif tipo is bytearray or tipo is bytes:
+            salida.append(_BYTES)
+            _varint(len(x), salida)
+            salida += x
+        elif tipo is TablaCadenas:
+            texto, fines = x.__getstate__()
+            salida.append(_TABLA)
+            escribir(texto, salida)
+            escribir(fines, salida)
+        elif tipo is Tramo:
+            compuesto(_TRAMO, None, (x.tipo, x.datos), salida)
+        elif tipo is ColeccionLiteral:
+            compuesto(_COLECCION, None, (x.total, x.tramos), salida)
+        elif hasattr(x, '__dict__'):
+            campos = vars(x)
+            if 'ancla' in campos: campos = sin_ancla(campos)
+            clave = (tipo.__name__, tuple(campos))
+            forma = formas.get(clave)
+            if forma is None:
+                forma = formas[clave] = len(formas)
+                indice(clave[0])
+                for campo in clave[1]: indice(campo)
+            compuesto(_NODO, forma, campos.values(), salida)
+        else:
+            raise TypeError(f"instantanea_ast: no se puede guardar un {tipo.__name__}")
+
+    raiz = bytearray()
+    escribir(ast, raiz)
+    salida = bytearray(MAGIA)
+    _varint(len(cadenas), salida)
+    for texto in cadenas:
+        codificado = texto.encode('utf-8', 'surrogatepass')
+        _varint(len(codificado), salida)
+        salida += codificado
+    _varint(len(formas), salida)
+    for clase, campos in formas:
+        _varint(cadenas[clase], salida)
+        _varint(len(campos), salida)
+        for campo in campos: _varint(cadenas[campo], salida)
+    salida += raiz
+    return bytes(salida)
+
+
+def guardar(archivo: str, ast):
+    with open(archivo, 'wb') as f:
+        f.write(serializar(ast))
+
+
+# =========================================================================
+# LECTURA
+# =========================================================================
+
+class Instantanea:
+    """Tablas de una instantánea ya leída; decodifica valores a partir de una posición."""
+
+    def __init__(self, datos, clases: Optional[Dict[str, type]] = None):
+        if bytes(datos[:len(MAGIA)]) != MAGIA:
+            raise ValueError("instantanea_ast: no es una instantánea (o es de otra versión)")
+        self.datos = datos
+        self.clases = clases or {}
+        cantidad, p = _leer_varint(datos, len(MAGIA))
+        self.cadenas: List[str] = []
+        for _ in range(cantidad):
+            largo, p = _leer_varint(datos, p)
+            self.cadenas.append(bytes(datos[p:p + largo]).decode('utf-8', 'surrogatepass'))
+            p += largo
+        cantidad, p = _leer_varint(datos, p)
+        # (nombre de la clase, campos) de cada forma
+        self.formas: List[Tuple[str, Tuple[str, ...]]] = []
+        for _ in range(cantidad):
+            clase, p = _leer_varint(datos, p)
+            n, p = _leer_varint(datos, p)
+            campos = []
+            for _ in range(n):
+                campo, p = _leer_varint(datos, p)
+                campos.append(self.cadenas[campo])
+            self.formas.append((self.cadenas[clase], tuple(campos)))
+        self.raiz = p
+        self._clases_formas: Optional[List[type]] = None
+        self.decodificar = self._decodificador()
+
+    def clase_de(self, forma: int) -> type:
+        if self._clases_formas is None:
+            faltan = {nombre for nombre, _ in self.formas if nombre not in self.clases}
+            if faltan:
+                raise ValueError(f"instantanea_ast: faltan las clases {', '.join(sorted(faltan))}")
+            self._clases_formas = [self.clases[nombre] for nombre, _ in self.formas]
+        return self._clases_formas[forma]
+
+    def _decodificador(self) -> Callable[[int], Tuple[object, int]]:
+        """decodificar(p) -> (valor, posición siguiente); todo en un cierre para no pagar atributos por nodo."""
+        datos, cadenas, formas, clase_de = self.datos, self.cadenas, self.formas, self.clase_de
+        leer_varint, doble = _leer_varint, _DOBLE.unpack_from
+
+        def valor(p):
+            etiqueta = datos[p]
+            p += 1
+            if etiqueta == _CADENA:
+                b = datos[p]
+                if b < 0x80: return cadenas[b], p + 1
+                i, p = leer_varint(datos, p)
+                return cadenas[i], p
+            if etiqueta == _ENTERO:
+                n, p = leer_varint(datos, p)
+                return (n >> 1) ^ -(n & 1), p
+            if etiqueta == _TUPLA or etiqueta == _LISTA:
+                n, p = leer_varint(datos, p)
+                _, p = leer_varint(datos, p)
+                hijos = []
+                for _ in range(n):
+                    hijo, p = valor(p)
+                    hijos.append(hijo)
+                return (tuple(hijos) if etiqueta == _TUPLA else hijos), p
+            if etiqueta == _NODO:
+                forma, p = leer_varint(datos, p)
+                _, p = leer_varint(datos, p)
+                clase = clase_de(forma)
+                campos = {}
+                for campo in formas[forma][1]:
+                    campos[campo], p = valor(p)
+                nodo = clase.__new__(clase)
+                nodo.__dict__.update(campos)
+                return nodo, p
+            if etiqueta == _NADA: return None, p
+            if etiqueta == _FALSO: return False, p
+            if etiqueta == _VERDADERO: return True, p
+            if etiqueta == _REAL: return doble(datos, p)[0], p + 8
+            if etiqueta == _ARREGLO:
+                codigo = chr(datos[p])
+                largo, p = leer_varint(datos, p + 1)
+                arreglo = array(codigo)
+                arreglo.frombytes(datos[p:p + largo])
+                if _INVERTIR: arreglo.byteswap()
+                return arreglo, p + largo
+            if etiqueta == _BYTES:
+                largo, p = leer_varint(datos, p)
+                return bytearray(datos[p:p + largo]), p + largo
+            if etiqueta == _TABLA:
+                texto, p = valor(p)
+                fines, p = valor(p)
+                tabla = TablaCadenas.__new__(TablaCadenas)
+                tabla.__setstate__((texto, fines))
+                return tabla, p
+            if etiqueta == _TRAMO:
+                _, p = leer_varint(datos, p)
+                tipo, p = valor(p)
+                contenido, p = valor(p)
+                return Tramo(tipo, contenido), p
+            if etiqueta == _COLECCION:
+                _, p = leer_varint(datos, p)
+                coleccion = ColeccionLiteral()
+                coleccion.total, p = valor(p)
+                coleccion.tramos, p = valor(p)
+                return coleccion, p
+            raise ValueError(f"instantanea_ast: etiqueta desconocida {etiqueta} en {p - 1}")
+
+        return valor
+
+    def saltar(self, p: int) -> int:
+        """Posición del valor que sigue al que empieza en `p`, sin decodificarlo."""
+        datos = self.datos
+        etiqueta = datos[p]
+        p += 1
+        if etiqueta in (_TUPLA, _LISTA, _NODO):
+            _, p = _leer_varint(datos, p)
+            largo, p = _leer_varint(datos, p)
+            return p + largo
+        if etiqueta in (_CADENA, _ENTERO):
+            return _leer_varint(datos, p)[1]
+        if etiqueta in (_NADA, _FALSO, _VERDADERO):
+            return p
+        if etiqueta == _REAL:
+            return p + 8
+        if etiqueta == _ARREGLO:
+            p += 1
+        if etiqueta in (_ARREGLO, _BYTES, _TRAMO, _COLECCION):
+            largo, p = _leer_varint(datos, p)
+            return p + largo
+        if etiqueta == _TABLA:
+            return self.saltar(self.saltar(p))
+        raise ValueError(f"instantanea_ast: etiqueta desconocida {etiqueta} en {p - 1}")
+
+    def elemento(self, p: int):
+        """El valor en `p`: una vista si es una tupla, lista o nodo; si no, el valor decodificado."""
+        etiqueta = self.datos[p]
+        if etiqueta == _TUPLA or etiqueta == _LISTA:
+            return VistaSecuencia(self, p)
+        if etiqueta == _NODO:
+            return VistaNodo(self, p)
+        return self.decodificar(p)[0]
+
+
+class _Vista:
+    """Tupla, lista o nodo sin decodificar; los hijos se ubican (saltando subárboles) al primer acceso."""
+    __slots__ = ('_instantanea', '_posicion', '_cantidad', '_hijos', '_inicio')
+
+    def __init__(self, instantanea: Instantanea, posicion: int):
+        self._instantanea = instantanea
+        self._posicion = posicion
+        datos = instantanea.datos
+        cabecera, p = _leer_varint(datos, posicion + 1)
+        _, self._inicio = _leer_varint(datos, p)
+        self._cantidad = cabecera if datos[posicion] != _NODO else len(instantanea.formas[cabecera][1])
+        self._hijos: Optional[List[int]] = None
+
+    def _hijo(self, i: int):
+        if self._hijos is None:
+            saltar, p, hijos = self._instantanea.saltar, self._inicio, []
+            for _ in range(self._cantidad):
+                hijos.append(p)
+                p = saltar(p)
+            self._hijos = hijos
+        return self._instantanea.elemento(self._hijos[i])
+
+    def materializar(self):
+        """El subárbol completo, como lo arma cargar(perezoso=False)."""
+        return self._instantanea.decodificar(self._posicion)[0]
+
+
+class VistaSecuencia(_Vista):
+    __slots__ = ()
+
+    @property
+    def es_tupla(self) -> bool:
+        return self._instantanea.datos[self._posicion] == _TUPLA
+
+    def __len__(self):
+        return self._cantidad
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._hijo(j) for j in range(*i.indices(self._cantidad))]
+        if i < 0: i += self._cantidad
+        if not 0 <= i < self._cantidad: raise IndexError(i)
+        return self._hijo(i)
+
+    def __iter__(self):
+        for i in range(self._cantidad): yield self._hijo(i)
+
+    def __repr__(self):
+        return f"VistaSecuencia({'tupla' if self.es_tupla else 'lista'}, {self._cantidad} elemento(s))"
+
+
+class VistaNodo(_Vista):
+    __slots__ = ()
+
+    @property
+    def clase(self) -> str:
+        return self._instantanea.formas[self._forma()][0]
+
+    @property
+    def campos(self) -> Tuple[str, ...]:
+        return self._instantanea.formas[self._forma()][1]
+
+    def _forma(self) -> int:
+        return _leer_varint(self._instantanea.datos, self._posicion + 1)[0]
+
+    def __getattr__(self, nombre: str):
+        try:
+            i = self.campos.index(nombre)
+        except ValueError:
+            raise AttributeError(nombre) from None
+        return self._hijo(i)
+
+    def __repr__(self):
+        return f"VistaNodo({self.clase})"
+
+
+def cargar(datos, clases: Optional[Dict[str, type]] = None, perezoso: bool = False):
+    """
+    AST de una instantánea ya leída (bytes o memoryview). `clases` va del
+    nombre de cada clase de nodo a la clase (solo hace falta si hay nodos y
+    se materializan). Con perezoso=True la raíz y sus hijos compuestos son
+    vistas (VistaSecuencia / VistaNodo).
+    """
+    instantanea = Instantanea(datos, clases)
+    if perezoso:
+        return instantanea.elemento(instantanea.raiz)
+    return instantanea.decodificar(instantanea.raiz)[0]
+
+
+def leer(archivo: str, clases: Optional[Dict[str, type]] = None, perezoso: bool = False):
+    """cargar() del archivo, leído de una sola vez."""
+    with open(archivo, 'rb') as f:
+        datos = f.read()
+    return cargar(datos, clases, perezoso)
@@ -0,0 +1,37 @@
+# =========================================================================
+# REGLAS LÉXICAS DE COSTO LINEAL
+# =========================================================================
+# Cadenas: el patrón "desenrollado"  " [^"\\\n]* (\\. [^"\\\n]*)* "  no
+# tiene alternativas que se solapen, así que nunca retrocede. La variante
+# sin comilla de cierre atrapa la cadena que llega al fin de línea: se
+# reporta una vez y se consume hasta ahí, en lugar de caer en t_error y
+# volver a empezar en el carácter siguiente.
+# Comentarios /* ... */: la regla solo reconoce la apertura y el cierre se
+# busca con str.find. Sin cierre, el resto del archivo es comentario (un
+# solo diagnóstico) y el lexer termina; antes cada '/*' suelto se volvía a
+# escanear hasta el final.
+# Resguardo: PLY arma el token de t_error con lexdata[lexpos:] (copia el
+# resto de la entrada en cada carácter ilegal). Cada lexer define, como su
+# última regla de función, una regla de un carácter que reporta el error sin
+# esa copia. PLY prueba todas las reglas de función antes que las de cadena,
+# así que no puede ser un comodín: toma cualquier carácter salvo los que
+# empiezan una regla de cadena (y de esos, los que no la completan, como un
+# '&' suelto). Lo que llega a una regla de función anterior gana igual.
+
+CADENA = r'\"[^\"\\\n]*(?:\\.[^\"\\\n]*)*\"'
+CADENA_SIN_CERRAR = r'\"[^\"\\\n]*(?:\\.[^\"\\\n]*)*'
+
+
+def saltar_comentario(t) -> bool:
+    """Desde la regla de '/*': avanza el lexer hasta después de '*/'.
+
+    Devuelve False si el comentario no se cierra (se consume hasta el final).
+    """
+    lexer = t.lexer
+    fin = lexer.lexdata.find('*/', lexer.lexpos)
+    cerrado = fin >= 0
+    fin = fin + 2 if cerrado else len(lexer.lexdata)
+    lexer.lineno += lexer.lexdata.count('\n', t.lexpos, fin)
+    lexer.lexpos = fin
+    return cerrado
+
@@ -0,0 +1,233 @@
+import bisect
+import re
+from typing import Callable, Dict, Iterator, List, Optional
+
+from ply.lex import LexToken
+
+from comun.lexico import CADENA, CADENA_SIN_CERRAR
+
+# =========================================================================
+# LÉXICO UNIFICADO (una pasada para las tres gramáticas)
+# =========================================================================
+# Los vocabularios de las tres gramáticas casi coinciden: '->' es FLECHA,
+# ARROW o LAMBDA_IN según quién lo pida, los identificadores y números se
+# reconocen con el mismo patrón, etc. `lexear` recorre el código una sola
+# vez con un superconjunto de las reglas y guarda tokens de tipo neutro:
+# 'ID', 'ENTERO', 'DECIMAL', 'CADENA', 'CARACTER', 'COMENTARIO' o el texto
+# del operador ('->', '...', '+=', ...). Cada gramática describe en una
+# Gramatica cómo se llaman esos tokens para ella, y LexerUnificado le da a
+# su parser el flujo ya traducido.
+# Donde las reglas no coinciden (Ayman no tiene comentarios ni '.', Ariel
+# lee '...' como tres PUNTO, '+=' es un token solo para Jordan, cadenas sin
+# cerrar, caracteres ilegales...) la tabla no tiene entrada y ese tramo lo
+# lexea el lexer propio de la gramática, desde el comienzo del token hasta
+# que uno de sus tokens termina donde termina uno del superconjunto; a
+# partir de ahí se sigue traduciendo. Así cada parser recibe exactamente
+# los tokens (y los diagnósticos léxicos) de su propio lexer.
+
+# Los blancos se saltan al comienzo de cada coincidencia: un match por token
+_REGLAS = (
+    ('NUEVA_LINEA', r'\n+'),
+    ('COMENTARIO', r'//[^\n]*'),
+    ('APERTURA_COMENTARIO', r'/\*'),       # el cierre se busca con find (comun/lexico.py)
+    ('NUMERO', r'\d+\.\d+|\d+'),
+    ('CADENA', CADENA),
+    ('CADENA_ABIERTA', CADENA_SIN_CERRAR),
+    ('CARACTER', r"'(?:[^'\\\n]|\\.)'"),
+    ('CARACTER_ABIERTO', r"'(?:[^'\\\n]|\\.)?"),
+    ('ID', r'[A-Za-z_][A-Za-z0-9_]*'),
+    ('OPERADOR', r'\.\.\.|\.\.<|\+=|-=|\*=|/=|==|!=|<=|>=|&&|\|\||->|[(){}\[\],;:.?=<>+\-*/%!]'),
+    ('ILEGAL', r'[^ \t]'),
+)
+_PATRON = re.compile('[ \t]*(?:' + '|'.join(f'(?P<{nombre}>{patron})' for nombre, patron in _REGLAS) + ')')
+
+# Valor por omisión de los tokens traducidos (el resto lleva su texto)
+VALORES = {'ENTERO': int, 'DECIMAL': float}
+
+# En una tabla: el token del superconjunto no llega al parser (comentarios)
+SALTAR = None
+
+
+class PasadaUnificada:
+    """Tokens del superconjunto de un código, en listas paralelas."""
+
+    def __init__(self, codigo: str):
+        self.codigo = codigo
+        self.tipos: List[str] = []
+        self.textos: List[Optional[str]] = []
+        self.inicios: List[int] = []
+        self.fines: List[int] = []
+        self.lineas: List[int] = []
+
+    def __len__(self):
+        return len(self.tipos)
+
+
+def lexear(codigo: str) -> PasadaUnificada:
+    """Una pasada del lexer superconjunto sobre `codigo`."""
+    pasada = PasadaUnificada(codigo)
+    tipos, textos, inicios, fines, lineas = (pasada.tipos.append, pasada.textos.append, pasada.inicios.append,
+                                             pasada.fines.append, pasada.lineas.append)
+    coincidir = _PATRON.match
+    pos, linea, largo = 0, 1, len(codigo)
+    while True:
+        m = coincidir(codigo, pos)
+        if m is None:               # solo quedan blancos
+            break
+        clase = m.lastgroup
+        inicio, fin = m.span(clase)
+        if clase == 'NUEVA_LINEA':
+            linea += fin - inicio
+            pos = fin
+            continue
+        texto = m[clase]
+        if clase == 'OPERADOR':
+            clase = texto
+        elif clase == 'NUMERO':
+            # Ariel solo acepta dígitos ASCII: los demás los decide cada lexer
+            clase = ('DECIMAL' if '.' in texto else 'ENTERO') if texto.isascii() else 'NUMERO_UNICODE'
+        elif clase == 'APERTURA_COMENTARIO':
+            cierre = codigo.find('*/', fin)
+            clase = 'COMENTARIO' if cierre >= 0 else 'COMENTARIO_ABIERTO'
+            fin = cierre + 2 if cierre >= 0 else largo
+            texto = None
+        tipos(clase)
+        textos(texto)
+        inicios(inicio)
+        fines(fin)
+        lineas(linea)
+        if clase == 'COMENTARIO' or clase == 'COMENTARIO_ABIERTO':
+            linea += codigo.count('\n', inicio, fin)
+        pos = fin
+    return pasada
+
+
+class Gramatica:
+    """
+    Cómo ve una gramática los tokens del superconjunto. `tabla` va del tipo
+    neutro (o texto del operador) al tipo de la gramática, o a SALTAR; lo que
+    no está en la tabla lo lexea `lexer`. Los identificadores pasan por
+    `reservadas` (texto -> tipo) o quedan como `identificador`.
+    """
+
+    def __init__(self, lexer, identificador: str, reservadas: Dict[str, str], tabla: Dict[str, Optional[str]],
+                 valores: Optional[Dict[str, Callable]] = None, valores_reservadas: Optional[Dict[str, object]] = None):
+        self.lexer = lexer
+        self.identificador = identificador
+        self.tabla = tabla
+        valores = {**VALORES, **(valores or {})}
+        # tipo neutro -> (tipo de la gramática, conversión del texto o None)
+        self.traducciones = {neutro: (tipo, valores.get(neutro)) for neutro, tipo in tabla.items() if tipo is not SALTAR}
+        valores_reservadas = valores_reservadas or {}
+        # texto -> (tipo, valor) de cada palabra reservada
+        self.palabras = {texto: (tipo, valores_reservadas.get(texto, texto)) for texto, tipo in reservadas.items()}
+
+    def traduce(self, tipo: str) -> bool:
+        return tipo == 'ID' or tipo in self.tabla
+
+
+class LexerUnificado:
+    """
+    Lexer para PLY que traduce una PasadaUnificada a los tokens de una
+    Gramatica. Acepta el rebobinado y el corte de la recuperación de errores
+    (lexpos hacia atrás o lexpos = len(lexdata)).
+    """
+
+    def __init__(self, pasada: PasadaUnificada, gramatica: Gramatica):
+        self.pasada = pasada
+        self.gramatica = gramatica
+        self.lexdata = pasada.codigo
+        self.lineno = 1
+        self._j = 0                 # próximo token de la pasada
+        self._propio = None         # lexer de la gramática mientras los tokens no coinciden
+        self._clon = None
+        self._tokens = self._traducir(0)
+
+    def input(self, texto: str):
+        if texto is not self.lexdata and texto != self.lexdata:
+            raise ValueError("LexerUnificado: el texto no es el de la pasada")
+
+    def token(self) -> Optional[LexToken]:
+        return next(self._tokens, None)
+
+    def _traducir(self, j: int, posicion: Optional[int] = None, linea: int = 1) -> Iterator[LexToken]:
+        p, g = self.pasada, self.gramatica
+        tipos, textos, inicios, lineas = p.tipos, p.textos, p.inicios, p.lineas
+        palabras, traducciones, identificador, saltar = g.palabras, g.traducciones, g.identificador, g.tabla
+        n = len(tipos)
+        if posicion is not None:
+            j = yield from self._propios(j, posicion, linea)
+        while j < n:
+            tipo = tipos[j]
+            if tipo == 'ID':
+                texto = textos[j]
+                palabra = palabras.get(texto)
+                tipo, valor = palabra if palabra is not None else (identificador, texto)
+            else:
+                traduccion = traducciones.get(tipo)
+                if traduccion is None:
+                    if tipo in saltar:          # SALTAR
+                        j += 1
+                        continue
+                    j = yield from self._propios(j, inicios[j], lineas[j])
+                    continue
+                tipo, convertir = traduccion
+                valor = convertir(textos[j]) if convertir is not None else textos[j]
+            t = LexToken()
+            t.type, t.value, t.lineno, t.lexpos = tipo, valor, lineas[j], inicios[j]
+            j += 1
+            self._j = j
+            yield t
+        self._j = n
+
+    def _propios(self, j: int, posicion: int, linea: int) -> Iterator[LexToken]:
+        """Tokens del lexer de la gramática desde `posicion` hasta que uno termina donde termina uno de la pasada."""
+        if self._clon is None:
+            self._clon = self.gramatica.lexer.clone()
+            self._clon.input(self.lexdata)
+        propio = self._propio = self._clon
+        propio.lexpos, propio.lineno = posicion, linea
+        fines, n = self.pasada.fines, len(self.pasada.fines)
+        while True:
+            t = propio.token()
+            if t is None:
+                self._propio = None
+                return n
+            t.lexer = self              # la recuperación de errores sigue leyendo de aquí
+            j = bisect.bisect_left(fines, propio.lexpos, j)
+            alineado = j < n and fines[j] == propio.lexpos
+            if alineado:
+                j += 1
+                self._propio = None
+            self._j = j
+            yield t
+            if alineado:
+                return j
+
+    @property
+    def lexpos(self) -> int:
+        if self._propio is not None:
+            return self._propio.lexpos
+        return self.pasada.inicios[self._j] if self._j < len(self.pasada) else len(self.lexdata)
+
+    @lexpos.setter
+    def lexpos(self, posicion: int):
+        p = self.pasada
+        self._propio = None
+        if posicion >= len(self.lexdata):
+            self._j = len(p)
+            self._tokens = iter(())
+            return
+        j = bisect.bisect_left(p.inicios, posicion)
+        if j < len(p) and p.inicios[j] == posicion and self.gramatica.traduce(p.tipos[j]):
+            self._j = j
+            self._tokens = self._traducir(j)
+            return
+        # dentro de un tramo que lexea la gramática: se vuelve a lexear desde ahí
+        k = bisect.bisect_right(p.inicios, posicion) - 1
+        if k < 0:
+            linea, k = 1 + self.lexdata.count('\n', 0, posicion), 0
+        else:
+            linea = p.lineas[k] + self.lexdata.count('\n', p.inicios[k], posicion)
+        self._j = k
+        self._tokens = self._traducir(k, posicion, linea)
@@ -0,0 +1,96 @@
+import time
+from typing import List, Optional
+
+# =========================================================================
+# HORA LÍMITE COOPERATIVA PARA UN ANÁLISIS
+# =========================================================================
+# El lexer (vía LexerConPlazo), el parser, el plegado y el semántico revisan el plazo
+# cada cierta cantidad de tokens o en cada sentencia de nivel superior.
+# Cuando se agota se lanza PlazoAgotado; `analyze` de cada analizador lo
+# atrapa y devuelve los errores encontrados hasta ese punto marcados como
+# parciales. El plazo es un instante de time.monotonic().
+
+
+class PlazoAgotado(Exception):
+    """Se pasó la hora límite; lo acumulado hasta aquí sigue siendo válido."""
+
+
+class Plazo:
+    __slots__ = ('limite',)
+
+    def __init__(self, limite: float):
+        self.limite = limite
+
+    @classmethod
+    def en_ms(cls, ms: float) -> 'Plazo':
+        return cls(time.monotonic() + ms / 1000)
+
+    @classmethod
+    def desde(cls, deadline) -> Optional['Plazo']:
+        """Acepta None, un Plazo o un instante de time.monotonic()."""
+        if deadline is None or isinstance(deadline, Plazo):
+            return deadline
+        return cls(float(deadline))
+
+    @classmethod
+    def sin_limite(cls) -> 'Plazo':
+        """Un plazo que solo se agota con cancelar()."""
+        return cls(float('inf'))
+
+    def cancelar(self):
+        """Lo agota ya, desde cualquier hilo: el análisis se corta en la próxima revisión."""
+        self.limite = float('-inf')
+
+    def agotado(self) -> bool:
+        return time.monotonic() >= self.limite
+
+    def revisar(self):
+        if time.monotonic() >= self.limite:
+            raise PlazoAgotado()
+
+    def restante_ms(self) -> float:
+        return max(0.0, (self.limite - time.monotonic()) * 1000)
+
+
+class LexerConPlazo:
+    """Envuelve un lexer de PLY y revisa el plazo cada `cada` tokens."""
+
+    def __init__(self, lexer, plazo: Plazo, cada: int = 64):
+        object.__setattr__(self, '_lexer', lexer)
+        object.__setattr__(self, '_plazo', plazo)
+        object.__setattr__(self, '_cada', cada)
+        object.__setattr__(self, '_cuenta', 0)
+
+    def token(self):
+        cuenta = self._cuenta + 1
+        if cuenta >= self._cada:
+            cuenta = 0
+            self._plazo.revisar()
+        object.__setattr__(self, '_cuenta', cuenta)
+        return self._lexer.token()
+
+    # lo demás (input, lineno, skip...) va directo al lexer real
+    def __getattr__(self, nombre):
+        return getattr(self._lexer, nombre)
+
+    def __setattr__(self, nombre, valor):
+        setattr(self._lexer, nombre, valor)
+
+
+class ResultadoAnalisis:
+    """Lo que devuelve `analyze`: errores en orden de fase y si el análisis se cortó."""
+    __slots__ = ('errores', 'fase_cortada', 'ast', 'duracion_ms')
+
+    def __init__(self, errores: List[str], fase_cortada: Optional[str], ast, duracion_ms: float):
+        self.errores = errores
+        self.fase_cortada = fase_cortada      # 'sintactico' / 'semantico', o None si terminó
+        self.ast = ast
+        self.duracion_ms = duracion_ms
+
+    @property
+    def parcial(self) -> bool:
+        return self.fase_cortada is not None
+
+    def __repr__(self):
+        estado = f"parcial en {self.fase_cortada}" if self.parcial else "completo"
+        return f"ResultadoAnalisis({len(self.errores)} error(es), {estado}, {self.duracion_ms:.1f} ms)"
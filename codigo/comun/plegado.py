@@ -0,0 +1,83 @@
+import math
+import operator
+
+# =========================================================================
+# PLEGADO DE CONSTANTES (evaluador compartido)
+# =========================================================================
+# Cada analizador recorre su propio AST y, cuando los dos operandos de una
+# operación son literales, llama a `operar` con los valores ya convertidos a
+# Python (int, float, str, bool). El tipo del resultado lo decide cada
+# analizador con sus propias reglas; aquí solo se calcula el valor.
+
+NO_PLEGABLE = object()
+
+INT_MIN, INT_MAX = -2 ** 63, 2 ** 63 - 1
+
+COMPARACIONES = {
+    '==': operator.eq, '!=': operator.ne,
+    '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+}
+
+
+class DivisionPorCero(Exception):
+    """División o módulo entero entre el literal 0 (en Swift es un error)."""
+
+
+def _entero(valor):
+    # fuera de rango Swift detiene el programa: se deja la expresión como está
+    return valor if INT_MIN <= valor <= INT_MAX else NO_PLEGABLE
+
+
+def _es_numero(valor):
+    return type(valor) in (int, float)
+
+
+def operar(op, a, b):
+    """Valor de `a op b`, o NO_PLEGABLE si la operación no se puede resolver sin ejecutar."""
+    ta, tb = type(a), type(b)
+    if ta is int and tb is int:         # el caso más común: antes que las otras reglas
+        if op == '+': return _entero(a + b)
+        if op == '-': return _entero(a - b)
+        if op == '*': return _entero(a * b)
+        if op == '/' or op == '%':
+            if b == 0: raise DivisionPorCero()
+            # división y resto de Swift: truncan hacia cero
+            cociente = abs(a) // abs(b)
+            if (a < 0) != (b < 0): cociente = -cociente
+            return _entero(cociente) if op == '/' else a - b * cociente
+        comparar = COMPARACIONES.get(op)
+        return comparar(a, b) if comparar is not None else NO_PLEGABLE
+    if op in ('&&', '||'):
+        if ta is bool and tb is bool:
+            return (a and b) if op == '&&' else (a or b)
+        return NO_PLEGABLE
+    if ta is bool or tb is bool:
+        if ta is tb and op in ('==', '!='):
+            return COMPARACIONES[op](a, b)
+        return NO_PLEGABLE
+    if ta is str or tb is str:
+        if ta is not tb: return NO_PLEGABLE
+        if op == '+': return a + b
+        if op in COMPARACIONES: return COMPARACIONES[op](a, b)
+        return NO_PLEGABLE
+    if not (_es_numero(a) and _es_numero(b)):
+        return NO_PLEGABLE
+    if op in COMPARACIONES:
+        return COMPARACIONES[op](a, b)
+    a, b = float(a), float(b)
+    if op in ('/', '%') and b == 0.0:
+        return NO_PLEGABLE      # inf / nan: se deja para tiempo de ejecución
+    if op == '+': return a + b
+    if op == '-': return a - b
+    if op == '*': return a * b
+    if op == '/': return a / b
+    if op == '%': return math.fmod(a, b)
+    return NO_PLEGABLE
+
+
+def operar_unaria(op, a):
+    ta = type(a)
+    if op == '!' and ta is bool: return not a
+    if op == '-' and ta is int: return _entero(-a)
+    if op == '-' and ta is float: return -a
+    return NO_PLEGABLE
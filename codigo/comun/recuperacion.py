@@ -0,0 +1,113 @@
+import contextlib
+from typing import Callable, Iterable, Optional
+
+# =========================================================================
+# RECUPERACIÓN DE ERRORES SINTÁCTICOS (MODO PÁNICO)
+# =========================================================================
+# Cada gramática tiene producciones con el token `error` a nivel de
+# sentencia (`sentencia : error ;` y `sentencia : error { ... }`). Cuando PLY
+# llama a p_error, Recuperacion.sincronizar descarta tokens hasta el próximo
+# punto seguro:
+#   - ';'                      -> cierra la sentencia con error
+#   - '{'                      -> el bloque que sigue se parsea normalmente
+#   - '}' de un bloque abierto -> se cierra la sentencia justo antes
+#   - palabra clave al comienzo de una línea (var, let, if, func...)
+#   - fin del archivo
+# PLY vuelve a poner el token inesperado como lookahead después de
+# `error`, así que ese token se convierte en el punto seguro (o en un ';'
+# sintético, y el lexer se rebobina para volver a leer el '}' o la palabra
+# clave). Las producciones de error llaman a errok(): el siguiente error
+# pasa otra vez por p_error en lugar de la recuperación silenciosa de PLY,
+# que descarta de a un token. Cada error reporta un solo diagnóstico y el
+# costo total queda lineal en el tamaño de la entrada. Pasados
+# `max_errores` se reporta una vez que se cortó y se descarta el resto.
+
+MAX_ERRORES = 100
+
+
+def al_inicio_de_linea(texto: str, posicion: int) -> bool:
+    """¿Solo hay espacios entre el salto de línea anterior y `posicion`?"""
+    i = posicion - 1
+    while i >= 0 and texto[i] in ' \t\r':
+        i -= 1
+    return i < 0 or texto[i] == '\n'
+
+
+class Recuperacion:
+    """Estado de recuperación de un parser; una instancia por gramática."""
+
+    def __init__(self, fin_sentencia: str, apertura: str, cierre: str, palabras_clave: Iterable[str],
+                 max_errores: int = MAX_ERRORES, al_rebobinar: Optional[Callable] = None):
+        self.fin_sentencia = fin_sentencia          # tipo de token de ';'
+        self.apertura, self.cierre = apertura, cierre
+        self.palabras_clave = frozenset(palabras_clave)
+        self.max_errores = max_errores
+        self.al_rebobinar = al_rebobinar            # p. ej. para no registrar dos veces un token
+        self.errores = 0
+        self._pila = None
+        self._rebobinado = None
+
+    @contextlib.contextmanager
+    def con_maximo(self, max_errores: Optional[int]):
+        """Usa otro max_errores mientras dure el bloque (None = el actual)."""
+        anterior = self.max_errores
+        if max_errores is not None:
+            self.max_errores = max_errores
+        try:
+            yield self
+        finally:
+            self.max_errores = anterior
+
+    def contar(self, parser, token) -> bool:
+        """Cuenta un error del parse en curso; pasado max_errores descarta el resto y devuelve False."""
+        if self._pila is not parser.symstack:      # cada parse de PLY arma una pila nueva
+            self._pila, self.errores, self._rebobinado = parser.symstack, 0, None
+        self.errores += 1
+        if self.errores <= self.max_errores:
+            return True
+        if token is not None:
+            token.lexer.lexpos = len(token.lexer.lexdata)
+            self._cerrar_sentencia(token)
+        return False
+
+    @property
+    def recien_cortado(self) -> bool:
+        """True solo en el error que superó max_errores (para avisarlo una vez)."""
+        return self.errores == self.max_errores + 1
+
+    def sincronizar(self, parser, token):
+        """Desde p_error (con token != None): deja a PLY listo para reanudar en el próximo punto seguro."""
+        if len(parser.statestack) <= 1:
+            return                                  # PLY descarta el token y empieza de nuevo
+        if token.type in (self.fin_sentencia, self.apertura):
+            return                                  # la producción de error lo consume tal cual
+        # PLY solo pone .lexer en los tokens de reglas con función: se usa el del token del error
+        lexer = token.lexer
+        abiertos = sum(1 for s in parser.symstack if s.type == self.apertura)
+        t = token
+        while t is not None:
+            if t.type in (self.fin_sentencia, self.apertura) and t is not token:
+                token.type, token.value, token.lineno, token.lexpos = t.type, t.value, t.lineno, t.lexpos
+                return
+            if self._reanuda_antes(t, lexer.lexdata, abiertos):
+                self._rebobinar(lexer, t)
+                self._cerrar_sentencia(token)
+                return
+            t = parser.token()
+        self._cerrar_sentencia(token)               # fin del archivo
+
+    def _reanuda_antes(self, t, texto: str, abiertos: int) -> bool:
+        if t.lexpos == self._rebobinado:
+            return False                            # ya se intentó reanudar aquí: se descarta
+        if t.type == self.cierre:
+            return abiertos > 0
+        return t.type in self.palabras_clave and al_inicio_de_linea(texto, t.lexpos)
+
+    def _rebobinar(self, lexer, t):
+        lexer.lexpos, lexer.lineno = t.lexpos, t.lineno
+        self._rebobinado = t.lexpos
+        if self.al_rebobinar is not None:
+            self.al_rebobinar(t)
+
+    def _cerrar_sentencia(self, token):
+        token.type, token.value = self.fin_sentencia, ';'
@@ -0,0 +1,297 @@
+import json
+import queue
+import re
+import sys
+import threading
+from typing import Callable, Dict, List, Optional, Set
+
+from comun.diagnosticos import Diagnostico, canal
+from comun.plazo import Plazo, ResultadoAnalisis
+
+# =========================================================================
+# SERVIDOR DE DIAGNÓSTICOS (subconjunto de LSP por stdio)
+# =========================================================================
+# JSON-RPC con encabezados Content-Length. Métodos: initialize,
+# initialized, shutdown, exit, textDocument/didOpen, didChange (cambios
+# incrementales o texto completo), didClose, textDocument/diagnostic
+# (diagnósticos a pedido) y $/cancelRequest. Los diagnósticos se publican
+# con textDocument/publishDiagnostics, con la versión del documento.
+# Un hilo solo lee mensajes y los encola; el hilo principal aplica todos
+# los que haya y recién con la cola vacía analiza cada documento cambiado
+# en su última versión: las ediciones que llegan juntas se analizan una
+# vez. Si llega una edición del documento que se está analizando, el
+# análisis se corta (Plazo.cancelar) y su resultado no se publica. Un
+# textDocument/diagnostic pendiente se contesta al terminar el análisis de
+# su documento, o con RequestCancelled apenas llega su $/cancelRequest.
+# Los diagnósticos se juntan del canal (comun/diagnosticos.py) mientras
+# corre el análisis: cada Diagnostico trae código, línea, columna y las
+# líneas de sus repeticiones.
+
+# Códigos de error de JSON-RPC / LSP
+METODO_DESCONOCIDO = -32601
+PEDIDO_CANCELADO = -32800
+
+SEVERIDADES = {'error': 1, 'advertencia': 2, 'info': 3}
+
+# Lo que se marca a partir de la columna de un diagnóstico
+_TOKEN = re.compile(r'\w+|\S')
+
+Analizar = Callable[[object, str, Plazo], ResultadoAnalisis]
+
+
+def leer_mensaje(entrada) -> Optional[dict]:
+    """El próximo mensaje de `entrada` (binaria), o None al final del flujo."""
+    largo = None
+    while True:
+        linea = entrada.readline()
+        if not linea:
+            return None
+        linea = linea.strip()
+        if not linea:
+            break
+        nombre, _, valor = linea.partition(b':')
+        if nombre.strip().lower() == b'content-length':
+            largo = int(valor)
+    if largo is None:
+        return None
+    return json.loads(entrada.read(largo).decode('utf-8'))
+
+
+def escribir_mensaje(salida, mensaje: dict):
+    datos = json.dumps(mensaje, ensure_ascii=False).encode('utf-8')
+    salida.write(b'Content-Length: %d\r\n\r\n' % len(datos) + datos)
+    salida.flush()
+
+
+def _desplazamiento(texto: str, posicion: dict) -> int:
+    """Índice en `texto` de una posición LSP (línea desde 0, carácter en unidades UTF-16)."""
+    pos = 0
+    for _ in range(posicion['line']):
+        pos = texto.find('\n', pos) + 1
+        if pos == 0:
+            return len(texto)
+    fin = texto.find('\n', pos)
+    linea = texto[pos:fin if fin >= 0 else len(texto)]
+    caracter = posicion['character']
+    if not linea.isascii():
+        caracter = len(linea.encode('utf-16-le')[:2 * caracter].decode('utf-16-le', 'ignore'))
+    return pos + min(caracter, len(linea))
+
+
+def aplicar_cambio(texto: str, cambio: dict) -> str:
+    """Un elemento de contentChanges: reemplazo de un rango o texto completo."""
+    rango = cambio.get('range')
+    if rango is None:
+        return cambio['text']
+    return texto[:_desplazamiento(texto, rango['start'])] + cambio['text'] + texto[_desplazamiento(texto, rango['end']):]
+
+
+def _utf16(linea: str, columna: int) -> int:
+    return columna if linea.isascii() else len(linea[:columna].encode('utf-16-le')) // 2
+
+
+def a_lsp(diagnostico: Diagnostico, lineas: List[str], fuente: str) -> List[dict]:
+    """Diagnósticos LSP de un Diagnostico: uno por cada línea donde aparece (hasta MAX_UBICACIONES)."""
+    salida = []
+    for i, numero in enumerate(diagnostico.lineas or [diagnostico.linea or 1]):
+        fila = min(max(numero - 1, 0), len(lineas) - 1)
+        linea = lineas[fila]
+        if i == 0 and diagnostico.columna:
+            inicio = min(diagnostico.columna - 1, len(linea))
+            token = _TOKEN.match(linea, inicio)
+            fin = token.end() if token else inicio
+        else:                           # sin columna: la línea sin la sangría
+            inicio, fin = len(linea) - len(linea.lstrip()), len(linea.rstrip())
+        salida.append({
+            'range': {'start': {'line': fila, 'character': _utf16(linea, inicio)},
+                      'end': {'line': fila, 'character': _utf16(linea, fin)}},
+            'severity': SEVERIDADES.get(diagnostico.severidad, 1),
+            'code': diagnostico.codigo,
+            'source': fuente,
+            'message': diagnostico.mensaje,
+        })
+    return salida
+
+
+class Documento:
+    __slots__ = ('uri', 'texto', 'version', 'estado', 'sucio', 'diagnosticos')
+
+    def __init__(self, uri: str, texto: str, version: int, estado):
+        self.uri = uri
+        self.texto = texto
+        self.version = version
+        self.estado = estado            # lo que el analizador guarda entre análisis (p. ej. ParseIncremental)
+        self.sucio = True
+        self.diagnosticos: List[dict] = []
+
+
+class ServidorLSP:
+    """
+    Servidor de diagnósticos sobre `entrada`/`salida` (binarias; por omisión
+    stdin/stdout). `analizar(estado, texto, plazo)` devuelve el
+    ResultadoAnalisis de un documento; `nuevo_estado()` crea el estado de
+    cada documento abierto.
+    """
+
+    def __init__(self, analizar: Analizar, nuevo_estado: Callable[[], object] = lambda: None,
+                 fuente: str = 'swift', entrada=None, salida=None):
+        self.analizar = analizar
+        self.nuevo_estado = nuevo_estado
+        self.fuente = fuente
+        self.entrada = entrada
+        self.salida = salida
+        self.documentos: Dict[str, Documento] = {}
+        self.estadisticas = {'analisis': 0, 'cortados': 0, 'cancelados': 0}
+        self._cola: 'queue.Queue' = queue.Queue()
+        self._cerrojo = threading.Lock()        # salida, pedidos pendientes y análisis en curso
+        self._pendientes: Dict[object, str] = {}     # id de textDocument/diagnostic -> uri
+        self._cancelados: Set[object] = set()        # $/cancelRequest que llegaron antes que su pedido
+        self._en_curso = None                   # (uri, Plazo) del análisis que está corriendo
+        self._apagado = False
+        self._salir = False
+
+    def atender(self) -> int:
+        """Atiende hasta `exit` o el fin de la entrada; devuelve el código de salida (0 si hubo shutdown)."""
+        if self.entrada is None:
+            self.entrada = sys.stdin.buffer
+        if self.salida is None:
+            self.salida = sys.stdout.buffer
+            sys.stdout = sys.stderr     # un print suelto no debe romper el protocolo
+        threading.Thread(target=self._leer, daemon=True).start()
+        while not self._salir:
+            self._manejar(self._cola.get())
+            self._drenar()
+            self._analizar_pendientes()
+        return 0 if self._apagado else 1
+
+    # --- mensajes ----------------------------------------------------------
+
+    def _leer(self):
+        while True:
+            mensaje = leer_mensaje(self.entrada)
+            if mensaje is None:
+                self._cola.put({'method': 'exit'})
+                return
+            metodo = mensaje.get('method')
+            if metodo == 'exit':
+                self._cola.put(mensaje)
+                return                  # sin hilos esperando en stdin al terminar el intérprete
+            if metodo == '$/cancelRequest':
+                self._cancelar(mensaje['params']['id'])
+                continue
+            if metodo == 'textDocument/didChange':
+                # una edición nueva hace inútil el análisis de la versión anterior
+                with self._cerrojo:
+                    if self._en_curso is not None and self._en_curso[0] == mensaje['params']['textDocument']['uri']:
+                        self._en_curso[1].cancelar()
+            self._cola.put(mensaje)
+
+    def _enviar(self, mensaje: dict):
+        mensaje['jsonrpc'] = '2.0'
+        with self._cerrojo:
+            escribir_mensaje(self.salida, mensaje)
+
+    def _responder(self, id_, resultado=None, error: Optional[tuple] = None):
+        if error is not None:
+            self._enviar({'id': id_, 'error': {'code': error[0], 'message': error[1]}})
+        else:
+            self._enviar({'id': id_, 'result': resultado})
+
+    def _cancelar(self, id_):
+        with self._cerrojo:
+            if self._pendientes.pop(id_, None) is None:
+                # todavía en la cola (o ya contestado): se contesta cancelado al sacarlo
+                self._cancelados.add(id_)
+                return
+        self.estadisticas['cancelados'] += 1
+        self._responder(id_, error=(PEDIDO_CANCELADO, 'pedido cancelado'))
+
+    def _drenar(self):
+        while not self._salir:
+            try:
+                mensaje = self._cola.get_nowait()
+            except queue.Empty:
+                return
+            self._manejar(mensaje)
+
+    def _manejar(self, mensaje: dict):
+        metodo, id_ = mensaje.get('method'), mensaje.get('id')
+        params = mensaje.get('params') or {}
+        if metodo == 'initialize':
+            self._responder(id_, {'capabilities': {'textDocumentSync': {'openClose': True, 'change': 2},
+                                                   'diagnosticProvider': {'interFileDependencies': False,
+                                                                          'workspaceDiagnostics': False}},
+                                  'serverInfo': {'name': self.fuente}})
+        elif metodo == 'shutdown':
+            self._apagado = True
+            self._responder(id_, None)
+        elif metodo == 'exit':
+            self._salir = True
+        elif metodo == 'textDocument/didOpen':
+            doc = params['textDocument']
+            self.documentos[doc['uri']] = Documento(doc['uri'], doc['text'], doc.get('version', 0), self.nuevo_estado())
+        elif metodo == 'textDocument/didChange':
+            documento = self.documentos.get(params['textDocument']['uri'])
+            if documento is not None:
+                for cambio in params['contentChanges']:
+                    documento.texto = aplicar_cambio(documento.texto, cambio)
+                documento.version = params['textDocument'].get('version', documento.version + 1)
+                documento.sucio = True
+        elif metodo == 'textDocument/didClose':
+            uri = params['textDocument']['uri']
+            if self.documentos.pop(uri, None) is not None:
+                self._enviar({'method': 'textDocument/publishDiagnostics', 'params': {'uri': uri, 'diagnostics': []}})
+        elif metodo == 'textDocument/diagnostic':
+            documento = self.documentos.get(params['textDocument']['uri'])
+            with self._cerrojo:
+                cancelado = id_ in self._cancelados
+                self._cancelados.discard(id_)
+            if cancelado:
+                self.estadisticas['cancelados'] += 1
+                self._responder(id_, error=(PEDIDO_CANCELADO, 'pedido cancelado'))
+            elif documento is None or not documento.sucio:
+                self._responder(id_, {'kind': 'full', 'items': documento.diagnosticos if documento else []})
+            else:
+                with self._cerrojo:
+                    self._pendientes[id_] = documento.uri
+        elif id_ is not None and metodo is not None:
+            self._responder(id_, error=(METODO_DESCONOCIDO, f'método no soportado: {metodo}'))
+        # notificaciones desconocidas (initialized, $/setTrace, ...) se ignoran
+
+    # --- análisis ----------------------------------------------------------
+
+    def _analizar_pendientes(self):
+        while not self._salir:
+            documento = next((d for d in self.documentos.values() if d.sucio), None)
+            if documento is None:
+                return
+            self._analizar(documento)
+            self._drenar()
+
+    def _analizar(self, documento: Documento):
+        plazo = Plazo.sin_limite()
+        texto, version = documento.texto, documento.version
+        with self._cerrojo:
+            self._en_curso = (documento.uri, plazo)
+        diagnosticos: List[Diagnostico] = []
+        baja = canal.suscribir(diagnosticos.append)
+        try:
+            resultado = self.analizar(documento.estado, texto, plazo)
+        finally:
+            baja()
+            with self._cerrojo:
+                self._en_curso = None
+        self.estadisticas['analisis'] += 1
+        if resultado.fase_cortada is not None or version != documento.version:
+            self.estadisticas['cortados'] += 1      # llegó una versión más nueva: se analiza esa
+            return
+        documento.sucio = False
+        lineas = texto.split('\n')
+        documento.diagnosticos = [d for diagnostico in diagnosticos for d in a_lsp(diagnostico, lineas, self.fuente)]
+        self._enviar({'method': 'textDocument/publishDiagnostics',
+                      'params': {'uri': documento.uri, 'version': version, 'diagnostics': documento.diagnosticos}})
+        with self._cerrojo:
+            contestar = [id_ for id_, uri in self._pendientes.items() if uri == documento.uri]
+            for id_ in contestar: del self._pendientes[id_]
+        for id_ in contestar:
+            self._responder(id_, {'kind': 'full', 'items': documento.diagnosticos})
@@ -0,0 +1,123 @@
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# =========================================================================
+# TABLA DE SÍMBOLOS COMPACTA (compartida por los tres analizadores)
+# =========================================================================
+# Cada ámbito guarda sus símbolos en un dict nombre -> entero y una columna
+# de líneas (array) en lugar de un dict u objeto por variable. Los tipos se
+# internan una sola vez en una tabla global, así que "Int" o
+# "Dictionary(String,Int)" existen una única vez aunque haya 1M
+# declaraciones. El entero del dict es código de tipo * 2 + mutabilidad:
+# mientras haya menos de 128 tipos distintos es uno de los enteros chicos
+# que Python comparte (-5..256) y no cuesta un objeto por símbolo. Un
+# índice por posición sí lo costaría (28 B cada uno, más que todo lo demás
+# salvo el dict), por eso la línea se busca por posición solo cuando se la
+# pide. No se conserva el texto fuente del inicializador.
+
+_TIPOS: List[Optional[str]] = [None]
+_CODIGOS: Dict[Optional[str], int] = {None: 0}
+
+
+def internar_tipo(tipo: Optional[str]) -> int:
+    """Devuelve el código del tipo, registrándolo la primera vez que aparece."""
+    codigo = _CODIGOS.get(tipo)
+    if codigo is None:
+        codigo = len(_TIPOS)
+        _TIPOS.append(tipo)
+        _CODIGOS[tipo] = codigo
+    return codigo
+
+
+def nombre_tipo(codigo: int) -> Optional[str]:
+    return _TIPOS[codigo]
+
+
+class Simbolo:
+    """
+    Vista de solo lectura de una entrada de un Ambito. La línea de un
+    símbolo sacado de un Ambito se busca recién al leerla.
+    """
+    __slots__ = ('nombre', 'tipo', 'mutable', '_linea', '_ambito')
+
+    def __init__(self, nombre, tipo, mutable=False, linea=0, ambito: Optional['Ambito'] = None):
+        self.nombre, self.tipo, self.mutable = nombre, tipo, mutable
+        self._linea, self._ambito = linea, ambito
+
+    @property
+    def linea(self) -> int:
+        if self._ambito is not None:
+            self._linea, self._ambito = self._ambito.linea_de(self.nombre) or 0, None
+        return self._linea
+
+    def __repr__(self):
+        return f"Simbolo({self.nombre!r}, {self.tipo!r}, mutable={self.mutable}, linea={self.linea})"
+
+
+class Ambito:
+    """Un ámbito: nombre -> código de tipo y mutabilidad, y las líneas en orden de declaración."""
+    __slots__ = ('_indice', '_lineas', '_posiciones')
+
+    def __init__(self):
+        self._indice: Dict[str, int] = {}
+        self._lineas = array('i')
+        # nombre -> posición en _lineas; se arma al pedir una línea y se descarta al declarar
+        self._posiciones: Optional[Dict[str, int]] = None
+
+    def declarar(self, nombre: str, tipo: Optional[str], mutable: bool = False, linea: int = 0) -> bool:
+        """Agrega el símbolo; devuelve False si el nombre ya existe en este ámbito."""
+        if nombre in self._indice:
+            return False
+        self._indice[nombre] = internar_tipo(tipo) << 1 | (1 if mutable else 0)
+        self._lineas.append(linea or 0)
+        self._posiciones = None
+        return True
+
+    def marca(self) -> int:
+        """Punto al que se puede volver con volver_a (cuántos símbolos hay)."""
+        return len(self._lineas)
+
+    def volver_a(self, marca: int):
+        """Quita los símbolos declarados después de `marca`. Los nombres están en
+        _indice en orden de declaración, así que popitem saca justo esos."""
+        for _ in range(len(self._lineas) - marca):
+            self._indice.popitem()
+        del self._lineas[marca:]
+        self._posiciones = None
+
+    def tipo_de(self, nombre: str) -> Optional[str]:
+        """Tipo del símbolo sin construir un Simbolo (None si no existe)."""
+        valor = self._indice.get(nombre)
+        return None if valor is None else _TIPOS[valor >> 1]
+
+    def linea_de(self, nombre: str) -> Optional[int]:
+        """Línea de la declaración (None si no existe). La primera consulta después de declarar recorre el ámbito."""
+        if self._posiciones is None:
+            self._posiciones = {n: i for i, n in enumerate(self._indice)}
+        i = self._posiciones.get(nombre)
+        return None if i is None else self._lineas[i]
+
+    def get(self, nombre: str, defecto=None) -> Optional[Simbolo]:
+        valor = self._indice.get(nombre)
+        if valor is None:
+            return defecto
+        return Simbolo(nombre, _TIPOS[valor >> 1], bool(valor & 1), ambito=self)
+
+    def __getitem__(self, nombre: str) -> Simbolo:
+        simb = self.get(nombre)
+        if simb is None:
+            raise KeyError(nombre)
+        return simb
+
+    def __contains__(self, nombre) -> bool:
+        return nombre in self._indice
+
+    def __len__(self) -> int:
+        return len(self._indice)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._indice)
+
+    def items(self) -> Iterator[Tuple[str, Simbolo]]:
+        for (nombre, valor), linea in zip(self._indice.items(), self._lineas):
+            yield nombre, Simbolo(nombre, _TIPOS[valor >> 1], bool(valor & 1), linea)
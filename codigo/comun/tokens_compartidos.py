@@ -0,0 +1,259 @@
+import bisect
+import pickle
+import struct
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from ply.lex import LexToken
+
+from comun.tuberia import contexto
+
+# =========================================================================
+# TOKENS EN MEMORIA COMPARTIDA
+# =========================================================================
+# Un proceso lexea una vez y deja los tokens en un bloque de
+# multiprocessing.shared_memory, por columnas:
+#   numero   int64/float64  valor entero, bits del float, u offset en `extra`
+#   posicion uint32         lexpos
+#   linea    uint32         lineno
+#   largo    uint32         largo del lexema (o del valor en `extra`)
+#   tipo     uint16         índice en la tabla de tipos
+#   clase    uint8          cómo se reconstruye el valor (ver CLASE_*)
+# seguidas del código fuente en UTF-8 y de `extra` (valores que no son un
+# pedazo del fuente, p. ej. cadenas con escapes ya resueltos). Los procesos
+# que parsean abren el bloque por nombre y leen las columnas sin copiarlas a
+# través de LexerCompartido, un lexer compatible con PLY; no se vuelve a
+# lexear ni se serializa ningún token. Cada gramática tiene su propio lexer
+# (tipos de token distintos), así que hay un bloque por lexer; los errores
+# léxicos van en la cabecera con el índice del token que los sigue.
+
+CLASE_FUENTE, CLASE_ENTERO, CLASE_REAL, CLASE_TEXTO, CLASE_NADA, CLASE_OTRO = range(6)
+
+# (nombre, formato de array) en orden de tamaño: así cada columna queda alineada
+COLUMNAS = (('numero', 'q'), ('posicion', 'I'), ('linea', 'I'), ('largo', 'I'), ('tipo', 'H'), ('clase', 'B'))
+
+_CABECERA = struct.Struct('<Q')
+_BITS_REAL = struct.Struct('<d')
+_ENTERO_REAL = struct.Struct('<q')
+_LIMITE_ENTERO = 2 ** 63
+
+
+class EscritorTokens:
+    """Junta los tokens de un lexer; misma interfaz que la salida de la etapa léxica de comun/tuberia.py."""
+
+    def __init__(self, codigo: str):
+        self.codigo = codigo
+        self.columnas = {nombre: array(formato) for nombre, formato in COLUMNAS}
+        self.tipos: List[str] = []
+        self._indice_tipo = {}
+        self.extra = bytearray()
+        self.diagnosticos: List[Tuple] = []
+        self._agregar = [self.columnas[nombre].append for nombre, _ in COLUMNAS]
+
+    def __call__(self, t):
+        indice = self._indice_tipo.get(t.type)
+        if indice is None:
+            indice = self._indice_tipo[t.type] = len(self.tipos)
+            self.tipos.append(t.type)
+        valor, numero, largo = t.value, 0, 0
+        if type(valor) is str and self.codigo.startswith(valor, t.lexpos):
+            clase, largo = CLASE_FUENTE, len(valor)
+        elif type(valor) is int and -_LIMITE_ENTERO <= valor < _LIMITE_ENTERO:
+            clase, numero = CLASE_ENTERO, valor
+        elif type(valor) is float:
+            clase, numero = CLASE_REAL, _ENTERO_REAL.unpack(_BITS_REAL.pack(valor))[0]
+        elif valor is None:
+            clase = CLASE_NADA
+        else:
+            datos = valor.encode('utf-8') if type(valor) is str else pickle.dumps(valor)
+            clase = CLASE_TEXTO if type(valor) is str else CLASE_OTRO
+            numero, largo = len(self.extra), len(datos)
+            self.extra += datos
+        numeros, posiciones, lineas, largos, tipos, clases = self._agregar
+        numeros(numero)
+        posiciones(t.lexpos)
+        lineas(t.lineno)
+        largos(largo)
+        tipos(indice)
+        clases(clase)
+
+    def reportar(self, codigo: str, linea=None, columna=None, severidad='error', **argumentos):
+        self.diagnosticos.append((len(self.columnas['tipo']), codigo, linea, columna, severidad, argumentos))
+
+
+class BufferTokens:
+    """Bloque de memoria compartida con los tokens de un código; se abre desde otros procesos por `nombre`."""
+
+    def __init__(self, memoria: shared_memory.SharedMemory, propietario: bool):
+        self.memoria = memoria
+        self.propietario = propietario
+        vista = memoria.buf
+        largo_meta = _CABECERA.unpack_from(vista, 0)[0]
+        meta = pickle.loads(vista[_CABECERA.size:_CABECERA.size + largo_meta])
+        self.cantidad: int = meta['cantidad']
+        self.tipos: List[str] = meta['tipos']
+        self.diagnosticos: List[Tuple] = meta['diagnosticos']
+        desplazamiento = meta['inicio']
+        self.columnas = {}
+        for nombre, formato in COLUMNAS:
+            tam = self.cantidad * array(formato).itemsize
+            self.columnas[nombre] = vista[desplazamiento:desplazamiento + tam].cast(formato)
+            desplazamiento += tam
+        self.reales = vista[meta['inicio']:meta['inicio'] + 8 * self.cantidad].cast('d')
+        fin_codigo = desplazamiento + meta['largo_codigo']
+        self.codigo: str = bytes(vista[desplazamiento:fin_codigo]).decode('utf-8')
+        self.extra = vista[fin_codigo:fin_codigo + meta['largo_extra']]
+
+    @property
+    def nombre(self) -> str:
+        return self.memoria.name
+
+    @classmethod
+    def crear(cls, codigo: str, lexica: Callable) -> 'BufferTokens':
+        """Corre lexica(codigo, escritor) en este proceso y copia el resultado a memoria compartida."""
+        escritor = EscritorTokens(codigo)
+        lexica(codigo, escritor)
+        fuente = codigo.encode('utf-8')
+        meta = {'cantidad': len(escritor.columnas['tipo']), 'tipos': escritor.tipos,
+                'diagnosticos': escritor.diagnosticos, 'largo_codigo': len(fuente),
+                'largo_extra': len(escritor.extra), 'inicio': 0}
+        largo_meta = len(pickle.dumps(meta)) + 16        # 'inicio' todavía no tiene su valor final
+        meta['inicio'] = (_CABECERA.size + largo_meta + 7) // 8 * 8
+        datos_meta = pickle.dumps(meta)
+        columnas = [escritor.columnas[nombre].tobytes() for nombre, _ in COLUMNAS]
+        total = meta['inicio'] + sum(map(len, columnas)) + len(fuente) + len(escritor.extra)
+        memoria = shared_memory.SharedMemory(create=True, size=max(total, 1))
+        vista = memoria.buf
+        _CABECERA.pack_into(vista, 0, len(datos_meta))
+        vista[_CABECERA.size:_CABECERA.size + len(datos_meta)] = datos_meta
+        desplazamiento = meta['inicio']
+        for bloque in (*columnas, fuente, bytes(escritor.extra)):
+            vista[desplazamiento:desplazamiento + len(bloque)] = bloque
+            desplazamiento += len(bloque)
+        return cls(memoria, propietario=True)
+
+    @classmethod
+    def abrir(cls, nombre: str) -> 'BufferTokens':
+        """
+        Se engancha a un bloque creado por otro proceso (sin copiar los tokens).
+        Pensado para procesos hijos del que lo creó: comparten su resource
+        tracker, así que registrar el bloque otra vez no cambia quién lo borra.
+        """
+        try:
+            memoria = shared_memory.SharedMemory(name=nombre, track=False)
+        except TypeError:               # antes de Python 3.13 no existe track
+            memoria = shared_memory.SharedMemory(name=nombre)
+        return cls(memoria, propietario=False)
+
+    def valor(self, i: int):
+        clase = self.columnas['clase'][i]
+        if clase == CLASE_FUENTE:
+            inicio = self.columnas['posicion'][i]
+            return self.codigo[inicio:inicio + self.columnas['largo'][i]]
+        if clase == CLASE_ENTERO:
+            return self.columnas['numero'][i]
+        if clase == CLASE_REAL:
+            return self.reales[i]
+        if clase == CLASE_NADA:
+            return None
+        inicio = self.columnas['numero'][i]
+        datos = bytes(self.extra[inicio:inicio + self.columnas['largo'][i]])
+        return datos.decode('utf-8') if clase == CLASE_TEXTO else pickle.loads(datos)
+
+    def cerrar(self):
+        """Suelta las vistas; el propietario además borra el bloque."""
+        for vista in (*self.columnas.values(), self.reales, self.extra):
+            vista.release()
+        self.columnas, self.reales, self.extra = {}, None, None
+        self.memoria.close()
+        if self.propietario:
+            self.memoria.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.cerrar()
+
+
+class LexerCompartido:
+    """
+    Lexer para PLY que lee un BufferTokens. Como LexerDeLotes (comun/tuberia.py)
+    acepta el rebobinado y el corte de la recuperación de errores, y pasa los
+    errores léxicos a `errores_lexicos` al llegar al token que los sigue.
+    """
+
+    def __init__(self, buffer: BufferTokens):
+        self.buffer = buffer
+        self.lexdata = buffer.codigo
+        self.lineno = 1
+        self.errores_lexicos = None
+        self._i = 0
+        self._cantidad = buffer.cantidad
+        self._diagnostico = 0
+        self._proximo = buffer.diagnosticos[0][0] if buffer.diagnosticos else float('inf')
+        self._tipos = buffer.tipos
+        c = buffer.columnas
+        self._tipo, self._linea, self._posicion = c['tipo'], c['linea'], c['posicion']
+        self._largo, self._clase = c['largo'], c['clase']
+
+    def input(self, texto: str):
+        pass                            # los tokens ya están en el buffer
+
+    def _reportar_hasta(self, indice: int):
+        diagnosticos = self.buffer.diagnosticos
+        while self._diagnostico < len(diagnosticos) and diagnosticos[self._diagnostico][0] <= indice:
+            _, codigo, linea, columna, severidad, argumentos = diagnosticos[self._diagnostico]
+            if self.errores_lexicos is not None:
+                self.errores_lexicos.reportar(codigo, linea, columna, severidad, **argumentos)
+            self._diagnostico += 1
+        self._proximo = diagnosticos[self._diagnostico][0] if self._diagnostico < len(diagnosticos) else float('inf')
+
+    def token(self) -> Optional[LexToken]:
+        i = self._i
+        if i >= self._proximo:
+            self._reportar_hasta(i)
+        if i >= self._cantidad:
+            return None
+        self._i = i + 1
+        t = LexToken()
+        t.type = self._tipos[self._tipo[i]]
+        t.lineno = self._linea[i]
+        t.lexpos = inicio = self._posicion[i]
+        # lo común (identificadores, palabras clave, operadores) es un pedazo del fuente
+        t.value = self.lexdata[inicio:inicio + self._largo[i]] if self._clase[i] == CLASE_FUENTE else self.buffer.valor(i)
+        return t
+
+    @property
+    def lexpos(self) -> int:
+        return self._posicion[self._i] if self._i < self._cantidad else len(self.lexdata)
+
+    @lexpos.setter
+    def lexpos(self, posicion: int):
+        if posicion >= len(self.lexdata):
+            self._i = self._cantidad
+            self._diagnostico, self._proximo = len(self.buffer.diagnosticos), float('inf')   # el corte descarta los posteriores
+        else:
+            self._i = bisect.bisect_left(self._posicion, posicion)
+
+
+def _en_trabajador(funcion: Callable, nombre: str, argumentos: Sequence):
+    buffer = BufferTokens.abrir(nombre)
+    try:
+        return funcion(buffer, *argumentos)
+    finally:
+        buffer.cerrar()
+
+
+def repartir(tareas: Sequence[Tuple[Callable, BufferTokens, Sequence]], trabajadores: Optional[int] = None) -> List:
+    """
+    Corre cada funcion(buffer, *argumentos) en un pool de procesos; cada
+    trabajador abre el buffer por nombre. Devuelve los resultados en orden
+    (lo que devuelve `funcion` se serializa de vuelta).
+    """
+    with ProcessPoolExecutor(trabajadores or len(tareas), mp_context=contexto()) as pool:
+        futuros = [pool.submit(_en_trabajador, funcion, buffer.nombre, tuple(argumentos))
+                   for funcion, buffer, argumentos in tareas]
+        return [f.result() for f in futuros]
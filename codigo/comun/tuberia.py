@@ -0,0 +1,215 @@
+import multiprocessing
+import queue
+import traceback
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from ply.lex import LexToken
+
+# =========================================================================
+# ANÁLISIS EN TUBERÍA DE PROCESOS
+# =========================================================================
+# Léxico, sintáctico y semántico corren cada uno en su propio proceso:
+#
+#   léxico --lotes de tokens--> sintáctico --lotes de sentencias--> semántico
+#
+# Los tokens viajan como tuplas (tipo, valor, línea, posición) y las
+# sentencias de nivel superior salen del parser apenas se reducen (ver
+# comun/flujo.py). Los errores léxicos viajan entre los tokens y se
+# registran en el proceso del parser al llegar a ese punto: si el parser
+# corta la entrada (max_errores), los posteriores se descartan igual que
+# cuando el lexer corre en el mismo proceso. Las colas son acotadas: si una
+# etapa se atrasa, la anterior espera en vez de acumular. Con archivos
+# grandes el tiempo total se acerca al de la etapa más lenta y no a la suma
+# de las tres (si hay núcleos libres). Cada analizador aporta tres
+# funciones, y `ejecutar` devuelve lo que devolvió cada una:
+#   lexica(codigo, salida)       salida(token) por token; salida.reportar
+#                                reemplaza a la lista de errores léxicos
+#   sintactica(lexer, entregar)  entregar(sentencia); lexer.errores_lexicos
+#                                recibe los errores léxicos
+#   semantica(sentencias)        plegado y semántico sobre el iterable
+# Los diagnósticos en vivo (comun.diagnosticos.canal) no cruzan procesos.
+
+TAM_LOTE = 2048             # tokens por mensaje
+LOTE_SENTENCIAS = 64        # sentencias por mensaje
+LOTES_EN_COLA = 8           # mensajes pendientes antes de frenar a la etapa anterior
+
+
+class EtapaFallida(Exception):
+    """Una etapa lanzó una excepción en su proceso (el traceback va en el mensaje)."""
+
+
+class EntradaLotes:
+    """Lado lector de una cola de lotes terminada en None."""
+
+    def __init__(self, cola):
+        self.cola = cola
+        self.terminada = False
+
+    def lotes(self) -> Iterator[list]:
+        while not self.terminada:
+            lote = self.cola.get()
+            if lote is None:
+                self.terminada = True
+                return
+            yield lote
+
+    def vaciar(self):
+        """Descarta lo que falte, para que la etapa anterior no quede bloqueada."""
+        for _ in self.lotes():
+            pass
+
+
+class SalidaLotes:
+    """Agrupa elementos de a `tam` antes de mandarlos por la cola."""
+
+    def __init__(self, cola, tam: int):
+        self.cola, self.tam = cola, tam
+        self.lote: list = []
+
+    def __call__(self, elemento):
+        self.lote.append(elemento)
+        if len(self.lote) >= self.tam:
+            self.cola.put(self.lote)
+            self.lote = []
+
+    def cerrar(self):
+        if self.lote:
+            self.cola.put(self.lote)
+            self.lote = []
+        self.cola.put(None)
+
+
+class SalidaTokens(SalidaLotes):
+    """Salida de la etapa léxica: tokens como tuplas y errores léxicos en el mismo orden."""
+
+    def __call__(self, t):
+        super().__call__((t.type, t.value, t.lineno, t.lexpos))
+
+    def reportar(self, codigo: str, linea=None, columna=None, severidad='error', **argumentos):
+        # posición -1: el rebobinado de LexerDeLotes nunca retrocede más allá de un error
+        super().__call__((None, (codigo, columna, severidad, argumentos), linea, -1))
+
+
+class LexerDeLotes:
+    """
+    Lexer para PLY que devuelve los tokens ya armados por la etapa léxica.
+    Acepta lo que la recuperación de errores le hace al lexer: volver atrás
+    a un token recién leído (lexpos hacia atrás) o cortar la entrada
+    (lexpos = len(lexdata)). Los errores léxicos que llegan entre los tokens
+    se pasan a `errores_lexicos` (una ListaDiagnosticos) al leerlos.
+    """
+
+    def __init__(self, lexdata: str, entrada: EntradaLotes):
+        self.lexdata = lexdata
+        self.lineno = 1
+        self.errores_lexicos = None
+        self._lotes = entrada.lotes()
+        self._lote: list = []
+        self._anterior: list = []      # por si se rebobina justo en el borde de un lote
+        self._i = 0
+        self._cortado = False
+
+    def input(self, texto: str):
+        self.lexdata = texto
+
+    def token(self) -> Optional[LexToken]:
+        while not self._cortado:
+            if self._i >= len(self._lote):
+                siguiente = next(self._lotes, None)
+                if siguiente is None:
+                    return None
+                self._anterior, self._lote, self._i = self._lote, siguiente, 0
+            tipo, valor, linea, posicion = self._lote[self._i]
+            self._i += 1
+            if tipo is None:
+                if self.errores_lexicos is not None:
+                    codigo, columna, severidad, argumentos = valor
+                    self.errores_lexicos.reportar(codigo, linea, columna, severidad, **argumentos)
+                continue
+            t = LexToken()
+            t.type, t.value, t.lineno, t.lexpos = tipo, valor, linea, posicion
+            return t
+        return None
+
+    @property
+    def lexpos(self) -> int:
+        for elemento in self._lote[self._i:]:
+            if elemento[0] is not None:
+                return elemento[3]
+        return len(self.lexdata)
+
+    @lexpos.setter
+    def lexpos(self, posicion: int):
+        if posicion >= len(self.lexdata):
+            self._cortado = True
+            return
+        while True:
+            while self._i > 0 and self._lote[self._i - 1][3] >= posicion:
+                self._i -= 1
+            if self._i > 0 or not self._anterior:
+                return
+            self._i = len(self._anterior)
+            self._lote, self._anterior = self._anterior + self._lote, []
+
+
+def _etapa(nombre, funcion, codigo, entrada_cola, salida_cola, tam, resultados):
+    """Cuerpo de cada proceso: corre la etapa y manda (nombre, resultado, traceback)."""
+    entrada = EntradaLotes(entrada_cola) if entrada_cola is not None else None
+    salida = None
+    if salida_cola is not None:
+        salida = SalidaTokens(salida_cola, tam) if nombre == 'lexico' else SalidaLotes(salida_cola, tam)
+    try:
+        if nombre == 'lexico':
+            resultado = funcion(codigo, salida)
+        elif nombre == 'sintactico':
+            resultado = funcion(LexerDeLotes(codigo, entrada), salida)
+        else:
+            resultado = funcion(e for lote in entrada.lotes() for e in lote)
+        resultados.put((nombre, resultado, None))
+    except BaseException:
+        resultados.put((nombre, None, traceback.format_exc()))
+    finally:
+        if entrada is not None:
+            entrada.vaciar()
+        if salida is not None:
+            salida.cerrar()
+
+
+def contexto():
+    # con fork los procesos heredan el código fuente y los módulos ya importados
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+
+def ejecutar(codigo: str, lexica: Callable, sintactica: Callable, semantica: Callable[[Iterable], object],
+             tam_lote: int = TAM_LOTE, lote_sentencias: int = LOTE_SENTENCIAS,
+             lotes_en_cola: int = LOTES_EN_COLA) -> List:
+    """Corre las tres etapas en procesos separados; devuelve [resultado léxico, sintáctico, semántico]."""
+    ctx = contexto()
+    tokens, sentencias, resultados = ctx.Queue(lotes_en_cola), ctx.Queue(lotes_en_cola), ctx.Queue()
+    procesos = [
+        ctx.Process(target=_etapa, args=('lexico', lexica, codigo, None, tokens, tam_lote, resultados)),
+        ctx.Process(target=_etapa, args=('sintactico', sintactica, codigo, tokens, sentencias,
+                                         lote_sentencias, resultados)),
+        ctx.Process(target=_etapa, args=('semantico', semantica, None, sentencias, None, 0, resultados)),
+    ]
+    for p in procesos:
+        p.daemon = True
+        p.start()
+    obtenidos = {}
+    while len(obtenidos) < len(procesos):
+        try:
+            nombre, resultado, fallo = resultados.get(timeout=0.5)
+        except queue.Empty:
+            if not any(p.is_alive() for p in procesos) and resultados.empty():
+                faltan = [n for n in ('lexico', 'sintactico', 'semantico') if n not in obtenidos]
+                raise EtapaFallida(f"la(s) etapa(s) {', '.join(faltan)} terminaron sin resultado")
+            continue
+        if fallo is not None:
+            for p in procesos: p.terminate()
+            raise EtapaFallida(f"etapa {nombre}:\n{fallo}")
+        obtenidos[nombre] = resultado
+    for p in procesos:
+        p.join()
+    return [obtenidos['lexico'], obtenidos['sintactico'], obtenidos['semantico']]
@@ -0,0 +1,96 @@
+import os
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# =========================================================================
+# VIGILANCIA DE ARCHIVOS (modo --watch)
+# =========================================================================
+# Se revisa el árbol cada `intervalo` segundos comparando (mtime, tamaño,
+# inodo) de cada archivo: sin dependencias y sin hilos. El inodo detecta
+# los editores que guardan escribiendo otro archivo y renombrándolo. Una
+# ráfaga de guardados (guardar todo, un formateador, git checkout) se
+# entrega una sola vez, cuando pasan `espera` segundos sin cambios nuevos,
+# comparada contra cómo estaba el árbol al empezar: un archivo creado y
+# borrado dentro de la ráfaga no aparece.
+# Si revisar el árbol tarda, la pausa crece con él para que el vigilante
+# no pase más de 1/CARGA del tiempo revisando (un árbol que tarda 20 ms en
+# escanearse se revisa cada 400 ms).
+# Las carpetas que empiezan con '.' (.git, .cache_analisis) no se miran.
+
+# Entre revisiones y silencio antes de entregar una ráfaga (segundos); con
+# ESPERA menor que INTERVALO basta una revisión sin cambios
+INTERVALO = 0.2
+ESPERA = 0.1
+CARGA = 20
+
+Estado = Tuple[int, int, int]       # (mtime_ns, tamaño, inodo)
+
+
+class Vigilante:
+    """Archivos con alguna de `extensiones` bajo `carpeta` y sus cambios."""
+
+    def __init__(self, carpeta: str, extensiones: Tuple[str, ...] = ('.swift',),
+                 intervalo: float = INTERVALO, espera: float = ESPERA):
+        self.carpeta = carpeta
+        self.extensiones = extensiones
+        self.intervalo = intervalo
+        self.espera = espera
+        self.estados: Dict[str, Estado] = self.escanear()
+
+    def escanear(self) -> Dict[str, Estado]:
+        estados = {}
+        for raiz, carpetas, archivos in os.walk(self.carpeta):
+            carpetas[:] = sorted(c for c in carpetas if not c.startswith('.'))
+            for nombre in archivos:
+                if not nombre.endswith(self.extensiones):
+                    continue
+                ruta = os.path.join(raiz, nombre)
+                try:
+                    e = os.stat(ruta)
+                except OSError:         # se borró entre el listado y el stat
+                    continue
+                estados[ruta] = (e.st_mtime_ns, e.st_size, e.st_ino)
+        return estados
+
+    def cambios(self) -> Tuple[List[str], List[str]]:
+        """(cambiados o nuevos, borrados) desde la revisión anterior."""
+        nuevos = self.escanear()
+        cambiados = [ruta for ruta, estado in nuevos.items() if self.estados.get(ruta) != estado]
+        borrados = [ruta for ruta in self.estados if ruta not in nuevos]
+        self.estados = nuevos
+        return cambiados, borrados
+
+    def pausa(self, costo: float) -> float:
+        """Segundos hasta la próxima revisión si la última tardó `costo`."""
+        return max(self.intervalo, costo * CARGA)
+
+    def rafaga(self, detener: Optional[Callable[[], bool]] = None) -> Optional[Tuple[List[str], List[str]]]:
+        """
+        Espera la próxima ráfaga de cambios y la devuelve como (cambiados,
+        borrados), cada archivo una vez. None si detener() se cumple antes.
+        """
+        antes, ultimo = self.estados, None
+        while True:
+            inicio = time.monotonic()
+            nuevos, idos = self.cambios()
+            ahora = time.monotonic()
+            if nuevos or idos:
+                ultimo = ahora
+            elif ultimo is not None and ahora - ultimo >= self.espera:
+                estados = self.estados
+                cambiados = [ruta for ruta, estado in estados.items() if antes.get(ruta) != estado]
+                borrados = [ruta for ruta in antes if ruta not in estados]
+                if cambiados or borrados:
+                    return sorted(cambiados), sorted(borrados)
+                ultimo = None           # todo volvió a como estaba: no hay nada que entregar
+            if detener is not None and detener():
+                return None
+            time.sleep(self.pausa(ahora - inicio))
+
+    def rafagas(self, detener: Optional[Callable[[], bool]] = None) -> Iterator[Tuple[List[str], List[str]]]:
+        """Las ráfagas de cambios, una tras otra, hasta que detener() se cumpla (o Ctrl+C)."""
+        while True:
+            rafaga = self.rafaga(detener)
+            if rafaga is None:
+                return
+            yield rafaga
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# los analizadores se importan como en sus carpetas (cada uno agrega comun/ por su cuenta)
+CODIGO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for carpeta in ('', 'Aymanarchivos', 'JordanArchivos', 'ArielArchivos'):
+    ruta = os.path.join(CODIGO, carpeta)
+    if ruta not in sys.path:
+        sys.path.append(ruta)
@@ -0,0 +1,53 @@
+import os
+
+from comun import cache_resultados
+from comun.cache_resultados import CacheResultados
+from comun.plazo import ResultadoAnalisis
+
+
+def _analizar(texto):
+    return ResultadoAnalisis([f"error en {texto.strip()}"], None, None, 1.0)
+
+
+def _archivos(tmp_path, n):
+    rutas = []
+    for i in range(n):
+        ruta = tmp_path / f"a{i}.txt"
+        ruta.write_text(f"archivo {i} " + "x" * 200 + "\n")
+        rutas.append(str(ruta))
+    return rutas
+
+
+def test_ayman_guarda_errores_lexicos(tmp_path):
+    import analizador_swift
+    ruta = tmp_path / "lexico.swift"
+    ruta.write_text('let x = 1 @\nprint(x)\n')
+    cache = analizador_swift.cache_resultados(str(tmp_path / "cache"))
+    primero = analizador_swift.analizar_ruta(str(ruta), cache)
+    segundo = analizador_swift.analizar_ruta(str(ruta), cache)
+    assert cache.estadisticas.aciertos == 1
+    assert primero.errores == segundo.errores == ["[LEX ERROR] Caracter ilegal: '@' en linea 1"]
+
+
+def test_guardar_no_recorre_la_carpeta(tmp_path, monkeypatch):
+    cache = CacheResultados(str(tmp_path / "cache"), 'prueba', 'firma')
+    recorridos = []
+    original = cache_resultados.os.scandir
+    monkeypatch.setattr(cache_resultados.os, 'scandir', lambda d: recorridos.append(d) or original(d))
+    for ruta in _archivos(tmp_path, 50):
+        cache.analizar(ruta, _analizar)
+    # uno por carpeta (resultados y rutas) al primer guardar, ninguno después
+    assert len(recorridos) == 2
+    assert cache.estadisticas.guardados == 50
+
+
+def test_desalojo_borra_resultados_y_rutas(tmp_path):
+    cache = CacheResultados(str(tmp_path / "cache"), 'prueba', 'firma', limite_bytes=4000)
+    rutas = _archivos(tmp_path, 60)
+    for ruta in rutas:
+        cache.analizar(ruta, _analizar)
+    assert cache.estadisticas.desalojados > 0
+    assert cache.tamano() <= cache.limite_bytes
+    assert len(os.listdir(cache._rutas)) < len(rutas)
+    # lo desalojado se vuelve a analizar y da lo mismo
+    assert cache.analizar(rutas[0], _analizar).errores == _analizar(open(rutas[0]).read()).errores
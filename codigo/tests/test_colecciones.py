@@ -0,0 +1,86 @@
+import pickle
+from array import array
+
+import pytest
+
+from comun.colecciones import ColeccionLiteral, TablaCadenas, agregar_elemento
+
+
+def literales(coleccion):
+    return list(coleccion.elementos(lambda tipo, valor: (tipo, valor)))
+
+
+# ---------------- tabla de cadenas ----------------
+
+def test_tabla_empaquetada():
+    tabla = TablaCadenas()
+    for cadena in ['a', '', 'ñandú', '😀']:
+        tabla.append(cadena)
+    assert (len(tabla), tabla[2], list(tabla)) == (4, 'ñandú', ['a', '', 'ñandú', '😀'])
+    # agregar despues de leer: lo pendiente se junta al texto en la proxima lectura
+    tabla.append('z')
+    assert (tabla[4], tabla[0], list(tabla)[-2:]) == ('z', 'a', ['😀', 'z'])
+    copia = pickle.loads(pickle.dumps(tabla))
+    assert list(copia) == list(tabla)
+    copia.append('w')
+    assert list(copia)[-1] == 'w' and len(tabla) == 5
+
+
+@pytest.mark.parametrize("valor", [1, None, b'x', ['a']])
+def test_tabla_rechaza_lo_que_no_es_str_sin_romperse(valor):
+    tabla = TablaCadenas()
+    tabla.append('a')
+    with pytest.raises(TypeError):
+        tabla.append(valor)
+    tabla.append('b')
+    assert (len(tabla), list(tabla), tabla[1]) == (2, ['a', 'b'], 'b')
+
+
+# ---------------- buffers tipados ----------------
+
+def test_literales_en_buffers_por_tipo():
+    coleccion = ColeccionLiteral()
+    for tipo, valor in [('Int', 1), ('Int', -2), ('Double', 0.5), ('Bool', True), ('Bool', False),
+                        ('String', 'x'), ('String', 'y'), ('Int', 3)]:
+        assert coleccion.agregar_literal(tipo, valor)
+    assert [(t.tipo, type(t.datos)) for t in coleccion.tramos] == [
+        ('Int', array), ('Double', array), ('Bool', bytearray), ('String', TablaCadenas), ('Int', array)]
+    assert coleccion.solo_literales() and len(coleccion) == 8
+    assert literales(coleccion) == [('Int', 1), ('Int', -2), ('Double', 0.5), ('Bool', True), ('Bool', False),
+                                    ('String', 'x'), ('String', 'y'), ('Int', 3)]
+
+
+@pytest.mark.parametrize("tipo, valor", [
+    ('Int', 2 ** 63),           # no cabe en 64 bits
+    ('Int', 'uno'),
+    ('Double', 'x'),
+    ('String', 5),
+    ('Bool', 'si'),
+])
+def test_literal_que_no_cabe_no_deja_rastro(tipo, valor):
+    coleccion = ColeccionLiteral()
+    coleccion.agregar_literal(tipo, 7 if tipo != 'String' else 's')
+    antes = literales(coleccion)
+    assert not coleccion.agregar_literal(tipo, valor)
+    assert literales(coleccion) == antes and len(coleccion) == 1
+    # en una coleccion vacia tampoco queda un tramo a medias
+    vacia = ColeccionLiteral()
+    assert not vacia.agregar_literal(tipo, valor)
+    assert (vacia.tramos, len(vacia)) == ([], 0)
+
+
+def test_agregar_elemento_cae_al_tramo_generico():
+    coleccion = ColeccionLiteral()
+    agregar_elemento(coleccion, 'nodo-1', ('Int', 1))
+    agregar_elemento(coleccion, 'nodo-grande', ('Int', 2 ** 64))
+    agregar_elemento(coleccion, 'nodo-id', None)
+    agregar_elemento(coleccion, 'nodo-2', ('Int', 2))
+    assert [t.tipo for t in coleccion.tramos] == ['Int', None, 'Int']
+    assert list(coleccion.nodos()) == ['nodo-grande', 'nodo-id']
+    assert literales(coleccion) == [('Int', 1), 'nodo-grande', 'nodo-id', ('Int', 2)]
+    assert list(coleccion.tramos_por_tipo(lambda nodo: 'Int')) == [('Int', 0, 4)]
+    assert coleccion.tipo_en(2, lambda nodo: 'Otro') == 'Otro'
+    # mapear_nodos copia los nodos y comparte los buffers
+    mapeada = coleccion.mapear_nodos(str.upper)
+    assert list(mapeada.nodos()) == ['NODO-GRANDE', 'NODO-ID']
+    assert mapeada.tramos[0] is coleccion.tramos[0]
@@ -0,0 +1,66 @@
+import pytest
+
+
+PROGRAMA = "let a = 1\nlet b = a + 1\nlet c = 2\nlet d = c * 3\nlet b = 4\nlet e = 1 / 0\n"
+
+
+def semanticos(codigo):
+    import analizador_swift
+    resultado = analizador_swift.analyze(codigo)
+    return list(resultado.errores)[len(analizador_swift.lex_errors) + len(analizador_swift.parse_errors):]
+
+
+def motor_de(codigo):
+    import analizador_swift
+    import consultas_ayman
+    return consultas_ayman.nuevo_motor(analizador_swift.analizar(codigo, solo_sintaxis=True))
+
+
+def test_diagnosticos_como_analyze():
+    import consultas_ayman
+    motor = motor_de(PROGRAMA)
+    assert list(consultas_ayman.diagnosticos(motor)) == semanticos(PROGRAMA)
+    assert consultas_ayman.resolve(motor, "b") == "Int"
+    assert consultas_ayman.resolve(motor, "c", posicion=1) is None
+
+
+@pytest.mark.parametrize("linea, nueva", [
+    (0, 'let a = "x"'),
+    (2, 'let c: Int = "s"'),
+    (4, 'print(d)'),
+    (0, 'let print = 1'),
+])
+def test_reemplazar_sentencia_como_analyze(linea, nueva):
+    import analizador_swift
+    import consultas_ayman
+    motor = motor_de(PROGRAMA)
+    consultas_ayman.diagnosticos(motor)
+    lineas = PROGRAMA.split("\n")
+    lineas[linea] = nueva
+    editado = "\n".join(lineas)
+    ast = analizador_swift.analizar(editado, solo_sintaxis=True)
+    consultas_ayman.reemplazar_sentencia(motor, linea, ast[1][linea])
+    assert list(consultas_ayman.diagnosticos(motor)) == semanticos(editado)
+
+
+def test_solo_se_reverifican_los_dependientes():
+    import analizador_swift
+    import consultas_ayman
+    motor = motor_de(PROGRAMA)
+    consultas_ayman.diagnosticos(motor)
+    antes = motor["verificaciones"]
+    editado = PROGRAMA.replace("let c = 2", 'let c = "dos"')
+    consultas_ayman.actualizar(motor, analizador_swift.analizar(editado, solo_sintaxis=True))
+    assert list(consultas_ayman.diagnosticos(motor)) == semanticos(editado)
+    # la sentencia editada y `let d = c * 3`, nada mas
+    assert motor["verificaciones"] - antes == 2
+
+
+def test_actualizar_con_lineas_insertadas():
+    import analizador_swift
+    import consultas_ayman
+    motor = motor_de(PROGRAMA)
+    consultas_ayman.diagnosticos(motor)
+    editado = "let z = a\n" + PROGRAMA
+    consultas_ayman.actualizar(motor, analizador_swift.analizar(editado, solo_sintaxis=True))
+    assert list(consultas_ayman.diagnosticos(motor)) == semanticos(editado)
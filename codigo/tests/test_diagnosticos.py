@@ -0,0 +1,54 @@
+from comun.diagnosticos import ListaDiagnosticos, MAX_UBICACIONES, apariciones
+
+
+MENSAJES = {'SIN001': "Linea {linea}: token '{valor}' inesperado (tipo: {tipo})"}
+
+
+# ---------------- repetidos ----------------
+# mismo codigo y argumentos: una sola entrada con el total y las primeras ubicaciones;
+# el texto dice cuantas mas hay, asi no se pierde ninguna
+
+def test_mismo_error_en_lineas_distintas_se_agrupa_con_sus_lineas():
+    lista = ListaDiagnosticos('sintactico', MENSAJES)
+    lista.reportar('SIN001', 3, valor=')', tipo='RPAREN')
+    lista.reportar('SIN001', 7, valor=')', tipo='RPAREN')
+    assert list(lista) == ["Linea 3: token ')' inesperado (tipo: RPAREN) (se repite 2 veces; líneas 3, 7)"]
+    assert len(lista) == 1
+    assert lista.total == apariciones(lista) == 2
+
+
+def test_tope_de_ubicaciones_configurable():
+    lista = ListaDiagnosticos('sintactico', MENSAJES, max_ubicaciones=2)
+    for linea in range(1, 11):
+        lista.reportar('SIN001', linea, valor=')', tipo='RPAREN')
+    assert list(lista) == ["Linea 1: token ')' inesperado (tipo: RPAREN) (se repite 10 veces; líneas 1, 2 y 8 más)"]
+    por_omision = ListaDiagnosticos('sintactico', MENSAJES)
+    for linea in range(1, 11):
+        por_omision.reportar('SIN001', linea, valor=')', tipo='RPAREN')
+    assert por_omision.diagnosticos()[0].lineas == list(range(1, MAX_UBICACIONES + 1))
+
+
+def test_argumentos_distintos_no_se_agrupan():
+    lista = ListaDiagnosticos('sintactico', MENSAJES)
+    lista.reportar('SIN001', 3, valor=')', tipo='RPAREN')
+    lista.reportar('SIN001', 3, valor='}', tipo='RBRACE')
+    assert len(lista) == 2
+
+
+def test_extend_suma_conteos_y_ubicaciones():
+    primera = ListaDiagnosticos('sintactico', MENSAJES)
+    primera.reportar('SIN001', 3, valor=')', tipo='RPAREN')
+    segunda = ListaDiagnosticos('sintactico', MENSAJES)
+    segunda.reportar('SIN001', 5, valor=')', tipo='RPAREN')
+    segunda.reportar('SIN001', 9, valor=')', tipo='RPAREN')
+    primera.extend(segunda, publicar=False)
+    [entrada] = primera.diagnosticos()
+    assert (entrada.veces, entrada.lineas) == (3, [3, 5, 9])
+    assert apariciones(primera, ["suelto"]) == 4
+
+
+def test_jordan_no_pierde_errores_de_sintaxis_repetidos():
+    import sintactico_jordan
+    sintactico_jordan.parsear('var x = = 1;\nvar y = 2;\nvar z = = 3;\n')
+    lineas = [linea for d in sintactico_jordan.syntax_errors.diagnosticos() if d.codigo == 'SIN001' for linea in d.lineas]
+    assert 1 in lineas and 3 in lineas
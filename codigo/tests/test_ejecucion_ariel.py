@@ -0,0 +1,112 @@
+import contextlib
+import io
+import random
+
+import pytest
+
+
+def ejecutar(codigo):
+    """(salida, error) del motor compilado y del InterpreteArbol; el programa no debe tener errores de analisis."""
+    import analizadorSintactico
+    import motorEjecucion
+    with contextlib.redirect_stdout(io.StringIO()):
+        resultado = analizadorSintactico.analyze(codigo)
+    assert list(resultado.errores) == []
+    tipos = motorEjecucion.tipos_de(resultado.ast)
+    motores = {'compilado': lambda salida: motorEjecucion.compilar(resultado.ast, tipos, salida).ejecutar(),
+               'arbol': lambda salida: motorEjecucion.InterpreteArbol(tipos, salida).ejecutar(resultado.ast)}
+    corridas = {}
+    for nombre, correr in motores.items():
+        salida, error = [], None
+        try:
+            correr(salida.append)
+        except motorEjecucion.ErrorEjecucion as e:
+            error = str(e)
+        corridas[nombre] = (salida, error)
+    return corridas
+
+
+# ---------------- mismo resultado en los dos motores ----------------
+
+CASOS = {
+    'recursion': ("""
+func fib(n: Int) -> Int { if (n < 2) { return n; } return fib(n - 1) + fib(n - 2); }
+func par(n: Int) -> Bool { if (n == 0) { return true; } return impar(n - 1); }
+func impar(n: Int) -> Bool { if (n == 0) { return false; } return par(n - 1); }
+print(fib(15), par(10), impar(7), par(7));
+""", ['610 true true false']),
+    'parametros_por_omision': ("""
+var total: Int = 0;
+func paso(a: Int, b: Double = 1.5, c: Int = 2) -> Double { total = total + 1; return a * b + c; }
+print(paso(2), paso(2, 3), paso(2, 0.5, 10), total);
+""", ['5.0 8.0 11.0 3']),
+    'conversion_int_double': ("""
+var d: Double = 3;
+d = d + 1;
+var e: Int = 2.9;
+e = e + 0.7;
+func mitad(x: Double) -> Int { return x / 2; }
+print(d, e, mitad(7), Double(3) / 2, Int(7.9), Int(-7.9), 1 + 2.5, 7 / 2.0);
+var sin_valor: Double;
+var n: Int;
+print(sin_valor, n);
+""", ['4.0 2 3 1.5 7 -7 3.5 3.5', '0.0 0']),
+    'division_y_resto_truncan': ("""
+print(7 / 2, -7 / 2, 7 / -2, -7 / -2);
+print(7 % 3, -7 % 3, 7 % -3, -7 % -3);
+print(7.5 / 2.0, -7.5 % 2.0, 7.5 % -2.0);
+""", ['3 -3 -3 3', '1 -1 1 -1', '3.75 -1.5 1.5']),
+    'sombreado': ("""
+var x = 1;
+if (x == 1) { var x = 2; print(x); if (x == 2) { var x = "tres"; print(x); } print(x); }
+print(x);
+func f(x: Int) -> Int { var y = x * 10; while (y > 15) { var x = y; y = y - x + 5; } return x + y; }
+print(f(3), x);
+func g() -> Int { var x = 100; return x; }
+print(g(), x);
+""", ['2', 'tres', '2', '1', '8 1', '100 1']),
+    'clases': ("""
+class Punto { var x: Int = 1; var y: Int = x + 1; var nombre: String = "p"; }
+let p = Punto(5);
+let q = Punto();
+print(p.x, p.y, p.nombre, q.x, q.y);
+print(p);
+""", ['5 6 p 1 2', 'Punto(x: 5, y: 6, nombre: "p")']),
+}
+
+
+@pytest.mark.parametrize("nombre", list(CASOS))
+def test_compilado_como_interprete(nombre):
+    codigo, esperado = CASOS[nombre]
+    corridas = ejecutar(codigo)
+    assert corridas['compilado'] == corridas['arbol'] == (esperado, None)
+
+
+def test_error_de_ejecucion_igual_en_los_dos():
+    corridas = ejecutar("var z = 0;\nprint(1);\nprint(10 / z);\nprint(2);\n")
+    assert corridas['compilado'] == corridas['arbol'] == (['1'], "❌ Línea 3: división entera entre cero")
+
+
+# ---------------- expresiones al azar ----------------
+# Int y Double mezclados, con / y % (tambien de negativos); cada expresion es un programa aparte
+# para que un error de ejecucion (division entre cero) no corte las que siguen
+
+def expresion(azar, profundidad):
+    if profundidad == 0 or azar.random() < 0.3:
+        return azar.choice(['i', 'j', 'x', 'y', str(azar.randint(1, 9)), str(-azar.randint(1, 9)),
+                            '%d.%d' % (azar.randint(0, 9), azar.randint(1, 9))])
+    operador = azar.choice(['+', '-', '*', '/', '%'])
+    return '(%s %s %s)' % (expresion(azar, profundidad - 1), operador, expresion(azar, profundidad - 1))
+
+
+@pytest.mark.parametrize("semilla", [1, 2, 3])
+def test_expresiones_al_azar(semilla):
+    azar = random.Random(semilla)
+    variables = "var i: Int = -7;\nvar j = 3;\nvar x: Double = 2.5;\nvar y = -0.75;\n"
+    sin_error = 0
+    for _ in range(40):
+        destino = azar.choice(['var r: Int = ', 'var r: Double = ', 'var r = '])
+        corridas = ejecutar(variables + destino + expresion(azar, 3) + ";\nprint(r);\n")
+        assert corridas['compilado'] == corridas['arbol']
+        sin_error += corridas['arbol'][1] is None
+    assert sin_error > 30
@@ -0,0 +1,60 @@
+import io
+
+import pytest
+
+
+# ---------------- errores lexicos ----------------
+# el lexer salta el caracter y el parse sigue, pero el programa no se compila ni se acepta en la sesion
+
+@pytest.mark.parametrize("codigo, error", [
+    ('let x = 1 @\nprint(x)\n', "[LEX ERROR] Caracter ilegal: '@' en linea 1"),
+    ('let x = 1\nlet s = "abc\n', "[LEX ERROR] Cadena sin cerrar en linea 2"),
+])
+def test_analyze_trae_errores_lexicos(codigo, error):
+    import analizador_swift
+    assert analizador_swift.analyze(codigo).errores == [error]
+
+
+def test_no_compila_con_errores_lexicos(tmp_path):
+    import analizador_swift
+    programa, errores = analizador_swift.compilar_programa('let x = 1 @\nprint(x)\n', carpeta=str(tmp_path))
+    assert programa is None
+    assert errores == ["[LEX ERROR] Caracter ilegal: '@' en linea 1"]
+    assert not list(tmp_path.iterdir())
+
+
+def test_compila_y_ejecuta_sin_errores():
+    import analizador_swift
+    import transpilador_ayman
+    programa, errores = analizador_swift.compilar_programa('let x = 1 + 2\nprint(x)\n', carpeta=None)
+    assert errores == []
+    salida = io.StringIO()
+    transpilador_ayman.ejecutar(programa, salida=salida)
+    assert salida.getvalue() == "3\n"
+
+
+def test_repl_no_acepta_entradas_con_errores_lexicos():
+    import analizador_swift
+    sesion = analizador_swift.nueva_sesion()
+    resultado = analizador_swift.evaluar_entrada(sesion, 'let x = 1 @\n', completa=True)
+    assert resultado.errores == ["[LEX ERROR] Caracter ilegal: '@' en linea 1"]
+    assert sesion["historial"] == []
+    assert 'x' not in dict(analizador_swift.tabla_simbolos["scopes"][0].items())
+
+
+# ---------------- repl ----------------
+
+def test_repl_deshace_una_entrada_que_falla_al_verificar():
+    import analizador_swift
+    sesion = analizador_swift.nueva_sesion()
+    analizador_swift.evaluar_entrada(sesion, 'let a = 1\n', completa=True)
+    anidado = 'let b = 2\nlet c = ' + '[' * 2000 + '1' + ']' * 2000 + '\n'
+    resultado = analizador_swift.evaluar_entrada(sesion, anidado, completa=True)
+    assert len(resultado.errores) == 1 and 'RecursionError' in resultado.errores[0]
+    global_ = analizador_swift.tabla_simbolos["scopes"]
+    assert len(global_) == 1
+    assert [nombre for nombre, _ in global_[0].items()] == ['print', 'readLine', 'a']
+    assert [codigo for codigo, _ in sesion["historial"]] == ['let a = 1\n']
+    # la sesion sigue
+    resultado = analizador_swift.evaluar_entrada(sesion, 'let d = a + 1\n', completa=True)
+    assert resultado.errores == []
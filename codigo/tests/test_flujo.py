@@ -0,0 +1,63 @@
+import contextlib
+import io
+import threading
+
+import pytest
+
+from comun.flujo import GramaticaOcupada
+
+
+def gramaticas():
+    import analizadorSintactico
+    with contextlib.redirect_stdout(io.StringIO()):
+        import analizador_swift
+        import semantico_jordan
+        import sintactico_jordan
+    return {
+        'ariel': (analizadorSintactico.analizar_en_flujo, analizadorSintactico.analyze, "var v{i} = {i};\n", "var w = ;"),
+        'ayman': (analizador_swift.analizar_en_flujo, analizador_swift.analyze, "let v{i} = {i}\n", "var w = "),
+        'jordan': (sintactico_jordan.parsear_en_flujo, semantico_jordan.analyze, "var v{i} = {i};\n", "var w = ;"),
+    }
+
+
+def programa(plantilla, n=2000):
+    return "".join(plantilla.format(i=i) for i in range(n))
+
+
+# ---------------- reentrada ----------------
+# el parser de cada gramatica es global: volver a analizar mientras se consume
+# un flujo de la misma gramatica falla en vez de pisar el parse a medias
+
+@pytest.mark.parametrize("nombre", ['ariel', 'ayman', 'jordan'])
+def test_analizar_entre_dos_next_falla(nombre):
+    en_flujo, analyze, plantilla, roto = gramaticas()[nombre]
+    with pytest.raises(GramaticaOcupada), contextlib.closing(en_flujo(programa(plantilla))) as flujo:
+        for i, _ in enumerate(flujo):
+            if i and i % 200 == 0:
+                analyze(roto)
+    # cerrado el generador, la gramatica vuelve a estar libre
+    assert analyze(roto).errores
+    assert sum(1 for _ in en_flujo(programa(plantilla))) == 2000
+
+
+@pytest.mark.parametrize("nombre", ['ariel', 'ayman', 'jordan'])
+def test_analizar_desde_el_callback_falla(nombre):
+    en_flujo, analyze, plantilla, roto = gramaticas()[nombre]
+    with pytest.raises(GramaticaOcupada):
+        en_flujo(programa(plantilla, 10), lambda sentencia: analyze(roto))
+
+
+@pytest.mark.parametrize("nombre", ['ariel', 'ayman', 'jordan'])
+def test_otro_hilo_espera_al_flujo(nombre):
+    en_flujo, analyze, plantilla, roto = gramaticas()[nombre]
+    esperado = list(analyze(roto).errores)
+    resultados = []
+    otros = []
+    for i, _ in enumerate(en_flujo(programa(plantilla))):
+        if i % 200 == 0:
+            hilo = threading.Thread(target=lambda: resultados.append(list(analyze(roto).errores)))
+            hilo.start()
+            otros.append(hilo)
+    for hilo in otros:
+        hilo.join()
+    assert resultados == [esperado] * 10
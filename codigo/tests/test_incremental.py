@@ -0,0 +1,150 @@
+import random
+import time
+
+import pytest
+
+from comun.incremental import _BLANCOS
+
+
+# ---------------- trozos en blanco ----------------
+# solo espacios y comentarios; un `/*` dentro de un `//` no abre un comentario de bloque
+
+@pytest.mark.parametrize("texto, blanco", [
+    ('', True),
+    ('  \n\t', True),
+    ('// a\n/* b\n c */\n', True),
+    ('/* a */ // b */', True),
+    (' // /* b\n24 */\n', False),
+    ('/* a */ x', False),
+    ('/* sin cerrar', False),
+])
+def test_blancos(texto, blanco):
+    assert bool(_BLANCOS.fullmatch(texto)) is blanco
+
+
+def test_blancos_sin_retroceso():
+    inicio = time.perf_counter()
+    assert not _BLANCOS.fullmatch(' ' * 5000 + 'x')
+    assert not _BLANCOS.fullmatch('// a\n' * 2000 + 'x')
+    assert time.perf_counter() - inicio < 1
+
+
+# ---------------- ediciones al azar ----------------
+# despues de cada edicion, el reparseo incremental da lo mismo que el parseo completo
+# (lineas incluidas: los trozos que siguen a una edicion con saltos de linea se mueven sin recorrerlos)
+
+SUELTAS = ['', '// c', '/* x', '*/', 'var q = 1 / 0;', 'var q: Int = "s";', 'x = 2;', 'y = zz + 1;', '}', '{',
+           'if (a) {', 'else { x = 1; }', 'let k = -5;', 'var w = 1 + 2 + 3 + total;', 'var n = -(4) * 2 + 1 + 2;',
+           'func g(a: Int) -> Int { return a; }', 'let t = 1; /* c */', '    ' * 4]
+
+
+def editar(texto, azar):
+    lineas = texto.split('\n')
+    r = azar.random()
+    if r < 0.3 and len(lineas) > 1:
+        del lineas[azar.randrange(len(lineas))]
+    elif r < 0.5:
+        i = azar.randrange(len(lineas))
+        lineas.insert(i, lineas[i])
+    else:
+        lineas.insert(azar.randrange(len(lineas) + 1), azar.choice(SUELTAS))
+    return '\n'.join(lineas)
+
+
+def forma(x):
+    """El arbol como tuplas, con la linea de cada nodo (anclado o no)."""
+    from analizadorSemantico import Nodo, OperacionNaria
+    from comun.colecciones import ColeccionLiteral
+    if isinstance(x, Nodo):
+        campos = {k: v for k, v in vars(x).items() if k not in ('linea', 'ancla', 'desde_ancla')}
+        lineas = x.lineas if isinstance(x, OperacionNaria) else None
+        return (type(x).__name__, x.linea, lineas, tuple((k, forma(campos[k])) for k in sorted(campos)))
+    if isinstance(x, (list, tuple)):
+        return tuple(forma(v) for v in x)
+    if isinstance(x, ColeccionLiteral):
+        return tuple(forma(e) for e in x.elementos(lambda tipo, valor: (tipo, valor)))
+    return x
+
+
+def ediciones(base, semilla, pasos=120):
+    """Textos editados al azar; cada edicion parte de uno de los ultimos textos sin errores."""
+    azar = random.Random(semilla)
+    buenos = [base]
+    for _ in range(pasos):
+        texto = editar(azar.choice(buenos[-3:]), azar)
+        sin_errores = yield texto
+        if sin_errores: buenos.append(texto)
+
+
+@pytest.mark.parametrize("semilla", [1, 2])
+def test_ariel_reparsear_como_parse_completo(semilla):
+    import analizadorSintactico as ariel
+    from comun.benchmarks import programa_ariel
+    incremental = ariel.parser_incremental()
+    textos = ediciones(programa_ariel(60), semilla)
+    texto = next(textos)
+    try:
+        while True:
+            programa = ariel.reparsear(incremental, texto)
+            errores = list(ariel.errores_lexicos) + list(ariel.errores_sintacticos)
+            ariel.errores_lexicos.clear()
+            ariel.errores_sintacticos.clear()
+            ariel.analizador_lexico.lineno = 1
+            completo = ariel.analizador_sintactico.parse(texto, lexer=ariel.analizador_lexico)
+            ariel.tokens_reconocidos.clear()
+            assert list(ariel.errores_lexicos) + list(ariel.errores_sintacticos) == errores
+            assert forma(programa) == forma(completo)
+            texto = textos.send(not errores)
+    except StopIteration:
+        pass
+
+
+@pytest.mark.parametrize("semilla", [3, 4])
+def test_ariel_analizar_incremental_como_analyze(semilla):
+    import analizadorSintactico as ariel
+    from comun.benchmarks import programa_ariel
+    incremental = ariel.parser_incremental()
+    textos = ediciones(programa_ariel(60), semilla)
+    texto = next(textos)
+    try:
+        while True:
+            # el plegado cambia los arboles que el incremental reutiliza: se comparan ya plegados
+            resultado = ariel.analizar_incremental(incremental, texto)
+            completo = ariel.analyze(texto)
+            assert list(resultado.errores) == list(completo.errores)
+            assert forma(resultado.ast) == forma(completo.ast)
+            texto = textos.send(not ariel.errores_lexicos and not ariel.errores_sintacticos)
+    except StopIteration:
+        pass
+
+
+@pytest.mark.parametrize("semilla", [5, 6])
+def test_jordan_reparsear_como_parsear(semilla):
+    import sintactico_jordan as jordan
+    from comun.benchmarks import programa_jordan
+    incremental = jordan.parser_incremental()
+    textos = ediciones(programa_jordan(60), semilla)
+    texto = next(textos)
+    try:
+        while True:
+            programa = jordan.reparsear(incremental, texto)
+            errores = list(jordan.syntax_errors) + list(jordan.plegado_errors)
+            assert programa == jordan.parsear(texto)
+            assert list(jordan.syntax_errors) + list(jordan.plegado_errors) == errores
+            texto = textos.send(not jordan.syntax_errors)
+    except StopIteration:
+        pass
+
+
+def test_mover_trozos_no_recorre_sus_nodos():
+    import analizadorSintactico as ariel
+    from comun.benchmarks import programa_ariel
+    codigo = programa_ariel(400)
+    incremental = ariel.parser_incremental()
+    ariel.reparsear(incremental, codigo)
+    ultima = incremental.sentencias[-1]
+    antes = ultima.linea
+    ariel.reparsear(incremental, "\n\n" + codigo)
+    assert incremental.parseados <= 1
+    assert ultima.linea == antes + 2
+    assert 'linea' not in vars(ultima)        # la linea sale del trozo, el nodo no se toco
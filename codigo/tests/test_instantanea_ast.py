@@ -0,0 +1,169 @@
+import contextlib
+import io
+from array import array
+
+import pytest
+
+from comun.colecciones import ColeccionLiteral, TablaCadenas, Tramo
+from comun.incremental import sin_ancla
+from comun.instantanea_ast import VistaNodo, VistaSecuencia, cargar, guardar, leer, serializar
+
+ARIEL = """var total: Int = 0;
+let escala = -3.25;
+var nombres = ("año", "b\\n", "", "😀", escala);
+var mezcla = (1, 2, 3, total, 2.5, true, false);
+func paso(a: Int, b: Double = 1.0) -> Int {
+    var acumulado = a * 2 + total + 1 + 2;
+    while (acumulado > 0) { acumulado = acumulado - 1; }
+    if (!(acumulado == 3) && true) { total = total % 7; } else { total = -total; }
+    return acumulado;
+}
+let grande = 9223372036854775807;
+let r = paso(4, 2.0) / 2;
+"""
+
+AYMAN = """let a: Int = 1
+let b = [1, 2, 3]
+let c = ["x": 1, "y": 2, "z": a]
+let d = [true, false, a > 0]
+let e = "ñandú" + "\\t"
+for i in 0...10 { let w = a * i - 40000000000 }
+let f = a + 2 * (3 - a % 4)
+"""
+
+JORDAN = """var a = 1 + 2 * 3;
+var b = [1, 2, a, "s", 2.5];
+var c = [[1, 2], [3.5, -4.0], ["x", "ñ"]];
+func f(x: Int) { return x + a; }
+if (a > 2) { var d = -a; } else { var d = a / 0; }
+var e = 18446744073709551616;
+"""
+
+
+def forma(x):
+    """El arbol como tuplas: clase, campos (linea absoluta si el nodo esta anclado), buffers con su tipo."""
+    if isinstance(x, ColeccionLiteral):
+        return ('coleccion', x.total, tuple(forma(t) for t in x.tramos))
+    if isinstance(x, Tramo):
+        return ('tramo', x.tipo, forma(x.datos))
+    if isinstance(x, TablaCadenas):
+        return ('tabla', tuple(x))
+    if isinstance(x, (array, bytearray)):
+        return (type(x).__name__, getattr(x, 'typecode', None), tuple(x))
+    if isinstance(x, (list, tuple)):
+        return (type(x).__name__, tuple(forma(v) for v in x))
+    if hasattr(x, '__dict__'):
+        campos = vars(x)
+        if 'ancla' in campos: campos = sin_ancla(campos)
+        return (type(x).__name__, tuple((k, forma(campos[k])) for k in sorted(campos)))
+    return (type(x).__name__, x)
+
+
+def forma_perezosa(x):
+    """forma() recorriendo las vistas, sin materializarlas."""
+    if isinstance(x, VistaSecuencia):
+        return ('tuple' if x.es_tupla else 'list', tuple(forma_perezosa(v) for v in x))
+    if isinstance(x, VistaNodo):
+        return (x.clase, tuple((k, forma_perezosa(getattr(x, k))) for k in sorted(x.campos)))
+    return forma(x)
+
+
+def ida_y_vuelta(ast, clases=None):
+    datos = serializar(ast)
+    esperado = forma(ast)
+    assert forma(cargar(datos, clases)) == esperado
+    assert forma(cargar(memoryview(datos), clases)) == esperado
+    perezoso = cargar(datos, clases, perezoso=True)
+    assert forma_perezosa(perezoso) == esperado
+    assert forma(perezoso.materializar()) == esperado
+    return datos
+
+
+def colecciones(x):
+    """Cuantas ColeccionLiteral hay en el arbol (para no probar un arbol sin ellas)."""
+    if isinstance(x, ColeccionLiteral):
+        return 1 + sum(colecciones(v) for t in x.tramos if t.tipo is None for v in t.datos)
+    if isinstance(x, (list, tuple)):
+        return sum(colecciones(v) for v in x)
+    if hasattr(x, '__dict__'):
+        return sum(colecciones(v) for v in vars(x).values())
+    return 0
+
+
+def parsear_ariel(codigo):
+    import analizadorSintactico
+    analizadorSintactico.errores_sintacticos.clear()
+    analizadorSintactico.analizador_lexico.lineno = 1
+    return analizadorSintactico.analizador_sintactico.parse(codigo, lexer=analizadorSintactico.analizador_lexico)
+
+
+# ---------------- ida y vuelta ----------------
+
+def test_ariel():
+    import analizadorSintactico
+    from plegadoConstantes import PlegadorConstantes
+    sin_plegar = parsear_ariel(ARIEL)
+    assert not analizadorSintactico.errores_sintacticos
+    assert colecciones(sin_plegar) >= 2
+    ida_y_vuelta(sin_plegar, analizadorSintactico.CLASES_AST)
+    plegado = PlegadorConstantes().plegar_programa(parsear_ariel(ARIEL))
+    ida_y_vuelta(plegado, analizadorSintactico.CLASES_AST)
+
+
+def test_ariel_nodos_anclados_se_guardan_con_su_linea():
+    import analizadorSintactico
+    incremental = analizadorSintactico.parser_incremental()
+    analizadorSintactico.reparsear(incremental, ARIEL)
+    editado = "// dos\n// lineas\n" + ARIEL
+    anclado = analizadorSintactico.reparsear(incremental, editado)
+    assert any('ancla' in vars(s) for s in anclado.sentencias)
+    datos = ida_y_vuelta(anclado, analizadorSintactico.CLASES_AST)
+    # igual que la instantanea del parseo completo, sin rastro de los trozos
+    assert datos == serializar(parsear_ariel(editado))
+    assert not any('ancla' in vars(s) for s in cargar(datos, analizadorSintactico.CLASES_AST).sentencias)
+
+
+def test_ayman():
+    with contextlib.redirect_stdout(io.StringIO()):
+        import analizador_swift
+    ast = analizador_swift.analizar(AYMAN, solo_sintaxis=True)
+    assert not analizador_swift.parse_errors
+    assert colecciones(ast) >= 2
+    ida_y_vuelta(ast)
+    ida_y_vuelta(analizador_swift.plegar_programa(ast))
+
+
+def test_jordan(tmp_path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        import sintactico_jordan
+    ast = sintactico_jordan.parsear(JORDAN)
+    assert not sintactico_jordan.syntax_errors
+    assert colecciones(ast) >= 4
+    ida_y_vuelta(ast)
+    guardar(str(tmp_path / 'jordan.ast'), ast)
+    assert forma(leer(str(tmp_path / 'jordan.ast'))) == forma(ast)
+    assert forma_perezosa(leer(str(tmp_path / 'jordan.ast'), perezoso=True)) == forma(ast)
+
+
+# ---------------- colecciones ----------------
+# cada tramo vuelve con el mismo tipo de buffer
+
+def test_buffers_de_colecciones():
+    coleccion = ColeccionLiteral()
+    for tipo, valor in [('Int', 1), ('Int', -2 ** 63), ('Double', 0.1), ('Bool', True), ('Bool', False),
+                        ('String', 'a'), ('String', ''), ('String', '\udcff'), ('Int', 7)]:
+        assert coleccion.agregar_literal(tipo, valor)
+    assert not coleccion.agregar_literal('Int', 2 ** 64)
+    coleccion.agregar_nodo(('id', 'x'))
+    interna = ColeccionLiteral()
+    interna.agregar_literal('Double', float('inf'))
+    coleccion.agregar_nodo(interna)
+    arbol = ('program', [coleccion, ColeccionLiteral(), (None, 0, -1, 2 ** 70 - 1, bytearray(b'\x00\xff'))])
+    ida_y_vuelta(arbol)
+    cargada = cargar(serializar(arbol))[1][0]
+    assert [type(t.datos) for t in cargada.tramos] == [array, array, bytearray, TablaCadenas, array, list]
+
+
+def test_valor_desconocido():
+    with pytest.raises(TypeError):
+        serializar(('program', [{'a': 1}]))
@@ -0,0 +1,95 @@
+import contextlib
+import io
+
+import pytest
+
+
+def lexers():
+    import analizadorLexicoArielAAT123
+    with contextlib.redirect_stdout(io.StringIO()):
+        import analizador_swift
+        import sintactico_jordan
+    return {'ariel': analizadorLexicoArielAAT123.analizador_lexico, 'ayman': analizador_swift.lexer,
+            'jordan': sintactico_jordan.lexer}
+
+
+# ---------------- resguardo ----------------
+# los caracteres ilegales los toma la ultima regla de funcion: t_error (que copia el resto
+# de la entrada) no se llama, y los tokens que empiezan igual se siguen reconociendo
+
+@pytest.mark.parametrize("nombre, texto, tipos", [
+    ('ariel', 'a ¤ && b & | || c\r', ['IDENTIFICADOR', 'AND', 'IDENTIFICADOR', 'OR', 'IDENTIFICADOR']),
+    ('ayman', 'a ¤ && b & | || 1...2 . c', ['ID', 'AND', 'ID', 'OR', 'INTEGER', 'DOTDOTDOT', 'INTEGER', 'ID']),
+    ('jordan', 'a ¤ && b & | || c . ? $', ['ID', 'AND', 'ID', 'OR', 'ID', 'DOT', 'QUESTION']),
+])
+def test_caracteres_ilegales_sin_t_error(nombre, texto, tipos):
+    lexer = lexers()[nombre].clone()
+
+    def t_error(t):
+        raise AssertionError(f"t_error con {t.value[:1]!r}")
+
+    lexer.lexerrorf = t_error
+    lexer.lineno = 1
+    lexer.input(texto)
+    assert [t.type for t in iter(lexer.token, None)] == tipos
+
+
+# ---------------- codigos ----------------
+# cada codigo significa lo mismo en los tres analizadores
+
+def test_ayman_caracter_sin_cerrar_no_es_lex003():
+    import analizador_swift
+    analizador_swift.analyze("let c = 'a\n")
+    assert [d.codigo for d in analizador_swift.lex_errors.diagnosticos()] == ['LEX004']
+
+
+def test_ariel_comentario_sin_cerrar_es_lex003():
+    import analizadorSintactico
+    analizadorSintactico.analyze("var x = 1; /* sin cierre\n")
+    assert [d.codigo for d in analizadorSintactico.errores_lexicos.diagnosticos()] == ['LEX003']
+
+
+# ---------------- pasada unificada ----------------
+# analyze(codigo, pasada=lexear(codigo)) da los mismos diagnosticos lexicos (y errores) que el lexer propio
+
+def analizadores():
+    import analizadorSintactico
+    with contextlib.redirect_stdout(io.StringIO()):
+        import analizador_swift
+        import semantico_jordan
+    return {'ariel': analizadorSintactico.analyze, 'ayman': analizador_swift.analyze, 'jordan': semantico_jordan.analyze}
+
+
+def lexicos(analyze, codigo, **opciones):
+    """(diagnosticos lexicos publicados, errores del resultado) de un analisis."""
+    from comun.diagnosticos import canal
+    publicados = []
+    baja = canal.suscribir(publicados.append)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            resultado = analyze(codigo, **opciones)
+    finally:
+        baja()
+    return ([(d.codigo, d.linea, d.columna, d.mensaje) for d in publicados if d.fase == 'lexico'],
+            list(resultado.errores))
+
+
+@pytest.mark.parametrize("nombre", ['ariel', 'ayman', 'jordan'])
+@pytest.mark.parametrize("codigo", [
+    'var a = 1...3;\nlet b = a ..< 4;\n',
+    'var x = 1;\nx += 2;\nx -= 1; x *= 3; x /= 2;\n',
+    'let s = "abc\nvar t = 2;\n',
+    'var u = "a\\"b\nvar v = "\\\\";\n',
+    "let c = 'a\nlet d = 'ab';\n",
+    'var c = ¤ 1 $ @;\nvar d = 2 # 3;\n',
+    '/* abierto\nvar x = 1;\n',
+    'var y = 2; // comentario "sin cerrar\n/* cerrado */ var z = 1.5.2;\n',
+    'a -> b ... c .. d . e ? f\n',
+])
+def test_pasada_unificada_como_lexer_propio(nombre, codigo):
+    from comun.lexico_unificado import lexear
+    analyze = analizadores()[nombre]
+    propio = lexicos(analyze, codigo)
+    assert lexicos(analyze, codigo, pasada=lexear(codigo)) == propio
+    if '¤' in codigo or 'abc\n' in codigo:
+        assert propio[0]            # los tres reportan algo: que la comparacion no sea entre listas vacias
@@ -0,0 +1,119 @@
+import pytest
+
+from comun.diagnosticos import ListaDiagnosticos, por_linea
+
+
+# ---------------- texto mezclado con otros tipos ----------------
+# el plegado no los toca (lo reporta el semantico, si lo mira) y no debe romperse
+
+@pytest.mark.parametrize("codigo", [
+    'var x = "a" * 2;\n',
+    'var y = "a" == 1;\n',
+    'var z = 1 + "a";\n',
+    'var w = "a\\n" < 2;\n',
+])
+def test_jordan_texto_con_entero(codigo):
+    import semantico_jordan
+    import sintactico_jordan
+    resultado = semantico_jordan.analyze(codigo)
+    assert not resultado.parcial
+    declaracion = sintactico_jordan.parsear(codigo)[1][0]
+    assert declaracion[-1][0] == 'binop'       # quedo sin plegar
+
+
+@pytest.mark.parametrize("codigo", [
+    'let x = "a" == 1\n',
+    'let x = 1 != "a"\n',
+    'let x = "a\\n" == 2\n',
+])
+def test_ayman_comparacion_texto_con_entero(codigo):
+    import analizador_swift
+    resultado = analizador_swift.analyze(codigo)
+    assert not resultado.parcial
+    assert resultado.ast[1][0][3][0] == 'cmp'
+
+
+def test_ayman_suma_texto_con_entero_es_error_semantico():
+    import analizador_swift
+    resultado = analizador_swift.analyze('let x = "a" + 1\n')
+    assert resultado.errores == ['[SEM ERROR] Tipos incompatibles: String + Int']
+
+
+def test_ayman_mismo_tipo_se_sigue_plegando():
+    import analizador_swift
+    resultado = analizador_swift.analyze('let x = "a" == "a"\n')
+    assert resultado.errores == []
+    assert resultado.ast[1][0][3] == ('literal', 'Bool', True)
+
+
+# ---------------- orden de los errores ----------------
+
+def test_por_linea_intercala_plegado_y_semantico():
+    plegado = ListaDiagnosticos('plegado', {'PLG001': "Línea {linea}: división entre cero."})
+    semantico = ListaDiagnosticos('semantico', {'SEM003': "Línea {linea}: '{nombre}' no declarada."})
+    plegado.reportar('PLG001', 5)
+    semantico.reportar('SEM003', 2, nombre='a')
+    semantico.reportar('SEM003', 5, nombre='b')
+    semantico.reportar('SEM003', 9, nombre='c')
+    assert por_linea(plegado, semantico) == [
+        "Línea 2: 'a' no declarada.",
+        "Línea 5: división entre cero.",
+        "Línea 5: 'b' no declarada.",
+        "Línea 9: 'c' no declarada.",
+    ]
+    # tambien con mensajes ya formateados (como vuelven de otro proceso)
+    assert por_linea(list(plegado), list(semantico)) == por_linea(plegado, semantico)
+
+
+# ---------------- plazo ----------------
+# el plegado revisa el plazo en cada sentencia de nivel superior, como el semantico
+
+def test_ayman_plegado_revisa_el_plazo():
+    import analizador_swift
+    import plegado_ayman
+    from comun.plazo import Plazo, PlazoAgotado
+    ast = analizador_swift.analizar('let x = 1 + 2\nlet y = x\n', solo_sintaxis=True)
+    plazo = Plazo.sin_limite()
+    assert plegado_ayman.plegar_programa(ast, plazo)[1][0][3] == ('literal', 'Int', 3)
+    plazo.cancelar()
+    with pytest.raises(PlazoAgotado):
+        plegado_ayman.plegar_programa(ast, plazo)
+
+
+def test_jordan_plegado_revisa_el_plazo():
+    import plegado_jordan
+    import sintactico_jordan
+    from comun.plazo import Plazo, PlazoAgotado
+    ast = sintactico_jordan.parser.parse('var x = 1 + 2;\n', lexer=sintactico_jordan.lexer)
+    plazo = Plazo.sin_limite()
+    plazo.cancelar()
+    with pytest.raises(PlazoAgotado):
+        plegado_jordan.plegar_programa(ast, plazo)
+
+
+def test_ariel_plegado_revisa_el_plazo():
+    import analizadorSintactico
+    from plegadoConstantes import PlegadorConstantes
+    from comun.plazo import Plazo, PlazoAgotado
+    plegador = PlegadorConstantes()
+    plegador.plazo = Plazo.sin_limite()
+    plegador.plazo.cancelar()
+    with pytest.raises(PlazoAgotado):
+        plegador.plegar_programa(analizadorSintactico.analizador_sintactico.parse('var x = 1 + 2;\n'))
+
+
+# ---------------- sin efectos afuera ----------------
+# plegar no modifica los literales que recibe ni toca el recolector del proceso
+
+def test_ariel_plegado_no_modifica_los_operandos():
+    import gc
+    from analizadorSemantico import Literal, OperacionBinaria, OperacionNaria
+    from plegadoConstantes import PlegadorConstantes
+    uno, dos = Literal(1, 'Int', 3), Literal(2.5, 'Double', 3)
+    plegado = PlegadorConstantes().plegar(OperacionBinaria('+', uno, dos, 3))
+    assert (plegado.valor, plegado.tipo, plegado.linea) == (3.5, 'Double', 3)
+    assert (uno.valor, uno.tipo, dos.valor, dos.tipo) == (1, 'Int', 2.5, 'Double')
+    naria = OperacionNaria('*', [uno, Literal(4, 'Int', 3)], [3])
+    assert PlegadorConstantes().plegar(naria).valor == 4
+    assert (uno.valor, uno.tipo) == (1, 'Int')
+    assert gc.isenabled()
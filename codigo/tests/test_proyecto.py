@@ -0,0 +1,122 @@
+import os
+
+import pytest
+
+ARCHIVOS = {
+    'geometria.swift': "import Foundation\nlet PI = 3.14;\nvar contador: Int = 0;\n"
+                       "func area(r: Double) -> Double { return PI * r * r; }\n",
+    'main.swift': 'import geometria\nlet a = area(2.0);\ncontador = contador + 1;\nPI = 3.0;\nlet t = texto + "!";\n',
+    'util/textos.swift': 'let texto = "hola";\n',
+    'util/ciclo_a.swift': "func ida(n: Int) -> Int { return vuelta(n); }\nlet base = limite + 1;\n",
+    'util/ciclo_b.swift': "func vuelta(n: Int) -> Int { return ida(n); }\nlet limite = 10;\n",
+}
+
+
+def escribir(carpeta, relativa, texto):
+    ruta = carpeta / relativa
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    ruta.write_text(texto, encoding='utf-8')
+
+
+@pytest.fixture
+def fuentes(tmp_path):
+    carpeta = tmp_path / 'src'
+    for relativa, texto in ARCHIVOS.items():
+        escribir(carpeta, relativa, texto)
+    return carpeta
+
+
+def relativas(carpeta, rutas):
+    return sorted(os.path.relpath(r, str(carpeta)).replace(os.sep, '/') for r in rutas)
+
+
+def analizar(carpeta, cache, trabajadores=1):
+    import proyecto
+    return proyecto.Proyecto(str(carpeta), str(cache) if cache is not None else None, trabajadores).analizar()
+
+
+# ---------------- grafo ----------------
+
+def test_descubrir_salta_ocultas_y_otras_extensiones(fuentes):
+    import proyecto
+    escribir(fuentes, '.cache_analisis/viejo.swift', 'let x = 1;\n')
+    escribir(fuentes, 'notas.txt', 'nada')
+    assert relativas(fuentes, proyecto.descubrir(str(fuentes))) == sorted(ARCHIVOS)
+
+
+def test_dependencias_por_import_y_por_nombre(fuentes):
+    resultado = analizar(fuentes, None)
+    orden = [relativas(fuentes, componente) for componente in resultado.componentes]
+    assert sorted(orden) == sorted([['geometria.swift'], ['main.swift'], ['util/textos.swift'],
+                                    ['util/ciclo_a.swift', 'util/ciclo_b.swift']])
+    # cada componente despues de los que usa: main importa geometria y usa `texto`
+    posicion = {ruta: i for i, componente in enumerate(orden) for ruta in componente}
+    assert posicion['main.swift'] > posicion['geometria.swift']
+    assert posicion['main.swift'] > posicion['util/textos.swift']
+    # lo de otros archivos se ve con su tipo: el unico error de main es asignar a la constante PI
+    main = str(fuentes / 'main.swift')
+    assert len(resultado.errores[main]) == 1 and 'PI' in resultado.errores[main][0]
+    assert all(resultado.errores[str(fuentes / r)] == [] for r in ARCHIVOS if r != 'main.swift')
+
+
+def test_ciclo_sin_import_se_verifica_junto(fuentes):
+    escribir(fuentes, 'util/ciclo_b.swift', 'func vuelta(n: Int) -> Int { return ida(n); }\nlet limite = "diez";\n')
+    resultado = analizar(fuentes, None)
+    ciclo = [str(fuentes / 'util/ciclo_a.swift'), str(fuentes / 'util/ciclo_b.swift')]
+    assert ciclo in resultado.componentes
+    # dentro del ciclo se ve el tipo declarado: `limite` sin anotacion queda Desconocido y no da error
+    assert resultado.errores[ciclo[0]] == []
+
+
+def test_declarado_en_dos_archivos_es_pry001(fuentes):
+    escribir(fuentes, 'util/otro.swift', 'let x = 1;\nfunc area(r: Int) -> Int { return r; }\n')
+    resultado = analizar(fuentes, None)
+    assert resultado.errores[str(fuentes / 'geometria.swift')] == []
+    [error] = resultado.errores[str(fuentes / 'util/otro.swift')]
+    assert "Línea 2: 'area' ya fue declarado en geometria.swift" in error
+
+
+# ---------------- corridas sucesivas ----------------
+# solo se parsea lo que cambio y se vuelve a verificar eso y lo que ve un exportado que cambio
+
+@pytest.mark.parametrize("trabajadores", [1, 2])
+def test_solo_se_reverifican_los_dependientes(fuentes, tmp_path, trabajadores):
+    cache = tmp_path / 'cache'
+
+    def corrida():
+        resultado = analizar(fuentes, cache, trabajadores)
+        return relativas(fuentes, resultado.parseados), relativas(fuentes, resultado.verificados), resultado
+
+    parseados, verificados, _ = corrida()
+    assert parseados == verificados == sorted(ARCHIVOS)
+    # sin cambios (y con un Proyecto nuevo: el estado queda en el cache)
+    assert corrida()[:2] == ([], [])
+
+    # una hoja: solo ella
+    escribir(fuentes, 'main.swift', ARCHIVOS['main.swift'].replace('"!"', '"?"'))
+    assert corrida()[:2] == (['main.swift'], ['main.swift'])
+
+    # el cuerpo de una funcion, sin tocar lo exportado: nadie mas
+    escribir(fuentes, 'geometria.swift', ARCHIVOS['geometria.swift'].replace('PI * r * r', 'PI * r'))
+    assert corrida()[:2] == (['geometria.swift'], ['geometria.swift'])
+
+    # PI pasa a var: main se vuelve a verificar y pierde el error
+    escribir(fuentes, 'geometria.swift', ARCHIVOS['geometria.swift'].replace('let PI = 3.14', 'var PI: Double = 3.14'))
+    parseados, verificados, resultado = corrida()
+    assert (parseados, verificados) == (['geometria.swift'], ['geometria.swift', 'main.swift'])
+    assert resultado.errores[str(fuentes / 'main.swift')] == []
+
+    # `texto` cambia de tipo: textos y main, que lo usa
+    escribir(fuentes, 'util/textos.swift', 'let texto = 4;\n')
+    parseados, verificados, resultado = corrida()
+    assert (parseados, verificados) == (['util/textos.swift'], ['main.swift', 'util/textos.swift'])
+    assert len(resultado.errores[str(fuentes / 'main.swift')]) == 1
+
+    # se borra un archivo del ciclo: el otro cambia de dependencias y pierde `vuelta` y `limite`
+    os.remove(str(fuentes / 'util/ciclo_b.swift'))
+    parseados, verificados, resultado = corrida()
+    assert (parseados, verificados) == ([], ['util/ciclo_a.swift'])
+    assert any('limite' in e for e in resultado.errores[str(fuentes / 'util/ciclo_a.swift')])
+
+    # lo mismo que un analisis desde cero
+    assert analizar(fuentes, None, trabajadores).errores == resultado.errores
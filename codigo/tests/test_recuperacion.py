@@ -0,0 +1,124 @@
+import contextlib
+import io
+import time
+
+import pytest
+
+
+def gramaticas():
+    import analizadorSintactico
+    with contextlib.redirect_stdout(io.StringIO()):
+        import analizador_swift
+        import semantico_jordan
+        import sintactico_jordan
+    # (analyze, errores sintacticos, nombres declarados en el nivel superior del ast)
+    return {
+        'ariel': (analizadorSintactico.analyze, analizadorSintactico.errores_sintacticos,
+                  lambda ast: [s.nombre for s in ast.sentencias if type(s).__name__ == 'DeclaracionVariable']),
+        'ayman': (analizador_swift.analyze, analizador_swift.parse_errors,
+                  lambda ast: [s[1] for s in ast[1] if s[0] == 'let_decl']),
+        'jordan': (semantico_jordan.analyze, sintactico_jordan.syntax_errors,
+                   lambda ast: [s[1] for s in ast[1] if s[0] == 'var_decl']),
+    }
+
+
+def sintacticos(nombre, codigo, max_errors=None):
+    """(lineas de cada SIN001, cuantos SIN003, nombres declarados) de analizar `codigo`.
+    Los repetidos solo guardan las primeras lineas: para contarlos, errores_de()."""
+    analyze, errores, declarados = gramaticas()[nombre]
+    resultado = analyze(codigo, max_errors=max_errors)
+    lineas = sorted(linea for d in errores.diagnosticos() if d.codigo == 'SIN001' for linea in d.lineas)
+    cortes = sum(d.veces for d in errores.diagnosticos() if d.codigo == 'SIN003')
+    return lineas, cortes, declarados(resultado.ast) if resultado.ast is not None else []
+
+
+def errores_de(nombre):
+    """(cuantos SIN001, cuantos SIN003) del ultimo analisis."""
+    errores = gramaticas()[nombre][1]
+    return tuple(sum(d.veces for d in errores.diagnosticos() if d.codigo == codigo) for codigo in ('SIN001', 'SIN003'))
+
+
+# ---------------- puntos seguros ----------------
+# un error por sentencia rota; el parse sigue en el proximo punto seguro
+
+@pytest.mark.parametrize("nombre, codigo", [
+    ('ariel', 'var x = = 1 ) ( ; var y = 2;\n'),
+    ('ayman', 'let x = = 1 ) ( ; let y = 2\n'),
+    ('jordan', 'var x = = 1 ) ( ; var y = 2;\n'),
+])
+def test_reanuda_despues_del_punto_y_coma(nombre, codigo):
+    assert sintacticos(nombre, codigo) == ([1], 0, ['y'])
+
+
+@pytest.mark.parametrize("nombre, codigo", [
+    ('ariel', 'func f() {\n var a = = 1 ) } var b = 2;\n'),
+    ('ayman', 'for i in 1...2 {\n let a = = 1 ) } let b = 2\n'),
+    ('jordan', 'func f() {\n var a = = 1 ) } var b = 2;\n'),
+])
+def test_reanuda_antes_de_la_llave_que_cierra(nombre, codigo):
+    # la palabra clave no esta al comienzo de la linea: lo que salva a `b` es la '}'
+    assert sintacticos(nombre, codigo) == ([2], 0, ['b'])
+
+
+@pytest.mark.parametrize("nombre, codigo", [
+    ('ariel', 'var x = = 1 )\nvar y = 2;\nvar z = = ;\nvar w = 3;\n'),
+    ('ayman', 'let x = = 1 )\nlet y = 2\nlet z = = \nlet w = 3\n'),
+    ('jordan', 'var x = = 1 )\nvar y = 2;\nvar z = = ;\nvar w = 3;\n'),
+])
+def test_reanuda_en_palabra_clave_al_comienzo_de_linea(nombre, codigo):
+    lineas, cortes, declarados = sintacticos(nombre, codigo)
+    assert (lineas, cortes) == ([1, 3], 0)
+    assert {'y', 'w'} <= set(declarados)
+
+
+@pytest.mark.parametrize("nombre, codigo", [
+    ('ariel', 'var x = = 1 ) var y = 2;\nvar z = 3;\n'),
+    ('ayman', 'let x = = 1 ) let y = 2\nlet z = 3\n'),
+    ('jordan', 'var x = = 1 ) var y = 2;\nvar z = 3;\n'),
+])
+def test_palabra_clave_en_medio_de_la_linea_no_es_punto_seguro(nombre, codigo):
+    lineas, cortes, declarados = sintacticos(nombre, codigo)
+    assert (lineas, cortes) == ([1], 0)
+    assert 'y' not in declarados and 'z' in declarados
+
+
+# ---------------- max_errors ----------------
+
+BASURA = {
+    'ariel': "var x = = 1 ) ( ;\nif (x { y = ; }\n",
+    'ayman': "let x = = 1 ) (\nlet y: = [1, 2\n",
+    'jordan': "var x = = 1 ) ( ;\nif (x { y = ; }\n",
+}
+
+
+@pytest.mark.parametrize("nombre", ['ariel', 'ayman', 'jordan'])
+def test_max_errors_corta_y_avisa_una_vez(nombre):
+    from comun.recuperacion import MAX_ERRORES
+    sintacticos(nombre, BASURA[nombre] * 50, max_errors=5)
+    assert errores_de(nombre) == (5, 1)
+    sintacticos(nombre, BASURA[nombre] * 50, max_errors=10 ** 9)
+    errores, cortes = errores_de(nombre)
+    assert errores > 50 and cortes == 0
+    # el tope vale solo para esa llamada
+    sintacticos(nombre, BASURA[nombre] * 200)
+    assert errores_de(nombre) == (MAX_ERRORES, 1)
+
+
+# ---------------- costo lineal ----------------
+# cuatro veces mas basura: cuatro veces los errores y el tiempo (cuadratico serian 16)
+
+@pytest.mark.parametrize("nombre", ['ariel', 'ayman', 'jordan'])
+def test_basura_en_tiempo_lineal(nombre):
+    def medir(veces):
+        mejor = None
+        for _ in range(3):
+            inicio = time.perf_counter()
+            sintacticos(nombre, BASURA[nombre] * veces, max_errors=10 ** 9)
+            duracion = time.perf_counter() - inicio
+            mejor = duracion if mejor is None else min(mejor, duracion)
+        return errores_de(nombre)[0], mejor
+
+    errores, chico = medir(500)
+    errores_grande, grande = medir(2000)
+    assert errores_grande == 4 * errores
+    assert grande < 8 * chico
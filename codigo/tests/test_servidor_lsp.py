@@ -0,0 +1,173 @@
+import contextlib
+import io
+import os
+import queue
+import statistics
+import threading
+import time
+
+import pytest
+
+from comun.servidor_lsp import PEDIDO_CANCELADO, escribir_mensaje, leer_mensaje
+
+URI = 'file:///prueba.swift'
+ESPERA = 30
+
+
+def servidores():
+    import analizadorSintactico
+    with contextlib.redirect_stdout(io.StringIO()):
+        import analizador_swift
+        import semantico_jordan
+    # (crear servidor, sentencia valida, sentencia con error de sintaxis)
+    return {
+        'ariel': (analizadorSintactico.servidor_lsp, "var v{i} = {i};", "var w = ;"),
+        'ayman': (analizador_swift.servidor_lsp, "let v{i} = {i}", "let w = )"),
+        'jordan': (semantico_jordan.servidor_lsp, "var v{i} = {i};", "var w = ;"),
+    }
+
+
+class Cliente:
+    """El servidor en un hilo, hablando por dos tuberias como lo haria el editor."""
+
+    def __init__(self, crear):
+        lee_servidor, escribe_cliente = os.pipe()
+        lee_cliente, escribe_servidor = os.pipe()
+        self.entrada = os.fdopen(escribe_cliente, 'wb')
+        self.servidor = crear(entrada=os.fdopen(lee_servidor, 'rb'), salida=os.fdopen(escribe_servidor, 'wb'))
+        self._mensajes = queue.Queue()
+        salida = os.fdopen(lee_cliente, 'rb')
+        threading.Thread(target=lambda: [self._mensajes.put(m) for m in iter(lambda: leer_mensaje(salida), None)],
+                         daemon=True).start()
+        self._hilo = threading.Thread(target=self.servidor.atender, daemon=True)
+        self._hilo.start()
+        self.enviar({'id': 0, 'method': 'initialize', 'params': {}})
+        assert 'capabilities' in self.recibir()['result']
+
+    def enviar(self, *mensajes):
+        # todo en una sola escritura: el servidor los encuentra juntos en la tuberia
+        buffer = io.BytesIO()
+        for mensaje in mensajes:
+            escribir_mensaje(buffer, dict(mensaje, jsonrpc='2.0'))
+        self.entrada.write(buffer.getvalue())
+        self.entrada.flush()
+
+    def recibir(self):
+        return self._mensajes.get(timeout=ESPERA)
+
+    def publicado(self):
+        mensaje = self.recibir()
+        assert mensaje['method'] == 'textDocument/publishDiagnostics'
+        return mensaje['params']
+
+    def cerrar(self):
+        self.enviar({'id': 99, 'method': 'shutdown'}, {'method': 'exit'})
+        self._hilo.join(ESPERA)
+        assert not self._hilo.is_alive()
+
+
+def abrir(cliente, lineas, version=1):
+    cliente.enviar({'method': 'textDocument/didOpen',
+                    'params': {'textDocument': {'uri': URI, 'version': version, 'text': '\n'.join(lineas) + '\n'}}})
+
+
+def cambio(version, linea, texto, fin=None):
+    """didChange incremental: reemplaza la linea `linea` (hasta `fin`, sin incluirla) por `texto`."""
+    fin = linea + 1 if fin is None else fin
+    return {'method': 'textDocument/didChange',
+            'params': {'textDocument': {'uri': URI, 'version': version},
+                       'contentChanges': [{'range': {'start': {'line': linea, 'character': 0},
+                                                     'end': {'line': fin, 'character': 0}},
+                                           'text': texto}]}}
+
+
+def detener_analisis(servidor, hasta):
+    """El próximo análisis espera a que hasta() sea cierto antes de empezar."""
+    analizar = servidor.analizar
+    entro = threading.Event()
+
+    def envoltura(estado, texto, plazo):
+        servidor.analizar = analizar
+        entro.set()
+        limite = time.monotonic() + ESPERA
+        while not hasta() and time.monotonic() < limite:
+            time.sleep(0.001)
+        return analizar(estado, texto, plazo)
+
+    servidor.analizar = envoltura
+    return entro
+
+
+@pytest.mark.parametrize("nombre", ['ariel', 'ayman', 'jordan'])
+def test_protocolo(nombre):
+    crear, valida, rota = servidores()[nombre]
+    lineas = [valida.format(i=i) for i in range(200)]
+    cliente = Cliente(crear)
+    try:
+        abrir(cliente, lineas[:10] + [rota] + lineas[10:])
+        params = cliente.publicado()
+        assert params['version'] == 1
+        assert 10 in {d['range']['start']['line'] for d in params['diagnostics']}
+
+        # incremental: se borra la linea con error
+        cliente.enviar(cambio(2, 10, ''))
+        params = cliente.publicado()
+        assert (params['version'], params['diagnostics']) == (2, [])
+        assert cliente.servidor.documentos[URI].texto == '\n'.join(lineas) + '\n'
+
+        # ediciones que llegan mientras se analiza la 3: esa se corta y solo se publica la ultima
+        estadisticas = dict(cliente.servidor.estadisticas)
+        entro = detener_analisis(cliente.servidor, lambda: cliente.servidor._cola.qsize() >= 7)
+        cliente.enviar(cambio(3, 0, valida.format(i=1000) + '\n', fin=0))
+        assert entro.wait(ESPERA)
+        cliente.enviar(*[cambio(v, 0, valida.format(i=1000 + v) + '\n', fin=0) for v in range(4, 10)],
+                       cambio(10, 5, rota + '\n'))
+        params = cliente.publicado()
+        assert params['version'] == 10
+        assert 5 in {d['range']['start']['line'] for d in params['diagnostics']}
+        assert cliente.servidor.estadisticas['analisis'] - estadisticas['analisis'] == 2
+        assert cliente.servidor.estadisticas['cortados'] - estadisticas['cortados'] == 1
+
+        # $/cancelRequest de un textDocument/diagnostic que espera al analisis
+        entro = detener_analisis(cliente.servidor, lambda: 8 in cliente.servidor._cancelados)
+        cliente.enviar(cambio(11, 5, valida.format(i=2000) + '\n'))
+        assert entro.wait(ESPERA)
+        cliente.enviar({'id': 8, 'method': 'textDocument/diagnostic', 'params': {'textDocument': {'uri': URI}}},
+                       {'method': '$/cancelRequest', 'params': {'id': 8}},
+                       {'id': 9, 'method': 'textDocument/diagnostic', 'params': {'textDocument': {'uri': URI}}})
+        respuestas = {}
+        while len(respuestas) < 2:
+            mensaje = cliente.recibir()
+            if 'id' in mensaje:
+                respuestas[mensaje['id']] = mensaje
+            else:
+                assert mensaje['params']['version'] == 11
+        assert respuestas[8]['error']['code'] == PEDIDO_CANCELADO
+        assert respuestas[9]['result'] == {'kind': 'full', 'items': []}
+    finally:
+        cliente.cerrar()
+
+
+@pytest.mark.parametrize("nombre", ['ariel', 'ayman', 'jordan'])
+def test_latencia(nombre, record_property):
+    crear, valida, rota = servidores()[nombre]
+    cliente = Cliente(crear)
+    try:
+        abrir(cliente, [valida.format(i=i) for i in range(2000)])
+        cliente.publicado()
+        tiempos = []
+        for version in range(2, 42):
+            texto = rota if version % 2 else valida.format(i=10000 + version)
+            inicio = time.perf_counter()
+            cliente.enviar(cambio(version, 1000, texto + '\n'))
+            params = cliente.publicado()
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+            assert params['version'] == version
+            assert bool(params['diagnostics']) == bool(version % 2)
+    finally:
+        cliente.cerrar()
+    p50 = statistics.median(tiempos)
+    p95 = statistics.quantiles(tiempos, n=20)[-1]
+    record_property('p50_ms', round(p50, 1))
+    record_property('p95_ms', round(p95, 1))
+    print(f"\n{nombre}: edicion -> publishDiagnostics en 2000 lineas: p50 {p50:.1f} ms, p95 {p95:.1f} ms")
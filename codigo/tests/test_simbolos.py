@@ -0,0 +1,63 @@
+import tracemalloc
+
+from comun.simbolos import Ambito
+
+
+def test_declarar_y_consultar():
+    ambito = Ambito()
+    assert ambito.declarar('a', 'Int', True, 3)
+    assert ambito.declarar('b', 'String', False, 7)
+    assert not ambito.declarar('a', 'Double', False, 9)
+    assert ambito.tipo_de('a') == 'Int' and ambito.tipo_de('c') is None
+    simb = ambito['b']
+    assert (simb.nombre, simb.tipo, simb.mutable, simb.linea) == ('b', 'String', False, 7)
+    assert ambito.get('a').mutable and ambito.get('a').linea == 3
+    assert [(n, s.linea) for n, s in ambito.items()] == [('a', 3), ('b', 7)]
+
+
+def test_linea_despues_de_volver_a():
+    ambito = Ambito()
+    ambito.declarar('a', 'Int', linea=1)
+    marca = ambito.marca()
+    ambito.declarar('b', 'Int', linea=2)
+    assert ambito.linea_de('b') == 2
+    ambito.volver_a(marca)
+    assert 'b' not in ambito and ambito.linea_de('b') is None
+    ambito.declarar('b', 'Bool', True, 5)
+    assert ambito.linea_de('b') == 5 and ambito.get('b').tipo == 'Bool'
+
+
+def test_muchos_tipos():
+    # pasado el rango de los enteros chicos el código sigue siendo correcto
+    ambito = Ambito()
+    for i in range(300):
+        ambito.declarar(f"v{i}", f"Tipo{i}", i % 2 == 0, i)
+    assert all(ambito.tipo_de(f"v{i}") == f"Tipo{i}" and ambito.get(f"v{i}").mutable == (i % 2 == 0)
+               for i in range(300))
+
+
+class SimboloAnterior:
+    # el registro de Ariel antes de Ambito (sin __slots__)
+    def __init__(self, nombre, tipo, mutable, linea):
+        self.nombre, self.tipo, self.mutable, self.linea = nombre, tipo, mutable, linea
+
+
+def test_memoria_por_simbolo():
+    nombres = [f"variable{i}" for i in range(200_000)]
+
+    def medir(construir):
+        tracemalloc.start()
+        objeto = construir()
+        tamano = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del objeto
+        return tamano
+
+    def compacto():
+        ambito = Ambito()
+        for i, nombre in enumerate(nombres):
+            ambito.declarar(nombre, 'Int', True, i + 1)
+        return ambito
+
+    anterior = medir(lambda: {n: SimboloAnterior(n, 'Int', True, i + 1) for i, n in enumerate(nombres)})
+    assert medir(compacto) * 4 <= anterior
@@ -0,0 +1,109 @@
+import os
+import threading
+import time
+
+from comun.vigilancia import CARGA, Vigilante
+
+PASO = 0.02         # entre guardados de una misma rafaga; menor que la espera
+LIMITE = 10
+
+
+def vigilante(carpeta):
+    return Vigilante(str(carpeta), intervalo=0.005, espera=0.15)
+
+
+def escribir(ruta, texto):
+    with open(ruta, 'w') as archivo:
+        archivo.write(texto)
+
+
+def en_segundo_plano(*pasos):
+    """Corre cada paso con PASO segundos entre uno y otro, como un editor guardando."""
+    def correr():
+        for paso in pasos:
+            paso()
+            time.sleep(PASO)
+    hilo = threading.Thread(target=correr)
+    hilo.start()
+    return hilo
+
+
+def hasta(segundos):
+    limite = time.monotonic() + segundos
+    return lambda: time.monotonic() > limite
+
+
+def rutas(carpeta, *nombres):
+    return sorted(os.path.join(str(carpeta), nombre) for nombre in nombres)
+
+
+# ---------------- rafagas ----------------
+# varios guardados seguidos se entregan juntos, una vez, cuando el arbol se calma
+
+def test_guardados_seguidos_son_una_rafaga(tmp_path):
+    a, b = tmp_path / 'a.swift', tmp_path / 'b.swift'
+    escribir(a, 'var a = 0;')
+    v = vigilante(tmp_path)
+    hilo = en_segundo_plano(*[lambda i=i: escribir(a, 'var a = %d;' % (10 ** i)) for i in range(1, 6)],
+                            lambda: escribir(b, 'var b = 1;'))
+    assert v.rafaga(hasta(LIMITE)) == (rutas(tmp_path, 'a.swift', 'b.swift'), [])
+    hilo.join()
+    # no queda nada pendiente: la siguiente rafaga no llega
+    assert v.rafaga(hasta(0.3)) is None
+
+
+def test_detener_corta_la_espera(tmp_path):
+    v = vigilante(tmp_path)
+    inicio = time.monotonic()
+    assert list(v.rafagas(hasta(0.1))) == []
+    assert time.monotonic() - inicio < LIMITE
+
+
+# ---------------- borrados ----------------
+
+def test_borrado(tmp_path):
+    c = tmp_path / 'c.swift'
+    escribir(c, 'var c = 1;')
+    v = vigilante(tmp_path)
+    os.remove(c)
+    assert v.rafaga(hasta(LIMITE)) == ([], rutas(tmp_path, 'c.swift'))
+
+
+def test_creado_y_borrado_en_la_misma_rafaga_no_aparece(tmp_path):
+    a, tmp = tmp_path / 'a.swift', tmp_path / 'tmp.swift'
+    escribir(a, 'var a = 1;')
+    v = vigilante(tmp_path)
+    hilo = en_segundo_plano(lambda: escribir(tmp, 'var t = 1;'),
+                            lambda: os.remove(tmp),
+                            lambda: escribir(a, 'var a = 22;'))
+    assert v.rafaga(hasta(LIMITE)) == (rutas(tmp_path, 'a.swift'), [])
+    hilo.join()
+
+
+def test_borrado_y_vuelto_a_crear_es_un_cambio(tmp_path):
+    a, nuevo = tmp_path / 'a.swift', tmp_path / 'a.swift.nuevo'
+    escribir(a, 'var a = 1;')
+    v = vigilante(tmp_path)
+    # como guardan algunos editores: escriben otro archivo y lo renombran encima
+    hilo = en_segundo_plano(lambda: os.remove(a),
+                            lambda: escribir(nuevo, 'var a = 2;'),
+                            lambda: os.rename(nuevo, a))
+    assert v.rafaga(hasta(LIMITE)) == (rutas(tmp_path, 'a.swift'), [])
+    hilo.join()
+
+
+def test_carpetas_ocultas_y_otras_extensiones_no_cuentan(tmp_path):
+    (tmp_path / '.cache_analisis').mkdir()
+    v = vigilante(tmp_path)
+    escribir(tmp_path / '.cache_analisis' / 'x.swift', 'var x = 1;')
+    escribir(tmp_path / 'notas.txt', 'nada')
+    assert v.rafaga(hasta(0.3)) is None
+
+
+# ---------------- pausa ----------------
+# un arbol que tarda en escanearse se revisa con menos frecuencia
+
+def test_pausa_crece_con_el_costo_de_revisar(tmp_path):
+    v = Vigilante(str(tmp_path), intervalo=0.2)
+    assert v.pausa(0.001) == 0.2
+    assert v.pausa(0.05) == 0.05 * CARGA